@@ -5,17 +5,74 @@ Bitcoin Auto Trading Backtest
 사용법:
 python backtest.py --start 2024-05-01 --end 2024-05-30
 python backtest.py --start 2024-05-01 --end 2024-05-30 --plot
+python backtest.py --start 2024-05-01 --end 2024-05-30 --plot-out result.png
+python backtest.py --start 2024-05-01 --end 2024-05-30 --fill-model
+python backtest.py --start 2024-05-01 --end 2024-05-30 --sweep sma_short=5,7 --sweep sma_long=20,25
+python backtest.py --start 2022-01-01 --end 2024-12-31 --store data/candles
+python backtest.py montecarlo --start 2024-01-01 --end 2024-06-30 --paths 10000
+python backtest.py slicing --start 2024-05-01 --end 2024-05-30
+python backtest.py --start 2024-05-01 --end 2024-05-30 --profile cpu
 """
 
 import argparse
+import itertools
 import logging
 import sys
+import time
 from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import ccxt
+import numpy as np
 import pandas as pd
 
+from candle_store import DEFAULT_CHUNK_SIZE, CandleStore
+from charts import chart_inputs, save_figure_headless, show_figure
 from config_loader import config_loader
+from fill_simulator import FillModel, Order, SimulatedBroker
+from gap_index import (
+    DEFAULT_GAP_POLICY,
+    GAP_INDEX_SUFFIX,
+    GAP_POLICIES,
+    GapIndex,
+    apply_chunk_policy,
+    fill_gaps,
+    load_gap_index,
+    ready_mask,
+    segment_starts,
+)
+from indicator_cache import IndicatorCache
+from metrics import (
+    DEFAULT_ROLLING_DAYS,
+    equity_arrays,
+    equity_metrics,
+    max_drawdown,
+    return_moments,
+    rolling_metrics,
+    summarize_rolling,
+    trade_arrays,
+    trade_metrics,
+)
+from montecarlo import (
+    DEFAULT_CONFIDENCE,
+    DEFAULT_PATHS,
+    print_montecarlo_results,
+    run_montecarlo,
+)
+from order_scheduler import SlicedSimOrder, SlicingConfig
+from profiling import DEFAULT_PROFILE_DIR, PROFILE_MODES, profile_run
+from resample import OHLCV_COLUMNS, index_to_ms, resample_ohlcv, timeframe_to_ms
+from result_cache import ResultCache, data_fingerprint, is_closed_range, run_key
+from strategy import (
+    PRICE_SCALE_INDICATORS,
+    Strategy,
+    add_indicator_columns,
+    create_strategy,
+    net_profit_rate,
+)
+
+# 매매 시뮬레이션 규칙이 바뀌면 올려서 이전 결과 캐시를 무효화
+ENGINE_VERSION = 2
 
 # 로깅 설정
 logging.basicConfig(
@@ -26,18 +83,32 @@ logger = logging.getLogger(__name__)
 
 class BacktestEngine:
     def __init__(self):
-        # 설정 파일에서 거래 설정 로드
-        trading_config = config_loader.get_trading_config()
+        # 설정 파일에서 검증된 거래 설정 스냅샷 로드
+        config = config_loader.get_trading_snapshot()
         exchange_config = config_loader.get_exchange_config()
 
-        self.symbol = trading_config.get("symbol", "BTC/USDT")
-        self.timeframe = trading_config.get("timeframe", "5m")
-        self.sma_short = trading_config.get("sma_short", 7)
-        self.sma_long = trading_config.get("sma_long", 25)
-        self.initial_balance = trading_config.get("initial_balance", 100.0)
-        self.trade_amount = trading_config.get("trade_amount", 90.0)
-        self.trading_fee = trading_config.get("trading_fee", 0.001)
-        self.profit_threshold = trading_config.get("profit_threshold", 0.003)
+        self.symbol = config.symbol
+        self.timeframe = config.timeframe
+        # 기본 캔들 타임프레임 (설정 시 이 캔들 하나로 상위 타임프레임을 만든다)
+        self.base_timeframe = config.base_timeframe
+        self.trading_config = config
+        self.strategy = create_strategy(config)
+        backtest_config = config_loader.get_backtest_config()
+        self.indicator_cache = IndicatorCache.from_config(backtest_config)
+        # 캔들 누락 구간 처리 정책 (ffill/mask/split)
+        self.gap_policy = backtest_config.get("gap_policy", DEFAULT_GAP_POLICY)
+        if self.gap_policy not in GAP_POLICIES:
+            raise ValueError(
+                f"지원하지 않는 gap_policy: {self.gap_policy} ({', '.join(GAP_POLICIES)})"
+            )
+        self.initial_balance = config.initial_balance
+        self.trade_amount = config.trade_amount
+        self.trading_fee = config.trading_fee
+        self.profit_threshold = config.profit_threshold
+        self.fill_model = FillModel.from_config(
+            config_loader.get_fill_model_config(), self.trading_fee
+        )
+        self.slicing = SlicingConfig.from_config(config)
 
         # 바이낸스 거래소 (데이터 조회용)
         self.exchange = ccxt.binance(
@@ -46,8 +117,23 @@ class BacktestEngine:
             }
         )
 
-    def fetch_historical_data(self, start_date: str, end_date: str) -> pd.DataFrame:
-        """과거 데이터 조회"""
+    def fetch_historical_data(
+        self, start_date: str, end_date: str, timeframe: Optional[str] = None
+    ) -> pd.DataFrame:
+        """과거 데이터 조회
+
+        timeframe을 지정하지 않으면 base_timeframe 캔들을 받아 전략 타임프레임으로
+        리샘플링한다.
+        """
+        if timeframe is None and self.base_timeframe != self.timeframe:
+            base_df = self.fetch_historical_data(
+                start_date, end_date, self.base_timeframe
+            )
+            return resample_ohlcv(base_df, self.timeframe, self.base_timeframe).drop(
+                columns="candles"
+            )
+
+        timeframe = timeframe or self.timeframe
         try:
             start_timestamp = int(
                 datetime.strptime(start_date, "%Y-%m-%d").timestamp() * 1000
@@ -56,29 +142,10 @@ class BacktestEngine:
                 datetime.strptime(end_date, "%Y-%m-%d").timestamp() * 1000
             )
 
-            all_ohlcv = []
-            current_timestamp = start_timestamp
-
             logger.info(f"Fetching historical data from {start_date} to {end_date}")
-
-            while current_timestamp < end_timestamp:
-                ohlcv = self.exchange.fetch_ohlcv(
-                    symbol=self.symbol,
-                    timeframe=self.timeframe,
-                    since=current_timestamp,
-                    limit=1000,
-                )
-
-                if not ohlcv:
-                    break
-
-                all_ohlcv.extend(ohlcv)
-                current_timestamp = ohlcv[-1][0] + 300000  # 5분 추가
-
-                # API 레이트 리미트 고려
-                import time
-
-                time.sleep(0.1)
+            all_ohlcv = []
+            for page in self._iter_pages(timeframe, start_timestamp, end_timestamp):
+                all_ohlcv.extend(page)
 
             # DataFrame 생성
             df = pd.DataFrame(
@@ -96,6 +163,7 @@ class BacktestEngine:
             start_dt = pd.to_datetime(start_date)
             end_dt = pd.to_datetime(end_date) + timedelta(days=1)
             df = df[(df.index >= start_dt) & (df.index < end_dt)]
+            df = self.repair_gaps(df, timeframe)
 
             logger.info(f"Fetched {len(df)} data points")
             return df
@@ -104,55 +172,662 @@ class BacktestEngine:
             logger.error(f"Failed to fetch historical data: {e}")
             raise
 
-    def calculate_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
-        """기술적 지표 계산"""
-        df = df.copy()
-        df[f"sma_{self.sma_short}"] = df["close"].rolling(window=self.sma_short).mean()
-        df[f"sma_{self.sma_long}"] = df["close"].rolling(window=self.sma_long).mean()
-
-        # 매수/매도 신호 계산
-        df["buy_signal"] = (
-            df[f"sma_{self.sma_short}"] > df[f"sma_{self.sma_long}"]
-        ) & (
-            df[f"sma_{self.sma_short}"].shift(1) <= df[f"sma_{self.sma_long}"].shift(1)
-        )
+    def _iter_pages(
+        self, timeframe: str, since: int, until: int
+    ) -> Iterator[List[List[float]]]:
+        """[since, until) 구간 OHLCV를 1000봉 페이지 단위로 조회"""
+        timeframe_ms = timeframe_to_ms(timeframe)
+        while since < until:
+            ohlcv = self.exchange.fetch_ohlcv(
+                symbol=self.symbol, timeframe=timeframe, since=since, limit=1000
+            )
+            if not ohlcv:
+                break
+            yield ohlcv
+            since = ohlcv[-1][0] + timeframe_ms
+
+            # API 레이트 리미트 고려
+            time.sleep(0.1)
+
+    def repair_gaps(self, df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+        """누락 구간만 다시 받아 채우고 남은 구간(거래소에도 없는 봉)은 경고"""
+        timeframe_ms = timeframe_to_ms(timeframe)
+        index = GapIndex.build(index_to_ms(df.index), timeframe_ms)
+        if len(index.gaps) == 0:
+            return df
 
+        logger.warning(f"{timeframe} 캔들 {index.summary()} - 해당 구간만 다시 조회합니다")
+        refetched = [
+            row
+            for start, end in index.missing_ranges()
+            for page in self._iter_pages(timeframe, start, end)
+            for row in page
+            if start <= row[0] < end
+        ]
+        if refetched:
+            extra = pd.DataFrame(refetched, columns=["timestamp", *OHLCV_COLUMNS])
+            extra.index = pd.to_datetime(extra.pop("timestamp"), unit="ms")
+            df = pd.concat([df, extra])
+            df = df[~df.index.duplicated(keep="first")].sort_index()
+            index = GapIndex.build(index_to_ms(df.index), timeframe_ms)
+
+        if len(index.gaps):
+            logger.warning(
+                f"{timeframe} 캔들 {index.summary()}이 남아 있습니다 "
+                f"(gap_policy: {self.gap_policy})"
+            )
         return df
 
+    def repair_store_gaps(
+        self, store: CandleStore, start_ms: int, end_ms: int
+    ) -> GapIndex:
+        """저장소의 확인되지 않은 누락 구간만 다시 받아 기록
+
+        다시 받아도 채워지지 않은 구간은 confirmed로 표시해 다음 실행에서 건너뛴다.
+        """
+        timeframe = self.timeframe
+        index = load_gap_index(store, self.symbol, timeframe)
+        ranges = index.missing_ranges(start_ms, end_ms)
+        if not ranges:
+            return index
+
+        logger.info(f"Refetching {len(ranges)} candle gaps ({index.summary()})")
+        for start, end in ranges:
+            for page in self._iter_pages(timeframe, start, end):
+                store.append(self.symbol, timeframe, page)
+        index = load_gap_index(store, self.symbol, timeframe)
+        if index.confirm(ranges):
+            index.save(store.path(self.symbol, timeframe, GAP_INDEX_SUFFIX))
+        return index
+
+    def fetch_multi_timeframe(
+        self, start_date: str, end_date: str, timeframes: List[str]
+    ) -> Dict[str, pd.DataFrame]:
+        """기본 캔들을 한 번만 받아 여러 타임프레임 캔들 생성"""
+        base_df = self.fetch_historical_data(start_date, end_date, self.base_timeframe)
+        frames = {self.base_timeframe: base_df}
+        for timeframe in timeframes:
+            if timeframe not in frames:
+                frames[timeframe] = resample_ohlcv(
+                    base_df, timeframe, self.base_timeframe
+                )
+        return frames
+
+    def sync_store(self, store: CandleStore, start_date: str, end_date: str) -> int:
+        """저장소에 없는 구간만 페이지 단위로 받아 바로 기록 (메모리 사용량 일정)"""
+        timeframe = self.timeframe
+        timeframe_ms = timeframe_to_ms(timeframe)
+        start_ms = int(pd.Timestamp(start_date).value // 1_000_000)
+        end_ms = int((pd.Timestamp(end_date) + timedelta(days=1)).value // 1_000_000)
+
+        stored = store.read_range(self.symbol, timeframe, start_ms, end_ms)
+        if len(stored) and stored["timestamp"][0] == start_ms:
+            # 시작 구간이 이미 있으면 마지막 저장 시각 이후만 받음
+            since = store.last_timestamp(self.symbol, timeframe) + timeframe_ms
+        else:
+            since = start_ms
+        written = 0
+
+        logger.info(f"Syncing candle store from {pd.Timestamp(since, unit='ms')}")
+        for page in self._iter_pages(timeframe, since, end_ms):
+            written += store.append(self.symbol, timeframe, page)
+
+        logger.info(f"Candle store synced ({written} new candles)")
+        return written
+
+    def calculate_indicators(
+        self, df: pd.DataFrame, strategy: Optional[Strategy] = None
+    ) -> pd.DataFrame:
+        """기술적 지표 및 전략 매수/매도 신호 계산 (누락 구간 정책 적용)"""
+        strategy = strategy or self.strategy
+        timeframe_ms = timeframe_to_ms(self.timeframe)
+        if self.gap_policy == "ffill":
+            df = fill_gaps(df, timeframe_ms)
+        elif self.gap_policy == "split":
+            starts = segment_starts(index_to_ms(df.index), timeframe_ms)
+            if len(starts) > 1:
+                ends = np.append(starts[1:], len(df))
+                return pd.concat(
+                    add_indicator_columns(
+                        df.iloc[start:end], strategy, self.indicator_cache
+                    )
+                    for start, end in zip(starts, ends)
+                )
+
+        indicator_df = add_indicator_columns(df, strategy, self.indicator_cache)
+        if self.gap_policy == "mask":
+            contiguous = ready_mask(
+                index_to_ms(df.index), timeframe_ms, strategy.warmup
+            )
+            for column in ("entry_signal", "exit_signal", "signal_ready"):
+                indicator_df[column] &= contiguous
+        return indicator_df
+
+    def run_params(
+        self, strategy: Optional[Strategy] = None, use_fill_model: bool = False
+    ) -> Dict[str, Any]:
+        """결과에 영향을 주는 실행 파라미터 (결과 캐시 키)"""
+        return {
+            "symbol": self.symbol,
+            "timeframe": self.timeframe,
+            "base_timeframe": self.base_timeframe,
+            "strategy": (strategy or self.strategy).describe(),
+            "initial_balance": self.initial_balance,
+            "trade_amount": self.trade_amount,
+            "trading_fee": self.trading_fee,
+            "profit_threshold": self.profit_threshold,
+            "fill_model": vars(self.fill_model) if use_fill_model else None,
+            "gap_policy": self.gap_policy,
+        }
+
+    def data_id(self, start_date: str, end_date: str) -> Tuple[str, ...]:
+        """조회 기간 식별자 (결과 캐시의 데이터 색인 키)"""
+        return (
+            self.symbol,
+            self.base_timeframe,
+            self.timeframe,
+            start_date,
+            end_date,
+        )
+
+    def run_cached(
+        self,
+        df: pd.DataFrame,
+        data_fp: str,
+        cache: Optional[ResultCache] = None,
+        use_fill_model: bool = False,
+        strategy: Optional[Strategy] = None,
+    ) -> Tuple[dict, dict]:
+        """결과 캐시를 확인하고 없으면 지표 계산/백테스트/성과 지표 계산 후 저장"""
+        key = run_key(
+            self.run_params(strategy, use_fill_model), ENGINE_VERSION, data_fp
+        )
+        cached = cache.load(key) if cache else None
+        if cached:
+            return cached
+
+        indicator_df = self.calculate_indicators(df, strategy)
+        if use_fill_model:
+            results = self.run_backtest_simulated(indicator_df)
+        else:
+            results = self.run_backtest(indicator_df)
+        metrics = self.calculate_performance_metrics(results, indicator_df)
+
+        if cache:
+            cache.save(key, results, metrics)
+        return results, metrics
+
+    def run_sweep(
+        self,
+        df: pd.DataFrame,
+        param_grid: Dict[str, List[Any]],
+        cache: Optional[ResultCache] = None,
+    ) -> List[Dict[str, Any]]:
+        """파라미터 조합별 백테스트 (같은 지표는 캐시로 한 번만 계산)
+
+        결과 캐시를 주면 이미 실행한 조합은 저장된 결과를 사용한다.
+        """
+        sweep_results = []
+        data_fp = data_fingerprint(df)
+        keys = list(param_grid.keys())
+        for values in itertools.product(*param_grid.values()):
+            params = dict(zip(keys, values))
+            strategy = create_strategy(self.trading_config, params)
+            _, metrics = self.run_cached(df, data_fp, cache, strategy=strategy)
+            sweep_results.append({"params": params, "metrics": metrics})
+
+        logger.info(f"Sweep finished - indicator cache: {self.indicator_cache.stats()}")
+        return sweep_results
+
     def run_backtest(self, df: pd.DataFrame) -> dict:
         """백테스트 실행"""
-        results = {"trades": [], "balance_history": [], "position_history": []}
+        state = self._initial_state()
+        balances, position_values, positions = self._simulate_bars(
+            df.index,
+            df["close"].to_numpy(),
+            df["entry_signal"].to_numpy(),
+            df["exit_signal"].to_numpy(),
+            df["signal_ready"].to_numpy(),
+            state,
+            record_positions=True,
+        )
+        total_values = balances + position_values
+
+        results = {
+            "trades": state["trades"],
+            "balance_history": [],
+            "position_history": [],
+            "equity": {
+                "timestamp": index_to_ms(df.index),
+                "total_value": total_values,
+                "position_value": position_values,
+            },
+        }
+        for i, timestamp in enumerate(df.index):
+            results["balance_history"].append(
+                {
+                    "timestamp": timestamp,
+                    "balance": balances[i],
+                    "position_value": position_values[i],
+                    "total_value": total_values[i],
+                }
+            )
+            results["position_history"].append(
+                {
+                    "timestamp": timestamp,
+                    "position": positions[i].copy() if positions[i] else None,
+                }
+            )
+
+        return results
+
+    def run_backtest_chunked(self, chunks: Iterable[np.ndarray]) -> dict:
+        """청크 단위 스트리밍 백테스트 (CANDLE_DTYPE 배열 청크를 순서대로 처리)
+
+        지표 warm-up 구간과 잔고/포지션 상태를 청크 사이에 이어 받으므로
+        결과(거래 내역, 성과 지표)는 전체 데이터를 한 번에 처리한 결과와 같다.
+        봉별 기록 대신 누적 요약만 유지해 메모리 사용량이 기간과 무관하다.
+        """
+        state = self._initial_state()
+        timeframe_ms = timeframe_to_ms(self.timeframe)
+        warmup_tail = np.empty(0)
+        tail_timestamps = np.empty(0, dtype=np.int64)
+        summary = {
+            "bars": 0,
+            "first_close": None,
+            "last_close": None,
+            "final_value": self.initial_balance,
+            "peak_value": None,
+            "max_drawdown": 0.0,
+            "return_moments": np.zeros(4),
+            "exposure_bars": 0,
+        }
+
+        for chunk, restart in apply_chunk_policy(chunks, timeframe_ms, self.gap_policy):
+            if restart:
+                warmup_tail = np.empty(0)
+                tail_timestamps = np.empty(0, dtype=np.int64)
+            closes = np.asarray(chunk["close"], dtype=np.float64)
+            chunk_ms = np.asarray(chunk["timestamp"])
+            timestamps = pd.to_datetime(chunk_ms, unit="ms")
+
+            # 이전 청크 끝부분을 붙여 지표를 계산한 뒤 그 구간은 버림
+            window = np.concatenate([warmup_tail, closes])
+            window_ms = np.concatenate([tail_timestamps, chunk_ms])
+            _, entry, exit_, ready = self.strategy.evaluate(window)
+            if self.gap_policy == "mask":
+                contiguous = ready_mask(window_ms, timeframe_ms, self.strategy.warmup)
+                entry, exit_, ready = (
+                    entry & contiguous,
+                    exit_ & contiguous,
+                    ready & contiguous,
+                )
+            offset = len(warmup_tail)
+            keep = self.strategy.warmup - 1
+            warmup_tail = window[-keep:] if keep > 0 else np.empty(0)
+            tail_timestamps = (
+                window_ms[-keep:] if keep > 0 else np.empty(0, dtype=np.int64)
+            )
+
+            balances, position_values, _ = self._simulate_bars(
+                timestamps,
+                closes,
+                entry[offset:],
+                exit_[offset:],
+                ready[offset:],
+                state,
+            )
+            total_values = balances + position_values
+
+            # MDD를 청크 경계를 넘어 누적 계산
+            peaks = np.maximum.accumulate(total_values)
+            if summary["peak_value"] is not None:
+                peaks = np.maximum(peaks, summary["peak_value"])
+            drawdown = ((total_values - peaks) / peaks).min()
+
+            # 봉 수익률 누적값 (청크 경계 수익률 포함)
+            summary["return_moments"] += return_moments(
+                total_values, summary["final_value"] if summary["bars"] else None
+            )
+            summary["exposure_bars"] += int(np.count_nonzero(position_values))
+
+            if summary["first_close"] is None:
+                summary["first_close"] = closes[0]
+                summary["max_drawdown"] = drawdown
+            else:
+                summary["max_drawdown"] = min(summary["max_drawdown"], drawdown)
+            summary["bars"] += len(closes)
+            summary["last_close"] = closes[-1]
+            summary["final_value"] = total_values[-1]
+            summary["peak_value"] = peaks[-1]
+
+        return {"trades": state["trades"], "summary": summary}
+
+    def run_backtest_simulated(
+        self,
+        df: pd.DataFrame,
+        fill_model: Optional[FillModel] = None,
+        slicing: Optional[SlicingConfig] = None,
+    ) -> dict:
+        """체결 시뮬레이터 백테스트 (지연/슬리피지/부분 체결 반영)
+
+        신호는 봉 종가에 확인하고 주문은 SimulatedBroker가 체결한다. 주문이 끝날 때까지
+        (전량 체결 또는 취소) 새 주문은 내지 않는다. slicing을 주면 주문을 TWAP/iceberg
+        자식 주문으로 나눠 제출한다. 결과 형식은 run_backtest와 같다.
+        """
+        fill_model = fill_model or self.fill_model
+        timeframe_ms = timeframe_to_ms(self.timeframe)
+        broker = SimulatedBroker(fill_model, timeframe_ms)
+
+        n = len(df)
+        starts = index_to_ms(df.index).tolist()
+        opens = df["open"].tolist()
+        highs = df["high"].tolist()
+        lows = df["low"].tolist()
+        closes = df["close"].tolist()
+        volumes = df["volume"].tolist()
+        entry_signals = df["entry_signal"].tolist()
+        exit_signals = df["exit_signal"].tolist()
+        ready = df["signal_ready"].tolist()
+
+        balances = np.empty(n)
+        position_values = np.zeros(n)
+        positions: List[Optional[dict]] = [None] * n
+        trades: List[dict] = []
 
         balance = self.initial_balance
-        position = None  # {'price': float, 'amount': float, 'timestamp': datetime}
+        holding = 0.0  # 체결 중인 수량까지 포함한 보유 BTC
+        position = None  # {'price', 'amount', 'cost', 'timestamp'}
+        order = None
+        seen = (0.0, 0.0, 0.0)  # 주문의 직전 (체결 수량, 체결 금액, 수수료)
+
+        for i in range(n):
+            bar = (starts[i], opens[i], highs[i], lows[i], closes[i], volumes[i])
+            for attempt in range(2):
+                if order is not None and broker.process_bar(*bar):
+                    # 이번 봉 체결분만큼 잔고/보유량 반영
+                    filled, cost, fee = (
+                        order.filled - seen[0],
+                        order.cost - seen[1],
+                        order.fee - seen[2],
+                    )
+                    seen = (order.filled, order.cost, order.fee)
+                    if order.side == "buy":
+                        balance -= cost
+                        holding += filled * (1 - self.trading_fee)
+                    else:
+                        balance += cost - fee
+                        holding -= filled
+
+                    if order.done:
+                        position = self._complete_order(
+                            order, position, holding, df.index[i], balance, trades
+                        )
+                        order = None
+
+                # 주문이 없을 때만 종가 기준 신호 확인 (지연 0 주문은 같은 봉에서 체결)
+                if attempt or order is not None or not ready[i]:
+                    break
+                price = closes[i]
+                now = starts[i] + timeframe_ms
+                if (
+                    position is None
+                    and entry_signals[i]
+                    and balance >= self.trade_amount
+                ):
+                    order = self._submit_order(
+                        broker,
+                        slicing,
+                        "buy",
+                        now,
+                        price,
+                        self.trade_amount,
+                        quote_budget=self.trade_amount,
+                    )
+                elif position is not None and exit_signals[i]:
+                    profit_rate = net_profit_rate(
+                        position["price"], price, self.trading_fee
+                    )
+                    if profit_rate >= self.profit_threshold:
+                        order = self._submit_order(
+                            broker,
+                            slicing,
+                            "sell",
+                            now,
+                            price,
+                            position["amount"] * price,
+                            quantity=position["amount"],
+                        )
+                if order is None:
+                    break
+                seen = (0.0, 0.0, 0.0)
+
+            balances[i] = balance
+            position_values[i] = holding * closes[i]
+            positions[i] = dict(position) if position else None
+
+        total_values = balances + position_values
+        return {
+            "trades": trades,
+            "equity": {
+                "timestamp": np.asarray(starts, dtype=np.int64),
+                "total_value": total_values,
+                "position_value": position_values,
+            },
+            "balance_history": [
+                {
+                    "timestamp": timestamp,
+                    "balance": balances[i],
+                    "position_value": position_values[i],
+                    "total_value": total_values[i],
+                }
+                for i, timestamp in enumerate(df.index)
+            ],
+            "position_history": [
+                {"timestamp": timestamp, "position": positions[i]}
+                for i, timestamp in enumerate(df.index)
+            ],
+        }
+
+    @staticmethod
+    def _submit_order(
+        broker: SimulatedBroker,
+        slicing: Optional[SlicingConfig],
+        side: str,
+        now: int,
+        price: float,
+        notional: float,
+        **size: float,
+    ):
+        """분할 설정이 적용되는 금액이면 자식 주문 묶음, 아니면 단일 주문 제출"""
+        if slicing is not None and slicing.applies_to(notional):
+            return SlicedSimOrder(broker, slicing, side, now, price, **size)
+        return broker.submit(side, now, price, **size)
+
+    def compare_slicing(
+        self, df: pd.DataFrame, slicing: Optional[SlicingConfig] = None
+    ) -> Dict[str, Dict[str, float]]:
+        """같은 체결 모델에서 단일 주문과 분할 주문의 슬리피지 비교
+
+        슬리피지는 신호 가격 대비 불리한 방향을 양수로 한 체결 금액 가중 평균(bps)이며,
+        분할 주문은 실행 기간 동안의 가격 변동(timing risk)도 함께 반영된다.
+        """
+        slicing = slicing or self.slicing
+        df = self.calculate_indicators(df)
+        comparison = {}
+        for label, config in (("single", None), (slicing.mode, slicing)):
+            results = self.run_backtest_simulated(df, slicing=config)
+            trades = results["trades"]
+            notional = np.array([t["price"] * t["amount"] for t in trades])
+            adverse = np.array(
+                [
+                    t["slippage"] if t["type"] == "BUY" else -t["slippage"]
+                    for t in trades
+                ]
+            )
+            total_notional = notional.sum()
+            comparison[label] = {
+                "trades": len(trades),
+                "slippage_bps": (
+                    float(notional @ adverse / total_notional * 10_000)
+                    if total_notional
+                    else 0.0
+                ),
+                "slippage_cost": float(notional @ adverse),
+                "fills": sum(t["fills"] for t in trades),
+                "final_value": float(results["equity"]["total_value"][-1]),
+            }
+        return comparison
+
+    def print_slicing_comparison(self, comparison: Dict[str, Dict[str, float]]):
+        """단일/분할 주문 슬리피지 비교 출력"""
+        print("\n" + "=" * 70)
+        print("주문 분할 슬리피지 비교")
+        print("=" * 70)
+        print(
+            f"{'Mode':<10} {'Trades':>7} {'Fills':>7} {'Slippage':>10} "
+            f"{'Cost':>10} {'Final':>12}"
+        )
+        print("-" * 70)
+        for label, row in comparison.items():
+            print(
+                f"{label:<10} {row['trades']:>7} {row['fills']:>7} "
+                f"{row['slippage_bps']:>7.2f}bps ${row['slippage_cost']:>8.2f} "
+                f"${row['final_value']:>10.2f}"
+            )
+        single, sliced = list(comparison.values())
+        print("-" * 70)
+        print(
+            f"절감 슬리피지: {single['slippage_bps'] - sliced['slippage_bps']:.2f}bps "
+            f"(${single['slippage_cost'] - sliced['slippage_cost']:.2f})"
+        )
+
+    def _complete_order(
+        self,
+        order: Order,
+        position: Optional[dict],
+        holding: float,
+        timestamp: pd.Timestamp,
+        balance: float,
+        trades: List[dict],
+    ) -> Optional[dict]:
+        """끝난 주문을 거래 내역에 기록하고 갱신된 포지션 반환"""
+        if order.filled <= 0:
+            logger.info(f"{order.side.upper()} order cancelled without fills")
+            return position
+
+        price = order.average
+        execution = {
+            "signal_price": order.signal_price,
+            "slippage": price / order.signal_price - 1,
+            "fills": order.fills,
+            "fill_ratio": (
+                order.cost / order.quote_budget
+                if order.side == "buy"
+                else order.filled / order.quantity
+            ),
+        }
+
+        if order.side == "buy":
+            amount = order.filled * (1 - self.trading_fee)
+            trades.append(
+                {
+                    "type": "BUY",
+                    "timestamp": timestamp,
+                    "price": price,
+                    "amount": amount,
+                    "cost": order.cost,
+                    "balance_after": balance,
+                    **execution,
+                }
+            )
+            logger.info(
+                f"BUY at {timestamp}: ${price:.2f}, Amount: {amount:.6f} BTC "
+                f"({order.fills} fills, slippage {execution['slippage']*100:.3f}%)"
+            )
+            return {
+                "price": price,
+                "amount": amount,
+                "cost": order.cost,
+                "timestamp": timestamp,
+            }
+
+        # 일부만 팔렸으면 남은 수량과 원가를 비율대로 유지
+        sold_ratio = order.filled / position["amount"]
+        cost_basis = position["cost"] * sold_ratio
+        revenue = order.cost - order.fee
+        trade_profit = revenue - cost_basis
+        profit_rate = net_profit_rate(position["price"], price, self.trading_fee)
+        trades.append(
+            {
+                "type": "SELL",
+                "timestamp": timestamp,
+                "price": price,
+                "amount": order.filled,
+                "revenue": revenue,
+                "profit": trade_profit,
+                "profit_rate": profit_rate,
+                "balance_after": balance,
+                "hold_days": (timestamp - position["timestamp"]).total_seconds()
+                / (24 * 3600),
+                **execution,
+            }
+        )
+        logger.info(
+            f"SELL at {timestamp}: ${price:.2f}, Profit: ${trade_profit:.2f} "
+            f"({order.fills} fills, slippage {execution['slippage']*100:.3f}%)"
+        )
+        if holding <= 1e-12:
+            return None
+        return {
+            **position,
+            "amount": holding,
+            "cost": position["cost"] - cost_basis,
+        }
 
-        for i, (timestamp, row) in enumerate(df.iterrows()):
-            current_price = row["close"]
-            sma_short = row[f"sma_{self.sma_short}"]
-            sma_long = row[f"sma_{self.sma_long}"]
+    def _initial_state(self) -> Dict[str, Any]:
+        return {"balance": self.initial_balance, "position": None, "trades": []}
+
+    def _simulate_bars(
+        self,
+        timestamps: pd.DatetimeIndex,
+        closes: np.ndarray,
+        entry_signals: np.ndarray,
+        exit_signals: np.ndarray,
+        ready: np.ndarray,
+        state: Dict[str, Any],
+        record_positions: bool = False,
+    ) -> Tuple[np.ndarray, np.ndarray, List[Optional[dict]]]:
+        """봉 단위 매매 시뮬레이션 (state의 잔고/포지션/거래 내역을 갱신)
+
+        봉별 (잔고, 포지션 가치, 포지션) 배열을 반환한다.
+        """
+        n = len(closes)
+        balances = np.empty(n)
+        position_values = np.zeros(n)
+        positions: List[Optional[dict]] = [None] * n if record_positions else []
+
+        balance = state["balance"]
+        position = state["position"]  # {'price', 'amount', 'timestamp'}
+        trades = state["trades"]
+
+        closes = closes.tolist()
+        entry_signals = entry_signals.tolist()
+        exit_signals = exit_signals.tolist()
+        ready = ready.tolist()
+
+        for i in range(n):
+            current_price = closes[i]
 
             # 지표가 계산되지 않은 초기 구간 스킵
-            if pd.isna(sma_short) or pd.isna(sma_long):
-                results["balance_history"].append(
-                    {
-                        "timestamp": timestamp,
-                        "balance": balance,
-                        "position_value": 0,
-                        "total_value": balance,
-                    }
-                )
-                results["position_history"].append(
-                    {"timestamp": timestamp, "position": None}
-                )
+            if not ready[i]:
+                balances[i] = balance
                 continue
 
             # 매수 조건 확인
-            if (
-                position is None
-                and sma_short > sma_long
-                and balance >= self.trade_amount
-            ):
+            if position is None and entry_signals[i] and balance >= self.trade_amount:
                 # 매수 실행
+                timestamp = timestamps[i]
                 btc_amount = (
                     self.trade_amount * (1 - self.trading_fee)
                 ) / current_price
@@ -163,7 +838,7 @@ class BacktestEngine:
                 }
                 balance -= self.trade_amount
 
-                results["trades"].append(
+                trades.append(
                     {
                         "type": "BUY",
                         "timestamp": timestamp,
@@ -180,15 +855,14 @@ class BacktestEngine:
 
             # 매도 조건 확인
             elif position is not None:
-                # 수익률 계산 (실제 매도시 받을 금액 기준)
-                gross_profit_rate = (current_price - position["price"]) / position[
-                    "price"
-                ]
                 # 실제 수익률 = 총 수익률 - 매수/매도 수수료
-                profit_rate = gross_profit_rate - (2 * self.trading_fee)
+                profit_rate = net_profit_rate(
+                    position["price"], current_price, self.trading_fee
+                )
 
-                if sma_short < sma_long and profit_rate >= self.profit_threshold:
+                if exit_signals[i] and profit_rate >= self.profit_threshold:
                     # 매도 실행
+                    timestamp = timestamps[i]
                     sell_value = (
                         position["amount"] * current_price * (1 - self.trading_fee)
                     )
@@ -196,7 +870,7 @@ class BacktestEngine:
 
                     trade_profit = sell_value - self.trade_amount
 
-                    results["trades"].append(
+                    trades.append(
                         {
                             "type": "SELL",
                             "timestamp": timestamp,
@@ -219,58 +893,79 @@ class BacktestEngine:
                     position = None
 
             # 현재 상태 기록
-            position_value = position["amount"] * current_price if position else 0
-            total_value = balance + position_value
+            balances[i] = balance
+            if position:
+                position_values[i] = position["amount"] * current_price
+            if record_positions:
+                positions[i] = position
 
-            results["balance_history"].append(
-                {
-                    "timestamp": timestamp,
-                    "balance": balance,
-                    "position_value": position_value,
-                    "total_value": total_value,
-                }
-            )
-
-            results["position_history"].append(
-                {
-                    "timestamp": timestamp,
-                    "position": position.copy() if position else None,
-                }
-            )
-
-        return results
+        state["balance"] = balance
+        state["position"] = position
+        return balances, position_values, positions
 
     def calculate_performance_metrics(self, results: dict, df: pd.DataFrame) -> dict:
         """성과 지표 계산"""
-        balance_history = pd.DataFrame(results["balance_history"])
-        trades = results["trades"]
+        equity = equity_arrays(results)
+        total_values = equity["total_value"]
+        closes = df["close"].to_numpy()
+
+        return self._build_metrics(
+            results["trades"],
+            total_values[-1],
+            max_drawdown(total_values),
+            closes[0],
+            closes[-1],
+            return_moments(total_values),
+            int(np.count_nonzero(equity["position_value"])),
+            len(total_values),
+        )
+
+    def calculate_chunked_metrics(self, results: dict) -> dict:
+        """스트리밍 백테스트 요약으로 성과 지표 계산"""
+        summary = results["summary"]
+        return self._build_metrics(
+            results["trades"],
+            summary["final_value"],
+            summary["max_drawdown"],
+            summary["first_close"],
+            summary["last_close"],
+            summary["return_moments"],
+            summary["exposure_bars"],
+            summary["bars"],
+        )
 
+    def calculate_rolling_metrics(
+        self, results: dict, window_days: int = DEFAULT_ROLLING_DAYS
+    ) -> Dict[str, float]:
+        """롤링 구간(기본 30일) 수익률/변동성/Sharpe/Sortino 요약"""
+        equity = equity_arrays(results)
+        rolling = rolling_metrics(
+            equity["timestamp"], equity["total_value"], window_days
+        )
+        return summarize_rolling(rolling)
+
+    def _build_metrics(
+        self,
+        trades: List[dict],
+        final_value: float,
+        max_drawdown: float,
+        first_close: float,
+        last_close: float,
+        moments: np.ndarray,
+        exposure_bars: int,
+        n_bars: int,
+    ) -> dict:
         # 기본 지표
         initial_value = self.initial_balance
-        final_value = balance_history["total_value"].iloc[-1]
         total_return = (final_value - initial_value) / initial_value
 
         # 거래 관련 지표
-        sell_trades = [t for t in trades if t["type"] == "SELL"]
-
-        total_trades = len(sell_trades)
-        winning_trades = len([t for t in sell_trades if t["profit"] > 0])
-        win_rate = winning_trades / total_trades if total_trades > 0 else 0
-
-        total_profit = sum([t["profit"] for t in sell_trades])
-        avg_profit_per_trade = total_profit / total_trades if total_trades > 0 else 0
+        trade_stats = trade_arrays(trades)
+        trade_summary = trade_metrics(trade_stats["profit"], trade_stats["hold_days"])
+        win_rate = trade_summary["win_rate"]
 
         # Buy & Hold 대비 성과
-        buy_hold_return = (df["close"].iloc[-1] - df["close"].iloc[0]) / df[
-            "close"
-        ].iloc[0]
-
-        # 최대 손실 (MDD)
-        balance_history["peak"] = balance_history["total_value"].cummax()
-        balance_history["drawdown"] = (
-            balance_history["total_value"] - balance_history["peak"]
-        ) / balance_history["peak"]
-        max_drawdown = balance_history["drawdown"].min()
+        buy_hold_return = (last_close - first_close) / first_close
 
         return {
             "initial_value": initial_value,
@@ -281,17 +976,24 @@ class BacktestEngine:
             "buy_hold_return_pct": buy_hold_return * 100,
             "outperformance": total_return - buy_hold_return,
             "outperformance_pct": (total_return - buy_hold_return) * 100,
-            "total_trades": total_trades,
-            "winning_trades": winning_trades,
-            "win_rate": win_rate,
+            **trade_summary,
             "win_rate_pct": win_rate * 100,
-            "total_profit": total_profit,
-            "avg_profit_per_trade": avg_profit_per_trade,
             "max_drawdown": max_drawdown,
             "max_drawdown_pct": max_drawdown * 100,
+            **equity_metrics(
+                moments,
+                exposure_bars,
+                n_bars,
+                initial_value,
+                final_value,
+                max_drawdown,
+                timeframe_to_ms(self.timeframe),
+            ),
         }
 
-    def print_results(self, results: dict, metrics: dict):
+    def print_results(
+        self, results: dict, metrics: dict, rolling: Optional[Dict[str, float]] = None
+    ):
         """결과 출력"""
         print("\n" + "=" * 60)
         print("백테스트 결과")
@@ -313,6 +1015,30 @@ class BacktestEngine:
         print(f"최대 손실: {metrics['max_drawdown_pct']:.2f}%")
         print()
 
+        print(
+            f"Sharpe: {metrics['sharpe_ratio']:.2f}  Sortino: {metrics['sortino_ratio']:.2f}  "
+            f"Calmar: {metrics['calmar_ratio']:.2f}"
+        )
+        print(
+            f"연환산 수익률: {metrics['cagr']*100:.2f}%  "
+            f"연환산 변동성: {metrics['volatility']*100:.2f}%"
+        )
+        print(
+            f"Profit Factor: {metrics['profit_factor']:.2f}  "
+            f"평균 보유 기간: {metrics['avg_hold_days']:.2f}일  "
+            f"포지션 노출: {metrics['exposure']*100:.1f}%"
+        )
+        if rolling:
+            print(
+                f"30일 롤링 수익률: {rolling['return_min']*100:.2f}% ~ "
+                f"{rolling['return_max']*100:.2f}% (중앙값 {rolling['return_median']*100:.2f}%)"
+            )
+            print(
+                f"30일 롤링 Sharpe: {rolling['sharpe_min']:.2f} ~ "
+                f"{rolling['sharpe_max']:.2f} (중앙값 {rolling['sharpe_median']:.2f})"
+            )
+        print()
+
         # 거래 내역
         if results["trades"]:
             print("거래 내역:")
@@ -335,168 +1061,271 @@ class BacktestEngine:
                         f"${trade['price']:<9.2f} {trade['amount']:<12.6f} {'':>10} {'':>8}"
                     )
 
-    def plot_results(self, df: pd.DataFrame, results: dict):
-        """결과 시각화"""
-        try:
-            import matplotlib.dates as mdates
-            import matplotlib.pyplot as plt
+    def print_sweep_results(self, sweep_results: List[Dict[str, Any]]):
+        """파라미터 스윕 결과 출력 (총 수익률 순)"""
+        print("\n" + "=" * 80)
+        print("파라미터 스윕 결과")
+        print("=" * 80)
+        print(f"{'Params':<36} {'Return':>9} {'Trades':>7} {'WinRate':>8} {'MDD':>8}")
+        print("-" * 80)
 
-            # 설정에서 차트 크기 가져오기
-            backtest_config = config_loader.get_backtest_config()
-            chart_size = backtest_config.get("chart_size", [15, 12])
+        ranked = sorted(
+            sweep_results, key=lambda r: r["metrics"]["total_return"], reverse=True
+        )
+        for result in ranked:
+            params = ", ".join(f"{k}={v}" for k, v in result["params"].items())
+            metrics = result["metrics"]
+            print(
+                f"{params:<36} {metrics['total_return_pct']:>8.2f}% "
+                f"{metrics['total_trades']:>7} {metrics['win_rate_pct']:>7.1f}% "
+                f"{metrics['max_drawdown_pct']:>7.2f}%"
+            )
 
-            fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=chart_size)
+    def plot_results(
+        self, df: pd.DataFrame, results: dict, output: Optional[str] = None
+    ) -> None:
+        """결과 시각화 (output을 주면 화면 대신 파일로 저장)
+
+        가격/자산 곡선은 LTTB로 다운샘플링하고 매매 마커는 모두 표시한다.
+        """
+        # 설정에서 차트 크기 가져오기
+        backtest_config = config_loader.get_backtest_config()
+        chart_size = backtest_config.get("chart_size", [15, 12])
+        indicator_columns = {
+            spec.label: spec.column
+            for spec in dict.fromkeys(self.strategy.indicators())
+            if spec.kind in PRICE_SCALE_INDICATORS
+        }
+        draw_args = chart_inputs(
+            df,
+            results,
+            indicator_columns,
+            self.initial_balance,
+            backtest_config.get("chart_max_points"),
+        )
 
-            # 1. 가격 차트와 SMA
-            ax1.plot(
-                df.index, df["close"], label="BTC Price", color="black", linewidth=1
-            )
-            ax1.plot(
-                df.index,
-                df[f"sma_{self.sma_short}"],
-                label=f"SMA({self.sma_short})",
-                color="blue",
-            )
-            ax1.plot(
-                df.index,
-                df[f"sma_{self.sma_long}"],
-                label=f"SMA({self.sma_long})",
-                color="red",
-            )
+        try:
+            if output:
+                save_figure_headless(output, chart_size, draw_args)
+                print(f"\n차트를 저장했습니다: {output}")
+            else:
+                show_figure(chart_size, draw_args)
 
-            # 매수/매도 포인트 표시
-            buy_trades = [t for t in results["trades"] if t["type"] == "BUY"]
-            sell_trades = [t for t in results["trades"] if t["type"] == "SELL"]
-
-            if buy_trades:
-                buy_dates = [t["timestamp"] for t in buy_trades]
-                buy_prices = [t["price"] for t in buy_trades]
-                ax1.scatter(
-                    buy_dates,
-                    buy_prices,
-                    color="green",
-                    marker="^",
-                    s=100,
-                    label="Buy",
-                    zorder=5,
-                )
+        except ImportError:
+            print("\n⚠️  matplotlib이 설치되지 않아 차트를 표시할 수 없습니다.")
+            print("차트를 보려면 다음 명령어로 설치하세요: pip install matplotlib")
 
-            if sell_trades:
-                sell_dates = [t["timestamp"] for t in sell_trades]
-                sell_prices = [t["price"] for t in sell_trades]
-                ax1.scatter(
-                    sell_dates,
-                    sell_prices,
-                    color="red",
-                    marker="v",
-                    s=100,
-                    label="Sell",
-                    zorder=5,
-                )
 
-            ax1.set_title("BTC Price and Trading Signals")
-            ax1.set_ylabel("Price (USDT)")
-            ax1.legend()
-            ax1.grid(True, alpha=0.3)
-
-            # 2. 포트폴리오 가치
-            balance_df = pd.DataFrame(results["balance_history"])
-            ax2.plot(
-                balance_df["timestamp"],
-                balance_df["total_value"],
-                label="Portfolio Value",
-                color="green",
-                linewidth=2,
-            )
-            ax2.axhline(
-                y=self.initial_balance,
-                color="gray",
-                linestyle="--",
-                alpha=0.7,
-                label="Initial Value",
-            )
+def parse_sweep_args(sweep_args: List[str]) -> Dict[str, List[Any]]:
+    """--sweep key=v1,v2 인자를 파라미터 그리드로 변환"""
+    param_grid = {}
+    for arg in sweep_args:
+        key, _, values = arg.partition("=")
+        if not values:
+            raise ValueError(f"잘못된 --sweep 형식: {arg} (예: sma_short=5,7,10)")
+        param_grid[key] = [
+            float(v) if "." in v else int(v) for v in values.split(",") if v
+        ]
+    return param_grid
+
+
+def run_store_backtest(engine: BacktestEngine, args: argparse.Namespace) -> None:
+    """--store 모드: 저장소를 동기화한 뒤 memmap 청크로 백테스트"""
+    store = CandleStore(args.store)
+    engine.sync_store(store, args.start, args.end)
+
+    start_ms = int(pd.Timestamp(args.start).value // 1_000_000)
+    end_ms = int((pd.Timestamp(args.end) + timedelta(days=1)).value // 1_000_000)
+    gap_index = engine.repair_store_gaps(store, start_ms, end_ms)
+    if gap_index.missing_ranges(start_ms, end_ms, include_confirmed=True):
+        print(f"⚠️  {gap_index.summary()} - gap_policy: {engine.gap_policy}")
+    chunks = store.iter_chunks(
+        engine.symbol, engine.timeframe, start_ms, end_ms, args.chunk_size
+    )
+    results = engine.run_backtest_chunked(chunks)
+
+    if results["summary"]["bars"] == 0:
+        print("⚠️  데이터를 찾을 수 없습니다. 날짜 범위를 확인해주세요.")
+        sys.exit(1)
 
-            ax2.set_title("Portfolio Value Over Time")
-            ax2.set_ylabel("Value (USDT)")
-            ax2.legend()
-            ax2.grid(True, alpha=0.3)
-
-            # 3. 수익률 비교
-            balance_df["strategy_return"] = (
-                balance_df["total_value"] / self.initial_balance - 1
-            ) * 100
-            buy_hold_return = (df["close"] / df["close"].iloc[0] - 1) * 100
-
-            ax3.plot(
-                balance_df["timestamp"],
-                balance_df["strategy_return"],
-                label="Strategy Return",
-                color="blue",
-                linewidth=2,
+    metrics = engine.calculate_chunked_metrics(results)
+    engine.print_results(results, metrics)
+    if args.plot or args.plot_out:
+        print("\n⚠️  --store 모드에서는 차트를 지원하지 않습니다.")
+
+
+def run_command(args: argparse.Namespace) -> None:
+    """명령줄 인자에 따라 백테스트 명령 실행"""
+    # 백테스트 엔진 초기화
+    engine = BacktestEngine()
+
+    # 로컬 캔들 저장소에서 청크 단위로 스트리밍 백테스트
+    if args.store:
+        run_store_backtest(engine, args)
+        return
+
+    # 이미 끝난 기간이면 데이터 조회 없이 결과 캐시 확인
+    cache = (
+        None
+        if args.no_cache
+        else ResultCache.from_config(config_loader.get_backtest_config())
+    )
+    data_id = engine.data_id(args.start, args.end)
+    closed_range = is_closed_range(args.end)
+    if cache and closed_range and args.command == "run" and not args.sweep:
+        data_fp = cache.lookup_data(data_id)
+        cached = (
+            cache.load(
+                run_key(
+                    engine.run_params(use_fill_model=args.fill_model),
+                    ENGINE_VERSION,
+                    data_fp,
+                )
             )
-            ax3.plot(
-                df.index,
-                buy_hold_return,
-                label="Buy & Hold Return",
-                color="orange",
-                linewidth=2,
+            if data_fp and not (args.plot or args.plot_out)
+            else None
+        )
+        if cached:
+            results, metrics = cached
+            engine.print_results(
+                results, metrics, engine.calculate_rolling_metrics(results)
             )
-            ax3.axhline(y=0, color="gray", linestyle="-", alpha=0.3)
-
-            ax3.set_title("Return Comparison")
-            ax3.set_ylabel("Return (%)")
-            ax3.set_xlabel("Date")
-            ax3.legend()
-            ax3.grid(True, alpha=0.3)
+            return
 
-            # 날짜 포맷 설정
-            for ax in [ax1, ax2, ax3]:
-                ax.xaxis.set_major_formatter(mdates.DateFormatter("%m-%d"))
-                ax.xaxis.set_major_locator(mdates.WeekdayLocator(interval=1))
-                plt.setp(ax.xaxis.get_majorticklabels(), rotation=45)
+    # 과거 데이터 조회
+    df = engine.fetch_historical_data(args.start, args.end)
 
-            plt.tight_layout()
-            plt.show()
+    if len(df) == 0:
+        print("⚠️  데이터를 찾을 수 없습니다. 날짜 범위를 확인해주세요.")
+        sys.exit(1)
 
-        except ImportError:
-            print("\n⚠️  matplotlib이 설치되지 않아 차트를 표시할 수 없습니다.")
-            print("차트를 보려면 다음 명령어로 설치하세요: pip install matplotlib")
+    data_fp = data_fingerprint(df)
+    if cache and closed_range:
+        cache.remember_data(data_id, data_fp)
+
+    # 파라미터 스윕
+    if args.sweep:
+        sweep_results = engine.run_sweep(df, parse_sweep_args(args.sweep), cache)
+        engine.print_sweep_results(sweep_results)
+        return
+
+    # 부트스트랩 강건성 분석
+    if args.command == "montecarlo":
+        report = run_montecarlo(
+            engine,
+            engine.calculate_indicators(df),
+            n_paths=args.paths,
+            block_size=args.block_size,
+            workers=args.workers,
+            seed=args.seed,
+            confidence=args.confidence,
+        )
+        print_montecarlo_results(report)
+        return
+
+    # 단일 주문 대비 TWAP/iceberg 분할 주문 슬리피지 (분할 미설정 시 기본 TWAP)
+    if args.command == "slicing":
+        slicing = engine.slicing
+        if slicing.mode == "none":
+            slicing = SlicingConfig(mode="twap")
+        slicing.min_notional = 0.0
+        engine.print_slicing_comparison(engine.compare_slicing(df, slicing))
+        return
+
+    # 지표 계산, 백테스트 실행, 성과 지표 계산 (결과 캐시 사용)
+    results, metrics = engine.run_cached(df, data_fp, cache, args.fill_model)
+
+    # 결과 출력
+    engine.print_results(results, metrics, engine.calculate_rolling_metrics(results))
+
+    # 차트 출력
+    if args.plot or args.plot_out:
+        engine.plot_results(
+            engine.calculate_indicators(df), results, output=args.plot_out
+        )
 
 
 def main():
     parser = argparse.ArgumentParser(description="Bitcoin Auto Trading Backtest")
+    parser.add_argument(
+        "command",
+        nargs="?",
+        default="run",
+        choices=["run", "montecarlo", "slicing"],
+        help=(
+            "run: single backtest (default), montecarlo: bootstrap robustness, "
+            "slicing: slippage of single vs sliced orders"
+        ),
+    )
     parser.add_argument("--start", required=True, help="Start date (YYYY-MM-DD)")
     parser.add_argument("--end", required=True, help="End date (YYYY-MM-DD)")
     parser.add_argument("--plot", action="store_true", help="Show plot")
+    parser.add_argument(
+        "--plot-out",
+        metavar="FILE",
+        help="Render the chart to FILE (.png/.svg/.pdf/.html) without a display",
+    )
+    parser.add_argument(
+        "--fill-model",
+        action="store_true",
+        help="Simulate latency, slippage and partial fills (config: fill_model)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore cached results and rerun the backtest",
+    )
+    parser.add_argument(
+        "--store",
+        metavar="DIR",
+        help="Stream candles from a local memory-mapped candle store",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="Candles per chunk in --store mode",
+    )
+    parser.add_argument(
+        "--sweep",
+        action="append",
+        default=[],
+        metavar="KEY=V1,V2",
+        help="Strategy parameter values to sweep (repeatable)",
+    )
+
+    parser.add_argument(
+        "--profile",
+        choices=PROFILE_MODES,
+        help="Profile the run (cpu: cProfile + sampled stacks, mem: tracemalloc)",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        default=DEFAULT_PROFILE_DIR,
+        metavar="DIR",
+        help="Directory for profile reports",
+    )
+
+    montecarlo_group = parser.add_argument_group("montecarlo")
+    montecarlo_group.add_argument(
+        "--paths", type=int, default=DEFAULT_PATHS, help="Resampled paths"
+    )
+    montecarlo_group.add_argument(
+        "--block-size", type=int, default=288, help="Bootstrap block length in bars"
+    )
+    montecarlo_group.add_argument(
+        "--workers", type=int, default=None, help="Worker processes (default: CPUs)"
+    )
+    montecarlo_group.add_argument("--seed", type=int, default=None)
+    montecarlo_group.add_argument(
+        "--confidence", type=float, default=DEFAULT_CONFIDENCE
+    )
 
     args = parser.parse_args()
 
     try:
-        # 백테스트 엔진 초기화
-        engine = BacktestEngine()
-
-        # 과거 데이터 조회
-        df = engine.fetch_historical_data(args.start, args.end)
-
-        if len(df) == 0:
-            print("⚠️  데이터를 찾을 수 없습니다. 날짜 범위를 확인해주세요.")
-            sys.exit(1)
-
-        # 기술적 지표 계산
-        df = engine.calculate_indicators(df)
-
-        # 백테스트 실행
-        results = engine.run_backtest(df)
-
-        # 성과 지표 계산
-        metrics = engine.calculate_performance_metrics(results, df)
-
-        # 결과 출력
-        engine.print_results(results, metrics)
-
-        # 차트 출력
-        if args.plot:
-            engine.plot_results(df, results)
+        with profile_run(args.profile, args.profile_dir, f"backtest-{args.command}"):
+            run_command(args)
 
     except KeyboardInterrupt:
         print("\n백테스트가 중단되었습니다.")
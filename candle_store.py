@@ -0,0 +1,160 @@
+"""
+로컬 캔들 저장소
+
+심볼/타임프레임별로 고정 크기 레코드(CANDLE_DTYPE) 바이너리 파일에 캔들을 저장하고
+np.memmap으로 읽는다. 파일 전체를 메모리에 올리지 않고 기간 조회와
+청크 단위 순회가 가능하므로 수년치 1분봉도 일정한 메모리로 처리할 수 있다.
+
+파일 레이아웃: {root}/{BTC_USDT}/{timeframe}.bin (타임스탬프 오름차순, 중복 없음)
+"""
+
+import logging
+import os
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+CANDLE_DTYPE = np.dtype(
+    [
+        ("timestamp", "<i8"),
+        ("open", "<f8"),
+        ("high", "<f8"),
+        ("low", "<f8"),
+        ("close", "<f8"),
+        ("volume", "<f8"),
+    ]
+)
+
+DEFAULT_STORE_DIR = "data/candles"
+DEFAULT_CHUNK_SIZE = 250_000
+
+
+def to_records(ohlcv) -> np.ndarray:
+    """ccxt OHLCV 리스트 또는 DataFrame을 CANDLE_DTYPE 배열로 변환"""
+    if isinstance(ohlcv, np.ndarray) and ohlcv.dtype == CANDLE_DTYPE:
+        return ohlcv
+    if isinstance(ohlcv, pd.DataFrame):
+        records = np.empty(len(ohlcv), dtype=CANDLE_DTYPE)
+        records["timestamp"] = ohlcv.index.asi8 // 1_000_000
+        for field in CANDLE_DTYPE.names[1:]:
+            records[field] = ohlcv[field].to_numpy()
+        return records
+
+    values = np.asarray(ohlcv, dtype=np.float64).reshape(-1, 6)
+    records = np.empty(len(values), dtype=CANDLE_DTYPE)
+    records["timestamp"] = values[:, 0].astype(np.int64)
+    for column, field in enumerate(CANDLE_DTYPE.names[1:], start=1):
+        records[field] = values[:, column]
+    return records
+
+
+def to_dataframe(records: np.ndarray) -> pd.DataFrame:
+    """CANDLE_DTYPE 배열을 기존 OHLCV DataFrame 형식으로 변환"""
+    df = pd.DataFrame(
+        {field: np.asarray(records[field]) for field in CANDLE_DTYPE.names[1:]},
+        index=pd.to_datetime(np.asarray(records["timestamp"]), unit="ms"),
+    )
+    df.index.name = "timestamp"
+    return df
+
+
+class CandleStore:
+    """memory-mapped 캔들 파일 저장소"""
+
+    def __init__(self, root: str = DEFAULT_STORE_DIR):
+        self.root = root
+
+    def path(self, symbol: str, timeframe: str, suffix: str = ".bin") -> str:
+        return os.path.join(self.root, symbol.replace("/", "_"), f"{timeframe}{suffix}")
+
+    def count(self, symbol: str, timeframe: str) -> int:
+        path = self.path(symbol, timeframe)
+        if not os.path.exists(path):
+            return 0
+        return os.path.getsize(path) // CANDLE_DTYPE.itemsize
+
+    def open(self, symbol: str, timeframe: str) -> np.ndarray:
+        """저장된 캔들을 읽기 전용 memmap으로 반환 (없으면 빈 배열)"""
+        if self.count(symbol, timeframe) == 0:
+            return np.empty(0, dtype=CANDLE_DTYPE)
+        return np.memmap(self.path(symbol, timeframe), dtype=CANDLE_DTYPE, mode="r")
+
+    def last_timestamp(self, symbol: str, timeframe: str) -> Optional[int]:
+        candles = self.open(symbol, timeframe)
+        return int(candles["timestamp"][-1]) if len(candles) else None
+
+    def append(self, symbol: str, timeframe: str, ohlcv) -> int:
+        """캔들 추가, 기록된 캔들 수 반환
+
+        마지막 저장 시각 이후 캔들은 파일 끝에 이어 쓰고, 과거 구간과 겹치면
+        병합 후 파일을 다시 쓴다.
+        """
+        records = to_records(ohlcv)
+        if len(records) == 0:
+            return 0
+        records = sort_unique(records)
+
+        path = self.path(symbol, timeframe)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        last = self.last_timestamp(symbol, timeframe)
+
+        if last is None or records["timestamp"][0] > last:
+            with open(path, "ab") as f:
+                f.write(records.tobytes())
+            return len(records)
+
+        # 과거 구간과 겹침 -> 병합 (새 데이터 우선)
+        existing = np.array(self.open(symbol, timeframe))
+        merged = sort_unique(np.concatenate([records, existing]))
+        self.write(symbol, timeframe, merged)
+        return len(merged) - len(existing)
+
+    def write(self, symbol: str, timeframe: str, records: np.ndarray) -> None:
+        """캔들 파일 전체를 원자적으로 교체"""
+        path = self.path(symbol, timeframe)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(np.ascontiguousarray(records, dtype=CANDLE_DTYPE).tobytes())
+        os.replace(tmp_path, path)
+
+    def read_range(
+        self,
+        symbol: str,
+        timeframe: str,
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None,
+    ) -> np.ndarray:
+        """[start_ms, end_ms) 구간의 memmap 뷰 (이진 탐색으로 위치 계산)"""
+        candles = self.open(symbol, timeframe)
+        timestamps = candles["timestamp"]
+        lo = 0 if start_ms is None else int(np.searchsorted(timestamps, start_ms))
+        hi = (
+            len(candles) if end_ms is None else int(np.searchsorted(timestamps, end_ms))
+        )
+        return candles[lo:hi]
+
+    def iter_chunks(
+        self,
+        symbol: str,
+        timeframe: str,
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[np.ndarray]:
+        """구간을 chunk_size개씩 나눈 memmap 뷰를 순서대로 반환"""
+        candles = self.read_range(symbol, timeframe, start_ms, end_ms)
+        for start in range(0, len(candles), chunk_size):
+            yield candles[start : start + chunk_size]
+
+
+def sort_unique(records: np.ndarray) -> np.ndarray:
+    """타임스탬프 기준 정렬 후 중복 제거 (먼저 나온 레코드 유지)"""
+    order = np.argsort(records["timestamp"], kind="stable")
+    records = records[order]
+    keep = np.ones(len(records), dtype=bool)
+    keep[1:] = records["timestamp"][1:] != records["timestamp"][:-1]
+    return records[keep]
@@ -0,0 +1,225 @@
+"""
+백테스트 차트 렌더링
+
+가격/지표/자산 곡선은 LTTB(Largest-Triangle-Three-Buckets)로 화면 해상도 수준
+(기본 2000점)까지 줄여서 그리고, 매수/매도 마커는 모두 그린다. 그리는 점 수가
+데이터 길이와 무관하므로 1년치 1분봉도 같은 시간에 렌더링된다.
+
+파일 출력(--plot-out)은 pyplot 없이 Agg 캔버스로 그리므로 디스플레이가 없는
+환경에서도 동작한다. 확장자가 .html이면 SVG를 HTML 파일에 포함한다.
+"""
+
+import io
+import os
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from metrics import equity_arrays
+
+DEFAULT_MAX_POINTS = 2000
+
+HTML_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>{title}</title></head>
+<body style="margin:0;background:#fff">
+{svg}
+</body>
+</html>
+"""
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """모양을 보존하는 다운샘플링 -> 선택된 점의 인덱스 (처음/마지막 점 포함)"""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # 첫/마지막 점을 뺀 구간을 n_out - 2개 버킷으로 나눔
+    edges = (np.arange(n_out - 1) * ((n - 2) / (n_out - 2))).astype(np.int64) + 1
+    edges[-1] = n - 1
+
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    selected = 0
+    for bucket in range(n_out - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        # 다음 버킷 평균점 (마지막 버킷은 마지막 점)
+        if bucket + 2 < len(edges):
+            next_start, next_end = end, edges[bucket + 2]
+        else:
+            next_start, next_end = n - 1, n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        ax, ay = x[selected], y[selected]
+        area = np.abs(
+            (ax - avg_x) * (y[start:end] - ay) - (ax - x[start:end]) * (avg_y - ay)
+        )
+        selected = start + int(area.argmax())
+        indices[bucket + 1] = selected
+    return indices
+
+
+def downsample(
+    timestamps_ms: np.ndarray, values: np.ndarray, max_points: int
+) -> Dict[str, np.ndarray]:
+    """NaN(지표 warm-up) 구간을 제외하고 LTTB 적용 -> {'x': datetime64, 'y'}"""
+    values = np.asarray(values, dtype=np.float64)
+    valid = np.flatnonzero(~np.isnan(values))
+    x, y = timestamps_ms[valid], values[valid]
+    keep = lttb(x, y, max_points)
+    return {"x": x[keep].astype("datetime64[ms]"), "y": y[keep]}
+
+
+def draw_backtest(
+    fig,
+    timestamps_ms: np.ndarray,
+    closes: np.ndarray,
+    indicator_lines: Dict[str, np.ndarray],
+    total_values: np.ndarray,
+    trades: List[dict],
+    initial_balance: float,
+    max_points: int = DEFAULT_MAX_POINTS,
+) -> None:
+    """가격/지표+매매 마커, 포트폴리오 가치, 수익률 비교 3단 차트"""
+    import matplotlib.dates as mdates
+
+    ax1, ax2, ax3 = fig.subplots(3, 1, sharex=True)
+
+    # 1. 가격 차트와 전략 지표
+    price = downsample(timestamps_ms, closes, max_points)
+    ax1.plot(price["x"], price["y"], label="BTC Price", color="black", linewidth=1)
+    for label, values in indicator_lines.items():
+        line = downsample(timestamps_ms, values, max_points)
+        ax1.plot(line["x"], line["y"], label=label)
+
+    # 매수/매도 포인트 표시 (다운샘플링하지 않음)
+    for trade_type, color, marker, label in (
+        ("BUY", "green", "^", "Buy"),
+        ("SELL", "red", "v", "Sell"),
+    ):
+        selected = [t for t in trades if t["type"] == trade_type]
+        if selected:
+            ax1.scatter(
+                [np.datetime64(t["timestamp"], "ms") for t in selected],
+                [t["price"] for t in selected],
+                color=color,
+                marker=marker,
+                s=100 if len(selected) < 200 else 20,
+                label=label,
+                zorder=5,
+            )
+
+    ax1.set_title("BTC Price and Trading Signals")
+    ax1.set_ylabel("Price (USDT)")
+    ax1.legend()
+    ax1.grid(True, alpha=0.3)
+
+    # 2. 포트폴리오 가치
+    equity = downsample(timestamps_ms, total_values, max_points)
+    ax2.plot(
+        equity["x"], equity["y"], label="Portfolio Value", color="green", linewidth=2
+    )
+    ax2.axhline(
+        y=initial_balance,
+        color="gray",
+        linestyle="--",
+        alpha=0.7,
+        label="Initial Value",
+    )
+    ax2.set_title("Portfolio Value Over Time")
+    ax2.set_ylabel("Value (USDT)")
+    ax2.legend()
+    ax2.grid(True, alpha=0.3)
+
+    # 3. 수익률 비교 (다운샘플링한 선을 그대로 변환)
+    ax3.plot(
+        equity["x"],
+        (equity["y"] / initial_balance - 1) * 100,
+        label="Strategy Return",
+        color="blue",
+        linewidth=2,
+    )
+    ax3.plot(
+        price["x"],
+        (price["y"] / closes[0] - 1) * 100,
+        label="Buy & Hold Return",
+        color="orange",
+        linewidth=2,
+    )
+    ax3.axhline(y=0, color="gray", linestyle="-", alpha=0.3)
+    ax3.set_title("Return Comparison")
+    ax3.set_ylabel("Return (%)")
+    ax3.set_xlabel("Date")
+    ax3.legend()
+    ax3.grid(True, alpha=0.3)
+
+    # 날짜 포맷 설정 (기간 길이에 맞춰 눈금 자동 선택)
+    locator = mdates.AutoDateLocator()
+    for ax in (ax1, ax2, ax3):
+        ax.xaxis.set_major_locator(locator)
+        ax.xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator))
+
+    fig.tight_layout()
+
+
+def save_figure_headless(
+    path: str, chart_size: Sequence[float], draw_args: Dict[str, Any]
+) -> str:
+    """pyplot 없이 Agg 캔버스로 그려서 .png/.svg/.pdf 또는 .html(SVG 포함)로 저장"""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=tuple(chart_size))
+    FigureCanvasAgg(fig)
+    draw_backtest(fig, **draw_args)
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    if path.lower().endswith((".html", ".htm")):
+        buffer = io.StringIO()
+        fig.savefig(buffer, format="svg")
+        svg = buffer.getvalue()
+        svg = svg[svg.index("<svg") :]  # XML 선언/DOCTYPE 제거
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(HTML_TEMPLATE.format(title="Backtest Result", svg=svg))
+    else:
+        fig.savefig(path, dpi=100)
+    return path
+
+
+def show_figure(chart_size: Sequence[float], draw_args: Dict[str, Any]) -> None:
+    """대화형 창으로 표시"""
+    import matplotlib.pyplot as plt
+
+    fig = plt.figure(figsize=tuple(chart_size))
+    draw_backtest(fig, **draw_args)
+    plt.show()
+
+
+def chart_inputs(
+    df,
+    results: dict,
+    indicator_columns: Dict[str, str],
+    initial_balance: float,
+    max_points: Optional[int] = None,
+) -> Dict[str, Any]:
+    """백테스트 DataFrame/결과를 draw_backtest 인자로 변환"""
+    equity = equity_arrays(results)
+    return {
+        "timestamps_ms": equity["timestamp"],
+        "closes": df["close"].to_numpy(dtype=np.float64),
+        "indicator_lines": {
+            label: df[column].to_numpy(dtype=np.float64)
+            for label, column in indicator_columns.items()
+        },
+        "total_values": equity["total_value"],
+        "trades": results["trades"],
+        "initial_balance": initial_balance,
+        "max_points": max_points or DEFAULT_MAX_POINTS,
+    }
@@ -1,5 +1,150 @@
+"""
+설정 파일 로더
+
+거래 설정은 검증을 통과한 읽기 전용 TradingConfig 스냅샷으로 제공한다. 오래 실행되는
+프로세스는 ConfigWatcher로 설정 원본(로컬 파일, s3://bucket/key, ssm:/parameter)을
+주기 사이에 확인해 스냅샷을 통째로 교체하고, 새 설정이 검증에 실패하면 마지막으로
+유효했던 설정을 계속 사용한다.
+"""
+
+import copy
+import hashlib
 import json
-from typing import Any, Dict
+import logging
+import os
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import boto3
+
+from execution import ExecutionConfig
+from order_scheduler import SlicingConfig
+from resample import timeframe_to_ms
+from strategy import SmaCrossoverStrategy, create_strategy
+
+logger = logging.getLogger(__name__)
+
+
+class ConfigError(ValueError):
+    """설정 검증 실패 (issues에 항목별 사유)"""
+
+    def __init__(self, issues: List[str]):
+        super().__init__("설정 검증 실패: " + "; ".join(issues))
+        self.issues = issues
+
+
+def _number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class TradingConfig:
+    """검증된 거래 설정 스냅샷 (읽기 전용)
+
+    자주 쓰는 값은 기본값을 채운 속성으로, 나머지(execution, slicing, strategy_params
+    등)는 get()으로 읽는다. get()은 복사본을 돌려주므로 스냅샷은 바뀌지 않는다.
+    """
+
+    __slots__ = (
+        "symbol",
+        "timeframe",
+        "base_timeframe",
+        "strategy",
+        "trade_amount",
+        "profit_threshold",
+        "trading_fee",
+        "initial_balance",
+        "version",
+        "_raw",
+    )
+
+    def __init__(self, raw: Dict[str, Any]):
+        raw = copy.deepcopy(raw)
+        values = {
+            "symbol": raw.get("symbol", "BTC/USDT"),
+            "timeframe": raw.get("timeframe", "5m"),
+            "base_timeframe": raw.get("base_timeframe", raw.get("timeframe", "5m")),
+            "strategy": raw.get("strategy", SmaCrossoverStrategy.name),
+            "trade_amount": raw.get("trade_amount", 90.0),
+            "profit_threshold": raw.get("profit_threshold", 0.003),
+            "trading_fee": raw.get("trading_fee", 0.001),
+            "initial_balance": raw.get("initial_balance", 100.0),
+        }
+        issues = self._validate(raw, values)
+        if issues:
+            raise ConfigError(issues)
+
+        canonical = json.dumps(raw, sort_keys=True, ensure_ascii=False)
+        values["version"] = hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:12]
+        values["_raw"] = raw
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    @staticmethod
+    def _validate(raw: Dict[str, Any], values: Dict[str, Any]) -> List[str]:
+        issues = []
+        symbol = values["symbol"]
+        if not isinstance(symbol, str) or symbol.count("/") != 1:
+            issues.append(f"symbol 형식 오류: {symbol!r} (예: BTC/USDT)")
+
+        try:
+            tf_ms = timeframe_to_ms(values["timeframe"])
+            base_ms = timeframe_to_ms(values["base_timeframe"])
+            if tf_ms % base_ms:
+                issues.append("timeframe은 base_timeframe의 배수여야 합니다")
+        except (TypeError, ValueError) as e:
+            issues.append(str(e))
+
+        for key in ("trade_amount", "profit_threshold", "initial_balance"):
+            if not _number(values[key]) or values[key] <= 0:
+                issues.append(f"{key}는 0보다 큰 숫자여야 합니다")
+        fee = values["trading_fee"]
+        if not _number(fee) or not 0 <= fee < 0.1:
+            issues.append("trading_fee는 0 이상 0.1 미만이어야 합니다")
+
+        sma_short, sma_long = raw.get("sma_short", 7), raw.get("sma_long", 25)
+        if (
+            values["strategy"] == SmaCrossoverStrategy.name
+            and _number(sma_short)
+            and _number(sma_long)
+            and sma_short >= sma_long
+        ):
+            issues.append("sma_short는 sma_long보다 작아야 합니다")
+
+        # 실제 사용할 객체를 만들어 보고 실패하면 거부
+        for label, build in (
+            ("strategy", create_strategy),
+            ("execution", ExecutionConfig.from_config),
+            ("slicing", SlicingConfig.from_config),
+        ):
+            try:
+                build(raw)
+            except (TypeError, ValueError, AttributeError) as e:
+                issues.append(f"{label} 설정 오류: {e}")
+        return issues
+
+    def __setattr__(self, name, value):
+        raise AttributeError("TradingConfig는 읽기 전용입니다")
+
+    def __delattr__(self, name):
+        raise AttributeError("TradingConfig는 읽기 전용입니다")
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, TradingConfig) and self._raw == other._raw
+
+    def __hash__(self) -> int:
+        return hash(self.version)
+
+    def __repr__(self) -> str:
+        return (
+            f"TradingConfig({self.symbol} {self.timeframe} {self.strategy}, "
+            f"version={self.version})"
+        )
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """원본 설정 값의 복사본 (dict 설정을 받는 기존 from_config 함수와 호환)"""
+        return copy.deepcopy(self._raw.get(key, default))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return copy.deepcopy(self._raw)
 
 
 class ConfigLoader:
@@ -8,6 +153,7 @@ class ConfigLoader:
     def __init__(self, config_path: str = "config.json"):
         self.config_path = config_path
         self._config = None
+        self._snapshot: Optional[TradingConfig] = None
 
     def load_config(self) -> Dict[str, Any]:
         """설정 파일 로드"""
@@ -27,6 +173,14 @@ class ConfigLoader:
         config = self.load_config()
         return config.get("trading", {})
 
+    def get_trading_snapshot(self) -> TradingConfig:
+        """검증된 거래 설정 스냅샷 반환 (검증 실패 시 ConfigError)"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = TradingConfig(self.get_trading_config())
+            self._snapshot = snapshot
+        return snapshot
+
     def get_exchange_config(self) -> Dict[str, Any]:
         """거래소 관련 설정 반환"""
         config = self.load_config()
@@ -37,22 +191,141 @@ class ConfigLoader:
         config = self.load_config()
         return config.get("aws", {})
 
+    def get_notification_config(self) -> Dict[str, Any]:
+        """알림 중복 제거/발송 제한/요약 설정 반환"""
+        config = self.load_config()
+        return config.get("notifications", {})
+
+    def get_fill_model_config(self) -> Dict[str, Any]:
+        """체결 시뮬레이션 설정 반환"""
+        config = self.load_config()
+        return config.get("fill_model", {})
+
+    def get_resilience_config(self) -> Dict[str, Any]:
+        """거래소 호출 재시도/서킷 브레이커/마감 시간 설정 반환"""
+        config = self.load_config()
+        return config.get("resilience", {})
+
     def get_backtest_config(self) -> Dict[str, Any]:
         """백테스트 관련 설정 반환"""
         config = self.load_config()
         return config.get("backtest", {})
 
+    def apply_config(
+        self,
+        config: Dict[str, Any],
+        on_change: Optional[Callable[[TradingConfig], None]] = None,
+    ) -> TradingConfig:
+        """새 설정을 검증한 뒤 캐시와 스냅샷 교체
+
+        검증이나 on_change(새 스냅샷을 실제로 적용하는 콜백)가 실패하면 기존 설정을
+        그대로 둔다.
+        """
+        snapshot = TradingConfig(config.get("trading", {}))
+        if on_change is not None:
+            on_change(snapshot)
+        self._config, self._snapshot = config, snapshot
+        return snapshot
+
     def update_trading_config(self, **kwargs) -> None:
-        """거래 설정 업데이트 및 저장"""
-        config = self.load_config()
-        config["trading"].update(kwargs)
+        """거래 설정 업데이트 및 저장 (검증에 실패하면 저장하지 않음)"""
+        config = copy.deepcopy(self.load_config())
+        config.setdefault("trading", {}).update(kwargs)
+        TradingConfig(config["trading"])
         self.save_config(config)
 
     def save_config(self, config: Dict[str, Any]) -> None:
-        """설정 파일 저장"""
-        with open(self.config_path, "w", encoding="utf-8") as f:
+        """설정 파일 저장 (감시 중인 프로세스가 쓰다 만 파일을 읽지 않도록 교체 방식)"""
+        tmp_path = f"{self.config_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
             json.dump(config, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.config_path)
         self._config = config  # 캐시 업데이트
+        self._snapshot = None
+
+
+class ConfigWatcher:
+    """설정 원본 변경 감시 및 핫 리로드
+
+    source는 로컬 파일 경로, s3://bucket/key, ssm:/parameter/name 중 하나다. poll()은
+    원본이 바뀌었을 때만 다시 읽고, 검증(와 on_change 콜백)을 통과하면 로더의 설정을
+    교체해 새 스냅샷을 돌려준다. 실패하면 마지막 유효 설정을 유지하고 같은 내용은 다시
+    시도하지 않는다.
+    """
+
+    def __init__(
+        self,
+        loader: "ConfigLoader",
+        source: Optional[str] = None,
+        on_error: Optional[Callable[[str], None]] = None,
+    ):
+        self.loader = loader
+        self.source = source or loader.config_path
+        self.on_error = on_error
+        self._digest: Optional[str] = None
+        self._clients: Dict[str, Any] = {}
+        # 시작 시점 설정을 기준으로 삼음
+        self._marker, text = self._read(None)
+        if text is not None:
+            self._digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    def poll(
+        self, on_change: Optional[Callable[[TradingConfig], None]] = None
+    ) -> Optional[TradingConfig]:
+        """변경된 유효 설정이면 교체 후 새 스냅샷, 아니면 None"""
+        try:
+            marker, text = self._read(self._marker)
+        except Exception as e:
+            logger.warning(f"설정 원본 확인 실패, 기존 설정 유지: {e}")
+            return None
+        self._marker = marker
+        if text is None:
+            return None
+        digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        if digest == self._digest:
+            return None
+        self._digest = digest
+
+        try:
+            snapshot = self.loader.apply_config(json.loads(text), on_change)
+        except (ValueError, AttributeError) as e:
+            message = f"새 설정을 적용하지 않고 마지막 유효 설정을 유지합니다: {e}"
+            logger.error(message)
+            if self.on_error is not None:
+                self.on_error(message)
+            return None
+        logger.info(f"설정 변경 적용: {snapshot}")
+        return snapshot
+
+    def _read(self, marker: Any) -> Tuple[Any, Optional[str]]:
+        """(변경 표시, 내용) 반환, 표시가 그대로면 내용은 None"""
+        if self.source.startswith("s3://"):
+            bucket, _, key = self.source[5:].partition("/")
+            head = self._aws("s3").head_object(Bucket=bucket, Key=key)
+            if head["ETag"] == marker:
+                return marker, None
+            body = self._aws("s3").get_object(Bucket=bucket, Key=key)["Body"]
+            return head["ETag"], body.read().decode("utf-8")
+
+        if self.source.startswith("ssm:"):
+            parameter = self._aws("ssm").get_parameter(
+                Name=self.source[4:], WithDecryption=True
+            )["Parameter"]
+            if parameter["Version"] == marker:
+                return marker, None
+            return parameter["Version"], parameter["Value"]
+
+        stat = os.stat(self.source)
+        current = (stat.st_mtime_ns, stat.st_size)
+        if current == marker:
+            return marker, None
+        with open(self.source, "r", encoding="utf-8") as f:
+            return current, f.read()
+
+    def _aws(self, service: str):
+        if service not in self._clients:
+            self._clients[service] = boto3.client(service)
+        return self._clients[service]
 
 
 # 전역 설정 로더 인스턴스
@@ -14,7 +14,7 @@ import argparse
 import json
 import sys
 
-from config_loader import config_loader
+from config_loader import ConfigError, TradingConfig, config_loader
 
 
 class ConfigManager:
@@ -133,15 +133,11 @@ class ConfigManager:
                 if key not in trading_config:
                     issues.append(f"누락된 설정: {key}")
 
-            # 값 범위 검사
-            if trading_config.get("sma_short", 0) >= trading_config.get("sma_long", 0):
-                issues.append("sma_short는 sma_long보다 작아야 합니다")
-
-            if trading_config.get("trade_amount", 0) <= 0:
-                issues.append("trade_amount는 0보다 커야 합니다")
-
-            if trading_config.get("profit_threshold", 0) <= 0:
-                issues.append("profit_threshold는 0보다 커야 합니다")
+            # 값 범위/전략/주문 실행 설정 검사 (봇이 시작할 때와 같은 검증)
+            try:
+                TradingConfig(trading_config)
+            except ConfigError as e:
+                issues.extend(e.issues)
 
             if issues:
                 print("❌ 설정 검증 실패:")
@@ -0,0 +1,251 @@
+"""
+주문 실행 엔진
+
+- market: 시장가 주문 (기존 방식), 실제 체결가/수수료를 응답에서 읽는다.
+- maker_first: 최우선 호가(매수는 bid, 매도는 ask)에 post-only 지정가 주문을 내고
+  fetch_order 폴링으로 체결을 추적한다. timeout_seconds 안에 다 체결되지 않으면
+  취소 후 새 최우선 호가로 다시 내고(max_reprices회), 그래도 남은 수량은
+  시장가로 체결한다 (fallback_to_market).
+
+모든 경로는 주문별 체결 수량/금액/수수료를 합친 실행 보고서(dict)를 반환하며,
+거래 봇은 이를 상태(state)에 기록한다. 사용자 데이터 스트림(websocket)은
+동기 ccxt에서 지원하지 않으므로 폴링만 사용한다.
+"""
+
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+import ccxt
+
+from order_validator import OrderRejected
+
+logger = logging.getLogger(__name__)
+
+# 요청 수량 대비 이 비율 미만으로 남으면 체결 완료로 본다 (거래소 최소 수량 미만 잔량)
+DUST_RATIO = 1e-3
+
+
+class ExecutionConfig:
+    """trading.execution 설정"""
+
+    def __init__(
+        self,
+        mode: str = "market",
+        maker_fee: Optional[float] = None,
+        timeout_seconds: float = 15.0,
+        poll_interval: float = 1.0,
+        max_reprices: int = 3,
+        fallback_to_market: bool = True,
+    ):
+        if mode not in ("market", "maker_first"):
+            raise ValueError(f"지원하지 않는 실행 모드: {mode}")
+        self.mode = mode
+        self.maker_fee = maker_fee
+        self.timeout_seconds = timeout_seconds
+        self.poll_interval = poll_interval
+        self.max_reprices = max_reprices
+        self.fallback_to_market = fallback_to_market
+
+    @classmethod
+    def from_config(cls, trading_config: Dict[str, Any]) -> "ExecutionConfig":
+        execution = trading_config.get("execution", {})
+        return cls(
+            mode=execution.get("mode", "market"),
+            maker_fee=execution.get("maker_fee"),
+            timeout_seconds=execution.get("timeout_seconds", 15.0),
+            poll_interval=execution.get("poll_interval", 1.0),
+            max_reprices=execution.get("max_reprices", 3),
+            fallback_to_market=execution.get("fallback_to_market", True),
+        )
+
+
+class FillTracker:
+    """여러 주문의 체결 수량/금액/수수료 합산"""
+
+    def __init__(self, symbol: str):
+        self.base, self.quote = symbol.split("/")
+        self.filled = 0.0
+        self.cost = 0.0
+        self.maker_amount = 0.0
+        self.taker_amount = 0.0
+        self.fees: Dict[str, float] = {}
+        self.orders: List[Dict[str, Any]] = []
+
+    def add(self, order: Dict[str, Any], maker: bool) -> None:
+        filled = order.get("filled") or 0.0
+        if filled <= 0:
+            return
+        average = order.get("average") or order.get("price") or 0.0
+        cost = order.get("cost") or filled * average
+
+        self.filled += filled
+        self.cost += cost
+        if maker:
+            self.maker_amount += filled
+        else:
+            self.taker_amount += filled
+
+        fees = order.get("fees") or ([order["fee"]] if order.get("fee") else [])
+        for fee in fees:
+            if fee and fee.get("cost"):
+                currency = fee.get("currency") or self.quote
+                self.fees[currency] = self.fees.get(currency, 0.0) + fee["cost"]
+
+        self.orders.append(
+            {
+                "id": order.get("id"),
+                "type": "limit" if maker else "market",
+                "filled": filled,
+                "average": cost / filled,
+            }
+        )
+
+    @property
+    def average(self) -> float:
+        return self.cost / self.filled if self.filled else 0.0
+
+    def report(self, side: str, requested: float) -> Dict[str, Any]:
+        """실행 보고서 (순수량/순금액은 기준/호가 통화 수수료를 반영)"""
+        base_fee = self.fees.get(self.base, 0.0)
+        quote_fee = self.fees.get(self.quote, 0.0)
+        if side == "buy":
+            net_amount = self.filled - base_fee
+            net_cost = self.cost + quote_fee  # 지불한 호가 통화
+        else:
+            net_amount = self.filled + base_fee
+            net_cost = self.cost - quote_fee  # 받은 호가 통화
+
+        # 호가 통화 환산 수수료 (그 외 통화, 예: BNB는 환산하지 않음)
+        fee_value = quote_fee + base_fee * self.average
+        return {
+            "order_id": self.orders[-1]["id"] if self.orders else None,
+            "requested": requested,
+            "filled": self.filled,
+            "amount": net_amount,
+            "price": self.average,
+            "gross_cost": self.cost,
+            "cost": net_cost,
+            "fees": dict(self.fees),
+            "fee": fee_value,
+            "fee_rate": fee_value / self.cost if self.cost else 0.0,
+            "maker_ratio": self.maker_amount / self.filled if self.filled else 0.0,
+            "orders": list(self.orders),
+        }
+
+
+class OrderExecutor:
+    """설정된 모드로 주문을 실행하고 실행 보고서 반환"""
+
+    def __init__(
+        self,
+        exchange,
+        symbol: str,
+        config: ExecutionConfig,
+        sleep=None,
+        validator=None,
+    ):
+        self.exchange = exchange
+        self.symbol = symbol
+        self.config = config
+        # 부분 체결 후 남은 수량/지정가를 거래소 필터에 맞추는 OrderValidator (선택)
+        self.validator = validator
+        self._sleep = sleep or time.sleep
+        self._clock = time.monotonic
+
+    def execute(self, side: str, amount: float) -> Dict[str, Any]:
+        """side('buy'/'sell')로 기준 통화 amount만큼 주문"""
+        tracker = FillTracker(self.symbol)
+        if self.config.mode == "maker_first":
+            self._execute_maker_first(side, amount, tracker)
+        else:
+            self._execute_market(side, amount, tracker)
+
+        if tracker.filled <= 0:
+            raise ccxt.OrderNotFillable(f"{side} 주문이 체결되지 않았습니다")
+        report = tracker.report(side, amount)
+        logger.info(
+            f"{side.upper()} 실행 완료 - 체결 {report['filled']:.6f} @ {report['price']:.2f}, "
+            f"수수료 {report['fee']:.4f}, maker 비율 {report['maker_ratio']*100:.0f}%"
+        )
+        return report
+
+    def _execute_market(self, side: str, amount: float, tracker: FillTracker) -> None:
+        order = self.exchange.create_order(self.symbol, "market", side, amount)
+        if order.get("filled") is None and order.get("id"):
+            # 응답에 체결 정보가 없는 거래소는 다시 조회
+            order = self.exchange.fetch_order(order["id"], self.symbol)
+        tracker.add(order, maker=False)
+
+    def _execute_maker_first(
+        self, side: str, amount: float, tracker: FillTracker
+    ) -> None:
+        attempts = 0
+        while attempts <= self.config.max_reprices:
+            remaining = amount - tracker.filled
+            if remaining <= amount * DUST_RATIO:
+                return
+
+            price = self._touch_price(side)
+            if self.validator is not None:
+                try:
+                    remaining, price = self.validator.validate(
+                        side, remaining, price, order_type="limit"
+                    )
+                except OrderRejected as e:
+                    logger.info(f"남은 수량은 주문할 수 없어 종료: {e}")
+                    return
+            try:
+                order = self.exchange.create_order(
+                    self.symbol, "limit", side, remaining, price, {"postOnly": True}
+                )
+            except ccxt.OrderImmediatelyFillable:
+                # 호가가 움직여 maker 주문이 즉시 체결될 상황 -> 새 호가로 재시도
+                logger.info(f"post-only 주문 거부 (가격 {price}), 다시 호가 조회")
+                attempts += 1
+                continue
+
+            order = self._wait_for_fill(order)
+            tracker.add(order, maker=True)
+            attempts += 1
+            if order.get("status") != "closed":
+                logger.info(
+                    f"지정가 주문 {order.get('id')} 미체결 잔량 "
+                    f"{amount - tracker.filled:.6f}, 재호가 {attempts}/"
+                    f"{self.config.max_reprices}"
+                )
+
+        remaining = amount - tracker.filled
+        if remaining > amount * DUST_RATIO and self.config.fallback_to_market:
+            if self.validator is not None:
+                try:
+                    remaining, _ = self.validator.validate(side, remaining, price)
+                except OrderRejected as e:
+                    if tracker.filled > 0:
+                        logger.info(f"남은 수량은 주문할 수 없어 종료: {e}")
+                        return
+                    raise
+            logger.info(f"지정가 미체결 잔량 {remaining:.6f} 시장가로 체결")
+            self._execute_market(side, remaining, tracker)
+
+    def _touch_price(self, side: str) -> float:
+        order_book = self.exchange.fetch_order_book(self.symbol, limit=5)
+        book_side = order_book["bids"] if side == "buy" else order_book["asks"]
+        if not book_side:
+            raise ccxt.ExchangeError(f"{self.symbol} 호가가 비어 있습니다")
+        return book_side[0][0]
+
+    def _wait_for_fill(self, order: Dict[str, Any]) -> Dict[str, Any]:
+        """체결되거나 timeout까지 폴링, 미체결이면 취소 후 최종 상태 반환"""
+        deadline = self._clock() + self.config.timeout_seconds
+        while order.get("status") == "open" and self._clock() < deadline:
+            self._sleep(self.config.poll_interval)
+            order = self.exchange.fetch_order(order["id"], self.symbol)
+
+        if order.get("status") == "open":
+            try:
+                self.exchange.cancel_order(order["id"], self.symbol)
+            except ccxt.OrderNotFound:
+                pass  # 취소 직전에 체결됨
+            order = self.exchange.fetch_order(order["id"], self.symbol)
+        return order
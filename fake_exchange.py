@@ -0,0 +1,307 @@
+"""
+테스트/로컬 실행용 가짜 거래소
+
+네트워크 없이 ccxt 바이낸스와 같은 메서드 시그니처로 캔들, 시세, 호가, 잔고, 주문을
+흉내 낸다. 캔들은 seed로 정해지는 결정적 가격 경로이고, 시장가 주문은 즉시 최우선
+호가로 체결되며, 지정가 주문은 조회 시점의 가격이 지정가를 넘어서면 체결된다.
+
+fail()로 메서드별 장애(예외, 지연, 체결 후 응답 유실)를 순서대로 주입할 수 있어
+재시도/서킷 브레이커/마감 시간 동작을 재현 가능하게 테스트할 수 있다.
+"""
+
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Dict, List, Optional
+
+import ccxt
+import numpy as np
+
+from resample import timeframe_to_ms
+
+
+class Fault:
+    """주입할 장애 하나
+
+    error: 발생시킬 예외 (None이면 지연만), latency: 응답 전 지연(초),
+    after_call: True면 요청은 처리된 뒤 응답만 유실된 것처럼 예외 발생
+    """
+
+    def __init__(
+        self,
+        error: Optional[Exception] = None,
+        latency: float = 0.0,
+        after_call: bool = False,
+    ):
+        self.error = error
+        self.latency = latency
+        self.after_call = after_call
+
+
+class FakeExchange:
+    """결정적 가격 경로와 주문 체결을 제공하는 ccxt 호환 가짜 거래소"""
+
+    id = "fake"
+    precisionMode = ccxt.TICK_SIZE
+
+    def __init__(
+        self,
+        symbol: str = "BTC/USDT",
+        timeframe: str = "5m",
+        start_price: float = 30_000.0,
+        bars: int = 1_000,
+        seed: int = 0,
+        balances: Optional[Dict[str, float]] = None,
+        fee: float = 0.001,
+        spread: float = 0.01,
+        now_ms: Optional[int] = None,
+        sleep=time.sleep,
+    ):
+        self.symbol = symbol
+        self.base, self.quote = symbol.split("/")
+        self.timeframe = timeframe
+        self.timeframe_ms = timeframe_to_ms(timeframe)
+        self.fee = fee
+        self.spread = spread
+        self.balances = dict(balances or {self.quote: 1_000.0, self.base: 0.0})
+        self.orders: Dict[str, Dict[str, Any]] = {}
+        self.calls: List[str] = []
+        self._faults: Dict[str, deque] = defaultdict(deque)
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+        # 사인파 추세 + 랜덤 워크 캔들 (마지막 봉이 now_ms에 끝나도록 정렬)
+        rng = np.random.default_rng(seed)
+        steps = rng.normal(0, 0.002, bars) + 0.004 * np.sin(np.arange(bars) / 40)
+        closes = start_price * np.exp(np.cumsum(steps) * 0.25)
+        opens = np.concatenate(([start_price], closes[:-1]))
+        wiggle = np.abs(rng.normal(0, 0.001, bars)) * closes
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+        last_start = now_ms - now_ms % self.timeframe_ms - self.timeframe_ms
+        starts = last_start - self.timeframe_ms * np.arange(bars)[::-1]
+        self._candles = [
+            [int(t), float(o), float(max(o, c) + w), float(min(o, c) - w), float(c), v]
+            for t, o, c, w, v in zip(
+                starts, opens, closes, wiggle, rng.uniform(1, 20, bars)
+            )
+        ]
+        self._visible = bars
+        self._now_ms = now_ms
+
+    # 장애 주입
+    def fail(self, method: str, *faults) -> None:
+        """method 호출에 순서대로 적용할 장애 (예외 또는 Fault) 추가"""
+        for fault in faults:
+            if isinstance(fault, Exception):
+                fault = Fault(error=fault)
+            self._faults[method].append(fault)
+
+    def _begin(self, method: str) -> Optional[Fault]:
+        with self._lock:
+            self.calls.append(method)
+            fault = self._faults[method].popleft() if self._faults[method] else None
+        if fault is None:
+            return None
+        if fault.latency:
+            self._sleep(fault.latency)
+        if fault.error is not None and not fault.after_call:
+            raise fault.error
+        return fault
+
+    @staticmethod
+    def _end(fault: Optional[Fault], result: Any) -> Any:
+        if fault is not None and fault.error is not None and fault.after_call:
+            raise fault.error
+        return result
+
+    # 시장 데이터
+    def advance(self, bars: int = 1) -> None:
+        """가격 경로를 bars개 봉만큼 진행 (새 봉은 마지막 종가에서 이어짐)"""
+        for _ in range(bars):
+            last = self._candles[-1]
+            close = last[4] * (1 + 0.001 * np.sin(len(self._candles) / 7))
+            start = last[0] + self.timeframe_ms
+            self._candles.append(
+                [start, last[4], max(last[4], close), min(last[4], close), close, 5.0]
+            )
+            self._visible += 1
+            self._now_ms += self.timeframe_ms
+
+    def milliseconds(self) -> int:
+        return self._now_ms
+
+    def load_markets(self, reload: bool = False) -> Dict[str, Any]:
+        fault = self._begin("load_markets")
+        return self._end(fault, {self.symbol: self.market(self.symbol)})
+
+    def market(self, symbol: str) -> Dict[str, Any]:
+        return {
+            "symbol": symbol,
+            "base": self.base,
+            "quote": self.quote,
+            "info": {
+                "filters": [
+                    {
+                        "filterType": "PRICE_FILTER",
+                        "minPrice": "0.01",
+                        "maxPrice": "1000000",
+                        "tickSize": "0.01",
+                    },
+                    {
+                        "filterType": "LOT_SIZE",
+                        "minQty": "0.00001",
+                        "maxQty": "9000",
+                        "stepSize": "0.00001",
+                    },
+                    {
+                        "filterType": "NOTIONAL",
+                        "minNotional": "5",
+                        "applyMinToMarket": True,
+                    },
+                ]
+            },
+        }
+
+    def fetch_ohlcv(
+        self,
+        symbol: str,
+        timeframe: str = "5m",
+        since: Optional[int] = None,
+        limit: Optional[int] = None,
+        params=None,
+    ) -> List[List[float]]:
+        fault = self._begin("fetch_ohlcv")
+        if timeframe != self.timeframe:
+            raise ccxt.BadRequest(f"fake exchange only serves {self.timeframe}")
+        candles = self._candles[: self._visible]
+        if since is not None:
+            candles = [c for c in candles if c[0] >= since]
+            candles = candles[:limit] if limit else candles
+        elif limit:
+            candles = candles[-limit:]
+        return self._end(fault, [list(c) for c in candles])
+
+    def _last(self) -> float:
+        return self._candles[self._visible - 1][4]
+
+    def fetch_ticker(self, symbol: str, params=None) -> Dict[str, Any]:
+        fault = self._begin("fetch_ticker")
+        last = self._last()
+        return self._end(
+            fault,
+            {
+                "symbol": symbol,
+                "last": last,
+                "bid": last - self.spread,
+                "ask": last + self.spread,
+                "timestamp": self._now_ms,
+            },
+        )
+
+    def fetch_order_book(self, symbol: str, limit=None, params=None):
+        fault = self._begin("fetch_order_book")
+        last = self._last()
+        return self._end(
+            fault,
+            {
+                "bids": [[last - self.spread, 1.0]],
+                "asks": [[last + self.spread, 1.0]],
+            },
+        )
+
+    def fetch_balance(self, params=None) -> Dict[str, Any]:
+        fault = self._begin("fetch_balance")
+        balance = {"info": {"fake": True}}
+        for currency, amount in self.balances.items():
+            balance[currency] = {"free": amount, "used": 0.0, "total": amount}
+        return self._end(fault, balance)
+
+    # 주문
+    def create_order(self, symbol, type, side, amount, price=None, params=None):
+        fault = self._begin("create_order")
+        params = params or {}
+        client_id = params.get("clientOrderId")
+        with self._lock:
+            if client_id and any(
+                o["clientOrderId"] == client_id for o in self.orders.values()
+            ):
+                raise ccxt.InvalidOrder("Duplicate order sent.")
+            order = {
+                "id": str(len(self.orders) + 1),
+                "clientOrderId": client_id,
+                "symbol": symbol,
+                "type": type,
+                "side": side,
+                "amount": amount,
+                "price": price,
+                "average": None,
+                "filled": 0.0,
+                "remaining": amount,
+                "cost": 0.0,
+                "fee": None,
+                "status": "open",
+                "timestamp": self._now_ms,
+            }
+            if type == "market":
+                last = self._last()
+                self._settle(
+                    order, last + self.spread if side == "buy" else last - self.spread
+                )
+            elif params.get("postOnly") and self._crosses(side, price):
+                raise ccxt.OrderImmediatelyFillable(f"fake post-only {side} @ {price}")
+            self.orders[order["id"]] = order
+        return self._end(fault, dict(order))
+
+    def fetch_order(self, id, symbol=None, params=None) -> Dict[str, Any]:
+        fault = self._begin("fetch_order")
+        order = self._find(id, params)
+        if order["status"] == "open" and self._crosses(order["side"], order["price"]):
+            with self._lock:
+                self._settle(order, order["price"])
+        return self._end(fault, dict(order))
+
+    def cancel_order(self, id, symbol=None, params=None) -> Dict[str, Any]:
+        fault = self._begin("cancel_order")
+        order = self._find(id, params)
+        if order["status"] != "open":
+            raise ccxt.OrderNotFound(f"fake order {id} is not open")
+        order["status"] = "canceled"
+        return self._end(fault, dict(order))
+
+    def _find(self, id, params) -> Dict[str, Any]:
+        client_id = (params or {}).get("clientOrderId")
+        for order in self.orders.values():
+            if (id is not None and order["id"] == id) or (
+                client_id and order["clientOrderId"] == client_id
+            ):
+                return order
+        raise ccxt.OrderNotFound(f"fake order {id or client_id} not found")
+
+    def _crosses(self, side: str, price: float) -> bool:
+        last = self._last()
+        return last <= price if side == "buy" else last >= price
+
+    def _settle(self, order: Dict[str, Any], fill_price: float) -> None:
+        quantity = order["amount"]
+        cost = quantity * fill_price
+        fee = cost * self.fee
+        if order["side"] == "buy":
+            if cost + fee > self.balances.get(self.quote, 0.0) + 1e-9:
+                raise ccxt.InsufficientFunds(f"fake {self.quote} balance too low")
+            self.balances[self.quote] -= cost + fee
+            self.balances[self.base] = self.balances.get(self.base, 0.0) + quantity
+        else:
+            if quantity > self.balances.get(self.base, 0.0) + 1e-12:
+                raise ccxt.InsufficientFunds(f"fake {self.base} balance too low")
+            self.balances[self.base] -= quantity
+            self.balances[self.quote] = self.balances.get(self.quote, 0.0) + cost - fee
+        order.update(
+            {
+                "average": fill_price,
+                "filled": quantity,
+                "remaining": 0.0,
+                "cost": cost,
+                "status": "closed",
+                "fee": {"cost": fee, "currency": self.quote},
+            }
+        )
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Fargate 작업 자원 예산 측정
+
+fargate_main.main() 한 주기를 가짜 거래소(EXCHANGE_FAKE)와 로컬 상태 파일(STATE_DIR)로
+새 프로세스에서 실행해 최대 RSS, 파이썬 할당 최대치(tracemalloc), 단계별 시간을 측정하고
+fargate_budget.json의 예산과 비교한다. 예산은 terraform의 task_memory 안에 headroom
+비율만큼 여유를 두고 들어가야 한다.
+
+tracemalloc은 실행을 느리게 하고 RSS를 늘리므로 시나리오마다 추적 없는 실행(RSS/시간)과
+추적 실행(파이썬 할당)을 따로 한다.
+
+사용법:
+python fargate_budget.py                 # 측정 후 예산 초과 시 종료 코드 1
+python fargate_budget.py --update 1.5    # 측정값 x 1.5로 예산 갱신
+"""
+
+import argparse
+import json
+import os
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BUDGET_PATH = os.path.join(ROOT, "fargate_budget.json")
+TERRAFORM_VARIABLES = os.path.join(ROOT, "terraform", "variables.tf")
+METRICS = ("peak_rss_mb", "python_peak_mb", "wall_seconds")
+MIN_LIMITS = {"peak_rss_mb": 1.0, "python_peak_mb": 1.0, "wall_seconds": 1.0}
+
+# 자식 프로세스에 넘기지 않을 환경 변수 (실제 AWS/거래소/부가 기능 차단)
+BLOCKED_ENV = (
+    "SNS_TOPIC_ARN",
+    "S3_BUCKET",
+    "DYNAMODB_TABLE",
+    "EXCHANGE_RECORD",
+    "EXCHANGE_REPLAY",
+    "PAPER_TRADING",
+    "PROFILE_MODE",
+    "BOT_LOOP_INTERVAL",
+    "CONFIG_SOURCE",
+    "METRICS_PORT",
+)
+
+
+def task_memory_mb(path: str = TERRAFORM_VARIABLES) -> Optional[int]:
+    """terraform task_memory 기본값 (MiB)"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+    except OSError:
+        return None
+    match = re.search(
+        r'variable\s+"task_memory"\s*\{[^}]*default\s*=\s*(\d+)', text, re.DOTALL
+    )
+    return int(match.group(1)) if match else None
+
+
+def _peak_rss_mb() -> float:
+    """현재 프로세스 최대 RSS (MiB)
+
+    리눅스의 ru_maxrss는 exec 뒤에도 부모 프로세스(pytest 등)의 최대치를 이어받으므로
+    /proc의 VmHWM을 우선 사용한다.
+    """
+    try:
+        with open("/proc/self/status", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # 리눅스는 KiB, macOS는 바이트
+    return max_rss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def _child(output: str, traced: bool) -> None:
+    """자식 프로세스: main() 한 주기 실행 후 측정값을 output에 JSON으로 저장
+
+    모듈 import는 추적하면 몇 배 느려지므로 tracemalloc은 import 뒤에 시작한다
+    (import로 늘어난 메모리는 RSS에 반영된다).
+    """
+    from profiling import phase_timer
+
+    started = time.perf_counter()
+    with phase_timer.phase("import"):
+        import fargate_main
+    if traced:
+        tracemalloc.start()
+    exit_code = fargate_main.main()
+    wall_seconds = time.perf_counter() - started
+
+    peak_rss_mb = _peak_rss_mb()
+    phases = phase_timer.phases
+    state_path = os.path.join(os.environ["STATE_DIR"], "trading_state_BTC_USDT.json")
+    with open(state_path, "r", encoding="utf-8") as f:
+        state = json.load(f)
+
+    result = {
+        "exit_code": exit_code,
+        "position_open": state.get("position") is not None,
+        "wall_seconds": wall_seconds,
+        "peak_rss_mb": peak_rss_mb,
+        "phases": phases,
+    }
+    if traced:
+        result["python_peak_mb"] = phase_timer.python_peak_mb
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f)
+
+
+def _run_child(
+    scenario: Dict[str, Any], workdir: str, traced: bool, timeout: float
+) -> Dict[str, Any]:
+    output = os.path.join(workdir, f"result-{int(traced)}.json")
+    state_dir = os.path.join(workdir, f"state-{int(traced)}")
+    env = {k: v for k, v in os.environ.items() if k not in BLOCKED_ENV}
+    env.update(
+        {
+            "BINANCE_API_KEY": "budget",
+            "BINANCE_SECRET": "budget",
+            "EXCHANGE_FAKE": str(scenario.get("seed", 0)),
+            "STATE_DIR": state_dir,
+            "USE_S3": "false",
+            "PYTHONPATH": os.pathsep.join(filter(None, [ROOT, env.get("PYTHONPATH")])),
+        }
+    )
+    command = [
+        sys.executable,
+        "-c",
+        f"import fargate_budget; fargate_budget._child({output!r}, {traced})",
+    ]
+    completed = subprocess.run(
+        command, cwd=workdir, env=env, capture_output=True, text=True, timeout=timeout
+    )
+    if completed.returncode != 0 or not os.path.exists(output):
+        raise RuntimeError(
+            f"예산 측정 실행 실패 (종료 코드 {completed.returncode}):\n"
+            f"{completed.stdout[-2000:]}{completed.stderr[-2000:]}"
+        )
+    with open(output, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def measure_scenario(
+    scenario: Dict[str, Any],
+    config_path: str = os.path.join(ROOT, "config.json"),
+    timeout: float = 120,
+) -> Dict[str, Any]:
+    """시나리오 하나 측정 (추적 없는 실행 + tracemalloc 실행)"""
+    with open(config_path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    config["trading"].update(scenario.get("trading", {}))
+
+    with tempfile.TemporaryDirectory(prefix="fargate-budget-") as workdir:
+        with open(os.path.join(workdir, "config.json"), "w", encoding="utf-8") as f:
+            json.dump(config, f)
+        plain = _run_child(scenario, workdir, False, timeout)
+        traced = _run_child(scenario, workdir, True, timeout)
+
+    phases = plain["phases"]
+    for name, entry in traced["phases"].items():
+        if "python_peak_mb" in entry:
+            phases[name]["python_peak_mb"] = entry["python_peak_mb"]
+    return {
+        "exit_code": plain["exit_code"],
+        "position_open": plain["position_open"],
+        "peak_rss_mb": plain["peak_rss_mb"],
+        "python_peak_mb": traced["python_peak_mb"],
+        "wall_seconds": plain["wall_seconds"],
+        "phases": phases,
+    }
+
+
+def check_budget(
+    name: str,
+    measured: Dict[str, Any],
+    budget: Dict[str, Any],
+    memory_limit_mb: Optional[float] = None,
+    wall_time: bool = True,
+) -> List[str]:
+    """예산 초과 항목 목록 (비어 있으면 통과)
+
+    wall_time=False면 실행 환경에 따라 흔들리는 시간 예산은 건너뛰고 RSS/파이썬 할당만
+    검사한다.
+    """
+    violations = []
+    if measured["exit_code"] != 0:
+        violations.append(f"{name}: main() 종료 코드 {measured['exit_code']}")
+    expected = budget.get("position_open")
+    if expected is not None and measured["position_open"] != expected:
+        violations.append(f"{name}: 포지션 상태 {measured['position_open']} (예상 {expected})")
+
+    limits = budget.get("limits", {})
+    for metric in METRICS:
+        if metric == "wall_seconds" and not wall_time:
+            continue
+        if metric in limits and measured[metric] > limits[metric]:
+            violations.append(
+                f"{name}: {metric} {measured[metric]:.2f} > 예산 {limits[metric]}"
+            )
+    for phase, phase_limits in limits.get("phases", {}).items():
+        entry = measured["phases"].get(phase, {})
+        for metric, limit in phase_limits.items():
+            if metric == "wall_seconds" and not wall_time:
+                continue
+            if entry.get(metric, 0.0) > limit:
+                violations.append(
+                    f"{name}: {phase}.{metric} {entry[metric]:.2f} > 예산 {limit}"
+                )
+
+    if memory_limit_mb is not None and limits.get("peak_rss_mb", 0) > memory_limit_mb:
+        violations.append(
+            f"{name}: peak_rss_mb 예산 {limits['peak_rss_mb']}이 작업 메모리 여유 한도 "
+            f"{memory_limit_mb:.0f}MB를 넘습니다"
+        )
+    return violations
+
+
+def load_budgets(path: str = DEFAULT_BUDGET_PATH) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def memory_limit(budgets: Dict[str, Any]) -> Optional[float]:
+    """terraform task_memory x headroom (terraform 설정이 없으면 None)"""
+    memory = task_memory_mb()
+    return None if memory is None else memory * budgets.get("headroom", 0.8)
+
+
+def updated_limits(measured: Dict[str, Any], margin: float) -> Dict[str, Any]:
+    """측정값 x margin으로 만든 예산 (소수 첫째 자리 반올림)"""
+
+    def bound(metric: str, value: float) -> float:
+        # 시간은 실행 환경에 따른 편차가 커서 여유를 두 배로, 아주 짧은 단계는 최소 예산
+        scale = margin * 2 if metric == "wall_seconds" else margin
+        return max(round(value * scale + 0.05, 1), MIN_LIMITS[metric])
+
+    return {
+        **{metric: bound(metric, measured[metric]) for metric in METRICS},
+        "phases": {
+            phase: {metric: bound(metric, value) for metric, value in entry.items()}
+            for phase, entry in measured["phases"].items()
+        },
+    }
+
+
+def print_report(name: str, measured: Dict[str, Any], budget: Dict[str, Any]) -> None:
+    limits = budget.get("limits", {})
+    print(f"\n[{name}] RSS/파이썬 할당/시간 (예산)")
+    for metric in METRICS:
+        print(f"  {metric:<16} {measured[metric]:>9.2f}  ({limits.get(metric, '-')})")
+    for phase, entry in measured["phases"].items():
+        phase_limits = limits.get("phases", {}).get(phase, {})
+        values = ", ".join(
+            f"{metric} {value:.2f} ({phase_limits.get(metric, '-')})"
+            for metric, value in entry.items()
+        )
+        print(f"  - {phase:<14} {values}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fargate task resource budgets")
+    parser.add_argument("--budgets", default=DEFAULT_BUDGET_PATH)
+    parser.add_argument(
+        "--update",
+        type=float,
+        metavar="MARGIN",
+        help="Rewrite budgets as measured values x MARGIN (floors: MIN_LIMITS)",
+    )
+    args = parser.parse_args()
+
+    budgets = load_budgets(args.budgets)
+    limit = memory_limit(budgets)
+    print(f"작업 메모리 여유 한도: {limit:.0f}MB" if limit else "terraform task_memory 없음")
+
+    violations = []
+    for name, budget in budgets["scenarios"].items():
+        measured = measure_scenario(budget)
+        if args.update:
+            budget["limits"] = updated_limits(measured, args.update)
+        print_report(name, measured, budget)
+        violations += check_budget(name, measured, budget, limit)
+
+    if args.update:
+        with open(args.budgets, "w", encoding="utf-8") as f:
+            json.dump(budgets, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        print(f"\n예산을 갱신했습니다: {args.budgets}")
+
+    if violations:
+        print("\n❌ 예산 초과:")
+        for violation in violations:
+            print(f"  - {violation}")
+        sys.exit(1)
+    print("\n✅ 모든 시나리오가 예산 안에 있습니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,20 @@
 #!/usr/bin/env python3
 """
 AWS Fargate에서 실행되는 비트코인 자동거래 봇
-10분마다 EventBridge에 의해 트리거됨
+10분마다 EventBridge에 의해 트리거됨 (BOT_LOOP_INTERVAL 설정 시 상주 실행)
 """
 
 import logging
 import os
 import sys
+import time
 import traceback
 from datetime import datetime
 
+from config_loader import ConfigWatcher, config_loader
+from metrics_server import MetricsServer, bot_metrics
 from notification import notifier
+from profiling import phase_timer, profile_from_env
 from state_store import StateStore
 from trade import TradingBot
 
@@ -24,46 +28,46 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def main():
-    """메인 실행 함수"""
-    try:
-        logger.info("🚀 Bitcoin Trading Bot (Fargate) started")
-        logger.info(f"⏰ Execution time: {datetime.now().isoformat()}")
+def initialize():
+    """환경 변수 확인 후 상태 저장소와 거래 봇 생성"""
+    required_env_vars = ["BINANCE_API_KEY", "BINANCE_SECRET"]
+    for var in required_env_vars:
+        if not os.getenv(var):
+            raise ValueError(f"Required environment variable {var} is not set")
+
+    # State Store 초기화 (STATE_DIR 설정 시 로컬 파일)
+    use_s3 = os.getenv("USE_S3", "true").lower() == "true"
+    state_dir = os.getenv("STATE_DIR")
+    state_store = StateStore(use_s3=use_s3, local_dir=state_dir)
+    logger.info(f"📦 State store initialized (S3: {use_s3}, local: {state_dir})")
 
-        # 환경 변수 확인
-        required_env_vars = ["BINANCE_API_KEY", "BINANCE_SECRET"]
-        for var in required_env_vars:
-            if not os.getenv(var):
-                raise ValueError(f"Required environment variable {var} is not set")
+    # 거래 봇 초기화
+    bot = TradingBot()
+    logger.info("✅ Trading bot initialized successfully")
+    return state_store, bot
 
-        # State Store 초기화
-        use_s3 = os.getenv("USE_S3", "true").lower() == "true"
-        state_store = StateStore(use_s3=use_s3)
-        logger.info(f"📦 State store initialized (S3: {use_s3})")
 
-        # 거래 봇 초기화
-        bot = TradingBot()
-        logger.info("✅ Trading bot initialized successfully")
+def run_cycle(bot: TradingBot, state_store: StateStore) -> int:
+    """매매 판단 한 주기 실행 (상태 로드 -> 전략 실행 -> 상태 저장)"""
+    current_state = None
+    started = time.monotonic()
+    try:
+        logger.info(f"⏰ Execution time: {datetime.now().isoformat()}")
 
-        # 현재 상태 로드
-        current_state = state_store.load_state()
+        # 현재 상태 로드 (알림 중복 제거/요약 상태 포함)
+        with phase_timer.phase("load_state"):
+            current_state = state_store.load_state()
+        notifier.coalescer.restore(current_state.get("notification_state"))
         logger.info(f"📊 Current state loaded: {current_state}")
 
         # 거래 전략 실행
         logger.info("🔄 Executing trading strategy...")
-        result = bot.execute_strategy(current_state)
-
-        # 상태가 변경된 경우에만 저장
-        if result.get("state_changed", False):
-            new_state = result["new_state"]
-            state_store.save_state(new_state)
-            logger.info(f"💾 State updated and saved: {new_state}")
-        else:
-            logger.info(f"📊 No state change, current result: {result}")
-
-        logger.info(f"🔄 Trading result: {result}")
+        # 분할 주문 진행 상황은 자식 주문마다 저장
+        with phase_timer.phase("strategy"):
+            result = bot.execute_strategy(current_state, state_store.save_state)
+        notifier.record_run_success()
 
-        # 성공 알림 (선택적)
+        # 성공 알림 (선택적, 유형별 발송 제한 적용)
         if os.getenv("NOTIFY_ON_SUCCESS", "false").lower() == "true":
             notifier.notify_bot_status(
                 "Bot 실행 완료",
@@ -71,28 +75,140 @@ def main():
                 f"실행 시간: {datetime.now().isoformat()}\n"
                 f"다음 실행: 10분 후",
             )
+        notifier.send_digest_if_due()
+
+        # 상태나 알림 집계가 변경된 경우에만 저장
+        if result.get("state_changed", False):
+            new_state = result["new_state"]
+        elif notifier.coalescer.dirty:
+            new_state = current_state
+        else:
+            new_state = None
+
+        with phase_timer.phase("save_state"):
+            if new_state is not None:
+                new_state["notification_state"] = notifier.coalescer.snapshot()
+                state_store.save_state(new_state)
+                logger.info(f"💾 State updated and saved: {new_state}")
+            else:
+                logger.info(f"📊 No state change, current result: {result}")
+
+        logger.info(f"🔄 Trading result: {result}")
+        logger.info(f"⏱️ Phase timings: {phase_timer.summary()}")
+        bot_metrics.record_cycle(time.monotonic() - started, result)
 
         logger.info("✅ Trading bot execution completed successfully")
         return 0
 
     except Exception as e:
-        error_msg = f"❌ Trading bot execution failed: {str(e)}"
-        logger.error(error_msg)
-        logger.error(f"Traceback: {traceback.format_exc()}")
+        bot_metrics.record_cycle(time.monotonic() - started)
+        report_failure(e, state_store, current_state)
+        return 1
 
-        # 오류 알림
+
+def report_failure(error: Exception, state_store=None, current_state=None) -> None:
+    """실행 오류 로그/알림 및 알림 상태 보관"""
+    error_msg = f"❌ Trading bot execution failed: {str(error)}"
+    logger.error(error_msg)
+    logger.error(f"Traceback: {traceback.format_exc()}")
+
+    # 오류 알림
+    try:
+        notifier.notify_error(
+            "Fargate Bot 실행 오류",
+            f"{error_msg}\n\nTraceback:\n{traceback.format_exc()}",
+            {"execution_time": datetime.now().isoformat()},
+        )
+    except Exception as notify_error:
+        logger.error(f"Failed to send error notification: {notify_error}")
+
+    # 다음 실행에서 중복 알림을 걸러낼 수 있도록 알림 상태 보관
+    # (상태 조회에 실패하면 current_state가 없으므로 저장된 상태를 덮어쓰지 않음)
+    if state_store is not None and current_state is not None:
         try:
-            notifier.notify_error(
-                "Fargate Bot 실행 오류",
-                f"{error_msg}\n\nTraceback:\n{traceback.format_exc()}",
-                {"execution_time": datetime.now().isoformat()},
-            )
-        except Exception as notify_error:
-            logger.error(f"Failed to send error notification: {notify_error}")
+            current_state["notification_state"] = notifier.coalescer.snapshot()
+            state_store.save_state(current_state)
+        except Exception as save_error:
+            logger.error(f"Failed to save notification state: {save_error}")
+
+
+def run_once() -> int:
+    """봇을 초기화하고 한 주기 실행"""
+    try:
+        with phase_timer.phase("initialize"):
+            state_store, bot = initialize()
+    except Exception as e:
+        report_failure(e)
+        return 1
+    return run_cycle(bot, state_store)
 
+
+def run_loop(interval: float) -> int:
+    """같은 프로세스에서 interval초마다 주기 반복, 주기 사이에 설정 변경 적용"""
+    try:
+        state_store, bot = initialize()
+    except Exception as e:
+        report_failure(e)
         return 1
 
+    watcher = ConfigWatcher(
+        config_loader,
+        os.getenv("CONFIG_SOURCE"),
+        on_error=lambda message: notifier.notify_error("설정 리로드 실패", message),
+    )
+    logger.info(f"🔁 Loop mode: every {interval:.0f}s (config: {watcher.source})")
+    start_metrics_server(interval)
+    try:
+        while True:
+            started = time.monotonic()
+            # 새 설정이 유효하고 봇에 적용될 때만 교체 (실패 시 마지막 유효 설정 유지)
+            watcher.poll(bot.apply_config)
+            with profile_from_env("fargate-cycle"):
+                run_cycle(bot, state_store)
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
+    except KeyboardInterrupt:
+        logger.info("🛑 Loop stopped")
+        return 0
+
+
+def start_metrics_server(interval: float) -> None:
+    """METRICS_PORT 설정 시 /metrics, /healthz 서버 시작
+
+    마지막 성공 주기가 METRICS_STALL_SECONDS(기본 주기 간격 x 3)보다 오래되면
+    /healthz가 503을 돌려준다.
+    """
+    port = os.getenv("METRICS_PORT")
+    if not port:
+        return
+    stall_seconds = float(os.getenv("METRICS_STALL_SECONDS", str(interval * 3)))
+    try:
+        MetricsServer(bot_metrics, int(port), stall_seconds=stall_seconds).start()
+    except OSError as e:
+        # 메트릭 서버 실패로 매매를 멈추지 않음
+        logger.error(f"Failed to start metrics server on port {port}: {e}")
+
+
+def main():
+    """메인 실행 함수
+
+    BOT_LOOP_INTERVAL(초)을 설정하면 한 번 실행하고 끝나는 대신 같은 프로세스에서
+    주기를 반복하며, 주기 사이에 설정 원본(CONFIG_SOURCE, 기본 config.json) 변경을
+    재시작 없이 적용하고, METRICS_PORT를 설정하면 메트릭/헬스 엔드포인트를 연다.
+    PROFILE_MODE=cpu|mem이면 PROFILE_DIR에 프로파일을 남긴다.
+    """
+    try:
+        logger.info("🚀 Bitcoin Trading Bot (Fargate) started")
+        loop_interval = float(os.getenv("BOT_LOOP_INTERVAL", "0"))
+        if loop_interval > 0:
+            return run_loop(loop_interval)
+
+        # 한 번 실행은 초기화부터 프로파일링 (상주 실행은 주기마다)
+        with profile_from_env("fargate"):
+            return run_once()
+
     finally:
+        # 백그라운드 큐에 남은 알림을 종료 전에 발송
+        notifier.flush()
         logger.info("🏁 Bitcoin Trading Bot (Fargate) finished")
 
 
@@ -0,0 +1,436 @@
+"""
+이벤트 기반 체결 시뮬레이터
+
+시장가 주문을 봉 종가에 즉시 전량 체결하는 대신 다음을 모델링한다.
+- 지연(latency): 주문은 제출 후 latency_ms 뒤에 도착하며, 도착 시점의 봉 안에서
+  시가/종가 사이를 보간한 가격(sub-bar price)으로 체결된다.
+- 스프레드/슬리피지: 반 스프레드 + 봉 거래량 대비 주문 수량에 비례하는 충격 비용
+- 부분 체결: 봉마다 거래량의 max_participation 비율까지만 체결되고 나머지는
+  다음 봉으로 넘어간다.
+
+대기 주문은 도착 시각 기준 힙(event queue)에 들어가고, 봉은 배열에서 순서대로
+읽으므로 힙에는 미도착 주문만 남아 수백만 봉에서도 빠르게 동작한다.
+같은 FillModel을 백테스트(SimulatedBroker)와 모의 거래(PaperExchange)가 공유한다.
+"""
+
+import heapq
+import itertools
+import json
+import logging
+import math
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import ccxt
+
+logger = logging.getLogger(__name__)
+
+
+class FillModel:
+    """지연/슬리피지/부분 체결 모델"""
+
+    def __init__(
+        self,
+        latency_ms: int = 0,
+        spread_bps: float = 0.0,
+        impact_coef: float = 0.0,
+        impact_model: str = "linear",
+        max_participation: Optional[float] = None,
+        max_order_bars: Optional[int] = None,
+        trading_fee: float = 0.001,
+    ):
+        if impact_model not in ("linear", "sqrt"):
+            raise ValueError(f"지원하지 않는 impact_model: {impact_model}")
+        self.latency_ms = latency_ms
+        self.spread_bps = spread_bps
+        self.impact_coef = impact_coef
+        self.impact_model = impact_model
+        self.max_participation = max_participation
+        self.max_order_bars = max_order_bars
+        self.trading_fee = trading_fee
+
+    @classmethod
+    def from_config(
+        cls, fill_config: Dict[str, Any], trading_fee: float = 0.001
+    ) -> "FillModel":
+        """fill_model 설정 섹션으로 생성"""
+        return cls(
+            latency_ms=fill_config.get("latency_ms", 0),
+            spread_bps=fill_config.get("spread_bps", 0.0),
+            impact_coef=fill_config.get("impact_coef", 0.0),
+            impact_model=fill_config.get("impact_model", "linear"),
+            max_participation=fill_config.get("max_participation"),
+            max_order_bars=fill_config.get("max_order_bars"),
+            trading_fee=trading_fee,
+        )
+
+    def slippage(self, quantity: float, bar_volume: float) -> float:
+        """가격 대비 슬리피지 비율 (반 스프레드 + 시장 충격)"""
+        slip = self.spread_bps / 2 / 10_000
+        if self.impact_coef and bar_volume > 0:
+            ratio = quantity / bar_volume
+            if self.impact_model == "sqrt":
+                ratio = math.sqrt(ratio)
+            slip += self.impact_coef * ratio
+        return slip
+
+    def capacity(self, bar_volume: float) -> float:
+        """봉 하나에서 체결 가능한 최대 수량"""
+        if self.max_participation is None:
+            return math.inf
+        return self.max_participation * bar_volume
+
+
+class Order:
+    """시뮬레이션 주문 (매수는 quote 예산, 매도는 base 수량 기준)"""
+
+    __slots__ = (
+        "id",
+        "side",
+        "quote_budget",
+        "quantity",
+        "submitted_at",
+        "arrival",
+        "signal_price",
+        "filled",
+        "cost",
+        "fee",
+        "fills",
+        "bars",
+        "last_bar",
+        "status",
+    )
+
+    def __init__(
+        self,
+        order_id: int,
+        side: str,
+        submitted_at: int,
+        arrival: int,
+        signal_price: float,
+        quote_budget: float = 0.0,
+        quantity: float = 0.0,
+    ):
+        self.id = order_id
+        self.side = side
+        self.quote_budget = quote_budget
+        self.quantity = quantity
+        self.submitted_at = submitted_at
+        self.arrival = arrival
+        self.signal_price = signal_price
+        self.filled = 0.0  # 체결된 base 수량 (수수료 차감 전)
+        self.cost = 0.0  # 체결 금액 (quote)
+        self.fee = 0.0  # quote 환산 수수료
+        self.fills = 0
+        self.bars = 0
+        self.last_bar: Optional[int] = None
+        self.status = "pending"
+
+    @property
+    def average(self) -> float:
+        return self.cost / self.filled if self.filled else 0.0
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("filled", "cancelled")
+
+    def remaining(self, price: float) -> float:
+        """남은 base 수량 (매수는 남은 예산을 price로 환산)"""
+        if self.side == "buy":
+            return max(self.quote_budget - self.cost, 0.0) / price
+        return max(self.quantity - self.filled, 0.0)
+
+
+class SimulatedBroker:
+    """봉 데이터 위에서 주문을 도착 시각 순으로 체결하는 브로커"""
+
+    def __init__(self, fill_model: FillModel, timeframe_ms: int):
+        self.model = fill_model
+        self.timeframe_ms = timeframe_ms
+        self._pending: List[Tuple[int, int, Order]] = []  # (도착 시각, 순번, 주문)
+        self._active: List[Order] = []
+        self._ids = itertools.count(1)
+        self._bar_start: Optional[int] = None
+        self._bar_used = 0.0
+
+    @property
+    def has_open_orders(self) -> bool:
+        return bool(self._pending or self._active)
+
+    def submit(
+        self,
+        side: str,
+        now_ms: int,
+        signal_price: float,
+        quote_budget: float = 0.0,
+        quantity: float = 0.0,
+    ) -> Order:
+        """주문 제출 (latency_ms 뒤 도착)"""
+        order = Order(
+            next(self._ids),
+            side,
+            now_ms,
+            now_ms + self.model.latency_ms,
+            signal_price,
+            quote_budget=quote_budget,
+            quantity=quantity,
+        )
+        heapq.heappush(self._pending, (order.arrival, order.id, order))
+        return order
+
+    def process_bar(
+        self,
+        bar_start: int,
+        open_: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float,
+    ) -> List[Order]:
+        """봉 하나를 처리하고 이번에 체결이 발생한 주문 목록 반환
+
+        같은 봉에서 여러 번 호출해도 (지연 0 주문 처리) 거래량 한도는 봉 단위로
+        공유되고, 넘어온 주문은 봉마다 한 번만 체결된다.
+        """
+        if bar_start != self._bar_start:
+            self._bar_start = bar_start
+            self._bar_used = 0.0
+        bar_end = bar_start + self.timeframe_ms
+        capacity = self.model.capacity(volume)
+        touched = []
+
+        # 이전 봉에서 넘어온 주문은 봉 대표가격으로 체결
+        carry_price = (high + low + close) / 3
+        for order in self._active:
+            if order.last_bar == bar_start:
+                continue
+            self._fill(order, carry_price, volume, capacity)
+            order.last_bar = bar_start
+            order.bars += 1
+            touched.append(order)
+
+        # 이번 봉 안에 도착한 주문은 도착 시점의 보간 가격으로 체결
+        while self._pending and self._pending[0][0] <= bar_end:
+            arrival, _, order = heapq.heappop(self._pending)
+            fraction = min(max((arrival - bar_start) / self.timeframe_ms, 0.0), 1.0)
+            self._fill(order, open_ + (close - open_) * fraction, volume, capacity)
+            order.last_bar = bar_start
+            order.bars = 1
+            touched.append(order)
+            self._active.append(order)
+
+        max_bars = self.model.max_order_bars
+        for order in touched:
+            if not order.done and max_bars is not None and order.bars >= max_bars:
+                order.status = "cancelled"
+        self._active = [order for order in self._active if not order.done]
+        return touched
+
+    def _fill(self, order: Order, price: float, volume: float, capacity: float) -> None:
+        available = capacity - self._bar_used
+        if available <= 0:
+            return
+
+        quantity = min(order.remaining(price), available)
+        if quantity <= 0:
+            order.status = "filled"
+            return
+
+        slip = self.model.slippage(quantity, volume)
+        fill_price = price * (1 + slip) if order.side == "buy" else price * (1 - slip)
+        if order.side == "buy":
+            # 예산 안에서 슬리피지 포함 가격으로 다시 계산
+            quantity = min(quantity, (order.quote_budget - order.cost) / fill_price)
+
+        order.filled += quantity
+        order.cost += quantity * fill_price
+        order.fee += quantity * fill_price * self.model.trading_fee
+        order.fills += 1
+        order.status = "partial"
+        if order.remaining(fill_price) <= 1e-12 * max(order.filled, 1.0):
+            order.status = "filled"
+        self._bar_used += quantity
+
+
+class PaperExchange:
+    """같은 FillModel로 주문을 모의 체결하는 ccxt 호환 거래소 래퍼
+
+    시세 조회는 실제 거래소(공개 API)에 위임하고, 잔고는 state_path JSON 파일에
+    보관해 실행 간 유지한다. 시장가 주문은 최근 1분봉 거래량으로 부분 체결 한도를
+    계산하며 체결되지 않은 나머지 수량은 취소된다. 지정가 주문은 조회 시점의 체결가가
+    지정가를 넘어서면 전량 체결된다.
+    """
+
+    def __init__(
+        self,
+        market_data_exchange,
+        fill_model: FillModel,
+        initial_balances: Optional[Dict[str, float]] = None,
+        state_path: Optional[str] = None,
+    ):
+        self.market = market_data_exchange
+        self.model = fill_model
+        self.state_path = state_path
+        self.balances = dict(initial_balances or {"USDT": 100.0, "BTC": 0.0})
+        self.orders: Dict[str, Dict[str, Any]] = {}
+        self._ids = itertools.count(1)
+        self._load()
+
+    def __getattr__(self, name):
+        # fetch_ohlcv, fetch_ticker 등 시세 조회는 실제 거래소로 위임
+        if name == "market":
+            raise AttributeError(name)
+        return getattr(self.market, name)
+
+    def fetch_balance(self) -> Dict[str, Any]:
+        balance = {"info": {"paper": True}}
+        for currency, amount in self.balances.items():
+            balance[currency] = {"free": amount, "used": 0.0, "total": amount}
+        return balance
+
+    def create_market_buy_order(self, symbol: str, amount: float, params=None):
+        return self._execute(symbol, "buy", amount)
+
+    def create_market_sell_order(self, symbol: str, amount: float, params=None):
+        return self._execute(symbol, "sell", amount)
+
+    def create_order(self, symbol, type, side, amount, price=None, params=None):
+        client_id = (params or {}).get("clientOrderId")
+        if type == "market":
+            return self._execute(symbol, side, amount, client_id)
+        if type != "limit":
+            raise NotImplementedError(f"PaperExchange는 {type} 주문을 지원하지 않습니다")
+
+        # 지정가: post-only면 즉시 체결될 가격을 거부, 이후 조회 시 시세가 넘어서면 체결
+        ticker = self.market.fetch_ticker(symbol)
+        if (params or {}).get("postOnly") and self._crosses(side, price, ticker):
+            raise ccxt.OrderImmediatelyFillable(f"paper post-only {side} @ {price}")
+        order = self._new_order(symbol, "limit", side, amount, price, client_id)
+        order.update({"status": "open", "filled": 0.0, "remaining": amount})
+        self.orders[order["id"]] = order
+        return self.fetch_order(order["id"], symbol)
+
+    def fetch_order(self, order_id: str, symbol: Optional[str] = None, params=None):
+        order = self._find(order_id, params)
+        if order["status"] == "open":
+            ticker = self.market.fetch_ticker(order["symbol"])
+            if self._crosses(order["side"], order["price"], ticker, strict=True):
+                # 지정가 전량 체결 (maker, 슬리피지 없음)
+                self._settle(order, order["amount"], order["price"])
+        return dict(order)
+
+    def cancel_order(self, order_id: str, symbol: Optional[str] = None, params=None):
+        order = self.orders.get(order_id)
+        if order is None or order["status"] != "open":
+            raise ccxt.OrderNotFound(f"paper order {order_id} is not open")
+        order["status"] = "canceled"
+        return dict(order)
+
+    def _find(self, order_id: Optional[str], params=None) -> Dict[str, Any]:
+        """주문 ID 또는 params의 clientOrderId로 주문 조회"""
+        if order_id in self.orders:
+            return self.orders[order_id]
+        client_id = (params or {}).get("clientOrderId")
+        for order in self.orders.values():
+            if client_id and order.get("clientOrderId") == client_id:
+                return order
+        raise ccxt.OrderNotFound(f"paper order {order_id or client_id} not found")
+
+    @staticmethod
+    def _crosses(side: str, price: float, ticker: Dict[str, Any], strict=False):
+        """매수 지정가가 매도 호가 이상(또는 체결가가 그 아래)인지"""
+        if strict:
+            last = ticker["last"]
+            return last < price if side == "buy" else last > price
+        ask = ticker.get("ask") or ticker["last"]
+        bid = ticker.get("bid") or ticker["last"]
+        return price >= ask if side == "buy" else price <= bid
+
+    def _execute(
+        self, symbol: str, side: str, amount: float, client_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        price = self.market.fetch_ticker(symbol)["last"]
+        candles = self.market.fetch_ohlcv(symbol, timeframe="1m", limit=2)
+        volume = candles[0][5] if candles else 0.0
+
+        quantity = min(amount, self.model.capacity(volume))
+        slip = self.model.slippage(quantity, volume)
+        fill_price = price * (1 + slip) if side == "buy" else price * (1 - slip)
+
+        order = self._new_order(symbol, "market", side, amount, None, client_id)
+        self._settle(order, quantity, fill_price)
+        if quantity < amount:
+            order["status"] = "canceled"
+        self.orders[order["id"]] = order
+        logger.info(
+            f"[PAPER] {side.upper()} {quantity:.6f} {symbol.split('/')[0]} "
+            f"@ {fill_price:.2f} (slippage {slip * 10_000:.1f}bps)"
+        )
+        return dict(order)
+
+    def _new_order(
+        self, symbol, type, side, amount, price, client_id=None
+    ) -> Dict[str, Any]:
+        return {
+            "id": f"paper-{int(time.time() * 1000)}-{next(self._ids)}",
+            "clientOrderId": client_id,
+            "symbol": symbol,
+            "type": type,
+            "side": side,
+            "price": price,
+            "average": None,
+            "amount": amount,
+            "filled": 0.0,
+            "remaining": amount,
+            "cost": 0.0,
+            "status": "open",
+            "fee": None,
+            "timestamp": int(time.time() * 1000),
+        }
+
+    def _settle(self, order: Dict[str, Any], quantity: float, fill_price: float):
+        """체결 수량만큼 잔고 반영
+
+        수수료는 SimulatedBroker 백테스트와 같게 매수는 받은 기준 통화에서,
+        매도는 받은 호가 통화에서 차감한다 (BNB 할인 없는 바이낸스 현물과 동일).
+        """
+        base, quote = order["symbol"].split("/")
+        cost = quantity * fill_price
+        rate = self.model.trading_fee
+
+        if order["side"] == "buy":
+            if cost > self.balances.get(quote, 0.0) + 1e-9:
+                raise ccxt.InsufficientFunds(f"paper {quote} 잔고 부족")
+            fee = {"cost": quantity * rate, "currency": base}
+            self.balances[quote] = self.balances.get(quote, 0.0) - cost
+            self.balances[base] = self.balances.get(base, 0.0) + quantity * (1 - rate)
+        else:
+            if quantity > self.balances.get(base, 0.0) + 1e-12:
+                raise ccxt.InsufficientFunds(f"paper {base} 잔고 부족")
+            fee = {"cost": cost * rate, "currency": quote}
+            self.balances[base] = self.balances.get(base, 0.0) - quantity
+            self.balances[quote] = self.balances.get(quote, 0.0) + cost - fee["cost"]
+
+        order.update(
+            {
+                "average": fill_price,
+                "filled": quantity,
+                "remaining": order["amount"] - quantity,
+                "cost": cost,
+                "status": "closed",
+                "fee": fee,
+            }
+        )
+        self._save()
+
+    def _load(self) -> None:
+        if self.state_path and os.path.exists(self.state_path):
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                # 저장 파일에 없는 통화는 초기 잔고 유지
+                self.balances.update(json.load(f)["balances"])
+
+    def _save(self) -> None:
+        if self.state_path:
+            with open(self.state_path, "w", encoding="utf-8") as f:
+                json.dump({"balances": self.balances}, f, indent=2)
@@ -0,0 +1,291 @@
+"""
+캔들 누락 구간 색인
+
+타임스탬프 배열을 한 번의 벡터 연산(np.diff)으로 훑어 누락 구간(gap)을 색인한다.
+수백만 봉도 수 밀리초면 되므로 데이터를 쓸 때마다 검사할 수 있다.
+- 저장소 캔들 옆({timeframe}.gaps.npz)에 저장하고, 캔들이 끝에만 추가됐으면 새 구간만
+  훑어 이어 붙인다.
+- missing_ranges()로 누락 구간만 다시 받고, 거래소에도 없는 구간(점검 시간 등)은
+  confirmed로 표시해 다시 요청하지 않는다.
+- 백테스트 누락 구간 처리 정책 (GAP_POLICIES)
+  - ffill: 빠진 봉을 직전 종가의 평평한 봉(거래량 0)으로 채움
+  - mask: 지표 계산 구간(warmup)이 누락 구간에 걸친 봉의 신호를 끔
+  - split: 누락 구간에서 데이터를 나눠 지표를 처음부터 다시 계산 (잔고/포지션은 유지)
+"""
+
+import logging
+import os
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from candle_store import CANDLE_DTYPE, CandleStore
+from resample import index_to_ms, timeframe_to_ms
+
+logger = logging.getLogger(__name__)
+
+GAP_POLICIES = ("ffill", "mask", "split")
+DEFAULT_GAP_POLICY = "mask"
+GAP_INDEX_SUFFIX = ".gaps.npz"
+
+# start: 첫 누락 시각, end: 다음 실제 봉 시각 (제외), position: 다음 실제 봉 위치
+GAP_DTYPE = np.dtype(
+    [("start", "<i8"), ("end", "<i8"), ("position", "<i8"), ("confirmed", "?")]
+)
+
+
+class GapIndex:
+    """정렬된 캔들 타임스탬프의 누락 구간 색인"""
+
+    def __init__(
+        self,
+        timeframe_ms: int,
+        gaps: np.ndarray,
+        count: int = 0,
+        first: Optional[int] = None,
+        last: Optional[int] = None,
+        irregular: int = 0,
+        misaligned: int = 0,
+    ):
+        self.timeframe_ms = timeframe_ms
+        self.gaps = gaps
+        self.count = count
+        self.first = first
+        self.last = last
+        # 간격이 타임프레임보다 짧은 곳 (중복/역순)과 타임프레임에 맞지 않는 시각 수
+        self.irregular = irregular
+        self.misaligned = misaligned
+
+    @classmethod
+    def build(
+        cls, timestamps: np.ndarray, timeframe_ms: int, offset: int = 0
+    ) -> "GapIndex":
+        """타임스탬프 배열 한 번 훑어 색인 생성 (offset: 배열 첫 봉의 위치)"""
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        steps = np.diff(timestamps)
+        breaks = np.flatnonzero(steps > timeframe_ms)
+        gaps = np.zeros(len(breaks), dtype=GAP_DTYPE)
+        gaps["start"] = timestamps[breaks] + timeframe_ms
+        gaps["end"] = timestamps[breaks + 1]
+        gaps["position"] = breaks + 1 + offset
+        return cls(
+            timeframe_ms,
+            gaps,
+            count=len(timestamps) + offset,
+            first=int(timestamps[0]) if len(timestamps) else None,
+            last=int(timestamps[-1]) if len(timestamps) else None,
+            irregular=int(np.count_nonzero(steps < timeframe_ms)),
+            misaligned=int(np.count_nonzero(timestamps % timeframe_ms)),
+        )
+
+    def extend(self, timestamps: np.ndarray) -> "GapIndex":
+        """현재 타임스탬프 배열에 맞게 갱신
+
+        기존 봉이 그대로이고 끝에만 추가됐으면 추가분만 훑고, 중간이 바뀌었으면 다시
+        만든다. 어느 쪽이든 이미 확인된(confirmed) 구간 표시는 유지한다.
+        """
+        timestamps = np.asarray(timestamps)
+        if len(timestamps) == self.count and (
+            self.count == 0 or int(timestamps[-1]) == self.last
+        ):
+            return self
+        if (
+            self.count
+            and len(timestamps) > self.count
+            and int(timestamps[0]) == self.first
+            and int(timestamps[self.count - 1]) == self.last
+        ):
+            tail = GapIndex.build(
+                timestamps[self.count - 1 :], self.timeframe_ms, self.count - 1
+            )
+            tail.first = self.first
+            tail.gaps = np.concatenate([self.gaps, tail.gaps])
+            tail.irregular += self.irregular
+            tail.misaligned += self.misaligned - int(self.last % self.timeframe_ms != 0)
+            return tail
+        rebuilt = GapIndex.build(timestamps, self.timeframe_ms)
+        rebuilt.confirm([(int(g["start"]), int(g["end"])) for g in self.confirmed])
+        return rebuilt
+
+    @property
+    def missing(self) -> int:
+        """빠진 봉 수"""
+        return int(((self.gaps["end"] - self.gaps["start"]) // self.timeframe_ms).sum())
+
+    @property
+    def confirmed(self) -> np.ndarray:
+        return self.gaps[self.gaps["confirmed"]]
+
+    def missing_ranges(
+        self,
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None,
+        include_confirmed: bool = False,
+    ) -> List[Tuple[int, int]]:
+        """[start_ms, end_ms)와 겹치는 누락 구간 [start, end) 목록 (구간 경계로 자름)"""
+        gaps = self.gaps if include_confirmed else self.gaps[~self.gaps["confirmed"]]
+        lo = np.iinfo(np.int64).min if start_ms is None else start_ms
+        hi = np.iinfo(np.int64).max if end_ms is None else end_ms
+        gaps = gaps[(gaps["end"] > lo) & (gaps["start"] < hi)]
+        return [
+            (max(int(start), lo), min(int(end), hi))
+            for start, end in zip(gaps["start"], gaps["end"])
+        ]
+
+    def confirm(self, ranges: Iterable[Tuple[int, int]]) -> int:
+        """다시 받아도 채워지지 않은 구간을 확인됨으로 표시, 표시한 수 반환"""
+        marked = np.zeros(len(self.gaps), dtype=bool)
+        for start, end in ranges:
+            marked |= (self.gaps["start"] < end) & (self.gaps["end"] > start)
+        newly = int(np.count_nonzero(marked & ~self.gaps["confirmed"]))
+        self.gaps["confirmed"] |= marked
+        return newly
+
+    def summary(self) -> str:
+        text = f"누락 구간 {len(self.gaps)}개 ({self.missing}봉"
+        if len(self.confirmed):
+            text += f", 거래소에도 없음 {len(self.confirmed)}개"
+        return text + ")"
+
+    def save(self, path: str) -> None:
+        """npz로 원자적 저장"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        meta = np.array(
+            [
+                self.timeframe_ms,
+                self.count,
+                -1 if self.first is None else self.first,
+                -1 if self.last is None else self.last,
+                self.irregular,
+                self.misaligned,
+            ],
+            dtype=np.int64,
+        )
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, gaps=self.gaps, meta=meta)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["GapIndex"]:
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as data:
+                gaps, meta = data["gaps"], data["meta"]
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"누락 구간 색인을 읽을 수 없어 다시 만듭니다 ({path}): {e}")
+            return None
+        timeframe_ms, count, first, last, irregular, misaligned = (int(v) for v in meta)
+        return cls(
+            timeframe_ms,
+            gaps.astype(GAP_DTYPE),
+            count,
+            None if first < 0 else first,
+            None if last < 0 else last,
+            irregular,
+            misaligned,
+        )
+
+
+def load_gap_index(store: CandleStore, symbol: str, timeframe: str) -> GapIndex:
+    """저장소 캔들의 누락 구간 색인 (저장된 색인을 갱신해 다시 저장)"""
+    path = store.path(symbol, timeframe, GAP_INDEX_SUFFIX)
+    timeframe_ms = timeframe_to_ms(timeframe)
+    timestamps = store.open(symbol, timeframe)["timestamp"]
+    cached = GapIndex.load(path)
+    if cached is None or cached.timeframe_ms != timeframe_ms:
+        index = GapIndex.build(timestamps, timeframe_ms)
+    else:
+        index = cached.extend(timestamps)
+    if index is not cached:
+        index.save(path)
+    return index
+
+
+def ready_mask(timestamps: np.ndarray, timeframe_ms: int, warmup: int) -> np.ndarray:
+    """봉마다 직전 warmup개 봉(자신 포함)이 끊김 없이 이어지는지 여부"""
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    breaks = np.zeros(len(timestamps), dtype=np.int64)
+    breaks[1:] = np.diff(timestamps) != timeframe_ms
+    breaks = np.cumsum(breaks)
+    lo = np.maximum(np.arange(len(timestamps)) - warmup + 1, 0)
+    return breaks == breaks[lo]
+
+
+def segment_starts(timestamps: np.ndarray, timeframe_ms: int) -> np.ndarray:
+    """끊김 없이 이어지는 구간들의 시작 위치 (첫 구간 0 포함)"""
+    steps = np.diff(np.asarray(timestamps, dtype=np.int64))
+    return np.concatenate(([0], np.flatnonzero(steps != timeframe_ms) + 1))
+
+
+def fill_gaps(df: pd.DataFrame, timeframe_ms: int) -> pd.DataFrame:
+    """빠진 봉을 직전 종가의 평평한 봉(거래량 0)으로 채운 DataFrame"""
+    if len(df) < 2 or not (np.diff(index_to_ms(df.index)) > timeframe_ms).any():
+        return df
+    grid = pd.date_range(
+        df.index[0], df.index[-1], freq=pd.Timedelta(timeframe_ms, "ms")
+    )
+    filled = df.reindex(grid.union(df.index))
+    filled.index.name = df.index.name
+    filled["close"] = filled["close"].ffill()
+    for column in ("open", "high", "low"):
+        filled[column] = filled[column].fillna(filled["close"])
+    filled["volume"] = filled["volume"].fillna(0.0)
+    return filled
+
+
+def fill_records(
+    records: np.ndarray, timeframe_ms: int, previous: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """CANDLE_DTYPE 청크의 빠진 봉 채우기 (previous: 직전 청크 마지막 봉)"""
+    if previous is not None:
+        records = np.concatenate([np.asarray([previous], dtype=CANDLE_DTYPE), records])
+    timestamps = records["timestamp"]
+    if not (np.diff(timestamps) > timeframe_ms).any():
+        return records[1:] if previous is not None else records
+
+    slots = (timestamps - timestamps[0]) // timeframe_ms
+    present = np.zeros(int(slots[-1]) + 1, dtype=bool)
+    present[slots] = True
+    source = np.zeros(len(present), dtype=np.int64)
+    source[slots] = np.arange(len(records))
+    source = np.maximum.accumulate(np.where(present, source, 0))
+
+    filled = np.empty(len(present), dtype=CANDLE_DTYPE)
+    filled["timestamp"] = timestamps[0] + np.arange(len(present)) * timeframe_ms
+    filled["timestamp"][slots] = timestamps
+    closes = records["close"][source]
+    for field in ("open", "high", "low", "close"):
+        filled[field] = np.where(present, records[field][source], closes)
+    filled["volume"] = np.where(present, records["volume"][source], 0.0)
+    return filled[1:] if previous is not None else filled
+
+
+def apply_chunk_policy(
+    chunks: Iterable[np.ndarray], timeframe_ms: int, policy: str
+) -> Iterator[Tuple[np.ndarray, bool]]:
+    """청크 스트림에 누락 구간 정책 적용 -> (청크, 지표를 다시 시작할지 여부)
+
+    mask는 청크를 그대로 넘기고 신호 계산 쪽에서 ready_mask로 처리한다.
+    """
+    previous = None
+    for chunk in chunks:
+        if len(chunk) == 0:
+            continue
+        if policy == "ffill":
+            yield fill_records(chunk, timeframe_ms, previous), False
+        elif policy == "split":
+            timestamps = np.asarray(chunk["timestamp"])
+            starts = segment_starts(timestamps, timeframe_ms)
+            ends = np.append(starts[1:], len(chunk))
+            for start, end in zip(starts, ends):
+                restart = start > 0 or (
+                    previous is not None
+                    and timestamps[0] - previous["timestamp"] != timeframe_ms
+                )
+                yield chunk[start:end], bool(restart)
+        else:
+            yield chunk, False
+        previous = np.array(chunk[-1])
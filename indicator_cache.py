@@ -0,0 +1,205 @@
+"""
+지표 계산 캐시
+
+(캔들 데이터 fingerprint, 지표 종류, 파라미터)를 키로 계산 결과를 재사용한다.
+메모리 계층은 바이트 예산을 가진 LRU이고, 디스크 디렉토리를 지정하면
+.npy 파일로 저장한 뒤 memory-map으로 다시 읽는 두 번째 계층을 사용한다.
+memory-map 배열은 메모리 예산 대신 열린 개수 제한을 받고, 디스크 계층은 별도
+바이트 예산을 넘으면 가장 오래 쓰지 않은 파일부터 지운다.
+"""
+
+import hashlib
+import logging
+import os
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_BYTES = 256 * 1024 * 1024
+DEFAULT_DISK_BYTES = 1024 * 1024 * 1024
+DEFAULT_MAX_MAPPED = 64
+
+CacheKey = Tuple[str, str, Tuple[Any, ...]]
+
+
+def fingerprint(values: np.ndarray) -> str:
+    """배열 내용 기반 fingerprint (dtype/shape 포함)"""
+    values = np.ascontiguousarray(values)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{values.dtype.str}{values.shape}".encode())
+    digest.update(memoryview(values).cast("B"))
+    return digest.hexdigest()
+
+
+class IndicatorCache:
+    """지표 계산 결과 캐시 (메모리 LRU + 선택적 디스크 mmap 계층)"""
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_CACHE_BYTES,
+        disk_dir: Optional[str] = None,
+        disk_max_bytes: int = DEFAULT_DISK_BYTES,
+        max_mapped: int = DEFAULT_MAX_MAPPED,
+    ):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        self.max_mapped = max_mapped
+        self._entries: "OrderedDict[CacheKey, np.ndarray]" = OrderedDict()
+        self._bytes = 0
+        self._mapped = 0
+        self._disk_bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            self._disk_bytes = sum(size for _, size, _ in self._disk_files())
+
+    @classmethod
+    def from_config(cls, backtest_config: Dict[str, Any]) -> "IndicatorCache":
+        """backtest 설정 섹션으로 생성"""
+        max_mb = backtest_config.get("indicator_cache_mb", DEFAULT_CACHE_BYTES >> 20)
+        disk_mb = backtest_config.get(
+            "indicator_cache_disk_mb", DEFAULT_DISK_BYTES >> 20
+        )
+        return cls(
+            max_bytes=int(max_mb * 1024 * 1024),
+            disk_dir=backtest_config.get("indicator_cache_dir"),
+            disk_max_bytes=int(disk_mb * 1024 * 1024),
+        )
+
+    def get_or_compute(
+        self,
+        data_fingerprint: str,
+        kind: str,
+        params: Tuple[Any, ...],
+        compute: Callable[[], np.ndarray],
+    ) -> np.ndarray:
+        """캐시된 지표를 반환하거나 계산 후 저장 (반환 배열은 읽기 전용)"""
+        key = (data_fingerprint, kind, tuple(params))
+
+        values = self._entries.get(key)
+        if values is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return values
+
+        values = self._load_from_disk(key)
+        if values is not None:
+            self.disk_hits += 1
+        else:
+            self.misses += 1
+            values = np.asarray(compute())
+            values.flags.writeable = False
+            self._save_to_disk(key, values)
+
+        self._remember(key, values)
+        return values
+
+    def clear(self) -> None:
+        """메모리 계층 비우기 (디스크 계층은 유지)"""
+        self._entries.clear()
+        self._bytes = 0
+        self._mapped = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "mapped": self._mapped,
+            "disk_bytes": self._disk_bytes,
+        }
+
+    def _remember(self, key: CacheKey, values: np.ndarray) -> None:
+        # mmap 배열은 페이지 캐시에 있으므로 메모리 예산 대신 열린 개수 제한을 받음
+        mapped = isinstance(values, np.memmap)
+        size = 0 if mapped else values.nbytes
+        if size > self.max_bytes or (mapped and self.max_mapped <= 0):
+            return
+
+        self._entries[key] = values
+        self._bytes += size
+        self._mapped += mapped
+        while self._bytes > self.max_bytes:
+            self._evict(next(iter(self._entries)))
+        if self._mapped > self.max_mapped:
+            self._evict(
+                next(k for k, v in self._entries.items() if isinstance(v, np.memmap))
+            )
+
+    def _evict(self, key: CacheKey) -> None:
+        evicted = self._entries.pop(key)
+        if isinstance(evicted, np.memmap):
+            self._mapped -= 1
+        else:
+            self._bytes -= evicted.nbytes
+
+    def _disk_path(self, key: CacheKey) -> str:
+        data_fingerprint, kind, params = key
+        suffix = "_".join(str(p) for p in params)
+        return os.path.join(self.disk_dir, f"{data_fingerprint}_{kind}_{suffix}.npy")
+
+    def _load_from_disk(self, key: CacheKey) -> Optional[np.ndarray]:
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            values = np.load(path, mmap_mode="r")
+            # 디스크 예산 초과 시 가장 오래 쓰지 않은 파일부터 지우도록 사용 시각 갱신
+            os.utime(path)
+            return values
+        except (OSError, ValueError) as e:
+            logger.warning(f"지표 캐시 파일을 읽을 수 없습니다 ({path}): {e}")
+            return None
+
+    def _save_to_disk(self, key: CacheKey, values: np.ndarray) -> None:
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                np.save(f, values)
+            self._disk_bytes += os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"지표 캐시 파일 저장 실패 ({path}): {e}")
+            return
+        if self._disk_bytes > self.disk_max_bytes:
+            self._trim_disk()
+
+    def _disk_files(self) -> List[Tuple[str, int, float]]:
+        """디스크 계층 파일 (경로, 크기, 마지막 사용 시각)"""
+        files = []
+        for entry in os.scandir(self.disk_dir):
+            if entry.is_file() and entry.name.endswith(".npy"):
+                stat = entry.stat()
+                files.append((entry.path, stat.st_size, stat.st_mtime))
+        return files
+
+    def _trim_disk(self) -> None:
+        """가장 오래 쓰지 않은 파일부터 지워 디스크 예산 안으로 맞춤
+
+        열려 있는 memory-map은 파일을 지워도 계속 읽을 수 있다.
+        """
+        files = sorted(self._disk_files(), key=lambda f: f[2])
+        total = sum(size for _, size, _ in files)
+        for path, size, _ in files:
+            if total <= self.disk_max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError as e:
+                logger.warning(f"지표 캐시 파일 삭제 실패 ({path}): {e}")
+        self._disk_bytes = total
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+바이낸스 공개 캔들 아카이브 일괄 가져오기
+
+data.binance.vision에서 받은 월별/일별 kline zip(CSV)을 API 호출 없이 로컬 캔들 저장소에
+기록한다. 파일마다 프로세스 풀에서 압축 해제와 pandas C 파서로 한 번에 읽고, 합친 뒤
+연속성(타임프레임 정렬, 누락 구간, 중복 충돌)을 검사해 저장한다.
+
+아카이브 형식: {SYMBOL}-{interval}-{YYYY-MM[-DD]}.zip (같은 이름의 CSV 하나)
+- 일부 파일은 헤더 행이 있고, 2025년부터 현물 데이터는 타임스탬프가 마이크로초다.
+- 옆에 {파일}.CHECKSUM(sha256)이 있으면 읽기 전에 검증한다.
+- 월별/일별이 겹치면 한 번만 저장하고, 같은 시각 값이 다르면 충돌로 보고한다.
+
+사용법:
+python kline_importer.py downloads/ --symbol BTC/USDT --timeframe 1m
+python kline_importer.py downloads/ --strict   # 누락 구간이 있으면 저장하지 않음
+"""
+
+import argparse
+import hashlib
+import logging
+import os
+import re
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from candle_store import CANDLE_DTYPE, DEFAULT_STORE_DIR, CandleStore, sort_unique
+from gap_index import GapIndex, load_gap_index
+from resample import timeframe_to_ms
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_PATTERN = re.compile(
+    r"^(?P<symbol>[A-Z0-9]+)-(?P<interval>\w+)-(?P<period>\d{4}-\d{2}(?:-\d{2})?)\.zip$"
+)
+# 이보다 큰 타임스탬프는 마이크로초 (밀리초로는 5138년)
+MICROSECOND_THRESHOLD = 10**14
+
+
+class ArchiveError(ValueError):
+    """아카이브 손상/형식 오류 또는 연속성 검사 실패"""
+
+
+def find_archives(directory: str, symbol: str, timeframe: str) -> List[str]:
+    """directory 아래(하위 폴더 포함) 심볼/타임프레임 아카이브 경로 (기간순)"""
+    market = symbol.replace("/", "").upper()
+    found = []
+    for dirpath, _, filenames in os.walk(directory):
+        for filename in filenames:
+            match = ARCHIVE_PATTERN.match(filename)
+            if match and (match["symbol"], match["interval"]) == (market, timeframe):
+                found.append((match["period"], os.path.join(dirpath, filename)))
+    return [path for _, path in sorted(found)]
+
+
+def verify_checksum(path: str) -> None:
+    """{path}.CHECKSUM이 있으면 sha256 비교"""
+    checksum_path = f"{path}.CHECKSUM"
+    if not os.path.exists(checksum_path):
+        return
+    with open(checksum_path, "r", encoding="utf-8") as f:
+        expected = f.read().split()[0].lower()
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    if digest.hexdigest() != expected:
+        raise ArchiveError(f"체크섬 불일치: {os.path.basename(path)}")
+
+
+def parse_archive(path: str) -> np.ndarray:
+    """zip 아카이브 하나를 CANDLE_DTYPE 배열로 변환 (밀리초 타임스탬프)"""
+    verify_checksum(path)
+    name = os.path.basename(path)
+    try:
+        with zipfile.ZipFile(path) as archive:
+            members = [n for n in archive.namelist() if n.endswith(".csv")]
+            if len(members) != 1:
+                raise ArchiveError(f"CSV가 하나가 아닙니다: {name}")
+            with archive.open(members[0]) as f:
+                has_header = not f.read(1).isdigit()
+            with archive.open(members[0]) as f:
+                frame = pd.read_csv(
+                    f,
+                    header=None,
+                    skiprows=1 if has_header else 0,
+                    usecols=range(6),
+                    dtype={0: np.int64, **{i: np.float64 for i in range(1, 6)}},
+                    engine="c",
+                )
+    except ArchiveError:
+        raise
+    except (zipfile.BadZipFile, ValueError, TypeError) as e:
+        raise ArchiveError(f"아카이브를 읽을 수 없습니다: {name}: {e}") from e
+
+    records = np.empty(len(frame), dtype=CANDLE_DTYPE)
+    timestamps = frame[0].to_numpy()
+    records["timestamp"] = np.where(
+        timestamps >= MICROSECOND_THRESHOLD, timestamps // 1000, timestamps
+    )
+    for column, field in enumerate(CANDLE_DTYPE.names[1:], start=1):
+        records[field] = frame[column].to_numpy()
+    return records
+
+
+def check_continuity(records: np.ndarray, timeframe_ms: int) -> Dict[str, Any]:
+    """정렬된 고유 캔들의 연속성 검사 (정렬 오류 시각 수, 누락 구간 목록)"""
+    index = GapIndex.build(records["timestamp"], timeframe_ms)
+    gaps = [
+        {
+            "after": start - timeframe_ms,
+            "before": end,
+            "missing": (end - start) // timeframe_ms,
+        }
+        for start, end in index.missing_ranges()
+    ]
+    return {"misaligned": index.misaligned, "gaps": gaps, "missing": index.missing}
+
+
+def _count_conflicts(records: np.ndarray) -> int:
+    """같은 시각인데 OHLCV 값이 다른 캔들 수 (월별/일별 아카이브 중복 등)"""
+    order = np.argsort(records["timestamp"], kind="stable")
+    ordered = records[order]
+    same = ordered["timestamp"][1:] == ordered["timestamp"][:-1]
+    differs = np.zeros(len(same), dtype=bool)
+    for field in CANDLE_DTYPE.names[1:]:
+        differs |= ordered[field][1:] != ordered[field][:-1]
+    return int(np.count_nonzero(same & differs))
+
+
+def import_archives(
+    directory: str,
+    symbol: str,
+    timeframe: str,
+    store: CandleStore,
+    workers: Optional[int] = None,
+    strict: bool = False,
+) -> Dict[str, Any]:
+    """아카이브를 병렬로 읽어 연속성 검사 후 저장소에 기록, 요약 반환
+
+    strict면 누락 구간이나 중복 충돌이 있을 때 저장하지 않고 ArchiveError를 낸다
+    (타임프레임에 맞지 않는 시각은 항상 오류).
+    """
+    started = time.perf_counter()
+    paths = find_archives(directory, symbol, timeframe)
+    if not paths:
+        raise ArchiveError(f"{directory}에 {symbol} {timeframe} 아카이브가 없습니다")
+
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    if workers == 1:
+        parts = [parse_archive(path) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(parse_archive, paths))
+
+    records = np.concatenate(parts)
+    conflicts = _count_conflicts(records)
+    records = sort_unique(records)
+    report = check_continuity(records, timeframe_to_ms(timeframe))
+    report.update(
+        {
+            "files": len(paths),
+            "candles": len(records),
+            "conflicts": conflicts,
+            "first": int(records["timestamp"][0]),
+            "last": int(records["timestamp"][-1]),
+        }
+    )
+
+    if report["misaligned"]:
+        raise ArchiveError(f"{timeframe}에 맞지 않는 시각 {report['misaligned']}개 (타임프레임 확인)")
+    if strict and (report["gaps"] or conflicts):
+        raise ArchiveError(
+            f"연속성 검사 실패: 누락 구간 {len(report['gaps'])}개"
+            f"({report['missing']}개 캔들), 중복 충돌 {conflicts}개"
+        )
+
+    report["written"] = store.append(symbol, timeframe, records)
+    # 저장소 전체 기준 누락 구간 색인을 캔들 옆에 갱신
+    report["store_gaps"] = len(load_gap_index(store, symbol, timeframe).gaps)
+    report["seconds"] = time.perf_counter() - started
+    logger.info(
+        f"캔들 아카이브 {len(paths)}개 가져옴: {report['written']}개 저장, "
+        f"누락 구간 {len(report['gaps'])}개 ({report['seconds']:.2f}초)"
+    )
+    return report
+
+
+def print_report(report: Dict[str, Any], max_gaps: int = 20) -> None:
+    def fmt(ms: int) -> str:
+        return str(pd.Timestamp(ms, unit="ms"))
+
+    print(f"\n📦 아카이브 {report['files']}개, 캔들 {report['candles']:,}개")
+    print(f"   기간: {fmt(report['first'])} ~ {fmt(report['last'])}")
+    print(f"   새로 저장: {report['written']:,}개 ({report['seconds']:.2f}초)")
+    if report["conflicts"]:
+        print(f"⚠️  같은 시각에 값이 다른 캔들 {report['conflicts']}개 (먼저 읽은 값 사용)")
+    if report["gaps"]:
+        print(f"⚠️  누락 구간 {len(report['gaps'])}개 ({report['missing']:,}개 캔들)")
+        for gap in report["gaps"][:max_gaps]:
+            print(f"   - {fmt(gap['after'])} ~ {fmt(gap['before'])}: {gap['missing']}개")
+        if len(report["gaps"]) > max_gaps:
+            print(f"   ... 외 {len(report['gaps']) - max_gaps}개")
+    else:
+        print("✅ 누락 구간 없음")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import Binance kline zip archives")
+    parser.add_argument("directory", help="Directory containing kline .zip archives")
+    parser.add_argument("--symbol", help="Symbol (default: trading config)")
+    parser.add_argument("--timeframe", help="Interval (default: trading config)")
+    parser.add_argument("--store", default=DEFAULT_STORE_DIR, metavar="DIR")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Worker processes (default: CPUs)"
+    )
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="Refuse to write when there are gaps or conflicting duplicates",
+    )
+    args = parser.parse_args()
+
+    if not (args.symbol and args.timeframe):
+        from config_loader import config_loader
+
+        config = config_loader.get_trading_snapshot()
+        args.symbol = args.symbol or config.symbol
+        args.timeframe = args.timeframe or config.timeframe
+
+    try:
+        report = import_archives(
+            args.directory,
+            args.symbol,
+            args.timeframe,
+            CandleStore(args.store),
+            args.workers,
+            args.strict,
+        )
+    except ArchiveError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print_report(report)
+
+
+if __name__ == "__main__":
+    main()
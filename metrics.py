@@ -0,0 +1,204 @@
+"""
+백테스트 성과 지표
+
+자산 곡선(봉별 총 자산/포지션 가치)과 거래 배열(손익, 보유 기간)만으로
+벡터화 계산한다. 봉 단위 수익률은 (개수, 합, 제곱합, 하방 제곱합) 누적값으로
+요약하므로 청크 스트리밍 백테스트도 같은 지표를 계산할 수 있다.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+YEAR_MS = 365 * 24 * 60 * 60 * 1000
+DAY_MS = 24 * 60 * 60 * 1000
+DEFAULT_ROLLING_DAYS = 30
+
+
+def equity_arrays(results: dict) -> Dict[str, np.ndarray]:
+    """백테스트 결과에서 (timestamp ms, 총 자산, 포지션 가치) 배열 추출"""
+    if "equity" in results:
+        return results["equity"]
+    history = results["balance_history"]
+    return {
+        "timestamp": np.fromiter(
+            (h["timestamp"].value // 1_000_000 for h in history),
+            dtype=np.int64,
+            count=len(history),
+        ),
+        "total_value": np.fromiter(
+            (h["total_value"] for h in history), dtype=np.float64, count=len(history)
+        ),
+        "position_value": np.fromiter(
+            (h["position_value"] for h in history),
+            dtype=np.float64,
+            count=len(history),
+        ),
+    }
+
+
+def trade_arrays(trades: List[dict]) -> Dict[str, np.ndarray]:
+    """매도 거래의 (손익, 보유 일수) 배열"""
+    sells = [t for t in trades if t["type"] == "SELL"]
+    return {
+        "profit": np.array([t["profit"] for t in sells], dtype=np.float64),
+        "hold_days": np.array([t["hold_days"] for t in sells], dtype=np.float64),
+    }
+
+
+def return_moments(
+    total_values: np.ndarray, previous_value: Optional[float] = None
+) -> np.ndarray:
+    """봉 수익률 누적값 [개수, 합, 제곱합, 하방 제곱합]
+
+    previous_value는 이전 청크의 마지막 자산 (청크 경계 수익률 포함용).
+    """
+    values = np.asarray(total_values, dtype=np.float64)
+    if previous_value is not None:
+        values = np.concatenate(([previous_value], values))
+    if len(values) < 2:
+        return np.zeros(4)
+    returns = np.diff(values) / values[:-1]
+    downside = np.minimum(returns, 0.0)
+    return np.array(
+        [len(returns), returns.sum(), returns @ returns, downside @ downside]
+    )
+
+
+def max_drawdown(total_values: np.ndarray) -> float:
+    peaks = np.maximum.accumulate(total_values)
+    return float(((total_values - peaks) / peaks).min())
+
+
+def equity_metrics(
+    moments: np.ndarray,
+    exposure_bars: int,
+    n_bars: int,
+    initial_value: float,
+    final_value: float,
+    mdd: float,
+    bar_ms: int,
+) -> Dict[str, float]:
+    """수익률 누적값으로 변동성/Sharpe/Sortino/CAGR/Calmar/노출 비율 계산"""
+    count, total, squares, downside_squares = moments
+    periods_per_year = YEAR_MS / bar_ms
+
+    mean = total / count if count else 0.0
+    variance = (squares - total * mean) / (count - 1) if count > 1 else 0.0
+    std = np.sqrt(max(variance, 0.0))
+    downside_dev = np.sqrt(downside_squares / count) if count else 0.0
+
+    years = n_bars * bar_ms / YEAR_MS
+    growth = final_value / initial_value
+    cagr = growth ** (1 / years) - 1 if years > 0 and growth > 0 else -1.0
+
+    return {
+        "volatility": float(std * np.sqrt(periods_per_year)),
+        "sharpe_ratio": (
+            float(mean / std * np.sqrt(periods_per_year)) if std > 0 else 0.0
+        ),
+        "sortino_ratio": (
+            float(mean / downside_dev * np.sqrt(periods_per_year))
+            if downside_dev > 0
+            else 0.0
+        ),
+        "cagr": float(cagr),
+        "calmar_ratio": float(cagr / abs(mdd)) if mdd < 0 else 0.0,
+        "exposure": exposure_bars / n_bars if n_bars else 0.0,
+    }
+
+
+def trade_metrics(profits: np.ndarray, hold_days: np.ndarray) -> Dict[str, Any]:
+    """매도 거래 손익/보유 기간 지표"""
+    total_trades = len(profits)
+    wins = profits > 0
+    winning_trades = int(wins.sum())
+    gross_profit = float(profits[wins].sum())
+    gross_loss = float(-profits[profits < 0].sum())
+    total_profit = float(profits.sum())
+
+    if gross_loss > 0:
+        profit_factor = gross_profit / gross_loss
+    else:
+        profit_factor = float("inf") if gross_profit > 0 else 0.0
+
+    return {
+        "total_trades": total_trades,
+        "winning_trades": winning_trades,
+        "win_rate": winning_trades / total_trades if total_trades > 0 else 0,
+        "total_profit": total_profit,
+        "avg_profit_per_trade": total_profit / total_trades if total_trades else 0,
+        "profit_factor": profit_factor,
+        "avg_win": gross_profit / winning_trades if winning_trades else 0.0,
+        "avg_loss": (
+            -gross_loss / (total_trades - winning_trades)
+            if total_trades > winning_trades
+            else 0.0
+        ),
+        "avg_hold_days": float(hold_days.mean()) if total_trades else 0.0,
+    }
+
+
+def rolling_metrics(
+    timestamps_ms: np.ndarray,
+    total_values: np.ndarray,
+    window_days: int = DEFAULT_ROLLING_DAYS,
+) -> Dict[str, np.ndarray]:
+    """봉마다 직전 window_days 구간의 수익률/변동성/Sharpe/Sortino (구간 미달은 NaN)
+
+    누적합 차분으로 계산하므로 창 크기와 무관하게 한 번의 패스로 끝난다.
+    """
+    n = len(total_values)
+    out = {
+        name: np.full(n, np.nan)
+        for name in ("return", "volatility", "sharpe", "sortino")
+    }
+    if n < 3:
+        return out
+
+    bar_ms = int(np.median(np.diff(timestamps_ms)))
+    window = int(window_days * DAY_MS // bar_ms)
+    if window < 2 or window >= n:
+        return out
+    periods_per_year = YEAR_MS / bar_ms
+
+    returns = np.diff(total_values) / total_values[:-1]
+    downside = np.minimum(returns, 0.0)
+    zero = np.zeros(1)
+    sums = np.concatenate((zero, np.cumsum(returns)))
+    squares = np.concatenate((zero, np.cumsum(returns * returns)))
+    downside_squares = np.concatenate((zero, np.cumsum(downside * downside)))
+
+    # 봉 i(>= window)의 창은 수익률 [i - window, i)
+    end = np.arange(window, n)
+    window_sum = sums[end] - sums[end - window]
+    mean = window_sum / window
+    variance = (squares[end] - squares[end - window] - window_sum * mean) / (window - 1)
+    std = np.sqrt(np.maximum(variance, 0.0))
+    downside_dev = np.sqrt(
+        (downside_squares[end] - downside_squares[end - window]) / window
+    )
+    scale = np.sqrt(periods_per_year)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out["return"][window:] = total_values[window:] / total_values[:-window] - 1
+        out["volatility"][window:] = std * scale
+        out["sharpe"][window:] = np.where(std > 0, mean / std * scale, 0.0)
+        out["sortino"][window:] = np.where(
+            downside_dev > 0, mean / downside_dev * scale, 0.0
+        )
+    return out
+
+
+def summarize_rolling(rolling: Dict[str, np.ndarray]) -> Dict[str, float]:
+    """롤링 지표의 최소/중앙값/최대 요약 (구간이 없으면 빈 dict)"""
+    summary = {}
+    for name, values in rolling.items():
+        valid = values[~np.isnan(values)]
+        if len(valid) == 0:
+            return {}
+        low, median, high = np.percentile(valid, [0, 50, 100])
+        summary[f"{name}_min"] = float(low)
+        summary[f"{name}_median"] = float(median)
+        summary[f"{name}_max"] = float(high)
+    return summary
@@ -0,0 +1,393 @@
+"""
+봇 런타임 메트릭/헬스 HTTP 엔드포인트
+
+상주 실행(BOT_LOOP_INTERVAL) 중인 봇 프로세스 안에서 METRICS_PORT를 설정하면 별도
+스레드의 asyncio 서버가 다음을 제공한다.
+- GET /metrics: Prometheus 텍스트 형식의 카운터/게이지/히스토그램 (주기 지연, 거래소
+  호출 지연/오류, 거래소 사용 가중치, 포지션, 미실현 손익, 마지막 성공 주기 시각)
+- GET /healthz: 마지막 성공 주기가 stall_seconds보다 오래되면 503
+
+메트릭 갱신과 렌더링은 짧은 락만 공유하므로 스크레이프가 매매 루프를 막지 않는다.
+"""
+
+import asyncio
+import bisect
+import json
+import logging
+import math
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CYCLE_BUCKETS = (0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+CALL_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# 바이낸스 응답 헤더의 1분 사용 가중치
+WEIGHT_HEADER = "x-mbx-used-weight-1m"
+REQUEST_TIMEOUT = 5.0
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = (
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        )
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str], lock):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self._lock = lock
+        self._values: Dict[Tuple[str, ...], Any] = {}
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} 레이블은 {self.label_names}이어야 합니다")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for key, value in sorted(self._values.items()):
+            lines.extend(self._samples(key, value))
+        return "\n".join(lines)
+
+    def _samples(self, key, value):
+        return [
+            f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+        ]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        if amount < 0:
+            raise ValueError("카운터는 감소할 수 없습니다")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def get(self, **labels) -> Optional[float]:
+        return self._values.get(self._key(labels))
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels, lock, buckets: Iterable[float]):
+        super().__init__(name, help_text, labels, lock)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        # 마지막 칸은 +Inf 버킷
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def _samples(self, key, value):
+        counts, total = value
+        bounds = [_format_value(b) for b in self.buckets] + ["+Inf"]
+        names = self.label_names + ("le",)
+        lines, cumulative = [], 0
+        for bound, count in zip(bounds, counts):
+            cumulative += count
+            labels = _format_labels(names, key + (bound,))
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        plain = _format_labels(self.label_names, key)
+        lines.append(f"{self.name}_sum{plain} {_format_value(total)}")
+        lines.append(f"{self.name}_count{plain} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """메트릭 모음 (모든 갱신/렌더링이 하나의 락을 짧게 공유)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"이미 등록된 메트릭: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labels: Iterable[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labels, self._lock))
+
+    def gauge(self, name: str, help_text: str, labels: Iterable[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help_text, labels, self._lock))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labels: Iterable[str] = (),
+        buckets: Iterable[float] = CYCLE_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, help_text, labels, self._lock, buckets))
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식 (0.0.4)"""
+        with self._lock:
+            return "\n".join(m.render() for m in self._metrics.values()) + "\n"
+
+
+class BotMetrics:
+    """거래 봇 메트릭 정의와 갱신 헬퍼"""
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None, clock=time.time):
+        self.registry = registry or MetricsRegistry()
+        self._clock = clock
+        self.started_at = clock()
+        r = self.registry
+        self.cycle_seconds = r.histogram(
+            "bot_cycle_duration_seconds", "매매 판단 주기 실행 시간", buckets=CYCLE_BUCKETS
+        )
+        self.cycles = r.counter("bot_cycles_total", "매매 판단 주기 실행 횟수", ["result"])
+        self.last_success = r.gauge(
+            "bot_last_success_timestamp_seconds", "마지막 성공 주기 완료 시각 (unix)"
+        )
+        self.call_seconds = r.histogram(
+            "bot_exchange_call_duration_seconds",
+            "거래소 API 호출 시간 (재시도는 시도마다)",
+            ["method"],
+            CALL_BUCKETS,
+        )
+        self.call_errors = r.counter(
+            "bot_exchange_errors_total", "거래소 API 호출 오류", ["method", "error"]
+        )
+        self.used_weight = r.gauge(
+            "bot_exchange_used_weight", "거래소가 보고한 1분 사용 가중치 (rate limit)"
+        )
+        self.position = r.gauge("bot_position_amount", "보유 포지션 수량 (기준 통화)")
+        self.entry_price = r.gauge("bot_position_entry_price", "포지션 매수가")
+        self.unrealized_pnl = r.gauge(
+            "bot_unrealized_pnl", "현재가 기준 미실현 손익 (호가 통화, 수수료 제외)"
+        )
+        self.balance = r.gauge("bot_balance", "가용 잔고", ["currency"])
+
+    def observe_call(
+        self,
+        method: str,
+        seconds: float,
+        error: Optional[BaseException] = None,
+        headers: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.call_seconds.observe(seconds, method=method)
+        if error is not None:
+            self.call_errors.inc(method=method, error=type(error).__name__)
+        for name, value in (headers or {}).items():
+            if name.lower() == WEIGHT_HEADER:
+                try:
+                    self.used_weight.set(float(value))
+                except (TypeError, ValueError):
+                    pass
+
+    def record_cycle(
+        self, seconds: float, result: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """주기 결과 기록 (result가 없으면 실패한 주기)"""
+        self.cycle_seconds.observe(seconds)
+        if result is None:
+            self.cycles.inc(result="failure")
+            return
+        self.cycles.inc(result="success")
+        self.last_success.set(self._clock())
+
+        for currency, amount in (result.get("current_balance") or {}).items():
+            self.balance.set(amount, currency=currency)
+        # 이번 주기에 주문이 체결됐으면 새 상태의 포지션
+        if result.get("state_changed"):
+            position = result["new_state"].get("position")
+        else:
+            position = result.get("current_position")
+        price = result.get("current_price")
+        if position:
+            amount, entry = position["buy_amount"], position["buy_price"]
+            self.position.set(amount)
+            self.entry_price.set(entry)
+            if price is not None:
+                self.unrealized_pnl.set((price - entry) * amount)
+        else:
+            self.position.set(0.0)
+            self.entry_price.set(0.0)
+            self.unrealized_pnl.set(0.0)
+
+    def health(self, stall_seconds: float) -> Tuple[bool, Dict[str, Any]]:
+        """마지막 성공 주기(없으면 프로세스 시작) 이후 stall_seconds 안인지"""
+        last = self.last_success.get()
+        reference = last if last is not None else self.started_at
+        age = self._clock() - reference
+        return age <= stall_seconds, {
+            "status": "ok" if age <= stall_seconds else "stalled",
+            "last_success": last,
+            "seconds_since_success": round(age, 3),
+            "stall_seconds": stall_seconds,
+        }
+
+
+class InstrumentedExchange:
+    """거래소 호출 시간/오류/사용 가중치를 기록하는 프록시"""
+
+    def __init__(self, exchange, metrics: Optional[BotMetrics] = None):
+        self._exchange = exchange
+        self._metrics = metrics or bot_metrics
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        attr = getattr(self._exchange, name)
+        if not callable(attr) or name == "milliseconds":
+            return attr
+
+        def instrumented(*args, **kwargs):
+            started = time.perf_counter()
+            error = None
+            try:
+                return attr(*args, **kwargs)
+            except Exception as e:
+                error = e
+                raise
+            finally:
+                self._metrics.observe_call(
+                    name,
+                    time.perf_counter() - started,
+                    error,
+                    getattr(self._exchange, "last_response_headers", None),
+                )
+
+        return instrumented
+
+
+class MetricsServer:
+    """/metrics, /healthz를 제공하는 asyncio HTTP 서버 (백그라운드 스레드)"""
+
+    def __init__(
+        self,
+        metrics: Optional[BotMetrics] = None,
+        port: int = 9100,
+        host: str = "0.0.0.0",
+        stall_seconds: float = 1800.0,
+    ):
+        self.metrics = metrics or bot_metrics
+        self.host = host
+        self.port = port
+        self.stall_seconds = stall_seconds
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._error: Optional[BaseException] = None
+
+    def start(self) -> int:
+        """서버 시작 후 실제 포트 반환 (port=0이면 임의 포트)"""
+        self._thread = threading.Thread(
+            target=self._run, name="metrics-server", daemon=True
+        )
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            raise self._error
+        logger.info(f"메트릭 서버 시작: http://{self.host}:{self.port}/metrics")
+        return self.port
+
+    def stop(self) -> None:
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+
+    def _run(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._server = self._loop.run_until_complete(
+                asyncio.start_server(self._handle, self.host, self.port)
+            )
+            self.port = self._server.sockets[0].getsockname()[1]
+        except OSError as e:
+            self._error = e
+            self._ready.set()
+            return
+        self._ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._server.close()
+            self._loop.run_until_complete(self._server.wait_closed())
+            self._loop.close()
+
+    async def _handle(self, reader, writer) -> None:
+        try:
+            request = await asyncio.wait_for(reader.readline(), REQUEST_TIMEOUT)
+            # 헤더는 읽고 버림
+            while True:
+                line = await asyncio.wait_for(reader.readline(), REQUEST_TIMEOUT)
+                if line in (b"\r\n", b"\n", b""):
+                    break
+            parts = request.decode("latin-1").split()
+            method, path = (parts + ["", ""])[:2]
+            status, content_type, body = self._route(method, path.split("?")[0])
+            payload = body.encode("utf-8")
+            writer.write(
+                (
+                    f"HTTP/1.1 {status}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    "Connection: close\r\n\r\n"
+                ).encode("latin-1")
+                + (payload if method != "HEAD" else b"")
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def _route(self, method: str, path: str) -> Tuple[str, str, str]:
+        if method not in ("GET", "HEAD"):
+            return "405 Method Not Allowed", "text/plain", "method not allowed\n"
+        if path == "/metrics":
+            return (
+                "200 OK",
+                "text/plain; version=0.0.4; charset=utf-8",
+                self.metrics.registry.render(),
+            )
+        if path == "/healthz":
+            healthy, payload = self.metrics.health(self.stall_seconds)
+            status = "200 OK" if healthy else "503 Service Unavailable"
+            return status, "application/json", json.dumps(payload) + "\n"
+        return "404 Not Found", "text/plain", "not found\n"
+
+
+# 전역 봇 메트릭 인스턴스
+bot_metrics = BotMetrics()
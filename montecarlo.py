@@ -0,0 +1,344 @@
+"""
+Monte Carlo / 부트스트랩 강건성 분석
+
+백테스트 한 번의 자산 곡선 대신 재표본화한 여러 경로의 성과 분포를 본다.
+- 거래 순서 부트스트랩: 실현 손익을 복원 추출해 거래 순서를 섞은 자산 곡선
+- 블록 부트스트랩 가격 경로: 로그 수익률을 블록 단위로 재배열한 합성 가격에
+  전략을 다시 적용 (변동성 군집 같은 단기 의존성은 블록 안에서 유지)
+
+가격 경로는 프로세스 풀에서 배치 단위로 생성/평가한다. 원본 로그 수익률은
+shared_memory 한 곳에 두고 워커가 복사 없이 붙어서 읽는다.
+"""
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from strategy import Strategy, net_profit_rate
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATHS = 10_000
+DEFAULT_BATCH_SIZE = 250
+DEFAULT_CONFIDENCE = 0.9
+METRICS = ("total_return", "max_drawdown", "win_rate")
+
+
+class SimulationParams(NamedTuple):
+    """경로 시뮬레이션에 필요한 엔진 설정"""
+
+    initial_balance: float
+    trade_amount: float
+    trading_fee: float
+    profit_threshold: float
+
+    @classmethod
+    def from_engine(cls, engine) -> "SimulationParams":
+        return cls(
+            engine.initial_balance,
+            engine.trade_amount,
+            engine.trading_fee,
+            engine.profit_threshold,
+        )
+
+
+def simulate_path(
+    closes: np.ndarray,
+    entry: np.ndarray,
+    exit_: np.ndarray,
+    params: SimulationParams,
+) -> Tuple[float, float, int, int]:
+    """신호 봉 사이를 건너뛰는 백테스트 -> (최종 자산, MDD, 거래 수, 수익 거래 수)
+
+    BacktestEngine._simulate_bars와 같은 매매 규칙/연산 순서를 따르므로 결과가
+    같지만, 봉마다 반복하지 않고 다음 매수/매도 후보 봉을 배열 탐색으로 찾는다.
+    """
+    n = len(closes)
+    entry_idx = np.flatnonzero(entry)
+    exit_idx = np.flatnonzero(exit_)
+    total_values = np.empty(n)
+
+    balance = params.initial_balance
+    trades = wins = 0
+    i = 0
+    while i < n:
+        # 다음 매수 봉
+        k = np.searchsorted(entry_idx, i)
+        if balance < params.trade_amount or k == len(entry_idx):
+            break
+        buy = int(entry_idx[k])
+        total_values[i:buy] = balance
+
+        buy_price = closes[buy]
+        amount = (params.trade_amount * (1 - params.trading_fee)) / buy_price
+        balance -= params.trade_amount
+
+        # 매도 신호이면서 목표 수익률을 넘는 첫 봉
+        candidates = exit_idx[np.searchsorted(exit_idx, buy + 1) :]
+        profitable = (
+            net_profit_rate(buy_price, closes[candidates], params.trading_fee)
+            >= params.profit_threshold
+        )
+        hits = np.flatnonzero(profitable)
+        sell = int(candidates[hits[0]]) if len(hits) else n
+
+        total_values[buy:sell] = balance + amount * closes[buy:sell]
+        if sell == n:
+            i = n
+            break
+
+        sell_value = amount * closes[sell] * (1 - params.trading_fee)
+        balance += sell_value
+        trades += 1
+        wins += sell_value - params.trade_amount > 0
+        total_values[sell] = balance
+        i = sell + 1
+
+    total_values[i:] = balance
+    peaks = np.maximum.accumulate(total_values)
+    max_drawdown = float(((total_values - peaks) / peaks).min())
+    return float(total_values[-1]), max_drawdown, trades, wins
+
+
+def trade_bootstrap(
+    profits: np.ndarray,
+    initial_balance: float,
+    n_paths: int = DEFAULT_PATHS,
+    seed: Optional[int] = None,
+    batch_size: int = 1000,
+) -> Dict[str, np.ndarray]:
+    """실현 손익 복원 추출 -> 경로별 수익률/실현 기준 MDD/승률"""
+    profits = np.asarray(profits, dtype=np.float64)
+    if len(profits) == 0:
+        zeros = np.zeros(n_paths)
+        return {"total_return": zeros, "max_drawdown": zeros, "win_rate": zeros}
+
+    rng = np.random.default_rng(seed)
+    results = {metric: np.empty(n_paths) for metric in METRICS}
+    for start in range(0, n_paths, batch_size):
+        stop = min(start + batch_size, n_paths)
+        sampled = profits[rng.integers(0, len(profits), (stop - start, len(profits)))]
+        equity = initial_balance + np.cumsum(sampled, axis=1)
+        equity = np.hstack([np.full((len(equity), 1), initial_balance), equity])
+        peaks = np.maximum.accumulate(equity, axis=1)
+
+        results["total_return"][start:stop] = equity[:, -1] / initial_balance - 1
+        results["max_drawdown"][start:stop] = ((equity - peaks) / peaks).min(axis=1)
+        results["win_rate"][start:stop] = (sampled > 0).mean(axis=1)
+    return results
+
+
+def block_bootstrap_closes(
+    log_returns: np.ndarray,
+    first_close: float,
+    n_paths: int,
+    block_size: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """로그 수익률 블록을 이어 붙인 (n_paths, len+1) 합성 종가 배열"""
+    length = len(log_returns)
+    block_size = max(1, min(block_size, length))
+    n_blocks = -(-length // block_size)
+    starts = rng.integers(0, length - block_size + 1, (n_paths, n_blocks))
+    index = (starts[:, :, None] + np.arange(block_size)).reshape(n_paths, -1)
+    sampled = log_returns[index[:, :length]]
+
+    paths = np.empty((n_paths, length + 1))
+    paths[:, 0] = 0.0
+    np.cumsum(sampled, axis=1, out=paths[:, 1:])
+    return first_close * np.exp(paths)
+
+
+# 워커 프로세스 전역 상태 (initializer에서 설정)
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(
+    shm_name: str,
+    length: int,
+    first_close: float,
+    strategy: Strategy,
+    params: SimulationParams,
+    block_size: int,
+) -> None:
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _worker.update(
+        shm=shm,
+        log_returns=np.ndarray((length,), dtype=np.float64, buffer=shm.buf),
+        first_close=first_close,
+        strategy=strategy,
+        params=params,
+        block_size=block_size,
+    )
+
+
+def _run_batch(task: Tuple[int, int]) -> np.ndarray:
+    """가격 경로 배치 평가 -> (n_paths, 4) [최종 자산, MDD, 거래 수, 수익 거래 수]"""
+    seed, n_paths = task
+    rng = np.random.default_rng(seed)
+    paths = block_bootstrap_closes(
+        _worker["log_returns"],
+        _worker["first_close"],
+        n_paths,
+        _worker["block_size"],
+        rng,
+    )
+    strategy, params = _worker["strategy"], _worker["params"]
+    results = np.empty((n_paths, 4))
+    for row, closes in enumerate(paths):
+        _, entry, exit_, _ = strategy.evaluate(closes)
+        results[row] = simulate_path(closes, entry, exit_, params)
+    return results
+
+
+def price_path_bootstrap(
+    closes: np.ndarray,
+    strategy: Strategy,
+    params: SimulationParams,
+    n_paths: int = DEFAULT_PATHS,
+    block_size: int = 288,
+    workers: Optional[int] = None,
+    seed: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Dict[str, np.ndarray]:
+    """블록 부트스트랩 가격 경로에 전략 적용 -> 경로별 수익률/MDD/승률"""
+    closes = np.asarray(closes, dtype=np.float64)
+    log_returns = np.diff(np.log(closes))
+    workers = workers or os.cpu_count() or 1
+
+    # 배치마다 독립 난수열 (워커 수와 무관하게 같은 결과)
+    seeds = np.random.SeedSequence(seed).generate_state(-(-n_paths // batch_size))
+    tasks = [
+        (int(batch_seed), min(batch_size, n_paths - i * batch_size))
+        for i, batch_seed in enumerate(seeds)
+    ]
+
+    shm = shared_memory.SharedMemory(create=True, size=max(log_returns.nbytes, 1))
+    try:
+        np.ndarray(log_returns.shape, dtype=np.float64, buffer=shm.buf)[:] = log_returns
+        init_args = (
+            shm.name,
+            len(log_returns),
+            closes[0],
+            strategy,
+            params,
+            block_size,
+        )
+        if workers == 1:
+            _init_worker(*init_args)
+            try:
+                batches = [_run_batch(task) for task in tasks]
+            finally:
+                worker_shm = _worker.pop("shm")
+                _worker.clear()  # 버퍼를 참조하는 배열을 먼저 놓아야 close 가능
+                worker_shm.close()
+        else:
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker, initargs=init_args
+            ) as pool:
+                batches = list(pool.map(_run_batch, tasks))
+    finally:
+        shm.close()
+        shm.unlink()
+
+    results = np.vstack(batches)
+    trades = results[:, 2]
+    return {
+        "total_return": results[:, 0] / params.initial_balance - 1,
+        "max_drawdown": results[:, 1],
+        "win_rate": np.divide(
+            results[:, 3], trades, out=np.zeros_like(trades), where=trades > 0
+        ),
+        "trades": trades,
+    }
+
+
+def confidence_intervals(
+    samples: Dict[str, np.ndarray], confidence: float = DEFAULT_CONFIDENCE
+) -> Dict[str, Dict[str, float]]:
+    """지표별 평균/중앙값/신뢰구간"""
+    tail = (1 - confidence) / 2 * 100
+    summary = {}
+    for metric in METRICS:
+        values = samples[metric]
+        lower, median, upper = np.percentile(values, [tail, 50, 100 - tail])
+        summary[metric] = {
+            "mean": float(values.mean()),
+            "median": float(median),
+            "lower": float(lower),
+            "upper": float(upper),
+        }
+    return summary
+
+
+def run_montecarlo(
+    engine,
+    df,
+    n_paths: int = DEFAULT_PATHS,
+    block_size: int = 288,
+    workers: Optional[int] = None,
+    seed: Optional[int] = None,
+    confidence: float = DEFAULT_CONFIDENCE,
+) -> Dict[str, Any]:
+    """지표가 계산된 DataFrame으로 두 가지 부트스트랩을 실행하고 요약 반환"""
+    params = SimulationParams.from_engine(engine)
+    results = engine.run_backtest(df)
+    baseline = engine.calculate_performance_metrics(results, df)
+    profits = [t["profit"] for t in results["trades"] if t["type"] == "SELL"]
+
+    logger.info(f"Trade bootstrap: {n_paths} paths over {len(profits)} trades")
+    trade_samples = trade_bootstrap(profits, params.initial_balance, n_paths, seed)
+
+    logger.info(f"Price path bootstrap: {n_paths} paths (block {block_size} bars)")
+    path_samples = price_path_bootstrap(
+        df["close"].to_numpy(),
+        engine.strategy,
+        params,
+        n_paths,
+        block_size,
+        workers,
+        seed,
+    )
+
+    return {
+        "paths": n_paths,
+        "confidence": confidence,
+        "baseline": baseline,
+        "trade_bootstrap": confidence_intervals(trade_samples, confidence),
+        "price_paths": confidence_intervals(path_samples, confidence),
+        "probability_of_loss": float((path_samples["total_return"] < 0).mean()),
+    }
+
+
+def print_montecarlo_results(report: Dict[str, Any]) -> None:
+    """Monte Carlo 결과 출력"""
+    confidence_pct = report["confidence"] * 100
+    baseline = report["baseline"]
+    print("\n" + "=" * 72)
+    print(f"Monte Carlo 분석 ({report['paths']} paths, {confidence_pct:.0f}% 신뢰구간)")
+    print("=" * 72)
+    print(
+        f"기준 백테스트: 수익률 {baseline['total_return_pct']:.2f}%, "
+        f"MDD {baseline['max_drawdown_pct']:.2f}%, 승률 {baseline['win_rate_pct']:.1f}%"
+    )
+
+    labels = {"total_return": "수익률", "max_drawdown": "MDD", "win_rate": "승률"}
+    sections: List[Tuple[str, str]] = [
+        ("trade_bootstrap", "거래 순서 부트스트랩"),
+        ("price_paths", "블록 부트스트랩 가격 경로"),
+    ]
+    for key, title in sections:
+        print(f"\n[{title}]")
+        print(f"{'Metric':<8} {'Mean':>9} {'Median':>9} {'Lower':>9} {'Upper':>9}")
+        for metric, label in labels.items():
+            stats = report[key][metric]
+            print(
+                f"{label:<8} {stats['mean']*100:>8.2f}% {stats['median']*100:>8.2f}% "
+                f"{stats['lower']*100:>8.2f}% {stats['upper']*100:>8.2f}%"
+            )
+
+    print(f"\n손실 확률 (가격 경로 기준): {report['probability_of_loss']*100:.1f}%")
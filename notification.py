@@ -1,7 +1,11 @@
+import atexit
 import logging
 import os
+import queue
+import threading
+import time
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import boto3
 from botocore.exceptions import ClientError
@@ -10,6 +14,280 @@ from config_loader import config_loader
 
 logger = logging.getLogger(__name__)
 
+# 백그라운드 발송 설정
+NOTIFICATION_QUEUE_SIZE = 100
+NOTIFICATION_BATCH_SIZE = 10  # SNS PublishBatch 요청당 최대 항목 수
+NOTIFICATION_MAX_RETRIES = 3
+NOTIFICATION_RETRY_BASE_DELAY = 0.5
+NOTIFICATION_FLUSH_TIMEOUT = 5.0
+# 워커 종료 요청 표시
+_STOP: Dict = {}
+
+
+class NotificationDispatcher:
+    """알림을 bounded 큐에 넣고 백그라운드 워커가 배치로 발송
+
+    publish_batch는 항목 리스트를 받아 재시도가 필요한 항목 리스트를 반환한다.
+    """
+
+    def __init__(
+        self,
+        publish_batch: Callable[[List[Dict]], List[Dict]],
+        queue_size: int = NOTIFICATION_QUEUE_SIZE,
+        batch_size: int = NOTIFICATION_BATCH_SIZE,
+        max_retries: int = NOTIFICATION_MAX_RETRIES,
+        retry_base_delay: float = NOTIFICATION_RETRY_BASE_DELAY,
+    ):
+        self.publish_batch = publish_batch
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self._queue: "queue.Queue[Dict]" = queue.Queue(maxsize=queue_size)
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.dropped = 0
+        # 워커를 다시 띄워도 종료 시 flush는 한 번만 등록
+        atexit.register(self.flush)
+
+    def submit(self, entry: Dict) -> bool:
+        """알림 항목을 큐에 넣음 (블로킹 없음, 큐가 가득 차면 버림)"""
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(entry)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            logger.warning(f"알림 큐가 가득 차 알림을 버립니다: {entry.get('Subject')}")
+            return False
+
+    def flush(self, timeout: float = NOTIFICATION_FLUSH_TIMEOUT) -> bool:
+        """큐가 비워질 때까지 최대 timeout초 대기, 모두 발송되면 True"""
+        deadline = time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning(
+                        f"알림 flush 시간 초과 - 미발송 {self._queue.unfinished_tasks}건"
+                    )
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self, timeout: float = NOTIFICATION_FLUSH_TIMEOUT) -> bool:
+        """대기 중인 알림을 발송하고 워커 종료, 모두 발송되면 True"""
+        flushed = self.flush(timeout)
+        with self._lock:
+            worker = self._worker
+            if worker is None:
+                return flushed
+            try:
+                self._queue.put_nowait(_STOP)
+            except queue.Full:
+                # flush 시간 초과로 큐가 아직 가득 참 -> 워커는 남겨 두고 다음 close에서 종료
+                logger.warning("알림 큐가 가득 차 발송 워커 종료 요청을 넣지 못했습니다")
+                return False
+            self._worker = None
+        worker.join(timeout)
+        if worker.is_alive():
+            logger.warning(f"알림 발송 워커가 {timeout}초 안에 종료되지 않았습니다")
+        return flushed
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None:
+            return
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="notification-dispatcher", daemon=True
+                )
+                self._worker.start()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stopping = any(item is _STOP for item in batch)
+            entries = [item for item in batch if item is not _STOP]
+            try:
+                if entries:
+                    self._publish_with_retry(entries)
+            except Exception as e:
+                logger.error(f"알림 발송 워커 예외: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _publish_with_retry(self, batch: List[Dict]) -> None:
+        pending = batch
+        for attempt in range(self.max_retries + 1):
+            pending = self.publish_batch(pending)
+            if not pending:
+                return
+            if attempt < self.max_retries:
+                time.sleep(self.retry_base_delay * (2**attempt))
+        logger.error(f"알림 {len(pending)}건 재시도 초과로 발송 실패")
+
+
+# 알림 유형별 기본 중복 제거 구간(초)과 발송 제한 (건수, 초)
+DEFAULT_DEDUP_WINDOWS = {"error": 1800, "balance": 3600}
+DEFAULT_RATE_LIMITS = {"error": (6, 3600), "balance": (2, 3600), "status": (1, 3600)}
+DEFAULT_DIGEST_INTERVAL = 86400
+
+
+class NotificationCoalescer:
+    """알림 중복 제거, 유형별 발송 제한, 주기적 요약(digest) 집계
+
+    clock은 epoch 초를 반환하는 함수로, 테스트에서는 가짜 시계를 주입한다.
+    snapshot()/restore()로 실행 간 상태를 거래 상태에 보관할 수 있다.
+    """
+
+    def __init__(
+        self,
+        dedup_windows: Optional[Dict[str, float]] = None,
+        rate_limits: Optional[Dict[str, Tuple[int, float]]] = None,
+        digest_interval: float = DEFAULT_DIGEST_INTERVAL,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.dedup_windows = (
+            DEFAULT_DEDUP_WINDOWS if dedup_windows is None else dedup_windows
+        )
+        self.rate_limits = DEFAULT_RATE_LIMITS if rate_limits is None else rate_limits
+        self.digest_interval = digest_interval
+        self.clock = clock
+        self._lock = threading.Lock()
+        self.dirty = False
+        self._dedup: Dict[str, Dict[str, float]] = {}
+        self._buckets: Dict[str, Dict[str, float]] = {}
+        self._digest = self._empty_digest()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "NotificationCoalescer":
+        """notifications 설정 섹션으로 생성"""
+        dedup_windows = dict(DEFAULT_DEDUP_WINDOWS)
+        dedup_windows.update(config.get("dedup_windows", {}))
+        rate_limits = dict(DEFAULT_RATE_LIMITS)
+        for kind, limit in config.get("rate_limits", {}).items():
+            rate_limits[kind] = tuple(limit)
+        return cls(
+            dedup_windows=dedup_windows,
+            rate_limits=rate_limits,
+            digest_interval=config.get("digest_interval", DEFAULT_DIGEST_INTERVAL),
+        )
+
+    def _empty_digest(self) -> Dict[str, Any]:
+        return {
+            "started_at": self.clock(),
+            "runs": 0,
+            "buys": 0,
+            "sells": 0,
+            "realized_pnl": 0.0,
+            "errors": {},
+            "suppressed": 0,
+        }
+
+    def admit(self, kind: str, key: Optional[str] = None) -> Optional[int]:
+        """발송 여부 결정
+
+        발송하면 직전 발송 이후 생략된 중복 건수를, 생략하면 None을 반환
+        """
+        with self._lock:
+            now = self.clock()
+            self.dirty = True
+            dedup_key = f"{kind}:{key}" if key is not None else None
+            window = self.dedup_windows.get(kind, 0)
+
+            entry = self._dedup.get(dedup_key) if dedup_key else None
+            if entry and window and now - entry["last_sent"] < window:
+                entry["suppressed"] += 1
+                self._digest["suppressed"] += 1
+                return None
+
+            if not self._take_token(kind, now):
+                if entry is not None:
+                    entry["suppressed"] += 1
+                self._digest["suppressed"] += 1
+                return None
+
+            suppressed = int(entry["suppressed"]) if entry else 0
+            if dedup_key and window:
+                self._dedup[dedup_key] = {"last_sent": now, "suppressed": 0}
+            return suppressed
+
+    def _take_token(self, kind: str, now: float) -> bool:
+        limit = self.rate_limits.get(kind)
+        if not limit:
+            return True
+        capacity, period = limit
+        bucket = self._buckets.setdefault(kind, {"tokens": capacity, "updated": now})
+        refill = (now - bucket["updated"]) * capacity / period
+        bucket["tokens"] = min(capacity, bucket["tokens"] + refill)
+        bucket["updated"] = now
+        if bucket["tokens"] < 1:
+            return False
+        bucket["tokens"] -= 1
+        return True
+
+    def record_trade(self, action: str) -> None:
+        with self._lock:
+            self.dirty = True
+            self._digest["buys" if action == "BUY" else "sells"] += 1
+
+    def record_profit(self, profit: float) -> None:
+        with self._lock:
+            self.dirty = True
+            self._digest["realized_pnl"] += profit
+
+    def record_error(self, error_type: str) -> None:
+        with self._lock:
+            self.dirty = True
+            errors = self._digest["errors"]
+            errors[error_type] = errors.get(error_type, 0) + 1
+
+    def record_run(self) -> None:
+        with self._lock:
+            self.dirty = True
+            self._digest["runs"] += 1
+
+    def pop_digest(self) -> Optional[Dict[str, Any]]:
+        """요약 주기가 지났으면 집계를 반환하고 초기화, 아니면 None"""
+        with self._lock:
+            if not self.digest_interval:
+                return None
+            if self.clock() - self._digest["started_at"] < self.digest_interval:
+                return None
+            digest = self._digest
+            self._digest = self._empty_digest()
+            self.dirty = True
+            return digest
+
+    def snapshot(self) -> Dict[str, Any]:
+        """실행 간 보관용 상태"""
+        with self._lock:
+            return {
+                "dedup": {k: dict(v) for k, v in self._dedup.items()},
+                "buckets": {k: dict(v) for k, v in self._buckets.items()},
+                "digest": dict(self._digest, errors=dict(self._digest["errors"])),
+            }
+
+    def restore(self, snapshot: Optional[Dict[str, Any]]) -> None:
+        """snapshot()으로 저장한 상태 복원"""
+        if not snapshot:
+            return
+        with self._lock:
+            self._dedup = {k: dict(v) for k, v in snapshot.get("dedup", {}).items()}
+            self._buckets = {k: dict(v) for k, v in snapshot.get("buckets", {}).items()}
+            digest = self._empty_digest()
+            digest.update(snapshot.get("digest", {}))
+            self._digest = digest
+            self.dirty = False
+
 
 class TradingNotifier:
     """거래 알림 관리 클래스"""
@@ -27,34 +305,77 @@ class TradingNotifier:
         if self.enabled and self.topic_arn:
             logger.info(f"SNS 알림 활성화됨 - 토픽: {self.topic_arn}")
 
+        # 거래 경로를 막지 않도록 발송은 백그라운드 워커가 담당
+        self.dispatcher = NotificationDispatcher(self._publish_batch)
+        self.coalescer = NotificationCoalescer.from_config(
+            config_loader.get_notification_config()
+        )
+
     def send_notification(
         self, subject: str, message: str, data: Optional[Dict] = None
-    ):
-        """SNS 알림 발송"""
+    ) -> bool:
+        """SNS 알림 발송 요청 (백그라운드 큐에 넣고 즉시 반환)"""
         if not self.enabled or not self.topic_arn:
             logger.info(f"알림 비활성화됨: {subject}")
-            return
+            return False
 
         try:
-            # 메시지 포맷팅
+            # 메시지 포맷팅 (발생 시각 기준)
             formatted_message = self._format_message(subject, message, data)
-
-            response = self.sns_client.publish(
-                TopicArn=self.topic_arn,
-                Subject=f"🤖 비트코인 봇: {subject}",
-                Message=formatted_message,
+        except Exception as e:
+            logger.error(f"알림 메시지 포맷팅 중 예외 발생: {e}")
+            return False
+
+        return self.dispatcher.submit(
+            {"Subject": f"🤖 비트코인 봇: {subject}", "Message": formatted_message}
+        )
+
+    def _send_coalesced(
+        self,
+        kind: str,
+        key: Optional[str],
+        subject: str,
+        message: str,
+        data: Optional[Dict] = None,
+    ) -> bool:
+        """중복 제거/발송 제한을 거쳐 알림 발송"""
+        suppressed = self.coalescer.admit(kind, key)
+        if suppressed is None:
+            logger.info(f"알림 생략 (중복/발송 제한): {subject}")
+            return False
+        if suppressed:
+            data = dict(data or {}, suppressed_duplicates=suppressed)
+        return self.send_notification(subject, message, data)
+
+    def flush(self, timeout: float = NOTIFICATION_FLUSH_TIMEOUT) -> bool:
+        """대기 중인 알림을 최대 timeout초 동안 발송"""
+        return self.dispatcher.flush(timeout)
+
+    def _publish_batch(self, entries: List[Dict]) -> List[Dict]:
+        """SNS PublishBatch 호출, 재시도가 필요한 항목 반환"""
+        request = [dict(entry, Id=str(i)) for i, entry in enumerate(entries)]
+        try:
+            response = self.sns_client.publish_batch(
+                TopicArn=self.topic_arn, PublishBatchRequestEntries=request
             )
-
-            logger.info(f"알림 발송 성공: {response['MessageId']}")
-            return response["MessageId"]
-
         except ClientError as e:
             error_code = e.response["Error"]["Code"]
             logger.error(f"SNS 알림 발송 실패 ({error_code}): {e}")
-            return None
+            return entries
         except Exception as e:
             logger.error(f"알림 발송 중 예외 발생: {e}")
-            return None
+            return entries
+
+        for success in response.get("Successful", []):
+            logger.info(f"알림 발송 성공: {success['MessageId']}")
+
+        retry = []
+        for failure in response.get("Failed", []):
+            entry = entries[int(failure["Id"])]
+            logger.error(f"SNS 알림 발송 실패 ({failure.get('Code')}): {entry['Subject']}")
+            if not failure.get("SenderFault", False):
+                retry.append(entry)
+        return retry
 
     def _format_message(
         self, subject: str, message: str, data: Optional[Dict] = None
@@ -104,7 +425,8 @@ class TradingNotifier:
             "balance": balance,
         }
 
-        self.send_notification(subject, message, data)
+        self.coalescer.record_trade(action)
+        self._send_coalesced("trade", None, subject, message, data)
 
     def notify_profit_achieved(
         self, buy_price: float, sell_price: float, profit: float, profit_rate: float
@@ -120,7 +442,8 @@ class TradingNotifier:
             "profit_rate": profit_rate,
         }
 
-        self.send_notification(subject, message, data)
+        self.coalescer.record_profit(profit)
+        self._send_coalesced("trade", None, subject, message, data)
 
     def notify_insufficient_balance(self, required: float, available: float):
         """잔고 부족 알림"""
@@ -133,7 +456,7 @@ class TradingNotifier:
             "shortage": required - available,
         }
 
-        self.send_notification(subject, message, data)
+        self._send_coalesced("balance", "insufficient", subject, message, data)
 
     def notify_error(
         self, error_type: str, error_message: str, details: Optional[Dict] = None
@@ -142,7 +465,8 @@ class TradingNotifier:
         subject = f"❌ 오류 발생: {error_type}"
         message = f"거래 봇에서 오류가 발생했습니다: {error_message}"
 
-        self.send_notification(subject, message, details)
+        self.coalescer.record_error(error_type)
+        self._send_coalesced("error", error_type, subject, message, details)
 
     def notify_bot_started(self):
         """봇 시작 알림"""
@@ -159,6 +483,36 @@ class TradingNotifier:
 
         self.send_notification(subject, message, data)
 
+    def notify_bot_status(self, status: str, message: str):
+        """봇 실행 상태 알림 (유형별 발송 제한 적용)"""
+        self._send_coalesced("status", status, f"ℹ️ {status}", message)
+
+    def record_run_success(self) -> None:
+        """성공한 실행 횟수를 요약에 집계"""
+        self.coalescer.record_run()
+
+    def send_digest_if_due(self) -> bool:
+        """요약 주기가 지났으면 손익/거래/오류 요약 알림 발송"""
+        digest = self.coalescer.pop_digest()
+        if digest is None:
+            return False
+
+        started = datetime.fromtimestamp(digest["started_at"])
+        errors = digest["errors"]
+        data = {
+            "period_start": started.strftime("%Y-%m-%d %H:%M:%S"),
+            "runs": digest["runs"],
+            "buys": digest["buys"],
+            "sells": digest["sells"],
+            "profit": digest["realized_pnl"],
+            "errors": sum(errors.values()),
+            "suppressed_notifications": digest["suppressed"],
+        }
+        for error_type, count in sorted(errors.items(), key=lambda kv: -kv[1]):
+            data[f"error[{error_type}]"] = count
+
+        return self.send_notification("📊 주기 요약 리포트", "지난 기간의 거래 봇 실행 요약입니다.", data)
+
     def notify_no_action(self, reason: str):
         """거래 없음 알림 (선택적)"""
         # 너무 빈번한 알림을 피하기 위해 로그만 남김
@@ -0,0 +1,328 @@
+"""
+주문 분할 실행 (TWAP / iceberg)
+
+한 번에 내면 호가를 밀어 0.3% 목표 수익을 깎는 큰 주문(부모 주문)을 여러 자식
+주문으로 나눠 실행한다.
+- twap: slices개로 균등 분할해 interval_seconds 간격으로 실행
+- iceberg: 노출 수량(display_size, 기준 통화)씩 잘라 interval_seconds 간격으로 실행
+
+자식 주문은 OrderExecutor(시장가 또는 maker 우선)로 실행한다. 부모 주문 진행 상황은
+JSON으로 저장 가능한 dict이며, 거래 봇이 상태(state)의 parent_order에 자식 주문마다
+저장하므로 프로세스가 중간에 죽거나 max_run_seconds를 넘기면 다음 실행에서 이어서
+진행한다. 자식 주문 도중 중단되어 체결 여부를 모르면 기준 통화 잔고 변화로 대사한다.
+
+백테스트용 SlicedSimOrder는 같은 분할 일정을 SimulatedBroker 자식 주문으로 만들어
+분할 전/후 슬리피지를 비교한다.
+"""
+
+import logging
+import math
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import ccxt
+
+from fill_simulator import SimulatedBroker
+
+logger = logging.getLogger(__name__)
+
+SLICING_MODES = ("none", "twap", "iceberg")
+
+# 요청 수량 대비 이 비율 미만 차이는 무시 (잔고 대사 오차)
+DUST_RATIO = 1e-3
+
+
+class SlicingConfig:
+    """trading.slicing 설정"""
+
+    def __init__(
+        self,
+        mode: str = "none",
+        slices: int = 5,
+        interval_seconds: float = 60.0,
+        display_size: Optional[float] = None,
+        min_notional: float = 0.0,
+        max_run_seconds: float = 480.0,
+    ):
+        if mode not in SLICING_MODES:
+            raise ValueError(f"지원하지 않는 분할 모드: {mode}")
+        if mode == "iceberg" and not display_size:
+            raise ValueError("iceberg 모드에는 display_size가 필요합니다")
+        if slices < 1:
+            raise ValueError("slices는 1 이상이어야 합니다")
+        self.mode = mode
+        self.slices = slices
+        self.interval_seconds = interval_seconds
+        self.display_size = display_size
+        self.min_notional = min_notional
+        self.max_run_seconds = max_run_seconds
+
+    @classmethod
+    def from_config(cls, trading_config: Dict[str, Any]) -> "SlicingConfig":
+        slicing = trading_config.get("slicing", {})
+        return cls(
+            mode=slicing.get("mode", "none"),
+            slices=slicing.get("slices", 5),
+            interval_seconds=slicing.get("interval_seconds", 60.0),
+            display_size=slicing.get("display_size"),
+            min_notional=slicing.get("min_notional", 0.0),
+            max_run_seconds=slicing.get("max_run_seconds", 480.0),
+        )
+
+    def applies_to(self, notional: float) -> bool:
+        """이 금액(호가 통화)의 주문을 분할할지"""
+        return self.mode != "none" and notional >= self.min_notional
+
+    def child_quantities(self, amount: float) -> List[float]:
+        """자식 주문 수량 목록 (합계 = amount)"""
+        if self.mode == "iceberg":
+            count = max(1, math.ceil(amount / self.display_size - 1e-9))
+            pieces = [self.display_size] * (count - 1)
+            return pieces + [amount - sum(pieces)]
+        return [amount / self.slices] * self.slices
+
+
+def new_parent_order(
+    side: str,
+    amount: float,
+    config: SlicingConfig,
+    base_balance: float,
+    now: Optional[float] = None,
+) -> Dict[str, Any]:
+    """부모 주문 생성 (base_balance는 잔고 대사 기준점)"""
+    now = time.time() if now is None else now
+    return {
+        "id": f"parent-{int(now * 1000)}",
+        "side": side,
+        "mode": config.mode,
+        "requested": amount,
+        "schedule": config.child_quantities(amount),
+        "next_child": 0,
+        "next_at": now,
+        "in_flight": False,
+        "base_balance_start": base_balance,
+        "filled": 0.0,
+        "amount": 0.0,
+        "gross_cost": 0.0,
+        "cost": 0.0,
+        "fee": 0.0,
+        "maker_volume": 0.0,
+        "children": [],
+        "status": "active",
+        "created_at": datetime.fromtimestamp(now).isoformat(),
+    }
+
+
+def _add_child(parent: Dict[str, Any], report: Dict[str, Any]) -> None:
+    for field in ("filled", "amount", "gross_cost", "cost", "fee"):
+        parent[field] += report[field]
+    parent["maker_volume"] += report["filled"] * report["maker_ratio"]
+    parent["children"].append(
+        {
+            "order_id": report["order_id"],
+            "filled": report["filled"],
+            "price": report["price"],
+        }
+    )
+
+
+def _advance(parent: Dict[str, Any], next_at: float) -> None:
+    parent["next_child"] += 1
+    if parent["next_child"] >= len(parent["schedule"]):
+        parent["status"] = "done"
+    else:
+        parent["next_at"] = next_at
+
+
+def parent_report(parent: Dict[str, Any]) -> Dict[str, Any]:
+    """부모 주문 집계를 OrderExecutor 실행 보고서 형식으로 변환"""
+    filled, gross_cost = parent["filled"], parent["gross_cost"]
+    return {
+        "order_id": parent["id"],
+        "requested": parent["requested"],
+        "filled": filled,
+        "amount": parent["amount"],
+        "price": gross_cost / filled if filled else 0.0,
+        "gross_cost": gross_cost,
+        "cost": parent["cost"],
+        "fee": parent["fee"],
+        "fee_rate": parent["fee"] / gross_cost if gross_cost else 0.0,
+        "maker_ratio": parent["maker_volume"] / filled if filled else 0.0,
+        "orders": list(parent["children"]),
+        "in_progress": parent["status"] == "active",
+    }
+
+
+def reconcile(parent: Dict[str, Any], base_balance: float, price: float) -> None:
+    """체결 여부를 모르는 중단된 자식 주문을 기준 통화 잔고 변화로 반영
+
+    체결분의 가격은 알 수 없으므로 현재가로 추정하고 수수료는 0으로 둔다.
+    """
+    if not parent.get("in_flight"):
+        return
+    if parent["side"] == "buy":
+        unknown = base_balance - parent["base_balance_start"] - parent["amount"]
+    else:
+        unknown = parent["base_balance_start"] - base_balance - parent["filled"]
+
+    index = parent["next_child"]
+    if unknown > parent["schedule"][index] * DUST_RATIO:
+        logger.warning(f"중단된 자식 주문 #{index} 체결분 {unknown:.6f}을 잔고로 추정합니다")
+        cost = unknown * price
+        _add_child(
+            parent,
+            {
+                "order_id": None,
+                "filled": unknown,
+                "amount": unknown,
+                "gross_cost": cost,
+                "cost": cost,
+                "fee": 0.0,
+                "maker_ratio": 0.0,
+                "price": price,
+            },
+        )
+    parent["in_flight"] = False
+    _advance(parent, time.time())
+
+
+class OrderScheduler:
+    """부모 주문의 자식 주문을 일정에 맞춰 실행"""
+
+    def __init__(
+        self,
+        executor,
+        config: SlicingConfig,
+        clock: Optional[Callable[[], float]] = None,
+        sleep: Optional[Callable[[float], None]] = None,
+    ):
+        self.executor = executor
+        self.config = config
+        self._clock = clock or time.time
+        self._sleep = sleep or time.sleep
+
+    def run(
+        self,
+        parent: Dict[str, Any],
+        on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+        max_seconds: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """끝나거나 max_seconds가 지날 때까지 자식 주문 실행 (parent를 갱신해 반환)"""
+        on_progress = on_progress or (lambda _: None)
+        budget = self.config.max_run_seconds if max_seconds is None else max_seconds
+        deadline = self._clock() + budget
+
+        while parent["status"] == "active":
+            now = self._clock()
+            if parent["next_at"] > now:
+                if parent["next_at"] > deadline:
+                    break  # 다음 실행에서 이어서 진행
+                self._sleep(parent["next_at"] - now)
+                continue
+            if now > deadline:
+                break
+            self._execute_child(parent, on_progress)
+
+        if parent["status"] == "active":
+            logger.info(
+                f"부모 주문 {parent['id']} 진행 중 - 자식 주문 "
+                f"{parent['next_child']}/{len(parent['schedule'])}"
+            )
+        return parent
+
+    def start(
+        self,
+        parent: Dict[str, Any],
+        on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+        max_seconds: Optional[float] = None,
+    ) -> Future:
+        """백그라운드 스레드에서 run 실행 (신호 계산과 병렬), result()로 대기"""
+        pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="order-scheduler")
+        future = pool.submit(self.run, parent, on_progress, max_seconds)
+        pool.shutdown(wait=False)
+        return future
+
+    def _execute_child(
+        self, parent: Dict[str, Any], on_progress: Callable[[Dict[str, Any]], None]
+    ) -> None:
+        index = parent["next_child"]
+        quantity = parent["schedule"][index]
+
+        # 체결 전에 기록해 두면 중단 시 다음 실행에서 잔고로 대사한다
+        parent["in_flight"] = True
+        on_progress(parent)
+        try:
+            report = self.executor.execute(parent["side"], quantity)
+        except ccxt.OrderNotFillable as e:
+            logger.warning(f"자식 주문 #{index} 미체결, 다음 주문으로 진행: {e}")
+            report = None
+        parent["in_flight"] = False
+
+        if report is not None:
+            _add_child(parent, report)
+        _advance(parent, self._clock() + self.config.interval_seconds)
+        on_progress(parent)
+
+
+class SlicedSimOrder:
+    """SimulatedBroker 자식 주문 묶음 (백테스트용, Order와 같은 집계 속성)
+
+    iceberg는 앞 조각 체결을 기다리지 않고 interval 간격으로 제출하는 근사다.
+    """
+
+    def __init__(
+        self,
+        broker: SimulatedBroker,
+        config: SlicingConfig,
+        side: str,
+        now_ms: int,
+        signal_price: float,
+        quote_budget: float = 0.0,
+        quantity: float = 0.0,
+    ):
+        self.side = side
+        self.signal_price = signal_price
+        self.quote_budget = quote_budget
+        self.quantity = quantity
+
+        total = quantity if side == "sell" else quote_budget / signal_price
+        interval_ms = int(config.interval_seconds * 1000)
+        self.children = []
+        for k, child in enumerate(config.child_quantities(total)):
+            share = child / total
+            self.children.append(
+                broker.submit(
+                    side,
+                    now_ms + k * interval_ms,
+                    signal_price,
+                    quote_budget=quote_budget * share,
+                    quantity=quantity * share,
+                )
+            )
+
+    @property
+    def filled(self) -> float:
+        return sum(child.filled for child in self.children)
+
+    @property
+    def cost(self) -> float:
+        return sum(child.cost for child in self.children)
+
+    @property
+    def fee(self) -> float:
+        return sum(child.fee for child in self.children)
+
+    @property
+    def fills(self) -> int:
+        return sum(child.fills for child in self.children)
+
+    @property
+    def average(self) -> float:
+        filled = self.filled
+        return self.cost / filled if filled else 0.0
+
+    @property
+    def done(self) -> bool:
+        return all(child.done for child in self.children)
@@ -0,0 +1,274 @@
+"""
+주문 사전 검증
+
+거래소 심볼 필터(LOT_SIZE, MIN_NOTIONAL/NOTIONAL, PRICE_FILTER)를 로컬에 캐시해 두고
+주문을 보내기 전에 수량을 stepSize로 내림하고 가격을 tickSize에 맞춘 뒤 최소/최대
+수량, 최소 주문 금액, 잔고를 확인한다. 통과하지 못한 주문은 네트워크 호출 없이
+OrderRejected(ccxt.InvalidOrder)로 거부된다.
+
+필터는 load_markets() 결과에서 읽어 filters_cache_path JSON 파일에 저장하고
+filters_ttl_hours 동안 재사용하므로 매 실행마다 마켓 정보를 받지 않는다.
+"""
+
+import json
+import logging
+import os
+import time
+from decimal import ROUND_CEILING, ROUND_FLOOR, Decimal
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import ccxt
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FILTERS_CACHE_PATH = "data/symbol_filters.json"
+DEFAULT_FILTERS_TTL_HOURS = 24
+
+
+class OrderRejected(ccxt.InvalidOrder):
+    """로컬 사전 검증에서 거부된 주문"""
+
+
+def _to_step(value: float, step: Optional[float], rounding=ROUND_FLOOR) -> float:
+    """value를 step 배수로 맞춤 (부동소수점 오차 없이 Decimal로 계산)"""
+    if not step:
+        return value
+    step_decimal = Decimal(str(step))
+    steps = (Decimal(str(value)) / step_decimal).to_integral_value(rounding=rounding)
+    return float(steps * step_decimal)
+
+
+def _float(value: Any) -> Optional[float]:
+    if value is None or value == "":
+        return None
+    value = float(value)
+    return value if value > 0 else None
+
+
+class SymbolFilters:
+    """심볼 주문 필터 (없는 제한은 None)"""
+
+    FIELDS = (
+        "step_size",
+        "min_qty",
+        "max_qty",
+        "market_max_qty",
+        "tick_size",
+        "min_price",
+        "max_price",
+        "min_notional",
+        "apply_to_market",
+    )
+
+    def __init__(
+        self,
+        step_size: Optional[float] = None,
+        min_qty: Optional[float] = None,
+        max_qty: Optional[float] = None,
+        market_max_qty: Optional[float] = None,
+        tick_size: Optional[float] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        min_notional: Optional[float] = None,
+        apply_to_market: bool = True,
+    ):
+        self.step_size = step_size
+        self.min_qty = min_qty
+        self.max_qty = max_qty
+        self.market_max_qty = market_max_qty
+        self.tick_size = tick_size
+        self.min_price = min_price
+        self.max_price = max_price
+        self.min_notional = min_notional
+        self.apply_to_market = apply_to_market
+
+    @classmethod
+    def from_market(
+        cls, market: Dict[str, Any], precision_mode: int = ccxt.TICK_SIZE
+    ) -> "SymbolFilters":
+        """ccxt market 구조에서 생성 (바이낸스 원본 filters 우선)"""
+        raw = {f["filterType"]: f for f in market.get("info", {}).get("filters", [])}
+        if raw:
+            lot = raw.get("LOT_SIZE", {})
+            price = raw.get("PRICE_FILTER", {})
+            notional = raw.get("NOTIONAL") or raw.get("MIN_NOTIONAL") or {}
+            return cls(
+                step_size=_float(lot.get("stepSize")),
+                min_qty=_float(lot.get("minQty")),
+                max_qty=_float(lot.get("maxQty")),
+                market_max_qty=_float(raw.get("MARKET_LOT_SIZE", {}).get("maxQty")),
+                tick_size=_float(price.get("tickSize")),
+                min_price=_float(price.get("minPrice")),
+                max_price=_float(price.get("maxPrice")),
+                min_notional=_float(notional.get("minNotional")),
+                apply_to_market=notional.get(
+                    "applyMinToMarket", notional.get("applyToMarket", True)
+                ),
+            )
+
+        # 원본 필터가 없는 거래소는 ccxt 통합 limits/precision 사용
+        limits, precision = market.get("limits", {}), market.get("precision", {})
+
+        def step(value):
+            if value is None or precision_mode == ccxt.TICK_SIZE:
+                return _float(value)
+            return 10.0 ** -int(value)
+
+        return cls(
+            step_size=step(precision.get("amount")),
+            min_qty=_float(limits.get("amount", {}).get("min")),
+            max_qty=_float(limits.get("amount", {}).get("max")),
+            tick_size=step(precision.get("price")),
+            min_price=_float(limits.get("price", {}).get("min")),
+            max_price=_float(limits.get("price", {}).get("max")),
+            min_notional=_float(limits.get("cost", {}).get("min")),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SymbolFilters":
+        return cls(**{field: data.get(field) for field in cls.FIELDS})
+
+
+class FilterCache:
+    """심볼 필터 디스크 캐시 (ttl 동안 load_markets 호출 생략)"""
+
+    def __init__(
+        self,
+        path: str = DEFAULT_FILTERS_CACHE_PATH,
+        ttl_hours: float = DEFAULT_FILTERS_TTL_HOURS,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_hours * 3600
+
+    @classmethod
+    def from_config(cls, exchange_config: Dict[str, Any]) -> "FilterCache":
+        """exchange 설정 섹션으로 생성"""
+        return cls(
+            exchange_config.get("filters_cache_path", DEFAULT_FILTERS_CACHE_PATH),
+            exchange_config.get("filters_ttl_hours", DEFAULT_FILTERS_TTL_HOURS),
+        )
+
+    def get(self, exchange, symbol: str) -> SymbolFilters:
+        entries = self._read()
+        entry = entries.get(symbol)
+        if entry and time.time() - entry["fetched_at"] < self.ttl_seconds:
+            return SymbolFilters.from_dict(entry["filters"])
+
+        exchange.load_markets()
+        filters = SymbolFilters.from_market(
+            exchange.market(symbol), getattr(exchange, "precisionMode", ccxt.TICK_SIZE)
+        )
+        entries[symbol] = {"fetched_at": time.time(), "filters": filters.to_dict()}
+        self._write(entries)
+        logger.info(f"{symbol} 주문 필터를 갱신했습니다: {filters.to_dict()}")
+        return filters
+
+    def _read(self) -> Dict[str, Any]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, entries: Dict[str, Any]) -> None:
+        directory = os.path.dirname(self.path)
+        try:
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"주문 필터 캐시 저장 실패: {e}")
+
+
+class OrderValidator:
+    """심볼 필터로 주문 수량/가격을 맞추고 검증
+
+    filters에 SymbolFilters 대신 함수를 주면 처음 검증할 때 한 번 호출해 로드한다.
+    """
+
+    def __init__(
+        self,
+        filters: Union[SymbolFilters, Callable[[], SymbolFilters]],
+        fee_rate: float = 0.0,
+    ):
+        self._filters = filters
+        self.fee_rate = fee_rate
+
+    @property
+    def filters(self) -> SymbolFilters:
+        if callable(self._filters):
+            self._filters = self._filters()
+        return self._filters
+
+    def validate(
+        self,
+        side: str,
+        amount: float,
+        price: float,
+        order_type: str = "market",
+        balance: Optional[float] = None,
+    ) -> Tuple[float, float]:
+        """(수량, 가격)을 필터에 맞춰 반환, 통과하지 못하면 OrderRejected
+
+        price는 지정가 주문의 가격 또는 시장가 주문의 예상 체결가다. balance는
+        매수면 호가 통화, 매도면 기준 통화 가용 잔고다.
+        """
+        f = self.filters
+        amount = _to_step(amount, f.step_size)
+        if order_type == "limit":
+            # 매수는 내림, 매도는 올림 (지정가보다 불리하게 체결되지 않도록)
+            rounding = ROUND_FLOOR if side == "buy" else ROUND_CEILING
+            price = _to_step(price, f.tick_size, rounding)
+            if f.min_price and price < f.min_price:
+                raise OrderRejected(f"가격 {price}이 최소 가격 {f.min_price} 미만")
+            if f.max_price and price > f.max_price:
+                raise OrderRejected(f"가격 {price}이 최대 가격 {f.max_price} 초과")
+
+        if amount <= 0 or (f.min_qty and amount < f.min_qty):
+            raise OrderRejected(f"수량 {amount}이 최소 수량 {f.min_qty} 미만")
+        max_qty = f.market_max_qty if order_type == "market" else None
+        max_qty = max_qty or f.max_qty
+        if max_qty and amount > max_qty:
+            raise OrderRejected(f"수량 {amount}이 최대 수량 {max_qty} 초과")
+
+        notional = amount * price
+        if (
+            f.min_notional
+            and (order_type == "limit" or f.apply_to_market)
+            and notional < f.min_notional
+        ):
+            raise OrderRejected(f"주문 금액 {notional:.4f}이 최소 주문 금액 {f.min_notional} 미만")
+
+        if balance is not None:
+            required = notional * (1 + self.fee_rate) if side == "buy" else amount
+            if required > balance:
+                raise OrderRejected(f"잔고 부족 - 필요 {required:.6f}, 보유 {balance:.6f}")
+        return amount, price
+
+    def normalize_schedule(self, quantities: List[float], price: float) -> List[float]:
+        """분할 주문 수량을 stepSize에 맞추고 최소 수량/금액 미만 조각은 앞 조각에 합침"""
+        f = self.filters
+        minimum = max(
+            f.min_qty or 0.0, (f.min_notional or 0.0) / price if price else 0.0
+        )
+        pieces: List[float] = []
+        carry = 0.0
+        for quantity in quantities:
+            carry += quantity
+            piece = _to_step(carry, f.step_size)
+            if piece > 0 and piece >= minimum:
+                pieces.append(piece)
+                carry -= piece
+        # 내림/병합으로 남은 수량은 마지막 조각에
+        if not pieces:
+            return [_to_step(carry, f.step_size)]
+        pieces[-1] = _to_step(pieces[-1] + carry, f.step_size)
+        return pieces
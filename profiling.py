@@ -0,0 +1,246 @@
+"""
+실행 프로파일링
+
+백테스트(--profile cpu|mem)와 Fargate 실행(PROFILE_MODE 환경 변수)을 코드 수정 없이
+프로파일링한다.
+- cpu: cProfile 결과(.prof)와 자체/누적 시간 상위 함수 표(.txt), 샘플링 프로파일러가
+  모은 스레드별 호출 스택(.collapsed, flamegraph.pl/speedscope 입력 형식)
+- mem: tracemalloc 상위 할당 위치 표(.txt)와 할당 바이트 가중 호출 스택(.collapsed)
+
+모드를 지정하지 않으면 nullcontext를 돌려주므로 추가 비용이 없다. 멀티프로세스
+작업(Monte Carlo 워커 등)은 메인 프로세스만 기록된다.
+
+phase_timer는 실행 단계별 시간(과 tracemalloc 추적 중이면 단계별 파이썬 할당 최대치)을
+항상 기록하는 가벼운 계측으로, 실행 로그와 Fargate 자원 예산 테스트에서 사용한다.
+"""
+
+import contextlib
+import cProfile
+import io
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import ContextManager, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ("cpu", "mem")
+DEFAULT_PROFILE_DIR = "profiles"
+DEFAULT_SAMPLE_INTERVAL = 0.005
+DEFAULT_TOP = 30
+TRACEMALLOC_FRAMES = 25
+
+
+def _frame_label(code) -> str:
+    return (
+        f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    )
+
+
+class SamplingProfiler:
+    """interval마다 모든 스레드의 호출 스택을 모아 collapsed stack으로 집계"""
+
+    def __init__(self, interval: float = DEFAULT_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name="sampling-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(names.get(ident, f"thread-{ident}"))
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def write_collapsed(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class Profiler:
+    """with 블록 실행을 프로파일링하고 종료 시 결과 파일 저장"""
+
+    def __init__(
+        self,
+        mode: str,
+        output_dir: str = DEFAULT_PROFILE_DIR,
+        label: str = "run",
+        interval: float = DEFAULT_SAMPLE_INTERVAL,
+        top: int = DEFAULT_TOP,
+    ):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"지원하지 않는 프로파일 모드: {mode} ({', '.join(PROFILE_MODES)})")
+        self.mode = mode
+        self.output_dir = output_dir
+        self.label = label
+        self.interval = interval
+        self.top = top
+        self.files: List[str] = []
+        self.summary = ""
+        self._profile: Optional[cProfile.Profile] = None
+        self._sampler: Optional[SamplingProfiler] = None
+        self._started = 0.0
+
+    def __enter__(self) -> "Profiler":
+        self._started = time.perf_counter()
+        if self.mode == "cpu":
+            self._sampler = SamplingProfiler(self.interval)
+            self._sampler.start()
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        elapsed = time.perf_counter() - self._started
+        os.makedirs(self.output_dir, exist_ok=True)
+        prefix = os.path.join(
+            self.output_dir,
+            f"{self.label}-{time.strftime('%Y%m%d-%H%M%S')}-{self.mode}",
+        )
+        if self.mode == "cpu":
+            self._profile.disable()
+            self._sampler.stop()
+            self._write_cpu(prefix, elapsed)
+        else:
+            self._write_mem(prefix, elapsed)
+        logger.info(f"프로파일 저장 ({self.mode}, {elapsed:.2f}초): {', '.join(self.files)}")
+
+    def _write_cpu(self, prefix: str, elapsed: float) -> None:
+        self._profile.dump_stats(f"{prefix}.prof")
+        stream = io.StringIO()
+        samples = self._sampler.samples
+        stream.write(f"{self.label} CPU 프로파일 - {elapsed:.2f}초, 샘플 {samples}개\n")
+        stats = pstats.Stats(self._profile, stream=stream).strip_dirs()
+        for sort in ("tottime", "cumulative"):
+            stream.write(f"\n=== {sort} 상위 {self.top}개 함수 ===\n")
+            stats.sort_stats(sort).print_stats(self.top)
+        self.summary = stream.getvalue()
+        with open(f"{prefix}.txt", "w", encoding="utf-8") as f:
+            f.write(self.summary)
+        self._sampler.write_collapsed(f"{prefix}.collapsed")
+        self.files = [f"{prefix}.txt", f"{prefix}.prof", f"{prefix}.collapsed"]
+
+    def _write_mem(self, prefix: str, elapsed: float) -> None:
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+                tracemalloc.Filter(False, "<unknown>"),
+            )
+        )
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        lines = [
+            f"{self.label} 메모리 프로파일 - {elapsed:.2f}초, "
+            f"현재 {current / 1e6:.1f}MB, 최대 {peak / 1e6:.1f}MB",
+            "",
+            f"=== 할당 위치 상위 {self.top}개 (해제되지 않은 메모리) ===",
+        ]
+        for stat in snapshot.statistics("lineno")[: self.top]:
+            frame = stat.traceback[0]
+            lines.append(
+                f"{stat.size / 1024:10.1f} KiB {stat.count:8d}회  "
+                f"{frame.filename}:{frame.lineno}"
+            )
+        self.summary = "\n".join(lines) + "\n"
+        with open(f"{prefix}.txt", "w", encoding="utf-8") as f:
+            f.write(self.summary)
+
+        # 할당 바이트를 가중치로 한 호출 스택 (오래된 프레임부터)
+        with open(f"{prefix}.collapsed", "w", encoding="utf-8") as f:
+            for stat in snapshot.statistics("traceback"):
+                stack = ";".join(
+                    f"{os.path.basename(frame.filename)}:{frame.lineno}"
+                    for frame in stat.traceback
+                )
+                f.write(f"{stack} {stat.size}\n")
+        self.files = [f"{prefix}.txt", f"{prefix}.collapsed"]
+
+
+class PhaseTimer:
+    """실행 단계별 벽시계 시간과 파이썬 할당 기록 (단계는 중첩하지 않음)
+
+    tracemalloc 추적 중이면 단계마다 시작 시점 대비 추가 할당 최대치(python_peak_mb)를
+    남기고, python_peak_mb 속성에 전체 단계 중 추적 메모리 최대치를 둔다.
+    """
+
+    def __init__(self):
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.python_peak_mb = 0.0
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        traced = tracemalloc.is_tracing()
+        if traced:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry = {"wall_seconds": time.perf_counter() - started}
+            if traced:
+                peak = tracemalloc.get_traced_memory()[1]
+                entry["python_peak_mb"] = (peak - baseline) / 1e6
+                self.python_peak_mb = max(self.python_peak_mb, peak / 1e6)
+            self.phases[name] = entry
+
+    def summary(self) -> str:
+        return ", ".join(
+            f"{name} {entry['wall_seconds']:.2f}s"
+            for name, entry in self.phases.items()
+        )
+
+
+def profile_run(
+    mode: Optional[str],
+    output_dir: str = DEFAULT_PROFILE_DIR,
+    label: str = "run",
+) -> ContextManager:
+    """mode가 없으면 아무 것도 하지 않는 컨텍스트, 있으면 Profiler"""
+    if not mode:
+        return contextlib.nullcontext()
+    return Profiler(mode, output_dir, label)
+
+
+def profile_from_env(label: str) -> ContextManager:
+    """PROFILE_MODE(cpu|mem), PROFILE_DIR 환경 변수로 profile_run"""
+    return profile_run(
+        os.getenv("PROFILE_MODE", "").lower() or None,
+        os.getenv("PROFILE_DIR", DEFAULT_PROFILE_DIR),
+        label,
+    )
+
+
+# 전역 단계 계측 인스턴스
+phase_timer = PhaseTimer()
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+거래소 호출 기록/재생
+
+RecordingExchange는 ccxt 거래소(또는 PaperExchange)를 감싸 모든 메서드 호출의
+인자, 응답(또는 예외), 시작 시각, 소요 시간을 gzip JSON Lines 파일에 기록한다.
+ReplayExchange는 기록 파일을 같은 순서로 돌려주므로 실거래 세션을 네트워크 없이
+재현/프로파일링하고, 인자가 달라지면 ReplayMismatch로 매매 판단 변화를 잡아낸다.
+precisionMode 같은 일반 속성은 헤더에, 호출마다 바뀌는 last_response_headers는 각
+호출 기록에 함께 남긴다. 매 주문 새로 만드는 clientOrderId는 인자 비교에서 제외한다.
+
+환경 변수:
+- EXCHANGE_RECORD=path: 실행 중 거래소 호출 기록
+- EXCHANGE_REPLAY=path: 기록 파일로 거래소 호출 재생
+- EXCHANGE_REPLAY_LATENCY=배율: 원래 지연의 몇 배로 재생할지 (기본 0 = 지연 없음)
+
+사용법:
+python replay.py stats session.jsonl.gz
+"""
+
+import argparse
+import atexit
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterator, List, Optional
+
+import ccxt
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+# 헤더에 기록하는 거래소 일반 속성 (메서드가 아닌 값)
+RECORDED_ATTRIBUTES = ("precisionMode",)
+
+
+class ReplayMismatch(Exception):
+    """재생 중 호출 순서/인자가 기록과 다름"""
+
+
+def _normalize(value: Any) -> Any:
+    """JSON 왕복 후 값과 비교할 수 있도록 정규화"""
+    return json.loads(json.dumps(value, default=str))
+
+
+def _without_client_ids(value: Any) -> Any:
+    """실행마다 새로 만드는 clientOrderId를 뺀 비교용 값"""
+    if isinstance(value, dict):
+        return {
+            key: None if key == "clientOrderId" else _without_client_ids(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_without_client_ids(item) for item in value]
+    return value
+
+
+class RecordingExchange:
+    """거래소 호출을 기록하는 프록시"""
+
+    def __init__(self, exchange, path: str):
+        self._exchange = exchange
+        self._path = path
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._origin = time.time()
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        self._write(
+            {
+                "version": FORMAT_VERSION,
+                "exchange": getattr(exchange, "id", type(exchange).__name__),
+                "created": self._origin,
+                "attributes": {
+                    name: _normalize(getattr(exchange, name))
+                    for name in RECORDED_ATTRIBUTES
+                    if hasattr(exchange, name)
+                },
+            }
+        )
+        atexit.register(self.close)
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        attr = getattr(self._exchange, name)
+        if not callable(attr):
+            return attr
+
+        def recorded(*args, **kwargs):
+            started = time.time()
+            entry = {
+                "method": name,
+                "args": _normalize(list(args)),
+                "kwargs": _normalize(kwargs),
+                "start": round(started - self._origin, 6),
+            }
+            try:
+                result = attr(*args, **kwargs)
+            except Exception as e:
+                entry["duration"] = round(time.time() - started, 6)
+                entry["error"] = {"type": type(e).__name__, "message": str(e)}
+                self._record(entry)
+                raise
+            entry["duration"] = round(time.time() - started, 6)
+            entry["result"] = _normalize(result)
+            self._record(entry)
+            return result
+
+        return recorded
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+                logger.info(f"거래소 호출 {self._seq}건을 기록했습니다: {self._path}")
+
+    def _record(self, entry: Dict[str, Any]) -> None:
+        # 사용 가중치 메트릭이 읽는 응답 헤더도 함께 재생
+        headers = getattr(self._exchange, "last_response_headers", None)
+        if headers:
+            entry["headers"] = _normalize(dict(headers))
+        with self._lock:
+            entry["seq"] = self._seq
+            self._seq += 1
+            self._write(entry)
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(entry, separators=(",", ":"), default=str))
+        self._file.write("\n")
+
+
+def _read_header(f) -> Dict[str, Any]:
+    header = json.loads(f.readline())
+    if header.get("version") != FORMAT_VERSION:
+        raise ValueError(f"지원하지 않는 기록 형식: {header.get('version')}")
+    return header
+
+
+def read_header(path: str) -> Dict[str, Any]:
+    """기록 파일 헤더 (거래소 ID, 일반 속성) 조회"""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return _read_header(f)
+
+
+def read_recording(path: str) -> Iterator[Dict[str, Any]]:
+    """기록 파일 헤더 검증 후 호출 기록 순회"""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        _read_header(f)
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class ReplayExchange:
+    """기록된 응답을 순서대로 돌려주는 거래소
+
+    latency_scale=0이면 지연 없이, 1이면 원래 지연대로, 그 외에는 배율만큼 기다린다.
+    strict=True면 메서드 이름과 인자(clientOrderId 제외)가 기록과 같아야 한다.
+    ccxt 메서드나 기록에 있는 메서드만 호출할 수 있고, 그 밖의 속성은 AttributeError다.
+    """
+
+    def __init__(self, path: str, latency_scale: float = 0.0, strict: bool = True):
+        self.path = path
+        self.latency_scale = latency_scale
+        self.strict = strict
+        header = read_header(path)
+        self.id = header.get("exchange")
+        self.precisionMode = ccxt.TICK_SIZE
+        for name, value in header.get("attributes", {}).items():
+            setattr(self, name, value)
+        self.last_response_headers: Optional[Dict[str, Any]] = None
+        # 재생한 load_markets() 결과
+        self.markets: Optional[Dict[str, Any]] = None
+        self._entries = list(read_recording(path))
+        self._methods = {entry["method"] for entry in self._entries}
+        self._position = 0
+
+    @property
+    def remaining(self) -> int:
+        return len(self._entries) - self._position
+
+    def __getattr__(self, name):
+        if name.startswith("_") or not (
+            name in self._methods or callable(getattr(ccxt.Exchange, name, None))
+        ):
+            raise AttributeError(name)
+
+        def replayed(*args, **kwargs):
+            return self._replay(name, args, kwargs)
+
+        return replayed
+
+    def _replay(self, name: str, args, kwargs) -> Any:
+        if self._position >= len(self._entries):
+            raise ReplayMismatch(f"기록이 끝났는데 {name}() 호출이 더 발생했습니다")
+        entry = self._entries[self._position]
+
+        if entry["method"] != name:
+            raise ReplayMismatch(
+                f"#{entry['seq']}: 기록은 {entry['method']}(), 실제 호출은 {name}()"
+            )
+        if self.strict and (
+            _without_client_ids(_normalize(list(args)))
+            != _without_client_ids(entry["args"])
+            or _without_client_ids(_normalize(kwargs))
+            != _without_client_ids(entry["kwargs"])
+        ):
+            raise ReplayMismatch(
+                f"#{entry['seq']} {name}() 인자가 다릅니다: "
+                f"기록 {entry['args']} {entry['kwargs']}, 실제 {list(args)} {kwargs}"
+            )
+        self._position += 1
+
+        if self.latency_scale > 0:
+            time.sleep(entry["duration"] * self.latency_scale)
+        self.last_response_headers = entry.get("headers")
+
+        if "error" in entry:
+            error = entry["error"]
+            error_class = getattr(ccxt, error["type"], None)
+            if not (
+                isinstance(error_class, type) and issubclass(error_class, Exception)
+            ):
+                error_class = RuntimeError
+            raise error_class(error["message"])
+        if name == "load_markets":
+            self.markets = entry["result"]
+        return entry["result"]
+
+
+def wrap_exchange_from_env(exchange):
+    """EXCHANGE_REPLAY/EXCHANGE_RECORD 환경 변수에 따라 거래소 교체 또는 감싸기"""
+    replay_path = os.getenv("EXCHANGE_REPLAY")
+    if replay_path:
+        latency_scale = float(os.getenv("EXCHANGE_REPLAY_LATENCY", "0"))
+        logger.info(f"거래소 호출을 재생합니다: {replay_path} (지연 x{latency_scale})")
+        return ReplayExchange(replay_path, latency_scale)
+
+    record_path = os.getenv("EXCHANGE_RECORD")
+    if record_path:
+        logger.info(f"거래소 호출을 기록합니다: {record_path}")
+        return RecordingExchange(exchange, record_path)
+    return exchange
+
+
+def recording_stats(path: str) -> Dict[str, Dict[str, float]]:
+    """메서드별 호출 수/오류 수/지연(평균, p50, p95, 최대, ms)"""
+    durations: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    for entry in read_recording(path):
+        durations[entry["method"]].append(entry["duration"] * 1000)
+        errors[entry["method"]] += "error" in entry
+
+    stats = {}
+    for method, values in durations.items():
+        values = np.array(values)
+        p50, p95 = np.percentile(values, [50, 95])
+        stats[method] = {
+            "calls": len(values),
+            "errors": errors[method],
+            "mean_ms": float(values.mean()),
+            "p50_ms": float(p50),
+            "p95_ms": float(p95),
+            "max_ms": float(values.max()),
+        }
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Exchange record/replay tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    stats_parser = subparsers.add_parser("stats", help="Latency summary per method")
+    stats_parser.add_argument("path")
+    args = parser.parse_args(argv)
+
+    stats = recording_stats(args.path)
+    print(
+        f"{'Method':<28} {'Calls':>6} {'Errors':>6} {'Mean':>9} "
+        f"{'P50':>9} {'P95':>9} {'Max':>9}"
+    )
+    for method, s in sorted(stats.items(), key=lambda item: -item[1]["calls"]):
+        print(
+            f"{method:<28} {s['calls']:>6} {s['errors']:>6} {s['mean_ms']:>7.1f}ms "
+            f"{s['p50_ms']:>7.1f}ms {s['p95_ms']:>7.1f}ms {s['max_ms']:>7.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
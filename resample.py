@@ -0,0 +1,197 @@
+"""
+캔들 타임프레임 리샘플링
+
+1분봉 같은 기본(base) 캔들 하나로 상위 타임프레임 캔들을 만든다.
+- resample_ohlcv(): 벡터화 리샘플링 (백테스트, 실거래 전체 재동기화)
+- alignment_index()/align_to_base(): 기본 봉마다 '이미 마감된' 상위 봉을 매핑
+  (미래 데이터 참조 방지)
+- IncrementalResampler: 실시간으로 들어오는 기본 캔들을 상위 봉으로 누적
+  (상태를 저장해 다음 실행에서 새 기본 캔들만 이어서 누적)
+- bucket_start(): 상위 봉 경계 (주봉은 월요일 00:00 UTC 시작)
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+OHLCV_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+_UNIT_MS = {
+    "s": 1000,
+    "m": 60 * 1000,
+    "h": 60 * 60 * 1000,
+    "d": 24 * 60 * 60 * 1000,
+    "w": 7 * 24 * 60 * 60 * 1000,
+}
+# 바이낸스 주봉은 월요일 00:00 UTC 시작 (epoch는 목요일)
+_WEEK_OFFSET_MS = 4 * _UNIT_MS["d"]
+
+
+def timeframe_to_ms(timeframe: str) -> int:
+    """'5m', '1h' 같은 타임프레임 문자열을 밀리초로 변환"""
+    try:
+        amount, unit = int(timeframe[:-1]), timeframe[-1]
+        return amount * _UNIT_MS[unit]
+    except (ValueError, KeyError, IndexError):
+        raise ValueError(f"지원하지 않는 타임프레임: {timeframe}")
+
+
+def bucket_start(timestamps_ms: np.ndarray, timeframe: str) -> np.ndarray:
+    """각 타임스탬프가 속한 상위 봉의 시작 시각 (ms)"""
+    tf_ms = timeframe_to_ms(timeframe)
+    offset = _WEEK_OFFSET_MS if timeframe.endswith("w") else 0
+    return (timestamps_ms - offset) // tf_ms * tf_ms + offset
+
+
+def index_to_ms(index: pd.DatetimeIndex) -> np.ndarray:
+    """DatetimeIndex -> epoch 밀리초 배열"""
+    return index.asi8 // 1_000_000
+
+
+def resample_ohlcv(
+    df: pd.DataFrame,
+    timeframe: str,
+    base_timeframe: str = "1m",
+    drop_partial: bool = False,
+) -> pd.DataFrame:
+    """기본 캔들 DataFrame을 상위 타임프레임으로 벡터화 리샘플링
+
+    drop_partial=True면 기본 봉 개수가 모자란 마지막 (진행 중) 봉을 제외한다.
+    결과에는 구성 봉 개수(candles) 컬럼이 포함된다.
+    """
+    tf_ms = timeframe_to_ms(timeframe)
+    base_ms = timeframe_to_ms(base_timeframe)
+    if tf_ms % base_ms:
+        raise ValueError(f"{timeframe}은 {base_timeframe}의 배수가 아닙니다")
+    if len(df) == 0:
+        return pd.DataFrame(columns=OHLCV_COLUMNS + ["candles"], index=df.index[:0])
+
+    buckets = bucket_start(index_to_ms(df.index), timeframe)
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(buckets)) + 1))
+    ends = np.append(starts[1:], len(buckets))
+
+    resampled = pd.DataFrame(
+        {
+            "open": df["open"].to_numpy()[starts],
+            "high": np.maximum.reduceat(df["high"].to_numpy(), starts),
+            "low": np.minimum.reduceat(df["low"].to_numpy(), starts),
+            "close": df["close"].to_numpy()[ends - 1],
+            "volume": np.add.reduceat(df["volume"].to_numpy(), starts),
+            "candles": ends - starts,
+        },
+        index=pd.to_datetime(buckets[starts], unit="ms"),
+    )
+    resampled.index.name = df.index.name
+
+    if drop_partial and resampled["candles"].iloc[-1] < tf_ms // base_ms:
+        resampled = resampled.iloc[:-1]
+    return resampled
+
+
+def alignment_index(
+    base_index: pd.DatetimeIndex,
+    higher_index: pd.DatetimeIndex,
+    base_timeframe: str,
+    timeframe: str,
+) -> np.ndarray:
+    """기본 봉마다 그 봉 마감 시점에 이미 마감된 최신 상위 봉의 위치 (없으면 -1)"""
+    base_close = index_to_ms(base_index) + timeframe_to_ms(base_timeframe)
+    higher_close = index_to_ms(higher_index) + timeframe_to_ms(timeframe)
+    return np.searchsorted(higher_close, base_close, side="right") - 1
+
+
+def align_to_base(
+    higher: pd.DataFrame,
+    base_index: pd.DatetimeIndex,
+    base_timeframe: str,
+    timeframe: str,
+) -> pd.DataFrame:
+    """상위 봉 컬럼을 기본 봉 인덱스에 맞춰 전달 (미래 참조 없음)"""
+    positions = alignment_index(base_index, higher.index, base_timeframe, timeframe)
+    valid = positions >= 0
+    aligned = {}
+    for column in higher.columns:
+        values = higher[column].to_numpy(dtype=np.float64)
+        out = np.full(len(base_index), np.nan)
+        out[valid] = values[positions[valid]]
+        aligned[column] = out
+    return pd.DataFrame(aligned, index=base_index)
+
+
+class IncrementalResampler:
+    """실시간 기본 캔들을 상위 타임프레임 봉으로 누적
+
+    봉은 [timestamp, open, high, low, close, volume, candles] 리스트다. 기본 봉 개수가
+    다 차거나 다음 상위 봉의 기본 캔들이 들어오면 마감한다 (resample_ohlcv와 같은 값).
+    """
+
+    def __init__(self, timeframe: str, base_timeframe: str = "1m"):
+        tf_ms = timeframe_to_ms(timeframe)
+        base_ms = timeframe_to_ms(base_timeframe)
+        if tf_ms % base_ms:
+            raise ValueError(f"{timeframe}은 {base_timeframe}의 배수가 아닙니다")
+        self.timeframe = timeframe
+        self.base_timeframe = base_timeframe
+        self.expected_candles = tf_ms // base_ms
+        self._current: Optional[List[float]] = None
+        self._last_base_ts: Optional[int] = None
+
+    @classmethod
+    def from_state(
+        cls, data: Optional[Dict[str, Any]], timeframe: str, base_timeframe: str
+    ) -> Optional["IncrementalResampler"]:
+        """to_state()로 저장한 누적 상태 복원 (없으면 None)"""
+        if not data or data.get("last") is None:
+            return None
+        resampler = cls(timeframe, base_timeframe)
+        resampler._last_base_ts = int(data["last"])
+        resampler._current = list(data["current"]) if data.get("current") else None
+        return resampler
+
+    def to_state(self) -> Dict[str, Any]:
+        return {"last": self._last_base_ts, "current": self.partial}
+
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        """마지막으로 누적한 기본 캔들 시각 (ms)"""
+        return self._last_base_ts
+
+    @property
+    def partial(self) -> Optional[List[float]]:
+        """진행 중인 상위 봉 [timestamp, open, high, low, close, volume, candles]"""
+        return list(self._current) if self._current else None
+
+    def update(self, candle: List[float]) -> List[List[float]]:
+        """기본 캔들 [timestamp_ms, o, h, l, c, v] 추가, 마감된 상위 봉 리스트 반환
+
+        같은 타임스탬프 캔들이 다시 들어오면 (진행 중 봉 갱신) 덮어쓰지 않고 무시하므로
+        마감된 기본 캔들만 전달해야 한다.
+        """
+        timestamp = int(candle[0])
+        if self._last_base_ts is not None and timestamp <= self._last_base_ts:
+            return []
+        self._last_base_ts = timestamp
+
+        start = int(bucket_start(np.array([timestamp]), self.timeframe)[0])
+        closed = []
+        if self._current is not None and self._current[0] != start:
+            closed.append(self._current)
+            self._current = None
+
+        _, open_, high, low, close, volume = candle[:6]
+        if self._current is None:
+            self._current = [start, open_, high, low, close, volume, 1]
+        else:
+            current = self._current
+            current[2] = max(current[2], high)
+            current[3] = min(current[3], low)
+            current[4] = close
+            current[5] += volume
+            current[6] += 1
+
+        # 마지막 기본 봉까지 채워졌으면 바로 마감
+        if self._current[6] >= self.expected_candles:
+            closed.append(self._current)
+            self._current = None
+        return closed
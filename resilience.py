@@ -0,0 +1,325 @@
+"""
+거래소 호출 복원력 계층
+
+ResilientExchange는 ccxt 거래소를 감싸 일시적인 네트워크 오류 하나로 10분 주기
+실행 전체가 중단되지 않도록 한다.
+- 읽기(fetch_*, load_markets)와 cancel_order: 지터를 넣은 지수 백오프로 제한 횟수 재시도
+- create_order: clientOrderId를 붙여 보내고, 실패하면 같은 ID로 주문을 조회해
+  이미 접수된 주문은 다시 보내지 않는다 (멱등 재시도). 조회까지 마감 시간 안에
+  실패하면 접수 여부를 모르므로 다시 보내지 않고 OrderStateUnknown을 낸다
+- hedge_after: 지정한 느린 읽기가 이 시간 안에 응답하지 않으면 같은 요청을 하나 더
+  보내 먼저 온 응답을 사용한다
+- 서킷 브레이커: 메서드별 연속 실패가 failure_threshold에 이르면 reset_seconds 동안
+  호출하지 않고 CircuitOpen을 낸다
+- start_cycle(): 한 번의 매매 판단 주기 전체 마감 시간. 재시도 대기는 남은 시간 안에서만
+  하고, 시간이 없으면 DeadlineExceeded를 낸다
+
+CircuitOpen/DeadlineExceeded/OrderStateUnknown은 ccxt.NetworkError 하위 클래스라 기존 오류 처리에서 그대로
+네트워크 오류로 다뤄진다.
+"""
+
+import itertools
+import logging
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Optional
+
+import ccxt
+
+logger = logging.getLogger(__name__)
+
+# 바이낸스 clientOrderId 허용 형식: ^[.A-Z:/a-z0-9_-]{1,36}$
+CLIENT_ORDER_PREFIX = "bot-"
+RETRIED_METHODS = ("load_markets", "cancel_order")
+DEFAULT_HEDGED_METHODS = ("fetch_ticker", "fetch_order_book", "fetch_ohlcv")
+
+
+class DeadlineExceeded(ccxt.RequestTimeout):
+    """매매 판단 주기 마감 시간 초과"""
+
+
+class CircuitOpen(ccxt.ExchangeNotAvailable):
+    """연속 실패로 차단된 엔드포인트 호출"""
+
+
+class OrderStateUnknown(ccxt.NetworkError):
+    """주문 접수/체결 여부를 확인하지 못함 (다시 보내면 중복 체결 위험)"""
+
+
+class Deadline:
+    """주기 전체 마감 시각"""
+
+    def __init__(self, seconds: Optional[float], clock=time.monotonic):
+        self._clock = clock
+        self.expires_at = None if seconds is None else clock() + seconds
+
+    def remaining(self) -> float:
+        if self.expires_at is None:
+            return float("inf")
+        return self.expires_at - self._clock()
+
+    def check(self, what: str) -> None:
+        if self.remaining() <= 0:
+            raise DeadlineExceeded(f"{what}: 주기 마감 시간을 넘었습니다")
+
+
+class RetryPolicy:
+    """지터를 넣은 지수 백오프 (full jitter)"""
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        rng: Optional[random.Random] = None,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._rng = rng or random.Random()
+
+    def delay(self, attempt: int) -> float:
+        """attempt번째(0부터) 실패 후 대기 시간"""
+        return self._rng.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+class CircuitBreaker:
+    """연속 실패 횟수 기반 서킷 브레이커 (closed -> open -> half_open)"""
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_seconds: float = 60.0,
+        clock=time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self._clock() - self.opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """호출해도 되는지 (half_open이면 시험 호출 허용)"""
+        return self.state != "open"
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                # half_open 시험 호출 실패도 다시 reset_seconds 동안 차단
+                self.opened_at = self._clock()
+
+
+class ResilientExchange:
+    """재시도/멱등 주문/헤지 요청/서킷 브레이커/주기 마감 시간을 적용하는 프록시"""
+
+    def __init__(
+        self,
+        exchange,
+        retry: Optional[RetryPolicy] = None,
+        failure_threshold: int = 5,
+        reset_seconds: float = 60.0,
+        hedge_after: Optional[float] = None,
+        hedged_methods: Iterable[str] = DEFAULT_HEDGED_METHODS,
+        cycle_seconds: Optional[float] = None,
+        clock=time.monotonic,
+        sleep=time.sleep,
+    ):
+        self._exchange = exchange
+        self._retry = retry or RetryPolicy()
+        if self._retry.max_attempts < 1:
+            raise ValueError("max_attempts는 1 이상이어야 합니다")
+        self._failure_threshold = failure_threshold
+        self._reset_seconds = reset_seconds
+        self._hedge_after = hedge_after
+        self._hedged_methods = set(hedged_methods)
+        self._cycle_seconds = cycle_seconds
+        self._clock = clock
+        self._sleep = sleep
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._deadline = Deadline(None, clock)
+
+    @classmethod
+    def from_config(cls, exchange, config: Dict[str, Any]) -> "ResilientExchange":
+        """resilience 설정 섹션으로 생성"""
+        return cls(
+            exchange,
+            RetryPolicy(
+                max_attempts=config.get("max_attempts", 4),
+                base_delay=config.get("base_delay", 0.5),
+                max_delay=config.get("max_delay", 8.0),
+            ),
+            failure_threshold=config.get("failure_threshold", 5),
+            reset_seconds=config.get("reset_seconds", 60.0),
+            hedge_after=config.get("hedge_after"),
+            hedged_methods=config.get("hedged_methods", DEFAULT_HEDGED_METHODS),
+            cycle_seconds=config.get("cycle_deadline_seconds"),
+        )
+
+    def start_cycle(self, seconds: Optional[float] = None) -> Deadline:
+        """새 매매 판단 주기 시작 (seconds 기본값은 cycle_deadline_seconds)"""
+        self._deadline = Deadline(
+            self._cycle_seconds if seconds is None else seconds, self._clock
+        )
+        return self._deadline
+
+    def breaker(self, method: str) -> CircuitBreaker:
+        if method not in self._breakers:
+            self._breakers[method] = CircuitBreaker(
+                self._failure_threshold, self._reset_seconds, self._clock
+            )
+        return self._breakers[method]
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        attr = getattr(self._exchange, name)
+        if not callable(attr):
+            return attr
+
+        if name == "create_order":
+            return self._create_order
+        if name.startswith("fetch_") or name in RETRIED_METHODS:
+
+            def retried(*args, **kwargs):
+                call = lambda: attr(*args, **kwargs)  # noqa: E731
+                if self._hedge_after is not None and name in self._hedged_methods:
+                    return self._with_retry(name, lambda: self._hedged(name, call))
+                return self._with_retry(name, call)
+
+            return retried
+        return attr
+
+    def _with_retry(self, method: str, call: Callable[[], Any]) -> Any:
+        breaker = self.breaker(method)
+        for attempt in range(self._retry.max_attempts):
+            self._deadline.check(method)
+            if not breaker.allow():
+                raise CircuitOpen(f"{method}: 연속 {breaker.failures}회 실패로 호출을 차단했습니다")
+            try:
+                result = call()
+            except ccxt.NetworkError as e:
+                if isinstance(e, (DeadlineExceeded, CircuitOpen, OrderStateUnknown)):
+                    raise
+                breaker.record_failure()
+                if attempt + 1 >= self._retry.max_attempts:
+                    raise
+                delay = self._retry.delay(attempt)
+                if delay >= self._deadline.remaining():
+                    raise DeadlineExceeded(f"{method}: 재시도할 시간이 없습니다 ({e})") from e
+                logger.warning(
+                    f"{method} 실패 ({type(e).__name__}: {e}), "
+                    f"{delay:.2f}초 후 재시도 {attempt + 1}/{self._retry.max_attempts - 1}"
+                )
+                self._sleep(delay)
+                continue
+            breaker.record_success()
+            return result
+
+    def _hedged(self, method: str, call: Callable[[], Any]) -> Any:
+        """hedge_after 안에 응답이 없으면 같은 요청을 하나 더 보내 먼저 온 응답 사용"""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=4, thread_name_prefix="hedged-read"
+            )
+        pending = {self._pool.submit(call)}
+        done, pending = wait(pending, timeout=self._hedge_after)
+        if not done:
+            logger.info(f"{method} 응답 지연 ({self._hedge_after}초), 헤지 요청 전송")
+            pending.add(self._pool.submit(call))
+
+        error = None
+        while done or pending:
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+            if not pending:
+                break
+            timeout = self._deadline.remaining()
+            done, pending = wait(
+                pending,
+                timeout=None if timeout == float("inf") else max(timeout, 0),
+                return_when=FIRST_COMPLETED,
+            )
+            if not done:
+                raise DeadlineExceeded(f"{method}: 주기 마감 시간을 넘었습니다")
+        raise error
+
+    def _create_order(self, symbol, type, side, amount, price=None, params=None):
+        """clientOrderId로 멱등 재시도하는 주문 생성"""
+        params = dict(params or {})
+        client_id = params.setdefault(
+            "clientOrderId", CLIENT_ORDER_PREFIX + uuid.uuid4().hex[:28]
+        )
+
+        attempts = []
+
+        def submit():
+            attempts.append(client_id)
+            try:
+                return self._exchange.create_order(
+                    symbol, type, side, amount, price, params
+                )
+            except (ccxt.NetworkError, ccxt.InvalidOrder) as e:
+                # 응답만 유실되고 접수됐을 수 있으므로 같은 ID로 조회
+                # (재시도가 중복 clientOrderId로 거부된 경우 포함)
+                if isinstance(e, ccxt.InvalidOrder) and len(attempts) == 1:
+                    raise
+                existing = self._find_order(symbol, client_id)
+                if existing is not None:
+                    logger.info(f"주문 {client_id}은 이미 접수되었습니다")
+                    return existing
+                raise
+
+        return self._with_retry("create_order", submit)
+
+    def _find_order(self, symbol: str, client_id: str) -> Optional[Dict[str, Any]]:
+        """clientOrderId로 주문 조회 (접수되지 않았으면 None)
+
+        바이낸스는 미체결 주문 사이에서만 clientOrderId 중복을 거부하므로, 이미 체결된
+        주문을 같은 ID로 다시 보내면 두 번 체결된다. 그래서 조회는 주기 마감 시간까지
+        (마감 시간이 없으면 max_attempts번) 재시도하고, 끝내 모르면 OrderStateUnknown을
+        낸다. 거래 봇은 다음 주기에 기준 통화 잔고 변화로 체결분을 대사한다.
+        """
+        for attempt in itertools.count():
+            try:
+                return self._exchange.fetch_order(
+                    None, symbol, {"clientOrderId": client_id}
+                )
+            except ccxt.OrderNotFound:
+                return None
+            except ccxt.NetworkError as e:
+                error = e
+
+            delay = self._retry.delay(attempt)
+            if delay >= self._deadline.remaining() or (
+                self._deadline.expires_at is None
+                and attempt + 1 >= self._retry.max_attempts
+            ):
+                raise OrderStateUnknown(
+                    f"주문 {client_id} 상태를 확인하지 못해 다시 보내지 않습니다 ({error})"
+                ) from error
+            logger.warning(
+                f"주문 {client_id} 조회 실패 ({type(error).__name__}: {error}), "
+                f"{delay:.2f}초 후 다시 조회"
+            )
+            self._sleep(delay)
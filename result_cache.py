@@ -0,0 +1,177 @@
+"""
+백테스트 결과 캐시
+
+(실행 파라미터, 엔진 버전, 캔들 데이터 fingerprint)를 해시한 키로 끝난 백테스트의
+거래 내역/자산 곡선/성과 지표를 디스크에 저장한다. 키 구성 요소 중 하나라도 바뀌면
+다른 키가 되므로 별도 무효화 없이 다시 계산된다.
+
+이미 끝난 기간(종료일이 오늘 이전)은 캔들이 바뀌지 않으므로 (심볼, 타임프레임, 기간)
+-> fingerprint 색인을 남겨 두고, 다음 실행에서는 데이터 조회 없이 결과를 찾는다.
+
+파일 레이아웃: {root}/{key}.json (거래 내역, 지표), {root}/{key}.npz (자산 곡선)
+"""
+
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from indicator_cache import fingerprint
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESULT_CACHE_DIR = "data/backtest_cache"
+DATA_INDEX_FILE = "data_index.json"
+CURVE_FIELDS = ("balance", "position_value", "total_value")
+
+
+def data_fingerprint(df: pd.DataFrame) -> str:
+    """OHLCV DataFrame(인덱스 포함) fingerprint"""
+    columns = ["open", "high", "low", "close", "volume"]
+    values = np.column_stack(
+        [df.index.asi8.astype(np.float64)]
+        + [df[c].to_numpy(np.float64) for c in columns]
+    )
+    return fingerprint(values)
+
+
+def run_key(run_params: Dict[str, Any], engine_version: Any, data_fp: str) -> str:
+    """실행 파라미터/엔진 버전/데이터 fingerprint로 캐시 키 생성"""
+    payload = json.dumps(
+        {"params": run_params, "engine": engine_version, "data": data_fp},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def is_closed_range(end_date: str) -> bool:
+    """종료일이 오늘 이전이면 캔들이 더 바뀌지 않는 구간"""
+    return pd.Timestamp(end_date).date() < datetime.utcnow().date()
+
+
+class ResultCache:
+    """디스크 백테스트 결과 캐시"""
+
+    def __init__(self, root: str = DEFAULT_RESULT_CACHE_DIR):
+        self.root = root
+        os.makedirs(self.root, exist_ok=True)
+
+    @classmethod
+    def from_config(cls, backtest_config: Dict[str, Any]) -> "ResultCache":
+        """backtest 설정 섹션으로 생성"""
+        return cls(backtest_config.get("result_cache_dir", DEFAULT_RESULT_CACHE_DIR))
+
+    # 데이터 색인 (기간 -> fingerprint)
+    def lookup_data(self, data_id: Tuple[Any, ...]) -> Optional[str]:
+        return self._read_index().get(self._data_id_key(data_id))
+
+    def remember_data(self, data_id: Tuple[Any, ...], data_fp: str) -> None:
+        index = self._read_index()
+        index[self._data_id_key(data_id)] = data_fp
+        self._write_json(os.path.join(self.root, DATA_INDEX_FILE), index)
+
+    # 결과
+    def load(self, key: str) -> Optional[Tuple[dict, dict]]:
+        """(results, metrics) 반환, 없거나 손상되었으면 None"""
+        json_path, npz_path = self._paths(key)
+        if not (os.path.exists(json_path) and os.path.exists(npz_path)):
+            return None
+        try:
+            with open(json_path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+            with np.load(npz_path) as curves:
+                arrays = {name: curves[name] for name in curves.files}
+        except (OSError, ValueError) as e:
+            logger.warning(f"백테스트 캐시를 읽을 수 없습니다 ({key}): {e}")
+            return None
+
+        trades = []
+        for trade in payload["trades"]:
+            trade = dict(trade)
+            trade["timestamp"] = pd.Timestamp(trade["timestamp"])
+            trades.append(trade)
+
+        timestamps = pd.to_datetime(arrays["timestamp"], unit="ms")
+        balance_history = [
+            {
+                "timestamp": timestamp,
+                **{field: float(arrays[field][i]) for field in CURVE_FIELDS},
+            }
+            for i, timestamp in enumerate(timestamps)
+        ]
+        results = {
+            "trades": trades,
+            "balance_history": balance_history,
+            "position_history": [],
+            "equity": {
+                "timestamp": arrays["timestamp"],
+                "total_value": arrays["total_value"],
+                "position_value": arrays["position_value"],
+            },
+        }
+        logger.info(f"Loaded cached backtest result {key}")
+        return results, payload["metrics"]
+
+    def save(self, key: str, results: dict, metrics: dict) -> None:
+        json_path, npz_path = self._paths(key)
+        history = results["balance_history"]
+        arrays = {
+            "timestamp": np.array(
+                [h["timestamp"].value // 1_000_000 for h in history], dtype=np.int64
+            )
+        }
+        for field in CURVE_FIELDS:
+            arrays[field] = np.array([h[field] for h in history], dtype=np.float64)
+
+        trades = [
+            {**trade, "timestamp": trade["timestamp"].isoformat()}
+            for trade in results["trades"]
+        ]
+        try:
+            tmp_npz = f"{npz_path}.{os.getpid()}.tmp.npz"
+            np.savez(tmp_npz, **arrays)
+            os.replace(tmp_npz, npz_path)
+            # json을 마지막에 써서 load 시 두 파일이 모두 완성된 상태만 보이게 함
+            self._write_json(json_path, {"trades": trades, "metrics": metrics})
+        except OSError as e:
+            logger.warning(f"백테스트 캐시 저장 실패 ({key}): {e}")
+
+    def _paths(self, key: str) -> Tuple[str, str]:
+        base = os.path.join(self.root, key)
+        return f"{base}.json", f"{base}.npz"
+
+    @staticmethod
+    def _data_id_key(data_id: Tuple[Any, ...]) -> str:
+        return "|".join(str(part) for part in data_id)
+
+    def _read_index(self) -> Dict[str, str]:
+        path = os.path.join(self.root, DATA_INDEX_FILE)
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _write_json(path: str, payload: Dict[str, Any]) -> None:
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, default=_json_default)
+        os.replace(tmp_path, path)
+
+
+def _json_default(value):
+    # 지표/거래 값에 섞인 numpy 스칼라 변환
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
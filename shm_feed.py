@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+"""
+공유 메모리 캔들 피드 (신호 모니터)
+
+같은 심볼에서 여러 전략/파라미터 조합의 실시간 신호를 나란히 지켜볼 때, 피드 프로세스
+하나만 거래소에서 캔들을 받아 기본 지표와 함께 multiprocessing.shared_memory 링 버퍼에 쓰고,
+전략 워커 프로세스들은 락 없이 읽어 각자 다른 코어에서 신호를 계산한다. 거래소 조회와
+데이터 사본은 하나뿐이다.
+
+워커는 마지막 봉의 매수/매도 신호만 피드 프로세스로 보고하며 주문, 포지션, 상태 저장은
+하지 않는다. 실거래는 조합 하나를 골라 TradingBot(trade.py/fargate_main.py)으로 실행한다.
+
+링 버퍼 레이아웃 (HEADER_BYTES 헤더 + 열 배열)
+- 헤더: int64 카운터(seq, count, updated_ms, meta_len) + 열 이름/용량 등 JSON 메타데이터
+- timestamps: int64[capacity], values: float64[capacity, 열 수]
+  (open, high, low, close, volume, 그리고 IndicatorSpec.column 이름의 지표 열)
+
+동기화는 seqlock이다. 쓰는 쪽은 seq를 홀수로 올리고 쓴 뒤 다시 짝수로 올린다. 읽는 쪽은
+seq가 짝수일 때 복사하고, 복사 전후 seq가 같을 때만 결과를 쓴다 (다르면 다시 읽음).
+쓰는 쪽은 피드 하나뿐이어야 한다.
+
+사용법:
+python shm_feed.py --param sma_short=5,sma_long=20 --param sma_short=7,sma_long=25
+EXCHANGE_FAKE=0 python shm_feed.py --param sma_short=5 --interval 1 --duration 10
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import time
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from candle_store import to_records
+from strategy import (
+    INDICATORS,
+    IndicatorSpec,
+    Strategy,
+    compute_indicator,
+    create_strategy,
+)
+
+logger = logging.getLogger(__name__)
+
+HEADER_BYTES = 4096
+COUNTER_BYTES = 64
+SEQ, COUNT, UPDATED_MS, META_LEN = range(4)
+BASE_COLUMNS = ("open", "high", "low", "close", "volume")
+DEFAULT_CAPACITY = 4096
+DEFAULT_LOOKBACK = 100
+SNAPSHOT_RETRIES = 10_000
+
+
+class FeedSnapshot(NamedTuple):
+    """링 버퍼에서 일관되게 복사한 최근 봉들"""
+
+    seq: int
+    timestamps: np.ndarray
+    values: np.ndarray
+    columns: Tuple[str, ...]
+
+    def column(self, name: str) -> np.ndarray:
+        return self.values[:, self.columns.index(name)]
+
+    @property
+    def close(self) -> np.ndarray:
+        return self.column("close")
+
+
+class CandleRing:
+    """shared_memory 캔들 링 버퍼 (쓰는 쪽 하나, 읽는 쪽 여럿)"""
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self._shm = shm
+        self._owner = owner
+        self._counters = np.ndarray((4,), dtype=np.int64, buffer=shm.buf)
+        meta_len = int(self._counters[META_LEN])
+        self.meta = json.loads(bytes(shm.buf[COUNTER_BYTES : COUNTER_BYTES + meta_len]))
+        self.columns: Tuple[str, ...] = tuple(self.meta["columns"])
+        self.capacity: int = self.meta["capacity"]
+        self._timestamps = np.ndarray(
+            (self.capacity,), dtype=np.int64, buffer=shm.buf, offset=HEADER_BYTES
+        )
+        self._values = np.ndarray(
+            (self.capacity, len(self.columns)),
+            dtype=np.float64,
+            buffer=shm.buf,
+            offset=HEADER_BYTES + self._timestamps.nbytes,
+        )
+
+    @classmethod
+    def create(
+        cls,
+        capacity: int,
+        columns: Iterable[str],
+        name: Optional[str] = None,
+        **meta: Any,
+    ) -> "CandleRing":
+        columns = tuple(columns)
+        encoded = json.dumps(
+            {**meta, "capacity": capacity, "columns": columns}
+        ).encode()
+        if len(encoded) > HEADER_BYTES - COUNTER_BYTES:
+            raise ValueError("링 버퍼 메타데이터가 헤더보다 큽니다 (지표 열 수 확인)")
+        size = HEADER_BYTES + capacity * 8 * (1 + len(columns))
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        counters = np.ndarray((4,), dtype=np.int64, buffer=shm.buf)
+        counters[:] = (0, 0, 0, len(encoded))
+        shm.buf[COUNTER_BYTES : COUNTER_BYTES + len(encoded)] = encoded
+        del counters
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "CandleRing":
+        """다른 프로세스가 만든 링 버퍼에 연결 (정리는 만든 쪽 책임)
+
+        피드가 multiprocessing으로 띄운 워커는 resource_tracker를 공유하므로 안전하다.
+        무관한 프로세스에서 연결하면 그 프로세스 종료 시 세그먼트가 지워질 수 있다.
+        """
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def seq(self) -> int:
+        return int(self._counters[SEQ])
+
+    @property
+    def count(self) -> int:
+        """지금까지 쓴 봉 수 (용량을 넘으면 오래된 봉부터 덮어씀)"""
+        return int(self._counters[COUNT])
+
+    def last_timestamp(self) -> Optional[int]:
+        count = self.count
+        return int(self._timestamps[(count - 1) % self.capacity]) if count else None
+
+    def write(self, timestamps: np.ndarray, values: np.ndarray) -> int:
+        """정렬된 봉들 기록 (쓰는 쪽 전용), 새로 추가한 봉 수 반환
+
+        마지막 봉과 같은 시각은 덮어쓰고(진행 중 봉 갱신), 더 이전 봉은 무시한다.
+        """
+        last = self.last_timestamp()
+        if last is not None:
+            keep = timestamps >= last
+            timestamps, values = timestamps[keep], values[keep]
+        if len(timestamps) == 0:
+            return 0
+
+        count = self.count
+        start = count - 1 if last is not None and timestamps[0] == last else count
+        slots = np.arange(start, start + len(timestamps)) % self.capacity
+        self._counters[SEQ] += 1  # 홀수: 쓰는 중
+        try:
+            self._timestamps[slots] = timestamps
+            self._values[slots] = values
+            self._counters[COUNT] = start + len(timestamps)
+            self._counters[UPDATED_MS] = int(time.time() * 1000)
+        finally:
+            self._counters[SEQ] += 1
+        return start + len(timestamps) - count
+
+    def snapshot(
+        self, n: Optional[int] = None, retries: int = SNAPSHOT_RETRIES
+    ) -> FeedSnapshot:
+        """최근 n개 봉(기본 전체)의 일관된 복사본"""
+        for _ in range(retries):
+            seq = self.seq
+            if seq & 1:
+                time.sleep(0)
+                continue
+            count = self.count
+            size = min(count, self.capacity, n if n is not None else count)
+            slots = np.arange(count - size, count) % self.capacity
+            timestamps = self._timestamps[slots]
+            values = self._values[slots]
+            if self.seq == seq:
+                return FeedSnapshot(seq, timestamps, values, self.columns)
+        raise TimeoutError("링 버퍼를 일관되게 읽지 못했습니다 (쓰기가 끝나지 않음)")
+
+    def wait(self, seq: int, timeout: float, interval: float = 0.005) -> bool:
+        """seq 이후 쓰기가 끝날 때까지 대기 (락 없이 폴링), 갱신 여부 반환"""
+        deadline = time.monotonic() + timeout
+        while True:
+            current = self.seq
+            if current != seq and not current & 1:
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(interval)
+
+    def close(self) -> None:
+        """버퍼 해제 (만든 쪽이면 세그먼트 삭제)"""
+        # 버퍼를 참조하는 배열을 먼저 놓아야 close 가능
+        del self._counters, self._timestamps, self._values
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+class SharedIndicators:
+    """피드가 미리 계산한 지표 열을 IndicatorCache 대신 제공 (없는 지표는 계산)"""
+
+    def __init__(self, snapshot: FeedSnapshot):
+        self.snapshot = snapshot
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(
+        self,
+        data_fingerprint: str,
+        kind: str,
+        params: Tuple[Any, ...],
+        compute: Callable[[], np.ndarray],
+    ) -> np.ndarray:
+        column = IndicatorSpec(kind, tuple(params)).column
+        if column in self.snapshot.columns:
+            self.hits += 1
+            return self.snapshot.column(column)
+        self.misses += 1
+        return compute()
+
+
+def evaluate_snapshot(strategy: Strategy, snapshot: FeedSnapshot) -> Tuple[bool, bool]:
+    """스냅샷 마지막 봉의 (매수, 매도) 신호 (피드 지표 사용)
+
+    지표는 각 봉의 구간 안 데이터에만 의존하므로 trade.py의 evaluate_latest와 같다.
+    """
+    if len(snapshot.timestamps) == 0:
+        return False, False
+    _, entry, exit_, _ = strategy.evaluate(snapshot.close, SharedIndicators(snapshot))
+    return bool(entry[-1]), bool(exit_[-1])
+
+
+class CandleFeed:
+    """거래소 캔들을 한 번만 받아 지표와 함께 링 버퍼에 쓰는 피드"""
+
+    def __init__(
+        self,
+        exchange,
+        symbol: str,
+        timeframe: str,
+        specs: Iterable[IndicatorSpec] = (),
+        capacity: int = DEFAULT_CAPACITY,
+        name: Optional[str] = None,
+    ):
+        self.exchange = exchange
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.specs = sorted(set(specs))
+        # 새 봉의 지표를 계산하는 데 필요한 이전 봉 수
+        self.lookback = max(
+            (spec.window + INDICATORS[spec.kind][1] for spec in self.specs), default=1
+        )
+        self.ring = CandleRing.create(
+            capacity,
+            BASE_COLUMNS + tuple(spec.column for spec in self.specs),
+            name=name,
+            symbol=symbol,
+            timeframe=timeframe,
+        )
+
+    @classmethod
+    def for_strategies(
+        cls, exchange, symbol: str, timeframe: str, strategies: List[Strategy], **kwargs
+    ) -> "CandleFeed":
+        """전략들이 쓰는 지표를 모두 미리 계산하는 피드"""
+        specs = [spec for strategy in strategies for spec in strategy.indicators()]
+        return cls(exchange, symbol, timeframe, specs, **kwargs)
+
+    def poll(self) -> int:
+        """마지막 봉 이후 캔들을 받아 기록, 새 봉 수 반환"""
+        last = self.ring.last_timestamp()
+        ohlcv = self.exchange.fetch_ohlcv(
+            self.symbol,
+            self.timeframe,
+            since=last,
+            limit=min(self.ring.capacity, 1000),
+        )
+        records = to_records(ohlcv)
+        if last is not None:
+            records = records[records["timestamp"] >= last]
+        if len(records) == 0:
+            return 0
+
+        # 새 봉 앞의 이전 봉들을 붙여 지표 계산 (지표는 구간 안 데이터에만 의존)
+        history = self.ring.snapshot(self.lookback)
+        previous = history.close[history.timestamps < records["timestamp"][0]]
+        closes = np.concatenate([previous, records["close"]])
+        columns = [records[name] for name in BASE_COLUMNS]
+        for spec in self.specs:
+            columns.append(compute_indicator(spec, closes)[len(previous) :])
+        return self.ring.write(records["timestamp"], np.column_stack(columns))
+
+    def run(self, interval: float, stop) -> None:
+        """stop(Event)이 설정될 때까지 interval초마다 poll"""
+        while not stop.is_set():
+            try:
+                self.poll()
+            except Exception as e:
+                logger.error(f"캔들 피드 조회 실패: {e}")
+            stop.wait(interval)
+
+    def close(self) -> None:
+        self.ring.close()
+
+
+def run_worker(
+    name: str,
+    ring_name: str,
+    trading_config: Dict[str, Any],
+    params: Dict[str, Any],
+    stop,
+    results,
+    lookback: Optional[int] = None,
+) -> None:
+    """전략 워커 프로세스: 링 버퍼가 갱신될 때마다 마지막 봉 신호를 results에 보냄
+
+    신호 보고 전용이며 주문은 내지 않는다.
+    """
+    ring = CandleRing.attach(ring_name)
+    strategy = create_strategy(trading_config, params)
+    lookback = lookback or max(DEFAULT_LOOKBACK, strategy.warmup)
+    seq = 0
+    try:
+        while not stop.is_set():
+            if not ring.wait(seq, timeout=0.5):
+                continue
+            snapshot = ring.snapshot(lookback)
+            seq = snapshot.seq
+            entry, exit_ = evaluate_snapshot(strategy, snapshot)
+            results.put(
+                {
+                    "worker": name,
+                    "params": params,
+                    "timestamp": int(snapshot.timestamps[-1]),
+                    "close": float(snapshot.close[-1]),
+                    "entry": entry,
+                    "exit": exit_,
+                }
+            )
+    finally:
+        ring.close()
+
+
+def run_group(
+    exchange,
+    symbol: str,
+    timeframe: str,
+    trading_config: Dict[str, Any],
+    param_sets: List[Dict[str, Any]],
+    interval: float,
+    on_signal: Callable[[Dict[str, Any]], None],
+    duration: Optional[float] = None,
+    capacity: int = DEFAULT_CAPACITY,
+) -> None:
+    """피드 하나와 파라미터 조합별 워커 프로세스 실행 (duration초 뒤 또는 Ctrl+C로 종료)"""
+    strategies = [create_strategy(trading_config, params) for params in param_sets]
+    feed = CandleFeed.for_strategies(
+        exchange, symbol, timeframe, strategies, capacity=capacity
+    )
+    context = multiprocessing.get_context("spawn")
+    stop = context.Event()
+    results = context.Queue()
+    workers = [
+        context.Process(
+            target=run_worker,
+            args=(
+                f"strategy-{i}",
+                feed.ring.name,
+                trading_config,
+                params,
+                stop,
+                results,
+            ),
+            name=f"strategy-{i}",
+            daemon=True,
+        )
+        for i, params in enumerate(param_sets)
+    ]
+    logger.info(
+        f"캔들 피드 시작: {symbol} {timeframe}, 워커 {len(workers)}개, "
+        f"지표 열 {len(feed.specs)}개 (shm: {feed.ring.name})"
+    )
+    deadline = None if duration is None else time.monotonic() + duration
+    try:
+        for worker in workers:
+            worker.start()
+        while deadline is None or time.monotonic() < deadline:
+            try:
+                feed.poll()
+            except Exception as e:
+                logger.error(f"캔들 피드 조회 실패: {e}")
+            # 다음 조회까지 워커 결과 전달
+            next_poll = time.monotonic() + interval
+            while time.monotonic() < next_poll:
+                try:
+                    on_signal(
+                        results.get(timeout=max(0.0, next_poll - time.monotonic()))
+                    )
+                except queue.Empty:
+                    break
+    except KeyboardInterrupt:
+        logger.info("캔들 피드 중단")
+    finally:
+        stop.set()
+        for worker in workers:
+            if worker.pid is not None:
+                worker.join(timeout=5)
+        feed.close()
+
+
+def parse_params(text: str) -> Dict[str, Any]:
+    """key=v,key=v -> 전략 파라미터"""
+    params = {}
+    for item in filter(None, text.split(",")):
+        key, _, value = item.partition("=")
+        if not value:
+            raise ValueError(f"잘못된 --param 형식: {text} (예: sma_short=5,sma_long=20)")
+        params[key] = float(value) if "." in value else int(value)
+    return params
+
+
+def main():
+    from config_loader import config_loader
+
+    parser = argparse.ArgumentParser(
+        description="Shared-memory candle feed signal monitor (no orders)"
+    )
+    parser.add_argument(
+        "--param",
+        action="append",
+        default=[],
+        metavar="K=V,K=V",
+        help="Strategy parameter set for one worker (repeatable)",
+    )
+    parser.add_argument("--interval", type=float, default=10.0, help="Poll seconds")
+    parser.add_argument("--duration", type=float, default=None, help="Stop after N s")
+    parser.add_argument("--capacity", type=int, default=DEFAULT_CAPACITY)
+    args = parser.parse_args()
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+
+    config = config_loader.get_trading_snapshot()
+    fake_seed = os.getenv("EXCHANGE_FAKE")
+    if fake_seed is not None:
+        from fake_exchange import FakeExchange
+
+        exchange = FakeExchange(config.symbol, config.timeframe, seed=int(fake_seed))
+    else:
+        import ccxt
+
+        exchange = ccxt.binance({"enableRateLimit": True})
+
+    def on_signal(signal: Dict[str, Any]) -> None:
+        flags = [name for name in ("entry", "exit") if signal[name]]
+        logger.info(
+            f"{signal['worker']} {signal['params']} close {signal['close']:.2f} "
+            f"{'/'.join(flags) or '-'}"
+        )
+
+    run_group(
+        exchange,
+        config.symbol,
+        config.timeframe,
+        config.to_dict(),
+        [parse_params(p) for p in args.param] or [{}],
+        args.interval,
+        on_signal,
+        args.duration,
+        args.capacity,
+    )
+
+
+if __name__ == "__main__":
+    main()
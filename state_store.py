@@ -1,14 +1,22 @@
 import json
 import logging
 import os
+import time
 from datetime import datetime
 from decimal import Decimal
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, List, Optional
 
 import boto3
 
 logger = logging.getLogger(__name__)
 
+# DynamoDB 배치 API 요청당 최대 항목 수
+DYNAMODB_BATCH_GET_LIMIT = 100
+DYNAMODB_BATCH_WRITE_LIMIT = 25
+# UnprocessedKeys/UnprocessedItems 재시도 설정
+DYNAMODB_MAX_RETRIES = 5
+DYNAMODB_RETRY_BASE_DELAY = 0.05
+
 
 def convert_floats_to_decimal(obj):
     """DynamoDB용으로 float를 Decimal로 변환"""
@@ -32,30 +40,96 @@ def convert_decimals_to_float(obj):
     return obj
 
 
+def encode_dynamodb_value(value: Any) -> Dict[str, Any]:
+    """파이썬 값을 DynamoDB 저수준 속성값으로 한 번에 변환
+
+    float는 Decimal을 거치지 않고 바로 "N" 문자열로 직렬화한다.
+    """
+    if value is None:
+        return {"NULL": True}
+    if isinstance(value, bool):
+        return {"BOOL": value}
+    if isinstance(value, (int, float, Decimal)):
+        return {"N": repr(value) if isinstance(value, float) else str(value)}
+    if isinstance(value, str):
+        return {"S": value}
+    if isinstance(value, dict):
+        return {"M": {k: encode_dynamodb_value(v) for k, v in value.items()}}
+    if isinstance(value, (list, tuple)):
+        return {"L": [encode_dynamodb_value(v) for v in value]}
+    raise TypeError(f"DynamoDB로 직렬화할 수 없는 타입: {type(value).__name__}")
+
+
+def decode_dynamodb_value(attribute: Dict[str, Any]) -> Any:
+    """DynamoDB 저수준 속성값을 파이썬 값으로 변환 (숫자는 int/float)"""
+    ((tag, value),) = attribute.items()
+    if tag == "N":
+        if "." in value or "e" in value or "E" in value:
+            return float(value)
+        return int(value)
+    if tag == "S" or tag == "BOOL":
+        return value
+    if tag == "NULL":
+        return None
+    if tag == "M":
+        return {k: decode_dynamodb_value(v) for k, v in value.items()}
+    if tag == "L":
+        return [decode_dynamodb_value(v) for v in value]
+    raise TypeError(f"지원하지 않는 DynamoDB 속성 타입: {tag}")
+
+
+def encode_dynamodb_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """상태 딕셔너리를 DynamoDB 저수준 Item으로 변환"""
+    return {k: encode_dynamodb_value(v) for k, v in item.items()}
+
+
+def decode_dynamodb_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """DynamoDB 저수준 Item을 상태 딕셔너리로 변환"""
+    return {k: decode_dynamodb_value(v) for k, v in item.items()}
+
+
+class StateLoadError(RuntimeError):
+    """저장소 조회 실패 (기본 상태로 대체하면 저장 시 실제 상태를 덮어쓰므로 예외로 전달)"""
+
+
+def _chunked(items: List[Any], size: int) -> Iterable[List[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
 class StateStore:
-    def __init__(self, use_s3: bool = True):
+    def __init__(self, use_s3: bool = True, local_dir: Optional[str] = None):
         """
         상태 저장소 초기화
         use_s3: True면 S3 사용, False면 DynamoDB 사용
+        local_dir: 지정하면 AWS 대신 이 디렉터리의 JSON 파일 사용 (로컬 실행/테스트)
         """
         self.use_s3 = use_s3
+        self.local_dir = local_dir
         self.trading_pair = "BTC/USDT"
 
-        if self.use_s3:
+        if self.local_dir:
+            os.makedirs(self.local_dir, exist_ok=True)
+        elif self.use_s3:
             self.s3_client = boto3.client("s3")
             self.bucket_name = os.getenv("S3_BUCKET")
-            self.object_key = (
-                f'trading_state_{self.trading_pair.replace("/", "_")}.json'
-            )
+            self.object_key = self.get_object_key(self.trading_pair)
         else:
             self.dynamodb = boto3.resource("dynamodb")
             self.table_name = os.getenv("DYNAMODB_TABLE")
             self.table = self.dynamodb.Table(self.table_name)
+            # 배치 API는 저수준 클라이언트로 호출 (자체 코덱 사용)
+            self.dynamodb_client = boto3.client("dynamodb")
+
+    @staticmethod
+    def get_object_key(trading_pair: str) -> str:
+        """거래쌍별 S3 오브젝트 키"""
+        return f'trading_state_{trading_pair.replace("/", "_")}.json'
 
-    def get_default_state(self) -> Dict[str, Any]:
+    def get_default_state(self, trading_pair: Optional[str] = None) -> Dict[str, Any]:
         """기본 상태 반환"""
         return {
-            "trading_pair": self.trading_pair,
+            "trading_pair": trading_pair or self.trading_pair,
             "position": None,  # {'buy_price': float, 'buy_amount': float, 'buy_time': str}
             "last_trade": None,  # 마지막 거래 정보
             "total_trades": 0,
@@ -66,36 +140,62 @@ class StateStore:
 
     def load_state_from_s3(self) -> Dict[str, Any]:
         """S3에서 상태 로드"""
+        return self._load_pair_from_s3(self.trading_pair)
+
+    def _load_pair_from_s3(self, trading_pair: str) -> Dict[str, Any]:
         try:
             response = self.s3_client.get_object(
-                Bucket=self.bucket_name, Key=self.object_key
+                Bucket=self.bucket_name, Key=self.get_object_key(trading_pair)
             )
             state_data = json.loads(response["Body"].read().decode("utf-8"))
-            logger.info("Trading state loaded from S3")
+            logger.info(f"Trading state loaded from S3 ({trading_pair})")
             return state_data
         except self.s3_client.exceptions.NoSuchKey:
             logger.info("No existing state found in S3, creating default state")
-            return self.get_default_state()
+            return self.get_default_state(trading_pair)
         except Exception as e:
             logger.error(f"Failed to load state from S3: {e}")
-            return self.get_default_state()
+            raise StateLoadError(f"S3 상태 조회 실패 ({trading_pair}): {e}") from e
 
     def save_state_to_s3(self, state: Dict[str, Any]) -> None:
         """S3에 상태 저장"""
-        try:
-            state["updated_at"] = datetime.now().isoformat()
+        state["updated_at"] = datetime.now().isoformat()
+        self._save_pair_to_s3(state)
 
+    def _save_pair_to_s3(self, state: Dict[str, Any]) -> None:
+        trading_pair = state.get("trading_pair", self.trading_pair)
+        try:
             self.s3_client.put_object(
                 Bucket=self.bucket_name,
-                Key=self.object_key,
+                Key=self.get_object_key(trading_pair),
                 Body=json.dumps(state, ensure_ascii=False, indent=2),
                 ContentType="application/json",
             )
-            logger.info("Trading state saved to S3")
+            logger.info(f"Trading state saved to S3 ({trading_pair})")
         except Exception as e:
             logger.error(f"Failed to save state to S3: {e}")
             raise
 
+    def _load_pair_from_file(self, trading_pair: str) -> Dict[str, Any]:
+        path = os.path.join(self.local_dir, self.get_object_key(trading_pair))
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                state_data = json.load(f)
+            logger.info(f"Trading state loaded from {path}")
+            return state_data
+        except FileNotFoundError:
+            logger.info("No existing local state found, creating default state")
+            return self.get_default_state(trading_pair)
+
+    def _save_pair_to_file(self, state: Dict[str, Any]) -> None:
+        trading_pair = state.get("trading_pair", self.trading_pair)
+        path = os.path.join(self.local_dir, self.get_object_key(trading_pair))
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+        logger.info(f"Trading state saved to {path}")
+
     def load_state_from_dynamodb(self) -> Dict[str, Any]:
         """DynamoDB에서 상태 로드"""
         try:
@@ -113,32 +213,132 @@ class StateStore:
                 return self.get_default_state()
         except Exception as e:
             logger.error(f"Failed to load state from DynamoDB: {e}")
-            return self.get_default_state()
+            raise StateLoadError(f"DynamoDB 상태 조회 실패: {e}") from e
 
     def save_state_to_dynamodb(self, state: Dict[str, Any]) -> None:
         """DynamoDB에 상태 저장"""
         try:
             state["updated_at"] = datetime.now().isoformat()
-            
+
             # float를 Decimal로 변환
             dynamodb_state = convert_floats_to_decimal(state)
-            
+
             self.table.put_item(Item=dynamodb_state)
             logger.info("Trading state saved to DynamoDB")
         except Exception as e:
             logger.error(f"Failed to save state to DynamoDB: {e}")
             raise
 
+    def _batch_get_from_dynamodb(self, pairs: List[str]) -> Dict[str, Dict[str, Any]]:
+        """batch_get_item으로 여러 거래쌍 상태 조회 (UnprocessedKeys 재시도)"""
+        items = {}
+        for chunk in _chunked(pairs, DYNAMODB_BATCH_GET_LIMIT):
+            request = {
+                self.table_name: {
+                    "Keys": [{"trading_pair": {"S": pair}} for pair in chunk]
+                }
+            }
+            for attempt in range(DYNAMODB_MAX_RETRIES + 1):
+                response = self.dynamodb_client.batch_get_item(RequestItems=request)
+                for raw_item in response.get("Responses", {}).get(self.table_name, []):
+                    item = decode_dynamodb_item(raw_item)
+                    items[item["trading_pair"]] = item
+
+                request = response.get("UnprocessedKeys") or {}
+                if not request:
+                    break
+                if attempt < DYNAMODB_MAX_RETRIES:
+                    time.sleep(DYNAMODB_RETRY_BASE_DELAY * (2**attempt))
+            else:
+                unprocessed = len(request[self.table_name]["Keys"])
+                raise RuntimeError(f"batch_get_item 미처리 키 {unprocessed}개 재시도 초과")
+        return items
+
+    def _batch_write_to_dynamodb(self, items: List[Dict[str, Any]]) -> None:
+        """batch_write_item으로 여러 상태 저장 (UnprocessedItems 재시도)"""
+        for chunk in _chunked(items, DYNAMODB_BATCH_WRITE_LIMIT):
+            request = {
+                self.table_name: [
+                    {"PutRequest": {"Item": encode_dynamodb_item(item)}}
+                    for item in chunk
+                ]
+            }
+            for attempt in range(DYNAMODB_MAX_RETRIES + 1):
+                response = self.dynamodb_client.batch_write_item(RequestItems=request)
+                request = response.get("UnprocessedItems") or {}
+                if not request:
+                    break
+                if attempt < DYNAMODB_MAX_RETRIES:
+                    time.sleep(DYNAMODB_RETRY_BASE_DELAY * (2**attempt))
+            else:
+                unprocessed = len(request[self.table_name])
+                raise RuntimeError(f"batch_write_item 미처리 항목 {unprocessed}개 재시도 초과")
+
+    def load_states(self, pairs: List[str]) -> Dict[str, Dict[str, Any]]:
+        """여러 거래쌍 상태 일괄 로드 (없는 거래쌍은 기본 상태, 조회 오류는 예외)"""
+        pairs = list(dict.fromkeys(pairs))
+        if not pairs:
+            return {}
+
+        if self.local_dir:
+            return {pair: self._load_pair_from_file(pair) for pair in pairs}
+
+        if self.use_s3:
+            # S3는 배치 조회 API가 없으므로 거래쌍별 오브젝트를 조회
+            states = {}
+            for pair in pairs:
+                states[pair] = self._load_pair_from_s3(pair)
+            return states
+
+        # 조회 실패 시 기본 상태로 대체하면 저장할 때 실제 상태를 덮어쓰므로 예외를 그대로 전달
+        items = self._batch_get_from_dynamodb(pairs)
+        logger.info(
+            f"Trading states loaded from DynamoDB ({len(items)}/{len(pairs)} found)"
+        )
+        return {pair: items.get(pair) or self.get_default_state(pair) for pair in pairs}
+
+    def save_states(self, states: Dict[str, Dict[str, Any]]) -> None:
+        """여러 거래쌍 상태 일괄 저장 (거래쌍 -> 상태)"""
+        if not states:
+            return
+
+        now = datetime.now().isoformat()
+        for pair, state in states.items():
+            state["trading_pair"] = pair
+            state["updated_at"] = now
+
+        if self.local_dir:
+            for state in states.values():
+                self._save_pair_to_file(state)
+            return
+
+        if self.use_s3:
+            for state in states.values():
+                self._save_pair_to_s3(state)
+            return
+
+        try:
+            self._batch_write_to_dynamodb(list(states.values()))
+            logger.info(f"Trading states saved to DynamoDB ({len(states)} pairs)")
+        except Exception as e:
+            logger.error(f"Failed to batch save states to DynamoDB: {e}")
+            raise
+
     def load_state(self) -> Dict[str, Any]:
-        """상태 로드 (S3 또는 DynamoDB)"""
+        """상태 로드 (로컬 파일, S3 또는 DynamoDB)"""
+        if self.local_dir:
+            return self._load_pair_from_file(self.trading_pair)
         if self.use_s3:
             return self.load_state_from_s3()
         else:
             return self.load_state_from_dynamodb()
 
     def save_state(self, state: Dict[str, Any]) -> None:
-        """상태 저장 (S3 또는 DynamoDB)"""
-        if self.use_s3:
+        """상태 저장 (로컬 파일, S3 또는 DynamoDB)"""
+        if self.local_dir:
+            state["updated_at"] = datetime.now().isoformat()
+            self._save_pair_to_file(state)
+        elif self.use_s3:
             self.save_state_to_s3(state)
         else:
             self.save_state_to_dynamodb(state)
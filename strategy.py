@@ -0,0 +1,354 @@
+"""
+거래 전략 정의
+
+전략은 필요한 지표를 IndicatorSpec으로 선언하고, 계산된 지표 배열로부터
+매수(entry)/매도(exit) 신호 배열을 반환한다.
+같은 코드가 백테스트에서는 전체 기간에 벡터화로, 실거래에서는 최근 봉
+구간(warmup)에만 적용되므로 두 경로의 신호가 항상 일치한다.
+
+수익률 조건(profit_threshold)은 포지션에 따라 달라지므로 전략이 아니라
+엔진에서 net_profit_rate()로 공통 적용한다.
+"""
+
+import logging
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Type
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from indicator_cache import IndicatorCache, fingerprint
+
+logger = logging.getLogger(__name__)
+
+
+class IndicatorSpec(NamedTuple):
+    """지표 선언 (종류 + 파라미터), 해시 가능"""
+
+    kind: str
+    params: Tuple[Any, ...]
+
+    @property
+    def window(self) -> int:
+        return int(self.params[0])
+
+    @property
+    def column(self) -> str:
+        return "_".join([self.kind] + [str(p) for p in self.params])
+
+    @property
+    def label(self) -> str:
+        return f"{self.kind.upper()}({', '.join(str(p) for p in self.params)})"
+
+
+def _rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """구간별 합계
+
+    누적합 차이는 값마다 앞선 전체 구간의 반올림 오차가 섞여 최근 봉만으로 계산한
+    실거래/청크 경로와 값이 달라지므로, 각 구간을 따로 합산한다 (벡터화).
+    """
+    if len(values) < window:
+        return np.empty(0, dtype=np.float64)
+    windows = sliding_window_view(np.asarray(values, dtype=np.float64), window)
+    return windows.sum(axis=1)
+
+
+def _pad(values: np.ndarray, length: int) -> np.ndarray:
+    out = np.full(length, np.nan)
+    if len(values):
+        out[length - len(values) :] = values
+    return out
+
+
+def sma(close: np.ndarray, window: int) -> np.ndarray:
+    """단순 이동평균"""
+    return _pad(_rolling_sum(close, window) / window, len(close))
+
+
+def bollinger_band(close: np.ndarray, window: int) -> np.ndarray:
+    """(이동평균, 이동 표준편차) 2행 배열, 상단/하단 밴드가 공유 (모표준편차)"""
+    band = np.full((2, len(close)), np.nan)
+    n = len(close) - window + 1
+    if n <= 0:
+        return band
+    mean = _rolling_sum(close, window) / window
+    acc = np.zeros(n)
+    for offset in range(window):
+        acc += (close[offset : offset + n] - mean) ** 2
+    band[0, window - 1 :] = mean
+    band[1, window - 1 :] = np.sqrt(acc / window)
+    return band
+
+
+def rolling_std(close: np.ndarray, window: int) -> np.ndarray:
+    """이동 표준편차 (모표준편차)"""
+    return bollinger_band(close, window)[1]
+
+
+def rsi(close: np.ndarray, window: int) -> np.ndarray:
+    """RSI (단순 평균 방식, 구간 밖 데이터에 의존하지 않음)"""
+    out = np.full(len(close), np.nan)
+    if len(close) <= window:
+        return out
+    diff = np.diff(close)
+    gains = _rolling_sum(np.clip(diff, 0, None), window)
+    losses = _rolling_sum(np.clip(-diff, 0, None), window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = np.where(losses == 0, 100.0, 100.0 - 100.0 / (1.0 + gains / losses))
+    out[window:] = values
+    return out
+
+
+def bb_upper(
+    close: np.ndarray, window: int, num_std: float, band: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """볼린저 밴드 상단 (band를 주면 이동평균/표준편차를 다시 계산하지 않음)"""
+    mean, std = bollinger_band(close, window) if band is None else band
+    return mean + num_std * std
+
+
+def bb_lower(
+    close: np.ndarray, window: int, num_std: float, band: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """볼린저 밴드 하단 (band를 주면 이동평균/표준편차를 다시 계산하지 않음)"""
+    mean, std = bollinger_band(close, window) if band is None else band
+    return mean - num_std * std
+
+
+# 지표 종류 -> (계산 함수, 필요한 추가 봉 수)
+INDICATORS: Dict[str, Tuple[Callable[..., np.ndarray], int]] = {
+    "sma": (sma, 0),
+    "rsi": (rsi, 1),
+    "bb_upper": (bb_upper, 0),
+    "bb_lower": (bb_lower, 0),
+}
+
+# 가격 차트에 함께 그릴 수 있는 지표
+PRICE_SCALE_INDICATORS = {"sma", "bb_upper", "bb_lower"}
+# bollinger_band 결과를 공유하는 지표
+BAND_INDICATORS = {"bb_upper", "bb_lower"}
+
+
+def compute_indicator(
+    spec: IndicatorSpec, close: np.ndarray, band: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """단일 지표 계산 (밴드 지표는 미리 계산한 band 사용 가능)"""
+    func, _ = INDICATORS[spec.kind]
+    if spec.kind in BAND_INDICATORS:
+        return func(close, *spec.params, band=band)
+    return func(close, *spec.params)
+
+
+def net_profit_rate(buy_price: float, price: float, trading_fee: float) -> float:
+    """매수/매도 수수료를 뺀 실제 수익률"""
+    gross_profit_rate = (price - buy_price) / buy_price
+    return gross_profit_rate - (2 * trading_fee)
+
+
+class Strategy:
+    """전략 인터페이스
+
+    하위 클래스는 indicators()와 signals()만 구현한다.
+    """
+
+    name = ""
+
+    def indicators(self) -> List[IndicatorSpec]:
+        """필요한 지표 목록"""
+        raise NotImplementedError
+
+    def signals(
+        self, indicators: Dict[IndicatorSpec, np.ndarray], close: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """(매수 신호, 매도 신호) bool 배열 반환"""
+        raise NotImplementedError
+
+    @property
+    def warmup(self) -> int:
+        """마지막 봉의 지표를 계산하는 데 필요한 봉 수"""
+        return max(spec.window + INDICATORS[spec.kind][1] for spec in self.indicators())
+
+    def compute_indicators(
+        self, close: np.ndarray, cache: Optional[IndicatorCache] = None
+    ) -> Dict[IndicatorSpec, np.ndarray]:
+        """선언된 지표를 종류/파라미터별로 한 번씩만 계산 (cache가 있으면 재사용)"""
+        close = np.asarray(close, dtype=np.float64)
+        specs = dict.fromkeys(self.indicators())
+        data_fingerprint = None if cache is None else fingerprint(close)
+
+        # 상단/하단 밴드는 같은 구간의 이동평균/표준편차를 한 번만 계산해 공유
+        bands: Dict[int, np.ndarray] = {}
+
+        def band(window: int) -> np.ndarray:
+            if window not in bands:
+                bands[window] = (
+                    bollinger_band(close, window)
+                    if cache is None
+                    else cache.get_or_compute(
+                        data_fingerprint,
+                        "bollinger_band",
+                        (window,),
+                        lambda: bollinger_band(close, window),
+                    )
+                )
+            return bands[window]
+
+        def compute(spec: IndicatorSpec) -> np.ndarray:
+            shared = band(spec.window) if spec.kind in BAND_INDICATORS else None
+            return compute_indicator(spec, close, shared)
+
+        if cache is None:
+            return {spec: compute(spec) for spec in specs}
+        return {
+            spec: cache.get_or_compute(
+                data_fingerprint,
+                spec.kind,
+                spec.params,
+                lambda spec=spec: compute(spec),
+            )
+            for spec in specs
+        }
+
+    def evaluate(
+        self, close: np.ndarray, cache: Optional[IndicatorCache] = None
+    ) -> Tuple[Dict[IndicatorSpec, np.ndarray], np.ndarray, np.ndarray, np.ndarray]:
+        """전체 구간 벡터화 평가 -> (지표, 매수 신호, 매도 신호, 지표 준비 여부)"""
+        close = np.asarray(close, dtype=np.float64)
+        indicators = self.compute_indicators(close, cache)
+        entry, exit_ = self.signals(indicators, close)
+        ready = np.ones(len(close), dtype=bool)
+        for values in indicators.values():
+            ready &= ~np.isnan(values)
+        return indicators, entry & ready, exit_ & ready, ready
+
+    def evaluate_latest(self, close: np.ndarray) -> Tuple[bool, bool]:
+        """마지막 봉만 평가 (warmup 구간만 사용)"""
+        close = np.asarray(close, dtype=np.float64)[-self.warmup :]
+        if len(close) == 0:
+            return False, False
+        _, entry, exit_, _ = self.evaluate(close)
+        return bool(entry[-1]), bool(exit_[-1])
+
+    def describe(self) -> Dict[str, Any]:
+        """로그/알림용 파라미터 요약"""
+        return {"strategy": self.name}
+
+
+class SmaCrossoverStrategy(Strategy):
+    """단기 SMA > 장기 SMA 매수, 단기 SMA < 장기 SMA 매도"""
+
+    name = "sma_crossover"
+
+    def __init__(self, sma_short: int = 7, sma_long: int = 25):
+        self.sma_short = sma_short
+        self.sma_long = sma_long
+        self.short_spec = IndicatorSpec("sma", (sma_short,))
+        self.long_spec = IndicatorSpec("sma", (sma_long,))
+
+    def indicators(self) -> List[IndicatorSpec]:
+        return [self.short_spec, self.long_spec]
+
+    def signals(self, indicators, close):
+        short = indicators[self.short_spec]
+        long = indicators[self.long_spec]
+        return short > long, short < long
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "strategy": self.name,
+            "sma_short": self.sma_short,
+            "sma_long": self.sma_long,
+        }
+
+
+class RsiReversionStrategy(Strategy):
+    """RSI 과매도 구간 매수, 과매수 구간 매도"""
+
+    name = "rsi_reversion"
+
+    def __init__(self, window: int = 14, oversold: float = 30, overbought: float = 70):
+        self.window = window
+        self.oversold = oversold
+        self.overbought = overbought
+        self.rsi_spec = IndicatorSpec("rsi", (window,))
+
+    def indicators(self) -> List[IndicatorSpec]:
+        return [self.rsi_spec]
+
+    def signals(self, indicators, close):
+        values = indicators[self.rsi_spec]
+        return values < self.oversold, values > self.overbought
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "strategy": self.name,
+            "window": self.window,
+            "oversold": self.oversold,
+            "overbought": self.overbought,
+        }
+
+
+class BollingerReversionStrategy(Strategy):
+    """종가가 하단 밴드 아래면 매수, 상단 밴드 위면 매도"""
+
+    name = "bollinger_reversion"
+
+    def __init__(self, window: int = 20, num_std: float = 2.0):
+        self.window = window
+        self.num_std = float(num_std)
+        self.upper_spec = IndicatorSpec("bb_upper", (window, self.num_std))
+        self.lower_spec = IndicatorSpec("bb_lower", (window, self.num_std))
+
+    def indicators(self) -> List[IndicatorSpec]:
+        return [self.upper_spec, self.lower_spec]
+
+    def signals(self, indicators, close):
+        return close < indicators[self.lower_spec], close > indicators[self.upper_spec]
+
+    def describe(self) -> Dict[str, Any]:
+        return {"strategy": self.name, "window": self.window, "num_std": self.num_std}
+
+
+STRATEGIES: Dict[str, Type[Strategy]] = {
+    SmaCrossoverStrategy.name: SmaCrossoverStrategy,
+    RsiReversionStrategy.name: RsiReversionStrategy,
+    BollingerReversionStrategy.name: BollingerReversionStrategy,
+}
+
+
+def create_strategy(
+    trading_config: Dict[str, Any], overrides: Optional[Dict[str, Any]] = None
+) -> Strategy:
+    """거래 설정으로 전략 생성
+
+    strategy 키가 없으면 기존 sma_short/sma_long 설정으로 SMA 교차 전략을 만든다.
+    """
+    name = trading_config.get("strategy", SmaCrossoverStrategy.name)
+    if name not in STRATEGIES:
+        raise ValueError(f"알 수 없는 전략: {name} (사용 가능: {', '.join(STRATEGIES.keys())})")
+
+    if name == SmaCrossoverStrategy.name:
+        params = {
+            "sma_short": trading_config.get("sma_short", 7),
+            "sma_long": trading_config.get("sma_long", 25),
+        }
+    else:
+        params = {}
+    params.update(trading_config.get("strategy_params", {}))
+    params.update(overrides or {})
+
+    return STRATEGIES[name](**params)
+
+
+def add_indicator_columns(
+    df: pd.DataFrame, strategy: Strategy, cache: Optional[IndicatorCache] = None
+) -> pd.DataFrame:
+    """지표/신호 컬럼을 추가한 DataFrame 복사본 반환"""
+    df = df.copy()
+    indicators, entry, exit_, ready = strategy.evaluate(df["close"].to_numpy(), cache)
+    for spec, values in indicators.items():
+        df[spec.column] = values
+    df["entry_signal"] = entry
+    df["exit_signal"] = exit_
+    df["signal_ready"] = ready
+    return df
@@ -0,0 +1,102 @@
+"""청크 스트리밍 백테스트가 메모리 내 백테스트와 같은 결과를 내는지 확인"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest import BacktestEngine
+from candle_store import CandleStore, to_dataframe
+
+logging.getLogger("backtest").setLevel(logging.WARNING)
+
+
+def make_candles(n: int = 5000, seed: int = 3) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    # 추세 전환이 잦은 가격 경로 (매수/매도가 여러 번 발생하도록)
+    t = np.arange(n)
+    closes = (
+        30000
+        * (1 + 0.02 * np.sin(t / 40))
+        * np.exp(np.cumsum(rng.normal(0, 0.0008, n)))
+    )
+    index = pd.date_range("2024-01-01", periods=n, freq="5min")
+    return pd.DataFrame(
+        {
+            "open": closes,
+            "high": closes * 1.001,
+            "low": closes * 0.999,
+            "close": closes,
+            "volume": rng.uniform(1, 10, n),
+        },
+        index=index,
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = CandleStore(str(tmp_path))
+    store.append("BTC/USDT", "5m", make_candles())
+    return store
+
+
+@pytest.mark.parametrize("chunk_size", [7, 24, 999, 100_000])
+def test_chunked_backtest_matches_in_memory(store, chunk_size):
+    engine = BacktestEngine()
+    df = to_dataframe(store.open("BTC/USDT", "5m"))
+    df = engine.calculate_indicators(df)
+    expected = engine.run_backtest(df)
+    expected_metrics = engine.calculate_performance_metrics(expected, df)
+    assert len(expected["trades"]) > 4
+
+    chunked = engine.run_backtest_chunked(
+        store.iter_chunks("BTC/USDT", "5m", chunk_size=chunk_size)
+    )
+
+    assert chunked["trades"] == expected["trades"]
+    chunked_metrics = engine.calculate_chunked_metrics(chunked)
+    # 봉 수익률 합은 청크별로 나눠 더하므로 반올림 오차만큼 다를 수 있음
+    moment_keys = {"volatility", "sharpe_ratio", "sortino_ratio"}
+    for key, value in expected_metrics.items():
+        if key in moment_keys:
+            assert chunked_metrics[key] == pytest.approx(value, rel=1e-9)
+        else:
+            assert chunked_metrics[key] == value, key
+
+
+def test_store_append_merges_overlaps(tmp_path):
+    store = CandleStore(str(tmp_path))
+    candles = make_candles(100)
+    store.append("BTC/USDT", "5m", candles.iloc[50:])
+    store.append("BTC/USDT", "5m", candles.iloc[:60])
+
+    stored = to_dataframe(store.open("BTC/USDT", "5m"))
+    pd.testing.assert_frame_equal(stored, candles, check_freq=False, check_names=False)
+
+    start_ms = int(candles.index[10].value // 1_000_000)
+    end_ms = int(candles.index[20].value // 1_000_000)
+    assert len(store.read_range("BTC/USDT", "5m", start_ms, end_ms)) == 10
+
+
+@pytest.mark.parametrize("policy", ["ffill", "mask", "split"])
+@pytest.mark.parametrize("chunk_size", [7, 999])
+def test_gap_policies_match_in_memory(tmp_path, policy, chunk_size):
+    candles = make_candles()
+    # 점검 시간처럼 빠진 구간 두 곳 (청크 경계에 걸치도록)
+    candles = candles.drop(candles.index[995:1010]).drop(candles.index[3000:3002])
+    store = CandleStore(str(tmp_path))
+    store.append("BTC/USDT", "5m", candles)
+
+    engine = BacktestEngine()
+    engine.gap_policy = policy
+    df = engine.calculate_indicators(to_dataframe(store.open("BTC/USDT", "5m")))
+    expected = engine.run_backtest(df)
+    assert len(expected["trades"]) > 4
+
+    chunked = engine.run_backtest_chunked(
+        store.iter_chunks("BTC/USDT", "5m", chunk_size=chunk_size)
+    )
+    assert chunked["trades"] == expected["trades"]
+    assert chunked["summary"]["bars"] == len(df)
+    assert len(df) == (5000 if policy == "ffill" else 5000 - 17)
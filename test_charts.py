@@ -0,0 +1,40 @@
+"""차트 다운샘플링/헤드리스 렌더링 테스트"""
+
+import logging
+
+import numpy as np
+import pytest
+
+from backtest import BacktestEngine
+from charts import lttb
+from test_backtest_chunked import make_candles
+
+logging.getLogger("backtest").setLevel(logging.WARNING)
+
+
+def test_lttb_keeps_endpoints_and_spikes():
+    x = np.arange(100_000, dtype=np.float64)
+    y = np.sin(x / 5000)
+    y[43_210] = 50.0
+
+    keep = lttb(x, y, 500)
+
+    assert len(keep) == 500
+    assert keep[0] == 0 and keep[-1] == len(x) - 1
+    assert np.all(np.diff(keep) > 0)
+    assert 43_210 in keep
+
+
+@pytest.mark.parametrize("filename", ["chart.png", "chart.html"])
+def test_plot_out_renders_headless(tmp_path, filename):
+    pytest.importorskip("matplotlib")
+    engine = BacktestEngine()
+    df = engine.calculate_indicators(make_candles(3000))
+    results = engine.run_backtest(df)
+    output = tmp_path / filename
+
+    engine.plot_results(df, results, output=str(output))
+
+    assert output.stat().st_size > 0
+    if filename.endswith(".html"):
+        assert "<svg" in output.read_text(encoding="utf-8")
@@ -0,0 +1,108 @@
+"""거래 설정 스냅샷 검증/핫 리로드 테스트"""
+
+import json
+import os
+
+import pytest
+
+from config_loader import ConfigError, ConfigLoader, ConfigWatcher, TradingConfig
+
+TRADING = {
+    "symbol": "BTC/USDT",
+    "timeframe": "5m",
+    "sma_short": 7,
+    "sma_long": 25,
+    "trade_amount": 50.0,
+    "profit_threshold": 0.003,
+    "trading_fee": 0.001,
+    "slicing": {"mode": "twap", "slices": 3},
+}
+
+
+def write_config(path, trading, mtime_ns):
+    path.write_text(json.dumps({"trading": trading}), encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_snapshot_is_frozen_and_fills_defaults():
+    config = TradingConfig(TRADING)
+    assert config.base_timeframe == "5m"
+    assert config.initial_balance == 100.0
+    with pytest.raises(AttributeError):
+        config.trade_amount = 1_000.0
+    with pytest.raises(AttributeError):
+        config.extra = 1
+
+    # get()은 복사본이라 스냅샷을 바꿀 수 없다
+    config.get("slicing")["slices"] = 99
+    assert config.get("slicing")["slices"] == 3
+    assert TradingConfig(TRADING) == config
+    assert TradingConfig({**TRADING, "trade_amount": 60.0}).version != config.version
+
+
+@pytest.mark.parametrize(
+    "override, reason",
+    [
+        ({"trade_amount": 0}, "trade_amount"),
+        ({"trade_amount": "50"}, "trade_amount"),
+        ({"trading_fee": 0.5}, "trading_fee"),
+        ({"sma_short": 30}, "sma_short"),
+        ({"timeframe": "7x"}, "타임프레임"),
+        ({"timeframe": "5m", "base_timeframe": "3m"}, "base_timeframe"),
+        ({"symbol": "BTCUSDT"}, "symbol"),
+        ({"strategy": "unknown"}, "알 수 없는 전략"),
+        ({"execution": {"mode": "fast"}}, "execution"),
+        ({"slicing": {"mode": "iceberg"}}, "slicing"),
+    ],
+)
+def test_invalid_config_is_rejected(override, reason):
+    with pytest.raises(ConfigError, match=reason):
+        TradingConfig({**TRADING, **override})
+
+
+def test_update_trading_config_validates_before_saving(tmp_path):
+    path = tmp_path / "config.json"
+    write_config(path, TRADING, 1_000_000_000)
+    loader = ConfigLoader(str(path))
+
+    with pytest.raises(ConfigError):
+        loader.update_trading_config(sma_short=40)
+    assert json.loads(path.read_text())["trading"]["sma_short"] == 7
+    assert loader.get_trading_snapshot().get("sma_short") == 7
+
+    loader.update_trading_config(trade_amount=70.0)
+    assert json.loads(path.read_text())["trading"]["trade_amount"] == 70.0
+    assert loader.get_trading_snapshot().trade_amount == 70.0
+
+
+def test_watcher_swaps_valid_config_and_keeps_last_good(tmp_path):
+    path = tmp_path / "config.json"
+    write_config(path, TRADING, 1_000_000_000)
+    loader = ConfigLoader(str(path))
+    original = loader.get_trading_snapshot()
+    errors, applied = [], []
+    watcher = ConfigWatcher(loader, on_error=errors.append)
+
+    assert watcher.poll(applied.append) is None
+
+    write_config(path, {**TRADING, "trade_amount": 80.0}, 2_000_000_000)
+    snapshot = watcher.poll(applied.append)
+    assert snapshot.trade_amount == 80.0
+    assert loader.get_trading_snapshot() is snapshot
+    assert applied == [snapshot] and original.trade_amount == 50.0
+
+    # 검증 실패: 마지막 유효 설정 유지, 같은 내용은 다시 알리지 않음
+    write_config(path, {**TRADING, "sma_short": 40}, 3_000_000_000)
+    assert watcher.poll(applied.append) is None
+    os.utime(path, ns=(4_000_000_000, 4_000_000_000))
+    assert watcher.poll(applied.append) is None
+    assert loader.get_trading_snapshot() is snapshot
+    assert len(errors) == 1 and "sma_short" in errors[0]
+
+    # 적용 콜백이 거부해도 교체하지 않음
+    def reject(config):
+        raise ConfigError(["심볼 변경은 재시작이 필요합니다"])
+
+    write_config(path, {**TRADING, "symbol": "ETH/USDT"}, 5_000_000_000)
+    assert watcher.poll(reject) is None
+    assert loader.get_trading_snapshot().symbol == "BTC/USDT"
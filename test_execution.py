@@ -0,0 +1,150 @@
+"""주문 실행 엔진 테스트"""
+
+import logging
+
+import ccxt
+import pytest
+
+from execution import ExecutionConfig, OrderExecutor
+
+logging.getLogger("execution").setLevel(logging.WARNING)
+
+
+class FakeBookExchange:
+    """호가/지정가 체결을 스크립트로 제어하는 가짜 거래소
+
+    fills: 지정가 주문마다 fetch_order 시 체결될 비율 목록 (없으면 체결 안 됨)
+    """
+
+    def __init__(self, bid=100.0, ask=100.1, fills=None, reject_first=0, fee=0.001):
+        self.bid, self.ask = bid, ask
+        self.fills = list(fills or [])
+        self.reject_first = reject_first
+        self.fee = fee
+        self.orders = {}
+        self.calls = []
+
+    def fetch_order_book(self, symbol, limit=None):
+        return {"bids": [[self.bid, 1.0]], "asks": [[self.ask, 1.0]]}
+
+    def create_order(self, symbol, type, side, amount, price=None, params=None):
+        self.calls.append((type, side, amount, price))
+        if type == "limit" and self.reject_first > 0:
+            self.reject_first -= 1
+            raise ccxt.OrderImmediatelyFillable("would cross")
+        order_id = str(len(self.orders) + 1)
+        if type == "market":
+            price = self.ask if side == "buy" else self.bid
+            order = self._order(order_id, side, amount, price, amount, "closed")
+        else:
+            ratio = self.fills.pop(0) if self.fills else 0.0
+            order = self._order(order_id, side, amount, price, 0.0, "open")
+            order["_ratio"] = ratio
+        self.orders[order_id] = order
+        return dict(order)
+
+    def fetch_order(self, order_id, symbol=None):
+        order = self.orders[order_id]
+        if order["status"] == "open" and order.get("_ratio"):
+            filled = order["amount"] * order.pop("_ratio")
+            order.update(
+                self._order(
+                    order_id,
+                    order["side"],
+                    order["amount"],
+                    order["price"],
+                    filled,
+                    "closed" if filled >= order["amount"] else "open",
+                )
+            )
+        return dict(order)
+
+    def cancel_order(self, order_id, symbol=None):
+        order = self.orders[order_id]
+        if order["status"] != "open":
+            raise ccxt.OrderNotFound(order_id)
+        order["status"] = "canceled"
+        return dict(order)
+
+    def _order(self, order_id, side, amount, price, filled, status):
+        cost = filled * price
+        return {
+            "id": order_id,
+            "side": side,
+            "amount": amount,
+            "price": price,
+            "average": price if filled else None,
+            "filled": filled,
+            "cost": cost,
+            "status": status,
+            "fee": {"cost": cost * self.fee, "currency": "USDT"},
+        }
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+    def __call__(self):
+        return self.now
+
+
+def make_executor(exchange, **config):
+    clock = FakeClock()
+    executor = OrderExecutor(
+        exchange,
+        "BTC/USDT",
+        ExecutionConfig(mode="maker_first", timeout_seconds=3, **config),
+        sleep=clock.sleep,
+    )
+    executor._clock = clock
+    return executor
+
+
+def test_market_mode_reports_actual_fill():
+    exchange = FakeBookExchange()
+    executor = OrderExecutor(exchange, "BTC/USDT", ExecutionConfig())
+    report = executor.execute("buy", 0.5)
+
+    assert report["price"] == 100.1
+    assert report["filled"] == 0.5
+    assert report["cost"] == pytest.approx(0.5 * 100.1 * 1.001)
+    assert report["fee_rate"] == pytest.approx(0.001)
+    assert report["maker_ratio"] == 0.0
+
+
+def test_maker_first_fills_at_touch():
+    exchange = FakeBookExchange(fills=[1.0], fee=0.0002)
+    report = make_executor(exchange).execute("sell", 0.5)
+
+    assert exchange.calls == [("limit", "sell", 0.5, 100.1)]
+    assert report["price"] == 100.1
+    assert report["maker_ratio"] == 1.0
+    assert report["cost"] == pytest.approx(0.5 * 100.1 * (1 - 0.0002))
+
+
+def test_partial_fill_reprices_then_falls_back_to_market():
+    exchange = FakeBookExchange(fills=[0.4, 0.0])
+    report = make_executor(exchange, max_reprices=1).execute("buy", 1.0)
+
+    types = [call[0] for call in exchange.calls]
+    assert types == ["limit", "limit", "market"]
+    # 재호가/시장가는 남은 수량만 주문
+    assert exchange.calls[1][2] == pytest.approx(0.6)
+    assert exchange.calls[2][2] == pytest.approx(0.6)
+    assert report["filled"] == pytest.approx(1.0)
+    assert report["maker_ratio"] == pytest.approx(0.4)
+    assert report["price"] == pytest.approx(0.4 * 100.0 + 0.6 * 100.1)
+    assert all(o["status"] != "open" for o in exchange.orders.values())
+
+
+def test_post_only_rejection_retries_and_no_fallback_raises():
+    exchange = FakeBookExchange(reject_first=5)
+    with pytest.raises(ccxt.OrderNotFillable):
+        make_executor(exchange, max_reprices=2, fallback_to_market=False).execute(
+            "buy", 1.0
+        )
+    assert len(exchange.calls) == 3
@@ -0,0 +1,53 @@
+"""Fargate 작업 자원 예산 회귀 테스트 (가짜 거래소 + 로컬 상태 파일)"""
+
+import os
+
+from fargate_budget import check_budget, load_budgets, measure_scenario, memory_limit
+
+
+def test_fargate_cycle_stays_within_budget():
+    budgets = load_budgets()
+    limit = memory_limit(budgets)
+    assert limit is None or limit > 0
+    # 시간 예산은 CI 부하에 따라 흔들리므로 BUDGET_WALL_TIME=true일 때만 검사
+    wall_time = os.getenv("BUDGET_WALL_TIME", "false").lower() == "true"
+
+    violations = []
+    for name, budget in budgets["scenarios"].items():
+        measured = measure_scenario(budget)
+        assert {"initialize", "strategy", "save_state"} <= set(measured["phases"])
+        violations += check_budget(name, measured, budget, limit, wall_time)
+    assert violations == []
+
+
+def test_check_budget_reports_each_overrun():
+    budget = {
+        "position_open": True,
+        "limits": {
+            "peak_rss_mb": 900.0,
+            "wall_seconds": 2.0,
+            "phases": {"strategy": {"python_peak_mb": 1.0}},
+        },
+    }
+    measured = {
+        "exit_code": 0,
+        "position_open": False,
+        "peak_rss_mb": 120.0,
+        "python_peak_mb": 5.0,
+        "wall_seconds": 3.0,
+        "phases": {"strategy": {"wall_seconds": 0.1, "python_peak_mb": 4.0}},
+    }
+
+    violations = check_budget("buy", measured, budget, memory_limit_mb=819.2)
+    assert len(violations) == 4
+    assert "포지션" in violations[0]
+    assert "wall_seconds" in violations[1]
+    assert "strategy.python_peak_mb" in violations[2]
+    assert "작업 메모리" in violations[3]
+
+    # 시간 예산을 끄면 RSS/할당 초과만 남음
+    violations = check_budget(
+        "buy", measured, budget, memory_limit_mb=819.2, wall_time=False
+    )
+    assert len(violations) == 3
+    assert not any("wall_seconds" in violation for violation in violations)
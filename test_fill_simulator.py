@@ -0,0 +1,173 @@
+"""체결 시뮬레이터 테스트"""
+
+import logging
+
+import pytest
+
+from backtest import BacktestEngine
+from fill_simulator import FillModel, PaperExchange, SimulatedBroker
+from test_backtest_chunked import make_candles
+
+logging.getLogger("backtest").setLevel(logging.WARNING)
+logging.getLogger("fill_simulator").setLevel(logging.WARNING)
+
+
+@pytest.fixture
+def indicator_df():
+    engine = BacktestEngine()
+    return engine, engine.calculate_indicators(make_candles(3000))
+
+
+def test_frictionless_model_matches_close_fills(indicator_df):
+    engine, df = indicator_df
+    expected = engine.run_backtest(df)
+    simulated = engine.run_backtest_simulated(df, FillModel(trading_fee=0.001))
+
+    assert len(simulated["trades"]) == len(expected["trades"]) > 4
+    for sim, exp in zip(simulated["trades"], expected["trades"]):
+        assert sim["type"] == exp["type"]
+        assert sim["timestamp"] == exp["timestamp"]
+        assert sim["price"] == pytest.approx(exp["price"])
+        assert sim["amount"] == pytest.approx(exp["amount"])
+        assert sim["fills"] == 1
+    assert simulated["balance_history"][-1]["total_value"] == pytest.approx(
+        expected["balance_history"][-1]["total_value"]
+    )
+
+
+def test_slippage_reduces_returns(indicator_df):
+    engine, df = indicator_df
+    frictionless = engine.run_backtest_simulated(df, FillModel())
+    costly = engine.run_backtest_simulated(
+        df, FillModel(spread_bps=10, impact_coef=0.5)
+    )
+
+    buys = [t for t in costly["trades"] if t["type"] == "BUY"]
+    sells = [t for t in costly["trades"] if t["type"] == "SELL"]
+    assert all(t["slippage"] > 0 for t in buys)
+    assert all(t["slippage"] < 0 for t in sells)
+    assert (
+        costly["balance_history"][-1]["total_value"]
+        < frictionless["balance_history"][-1]["total_value"]
+    )
+
+
+def test_latency_fills_at_later_bar(indicator_df):
+    engine, df = indicator_df
+    first_buy = engine.run_backtest_simulated(df, FillModel())["trades"][0]
+    delayed = engine.run_backtest_simulated(df, FillModel(latency_ms=5 * 60_000))
+    delayed_buy = delayed["trades"][0]
+
+    # 5분 지연이면 다음 5분봉 종가에 체결
+    next_bar = df.index.get_loc(first_buy["timestamp"]) + 1
+    assert delayed_buy["timestamp"] == df.index[next_bar]
+    assert delayed_buy["price"] == pytest.approx(df["close"].iloc[next_bar])
+
+
+def test_partial_fills_respect_participation():
+    model = FillModel(max_participation=0.1, trading_fee=0.0)
+    broker = SimulatedBroker(model, timeframe_ms=60_000)
+    order = broker.submit("sell", 0, 100.0, quantity=2.5)
+
+    volumes = [10.0, 10.0, 10.0]
+    for i, volume in enumerate(volumes):
+        broker.process_bar(i * 60_000, 100.0, 100.0, 100.0, 100.0, volume)
+
+    assert order.fills == 3
+    assert order.filled == pytest.approx(2.5)
+    assert order.status == "filled"
+    assert not broker.has_open_orders
+
+
+def test_unfilled_orders_are_cancelled_after_max_bars():
+    model = FillModel(max_participation=0.1, max_order_bars=2)
+    broker = SimulatedBroker(model, timeframe_ms=60_000)
+    order = broker.submit("sell", 0, 100.0, quantity=5.0)
+
+    for i in range(3):
+        broker.process_bar(i * 60_000, 100.0, 100.0, 100.0, 100.0, 10.0)
+
+    assert order.status == "cancelled"
+    assert order.filled == pytest.approx(2.0)
+
+
+class FakeMarket:
+    def fetch_ticker(self, symbol):
+        return {"last": 100.0}
+
+    def fetch_ohlcv(self, symbol, timeframe="1m", limit=2):
+        return [[0, 100.0, 100.0, 100.0, 100.0, 50.0]]
+
+
+def test_paper_exchange_uses_fill_model(tmp_path):
+    state_path = str(tmp_path / "paper.json")
+    model = FillModel(spread_bps=20, max_participation=0.01, trading_fee=0.001)
+    exchange = PaperExchange(FakeMarket(), model, {"USDT": 100.0}, state_path)
+
+    order = exchange.create_market_buy_order("BTC/USDT", 0.8)
+
+    assert order["filled"] == pytest.approx(0.5)  # 거래량 50의 1%
+    assert order["status"] == "canceled"
+    assert order["average"] == pytest.approx(100.0 * 1.001)
+    # 매수 수수료는 받은 BTC에서 차감
+    assert exchange.fetch_balance()["BTC"]["free"] == pytest.approx(0.5 * 0.999)
+
+    # 잔고는 state_path에 저장되어 다음 실행에서 이어진다
+    reloaded = PaperExchange(FakeMarket(), model, {"USDT": 100.0}, state_path)
+    assert reloaded.balances == exchange.balances
+
+
+def test_fargate_cycle_runs_in_paper_mode(tmp_path, monkeypatch):
+    import fargate_main
+    from config_loader import config_loader
+
+    for name, value in {
+        "BINANCE_API_KEY": "paper",
+        "BINANCE_SECRET": "paper",
+        "EXCHANGE_FAKE": "1",
+        "PAPER_TRADING": "true",
+        "STATE_DIR": str(tmp_path),
+        "USE_S3": "false",
+    }.items():
+        monkeypatch.setenv(name, value)
+    exchange_config = {
+        **config_loader.get_exchange_config(),
+        "paper_state_path": str(tmp_path / "paper.json"),
+        "filters_cache_path": str(tmp_path / "filters.json"),
+    }
+    monkeypatch.setattr(config_loader, "get_exchange_config", lambda: exchange_config)
+    errors = []
+    monkeypatch.setattr(
+        fargate_main.notifier, "notify_error", lambda *a, **k: errors.append(a)
+    )
+
+    store, bot = fargate_main.initialize()
+    # 모의 잔고에 기준 통화가 없으면 잔고 조회에서 KeyError가 났다
+    assert fargate_main.run_cycle(bot, store) == 0
+    assert errors == []
+    assert set(bot.get_current_balance()) == {"USDT", "BTC"}
+
+
+def test_paper_and_backtest_fills_leave_same_balances():
+    model = FillModel(spread_bps=20, trading_fee=0.001)
+    broker = SimulatedBroker(model, timeframe_ms=60_000)
+    paper = PaperExchange(FakeMarket(), model, {"USDT": 100.0, "BTC": 0.0})
+    # run_backtest_simulated와 같은 방식으로 잔고 반영
+    usdt, btc = 100.0, 0.0
+
+    buy = broker.submit("buy", 0, 100.0, quote_budget=50.0)
+    broker.process_bar(0, 100.0, 100.0, 100.0, 100.0, 50.0)
+    usdt -= buy.cost
+    btc += buy.filled * (1 - model.trading_fee)
+    paper_buy = paper.create_market_buy_order("BTC/USDT", buy.filled)
+    assert paper_buy["fee"]["currency"] == "BTC"
+    assert paper.balances == pytest.approx({"USDT": usdt, "BTC": btc})
+
+    sell = broker.submit("sell", 60_000, 100.0, quantity=btc)
+    broker.process_bar(60_000, 100.0, 100.0, 100.0, 100.0, 50.0)
+    usdt += sell.cost - sell.fee
+    btc -= sell.filled
+    paper_sell = paper.create_market_sell_order("BTC/USDT", sell.filled)
+    assert paper_sell["fee"] == {"cost": pytest.approx(sell.fee), "currency": "USDT"}
+    assert paper.balances == pytest.approx({"USDT": usdt, "BTC": btc}, abs=1e-12)
+    assert usdt < 100.0
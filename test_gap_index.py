@@ -0,0 +1,140 @@
+"""캔들 누락 구간 색인/복구 테스트"""
+
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+
+from backtest import BacktestEngine
+from candle_store import CandleStore, to_records
+from gap_index import (
+    GAP_INDEX_SUFFIX,
+    GapIndex,
+    apply_chunk_policy,
+    fill_records,
+    load_gap_index,
+    ready_mask,
+)
+
+logging.getLogger("backtest").setLevel(logging.WARNING)
+
+MINUTE = 60_000
+
+
+def ohlcv(timestamps):
+    return [
+        [int(t), 1.0 + i, 2.0 + i, 0.5 + i, 1.5 + i, 3.0]
+        for i, t in enumerate(timestamps)
+    ]
+
+
+class PagedExchange:
+    """since 이후 캔들을 limit개까지 돌려주는 거래소"""
+
+    def __init__(self, timestamps):
+        self.candles = ohlcv(timestamps)
+        self.calls = []
+
+    def fetch_ohlcv(self, symbol, timeframe, since, limit):
+        self.calls.append(since)
+        return [c for c in self.candles if c[0] >= since][:limit]
+
+
+def test_index_builds_extends_and_persists(tmp_path):
+    timestamps = np.delete(
+        np.arange(1_000_000, dtype=np.int64) * MINUTE, [10, 11, 500_000]
+    )
+    started = time.perf_counter()
+    index = GapIndex.build(timestamps, MINUTE)
+    assert time.perf_counter() - started < 1.0
+    assert index.missing == 3 and index.misaligned == 0 and index.irregular == 0
+    assert index.missing_ranges() == [
+        (10 * MINUTE, 12 * MINUTE),
+        (500_000 * MINUTE, 500_001 * MINUTE),
+    ]
+    assert list(index.gaps["position"]) == [10, 499_998]
+    assert index.missing_ranges(11 * MINUTE, 20 * MINUTE) == [
+        (11 * MINUTE, 12 * MINUTE)
+    ]
+
+    # 끝에만 추가되면 추가분만 훑은 결과가 전체를 다시 만든 결과와 같음
+    grown = np.concatenate([timestamps, np.arange(1_000_002, 1_000_010) * MINUTE])
+    index.confirm([(10 * MINUTE, 12 * MINUTE)])
+    extended = index.extend(grown)
+    rebuilt = GapIndex.build(grown, MINUTE)
+    assert extended.count == rebuilt.count and extended.last == rebuilt.last
+    np.testing.assert_array_equal(
+        extended.gaps[["start", "end", "position"]],
+        rebuilt.gaps[["start", "end", "position"]],
+    )
+    assert extended.missing_ranges() == [
+        (500_000 * MINUTE, 500_001 * MINUTE),
+        (1_000_000 * MINUTE, 1_000_002 * MINUTE),
+    ]
+
+    path = str(tmp_path / f"1m{GAP_INDEX_SUFFIX}")
+    extended.save(path)
+    loaded = GapIndex.load(path)
+    np.testing.assert_array_equal(loaded.gaps, extended.gaps)
+    assert (loaded.count, loaded.first, loaded.last) == (
+        extended.count,
+        0,
+        extended.last,
+    )
+
+    # 중간이 채워지면 다시 만들되 확인된 구간 표시는 유지
+    filled = np.sort(np.concatenate([grown, [500_000 * MINUTE]]))
+    assert len(loaded.extend(filled).gaps) == 2
+    assert loaded.extend(filled).missing_ranges() == [
+        (1_000_000 * MINUTE, 1_000_002 * MINUTE)
+    ]
+
+
+def test_policies_mask_fill_and_split():
+    timestamps = np.array([0, 1, 2, 5, 6, 7, 8]) * MINUTE
+    expected = np.array([1, 1, 1, 0, 0, 1, 1], dtype=bool)
+    np.testing.assert_array_equal(ready_mask(timestamps, MINUTE, 3), expected)
+
+    records = to_records(ohlcv(timestamps))
+    filled = fill_records(records[:4], MINUTE)
+    assert list(filled["timestamp"] // MINUTE) == [0, 1, 2, 3, 4, 5]
+    assert list(filled["close"]) == [1.5, 2.5, 3.5, 3.5, 3.5, 4.5]
+    assert list(filled["volume"]) == [3.0, 3.0, 3.0, 0.0, 0.0, 3.0]
+
+    chunks = [records[:2], records[2:5], records[5:]]
+    split = [
+        (list(c["timestamp"] // MINUTE), restart)
+        for c, restart in apply_chunk_policy(chunks, MINUTE, "split")
+    ]
+    assert split == [([0, 1], False), ([2], False), ([5, 6], True), ([7, 8], False)]
+
+    gapped = [records[:2], records[3:]]
+    stream = np.concatenate([c for c, _ in apply_chunk_policy(gapped, MINUTE, "ffill")])
+    assert list(stream["timestamp"] // MINUTE) == list(range(9))
+
+
+def test_store_repair_refetches_only_missing_ranges(tmp_path):
+    tf = 5 * MINUTE
+    start = int(pd.Timestamp("2024-01-01").value // 1_000_000)
+    timestamps = start + np.arange(300) * tf
+    # 저장소에는 두 구간이 빠졌고, 그중 하나는 거래소에도 없음 (점검 시간)
+    store = CandleStore(str(tmp_path))
+    store.append("BTC/USDT", "5m", ohlcv(np.delete(timestamps, [50, 51, 200])))
+    engine = BacktestEngine()
+    engine.exchange = PagedExchange(np.delete(timestamps, [200]))
+
+    end = int(timestamps[-1]) + tf
+    index = engine.repair_store_gaps(store, start, end)
+    assert engine.exchange.calls == [int(timestamps[50]), int(timestamps[200])]
+    assert store.count("BTC/USDT", "5m") == 299
+    assert index.missing_ranges(start, end) == []
+    assert index.missing_ranges(start, end, include_confirmed=True) == [
+        (int(timestamps[200]), int(timestamps[201]))
+    ]
+
+    # 확인된 구간은 다음 실행에서 다시 요청하지 않음
+    engine.exchange.calls.clear()
+    engine.repair_store_gaps(store, start, end)
+    assert engine.exchange.calls == []
+    assert len(load_gap_index(store, "BTC/USDT", "5m").confirmed) == 1
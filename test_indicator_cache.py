@@ -0,0 +1,80 @@
+"""지표 계산 캐시 테스트 (메모리 LRU, 디스크 mmap 계층, 예산)"""
+
+import os
+
+import numpy as np
+
+from indicator_cache import IndicatorCache, fingerprint
+
+
+def counted(values):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return values
+
+    return compute, calls
+
+
+def test_hits_misses_and_fingerprint_invalidation():
+    cache = IndicatorCache()
+    closes = np.arange(100, dtype=np.float64)
+    compute, calls = counted(closes * 2)
+
+    first = cache.get_or_compute(fingerprint(closes), "sma", (7,), compute)
+    again = cache.get_or_compute(fingerprint(closes), "sma", (7,), compute)
+    assert again is first and not first.flags.writeable
+    assert (len(calls), cache.hits, cache.misses) == (1, 1, 1)
+
+    # 데이터가 한 값만 바뀌어도(또는 dtype이 달라도) 다시 계산
+    changed = closes.copy()
+    changed[-1] += 1e-9
+    assert fingerprint(changed) != fingerprint(closes)
+    assert fingerprint(closes.astype(np.float32)) != fingerprint(closes)
+    cache.get_or_compute(fingerprint(changed), "sma", (7,), compute)
+    cache.get_or_compute(fingerprint(closes), "sma", (8,), compute)
+    assert len(calls) == 3
+
+
+def test_memory_budget_evicts_least_recently_used():
+    array = np.zeros(100)  # 800바이트
+    cache = IndicatorCache(max_bytes=2000)
+    for window in (1, 2):
+        cache.get_or_compute("fp", "sma", (window,), lambda: array.copy())
+    cache.get_or_compute("fp", "sma", (1,), lambda: array.copy())  # 1을 최근으로
+    cache.get_or_compute("fp", "sma", (3,), lambda: array.copy())
+
+    assert cache.stats()["bytes"] == 1600
+    compute, calls = counted(array.copy())
+    cache.get_or_compute("fp", "sma", (2,), compute)
+    assert calls == [1]
+    cache.get_or_compute("fp", "sma", (3,), compute)
+    assert calls == [1]
+
+
+def test_mapped_entries_and_disk_tier_are_bounded(tmp_path):
+    disk_dir = str(tmp_path)
+    array = np.arange(1000, dtype=np.float64)
+    writer = IndicatorCache(disk_dir=disk_dir)
+    for window in range(4):
+        writer.get_or_compute("fp", "sma", (window,), lambda: array + window)
+    file_size = os.path.getsize(os.path.join(disk_dir, "fp_sma_0.npy"))
+    assert writer.stats()["disk_bytes"] == 4 * file_size
+
+    # 디스크에서 읽은 mmap 배열은 열린 개수 제한을 받음
+    reader = IndicatorCache(disk_dir=disk_dir, max_mapped=2)
+    for window in range(4):
+        values = reader.get_or_compute("fp", "sma", (window,), lambda: None)
+        assert isinstance(values, np.memmap) and values[1] == 1 + window
+    assert reader.disk_hits == 4
+    assert reader.stats()["mapped"] == 2 and reader.stats()["entries"] == 2
+
+    # 디스크 예산을 넘으면 가장 오래 쓰지 않은 파일부터 삭제
+    os.utime(os.path.join(disk_dir, "fp_sma_0.npy"), (1, 1))
+    small = IndicatorCache(disk_dir=disk_dir, disk_max_bytes=int(3.5 * file_size))
+    assert small.stats()["disk_bytes"] == 4 * file_size
+    small.get_or_compute("fp", "sma", (9,), lambda: array)
+    remaining = sorted(os.listdir(disk_dir))
+    assert "fp_sma_0.npy" not in remaining and "fp_sma_9.npy" in remaining
+    assert small.stats()["disk_bytes"] == 3 * file_size == len(remaining) * file_size
@@ -0,0 +1,92 @@
+"""바이낸스 캔들 아카이브 가져오기 테스트"""
+
+import hashlib
+import os
+import zipfile
+
+import numpy as np
+import pytest
+
+from candle_store import CandleStore
+from kline_importer import ArchiveError, import_archives
+
+MINUTE = 60_000
+HEADER = "open_time,open,high,low,close,volume,close_time,quote_volume,count,"
+HEADER += "taker_buy_volume,taker_buy_quote_volume,ignore\n"
+
+
+def write_archive(directory, period, start_ms, count, unit=1, header=False, skip=()):
+    """바이낸스 형식 1m 아카이브 (unit=1000이면 마이크로초 타임스탬프)"""
+    name = f"BTCUSDT-1m-{period}"
+    rows = [HEADER] if header else []
+    for i in range(count):
+        if i in skip:
+            continue
+        open_time = start_ms + i * MINUTE
+        price = 100.0 + i
+        rows.append(
+            f"{open_time * unit},{price},{price + 1},{price - 1},{price + 0.5},2.5,"
+            f"{(open_time + MINUTE - 1) * unit},250.0,10,1.0,100.0,0\n"
+        )
+    path = os.path.join(directory, f"{name}.zip")
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(f"{name}.csv", "".join(rows))
+    return path
+
+
+def test_import_mixed_archives_into_store(tmp_path):
+    downloads = tmp_path / "downloads"
+    (downloads / "monthly").mkdir(parents=True)
+    (downloads / "daily").mkdir()
+    start = 1_735_689_600_000  # 2025-01-01
+    write_archive(str(downloads / "monthly"), "2024-12", start - 60 * MINUTE, 60)
+    # 마이크로초 타임스탬프 + 헤더, 중간 2분 누락
+    write_archive(
+        str(downloads / "monthly"), "2025-01", start, 60, 1000, True, skip={10, 11}
+    )
+    # 일별 아카이브가 월별과 겹침 (같은 값)
+    write_archive(str(downloads / "daily"), "2025-01-01", start, 5)
+    other = write_archive(str(downloads), "2025-01", start, 5)
+    os.rename(other, other.replace("BTCUSDT", "ETHUSDT"))
+
+    store = CandleStore(str(tmp_path / "candles"))
+    report = import_archives(str(downloads), "BTC/USDT", "1m", store, workers=2)
+
+    assert report["files"] == 3
+    assert report["candles"] == 118 and report["written"] == 118
+    assert report["conflicts"] == 0
+    assert report["gaps"] == [
+        {"after": start + 9 * MINUTE, "before": start + 12 * MINUTE, "missing": 2}
+    ]
+    candles = store.open("BTC/USDT", "1m")
+    assert candles["timestamp"][0] == start - 60 * MINUTE
+    assert np.all(np.diff(candles["timestamp"]) > 0)
+    assert candles["close"][60] == 100.5
+
+    # 다시 가져오면 새로 저장할 캔들 없음, strict면 누락 구간 때문에 거부
+    again = import_archives(str(downloads), "BTC/USDT", "1m", store, workers=1)
+    assert again["written"] == 0
+    with pytest.raises(ArchiveError, match="누락 구간 1개"):
+        import_archives(str(downloads), "BTC/USDT", "1m", store, strict=True)
+
+
+def test_rejects_corrupt_or_mismatched_archives(tmp_path):
+    store = CandleStore(str(tmp_path / "candles"))
+    path = write_archive(str(tmp_path), "2024-01", 1_704_067_200_000, 10)
+    with open(f"{path}.CHECKSUM", "w") as f:
+        f.write(f"{'0' * 64}  {os.path.basename(path)}\n")
+    with pytest.raises(ArchiveError, match="체크섬"):
+        import_archives(str(tmp_path), "BTC/USDT", "1m", store)
+
+    with open(path, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    with open(f"{path}.CHECKSUM", "w") as f:
+        f.write(f"{digest}  {os.path.basename(path)}\n")
+    # 1m 아카이브를 5m으로 가져오면 시각이 타임프레임에 맞지 않음
+    os.rename(path, path.replace("-1m-", "-5m-"))
+    with pytest.raises(ArchiveError, match="맞지 않는 시각"):
+        import_archives(str(tmp_path), "BTC/USDT", "5m", store)
+    assert store.count("BTC/USDT", "5m") == 0
+
+    with pytest.raises(ArchiveError, match="아카이브가 없습니다"):
+        import_archives(str(tmp_path), "BTC/USDT", "1h", store)
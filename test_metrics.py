@@ -0,0 +1,78 @@
+"""성과 지표 모듈 테스트"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from metrics import (
+    YEAR_MS,
+    equity_metrics,
+    max_drawdown,
+    return_moments,
+    rolling_metrics,
+    trade_metrics,
+)
+
+BAR_MS = 60 * 60 * 1000
+
+
+@pytest.fixture
+def equity():
+    rng = np.random.default_rng(5)
+    values = 100 * np.exp(np.cumsum(rng.normal(0.0002, 0.004, 24 * 120)))
+    timestamps = np.arange(len(values), dtype=np.int64) * BAR_MS
+    return timestamps, values
+
+
+def test_equity_metrics_match_pandas(equity):
+    _, values = equity
+    returns = pd.Series(values).pct_change().dropna()
+    scale = np.sqrt(YEAR_MS / BAR_MS)
+    mdd = max_drawdown(values)
+
+    result = equity_metrics(
+        return_moments(values), 10, len(values), 100.0, values[-1], mdd, BAR_MS
+    )
+
+    assert result["sharpe_ratio"] == pytest.approx(
+        returns.mean() / returns.std() * scale
+    )
+    downside = np.sqrt((np.minimum(returns, 0) ** 2).mean())
+    assert result["sortino_ratio"] == pytest.approx(returns.mean() / downside * scale)
+    assert result["calmar_ratio"] == pytest.approx(result["cagr"] / abs(mdd))
+    assert result["exposure"] == pytest.approx(10 / len(values))
+
+
+def test_rolling_metrics_match_pandas(equity):
+    timestamps, values = equity
+    rolling = rolling_metrics(timestamps, values, window_days=30)
+    window = 30 * 24
+
+    returns = pd.Series(values).pct_change()
+    expected_sharpe = (
+        returns.rolling(window).mean()
+        / returns.rolling(window).std()
+        * np.sqrt(YEAR_MS / BAR_MS)
+    )
+    expected_return = pd.Series(values).pct_change(window)
+
+    assert np.isnan(rolling["sharpe"][:window]).all()
+    np.testing.assert_allclose(
+        rolling["sharpe"][window:], expected_sharpe[window:], rtol=1e-6
+    )
+    np.testing.assert_allclose(rolling["return"][window:], expected_return[window:])
+
+
+def test_trade_metrics():
+    profits = np.array([3.0, -1.0, 2.0, -2.0])
+    hold_days = np.array([1.0, 2.0, 3.0, 2.0])
+
+    result = trade_metrics(profits, hold_days)
+
+    assert result["profit_factor"] == pytest.approx(5 / 3)
+    assert result["win_rate"] == 0.5
+    assert result["avg_hold_days"] == 2.0
+    assert result["avg_loss"] == -1.5
+    assert trade_metrics(np.array([1.0]), np.array([1.0]))["profit_factor"] == float(
+        "inf"
+    )
@@ -0,0 +1,102 @@
+"""봇 메트릭/헬스 엔드포인트 테스트"""
+
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from metrics_server import BotMetrics, InstrumentedExchange, MetricsServer
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class StubExchange:
+    last_response_headers = {"X-MBX-USED-WEIGHT-1M": "42"}
+
+    def fetch_ticker(self, symbol):
+        return {"symbol": symbol, "last": 100.0}
+
+    def fetch_balance(self):
+        raise TimeoutError("timed out")
+
+
+def test_render_prometheus_text_and_cycle_metrics():
+    metrics = BotMetrics(clock=Clock())
+    position = {"buy_price": 100.0, "buy_amount": 0.5}
+    metrics.record_cycle(
+        1.5,
+        {
+            "current_balance": {"USDT": 900.0, "BTC": 0.0},
+            "current_position": None,
+            "current_price": 110.0,
+            "state_changed": True,
+            "new_state": {"position": position},
+        },
+    )
+    metrics.record_cycle(3.0)
+
+    text = metrics.registry.render()
+    assert "# TYPE bot_cycle_duration_seconds histogram" in text
+    assert 'bot_cycle_duration_seconds_bucket{le="2.0"} 1' in text
+    assert 'bot_cycle_duration_seconds_bucket{le="+Inf"} 2' in text
+    assert "bot_cycle_duration_seconds_sum 4.5" in text
+    assert 'bot_cycles_total{result="failure"} 1.0' in text
+    assert 'bot_cycles_total{result="success"} 1.0' in text
+    assert 'bot_balance{currency="USDT"} 900.0' in text
+    assert "bot_position_amount 0.5" in text
+    assert "bot_unrealized_pnl 5.0" in text
+    assert "bot_last_success_timestamp_seconds 1000.0" in text
+    with pytest.raises(ValueError):
+        metrics.cycles.inc()
+
+
+def test_instrumented_exchange_records_latency_errors_and_weight():
+    metrics = BotMetrics()
+    exchange = InstrumentedExchange(StubExchange(), metrics)
+
+    assert exchange.fetch_ticker("BTC/USDT")["last"] == 100.0
+    with pytest.raises(TimeoutError):
+        exchange.fetch_balance()
+
+    text = metrics.registry.render()
+    assert 'bot_exchange_call_duration_seconds_count{method="fetch_ticker"} 1' in text
+    errors = (
+        'bot_exchange_errors_total{method="fetch_balance",error="TimeoutError"} 1.0'
+    )
+    assert errors in text
+    assert "bot_exchange_used_weight 42.0" in text
+
+
+def test_server_serves_metrics_and_reports_stalled_cycles():
+    clock = Clock()
+    metrics = BotMetrics(clock=clock)
+    server = MetricsServer(metrics, port=0, host="127.0.0.1", stall_seconds=60)
+    port = server.start()
+    base = f"http://127.0.0.1:{port}"
+    try:
+        with urllib.request.urlopen(f"{base}/metrics", timeout=5) as response:
+            assert response.headers["Content-Type"].startswith("text/plain")
+            assert "bot_cycles_total" in response.read().decode("utf-8")
+
+        # 시작 직후에는 유예, 마지막 성공 후 stall_seconds가 지나면 503
+        with urllib.request.urlopen(f"{base}/healthz", timeout=5) as response:
+            assert json.load(response)["status"] == "ok"
+        metrics.record_cycle(1.0, {"current_position": None})
+        clock.now += 61
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(f"{base}/healthz", timeout=5)
+        assert error.value.code == 503
+        assert json.load(error.value)["seconds_since_success"] == 61
+
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(f"{base}/nope", timeout=5)
+        assert error.value.code == 404
+    finally:
+        server.stop()
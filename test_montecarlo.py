@@ -0,0 +1,64 @@
+"""Monte Carlo 부트스트랩 테스트"""
+
+import logging
+
+import numpy as np
+import pytest
+
+from backtest import BacktestEngine
+from montecarlo import (
+    SimulationParams,
+    price_path_bootstrap,
+    simulate_path,
+    trade_bootstrap,
+)
+from test_backtest_chunked import make_candles
+
+logging.getLogger("backtest").setLevel(logging.WARNING)
+
+
+@pytest.fixture(scope="module")
+def engine_df():
+    engine = BacktestEngine()
+    return engine, engine.calculate_indicators(make_candles(4000))
+
+
+def test_simulate_path_matches_engine(engine_df):
+    engine, df = engine_df
+    results = engine.run_backtest(df)
+    metrics = engine.calculate_performance_metrics(results, df)
+
+    closes = df["close"].to_numpy()
+    _, entry, exit_, _ = engine.strategy.evaluate(closes)
+    final_value, max_drawdown, trades, wins = simulate_path(
+        closes, entry, exit_, SimulationParams.from_engine(engine)
+    )
+
+    assert final_value == metrics["final_value"]
+    assert max_drawdown == metrics["max_drawdown"]
+    assert (trades, wins) == (metrics["total_trades"], metrics["winning_trades"])
+
+
+def test_price_paths_are_reproducible_across_workers(engine_df):
+    engine, df = engine_df
+    params = SimulationParams.from_engine(engine)
+    closes = df["close"].to_numpy()
+
+    kwargs = dict(n_paths=40, block_size=50, seed=7, batch_size=16)
+    single = price_path_bootstrap(closes, engine.strategy, params, workers=1, **kwargs)
+    pooled = price_path_bootstrap(closes, engine.strategy, params, workers=2, **kwargs)
+
+    assert len(single["total_return"]) == 40
+    for metric in single:
+        np.testing.assert_array_equal(single[metric], pooled[metric])
+
+
+def test_trade_bootstrap_bounds():
+    profits = np.array([2.0, -1.0, 3.0, -0.5])
+    samples = trade_bootstrap(profits, 100.0, n_paths=500, seed=1)
+
+    assert np.all(samples["max_drawdown"] <= 0)
+    assert np.all((samples["win_rate"] >= 0) & (samples["win_rate"] <= 1))
+    # 모든 경로는 같은 거래 수를 뽑으므로 수익률 범위가 제한된다
+    assert samples["total_return"].min() >= -0.04 - 1e-12
+    assert samples["total_return"].max() <= 0.12 + 1e-12
@@ -0,0 +1,93 @@
+"""알림 중복 제거/발송 제한/요약 테스트 (가짜 시계 사용, 네트워크 없음)"""
+
+from notification import NotificationCoalescer
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_700_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def make_coalescer(clock, **kwargs):
+    options = {
+        "dedup_windows": {"error": 600},
+        "rate_limits": {"error": (3, 3600)},
+        "digest_interval": 86400,
+        "clock": clock,
+    }
+    options.update(kwargs)
+    return NotificationCoalescer(**options)
+
+
+def test_duplicates_within_window_are_suppressed_and_counted():
+    clock = FakeClock()
+    coalescer = make_coalescer(clock, rate_limits={})
+
+    assert coalescer.admit("error", "네트워크 오류") == 0
+    clock.advance(60)
+    assert coalescer.admit("error", "네트워크 오류") is None
+    assert coalescer.admit("error", "네트워크 오류") is None
+    # 다른 키는 독립적으로 발송
+    assert coalescer.admit("error", "거래소 오류") == 0
+
+    clock.advance(600)
+    assert coalescer.admit("error", "네트워크 오류") == 2
+
+
+def test_rate_limit_per_type_refills_over_time():
+    clock = FakeClock()
+    coalescer = make_coalescer(clock, dedup_windows={})
+
+    assert [coalescer.admit("error", f"e{i}") for i in range(4)] == [0, 0, 0, None]
+    # 다른 유형은 제한 없음
+    assert coalescer.admit("trade") == 0
+
+    clock.advance(1200)  # 3건/3600초 -> 1개 토큰 회복
+    assert coalescer.admit("error", "e9") == 0
+    assert coalescer.admit("error", "e10") is None
+
+
+def test_digest_rolls_up_and_resets_after_interval():
+    clock = FakeClock()
+    coalescer = make_coalescer(clock)
+
+    coalescer.record_run()
+    coalescer.record_trade("BUY")
+    coalescer.record_trade("SELL")
+    coalescer.record_profit(1.25)
+    coalescer.record_error("네트워크 오류")
+    coalescer.record_error("네트워크 오류")
+    assert coalescer.pop_digest() is None
+
+    clock.advance(86400)
+    digest = coalescer.pop_digest()
+    assert digest["runs"] == 1
+    assert (digest["buys"], digest["sells"]) == (1, 1)
+    assert digest["realized_pnl"] == 1.25
+    assert digest["errors"] == {"네트워크 오류": 2}
+
+    assert coalescer.pop_digest() is None
+
+
+def test_snapshot_restore_keeps_windows_across_runs():
+    clock = FakeClock()
+    first_run = make_coalescer(clock)
+    first_run.admit("error", "네트워크 오류")
+    first_run.record_error("네트워크 오류")
+    snapshot = first_run.snapshot()
+
+    clock.advance(300)
+    second_run = make_coalescer(clock)
+    second_run.restore(snapshot)
+    assert not second_run.dirty
+    assert second_run.admit("error", "네트워크 오류") is None
+    assert second_run.dirty
+
+    clock.advance(86400)
+    assert second_run.pop_digest()["errors"] == {"네트워크 오류": 1}
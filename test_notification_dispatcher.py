@@ -0,0 +1,145 @@
+"""백그라운드 SNS 알림 발송 테스트 (가짜 SNS 클라이언트 사용, 네트워크 없음)"""
+
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+
+from botocore.exceptions import ClientError
+
+from notification import NotificationDispatcher, notifier
+
+
+def entry(i):
+    return {"Subject": f"s{i}", "Message": f"m{i}"}
+
+
+def test_entries_are_batched_retried_and_flushed():
+    batches = []
+    failed_once = set()
+
+    def publish(batch):
+        batches.append([e["Subject"] for e in batch])
+        # 각 항목의 첫 발송은 일시 오류로 재시도 대상
+        retry = [e for e in batch if e["Subject"] not in failed_once]
+        failed_once.update(e["Subject"] for e in retry)
+        return retry
+
+    dispatcher = NotificationDispatcher(publish, batch_size=10, retry_base_delay=0)
+    assert all(dispatcher.submit(entry(i)) for i in range(25))
+    assert dispatcher.flush(timeout=5)
+    worker = dispatcher._worker
+    assert dispatcher.close(timeout=5) and not worker.is_alive()
+
+    assert max(len(b) for b in batches) <= 10
+    assert failed_once == {f"s{i}" for i in range(25)}
+    assert dispatcher.dropped == 0
+
+
+def test_full_queue_drops_and_exhausted_retries_do_not_block_flush():
+    release = threading.Event()
+    calls = []
+
+    def publish(batch):
+        release.wait(5)
+        calls.append(len(batch))
+        return batch  # 계속 실패
+
+    dispatcher = NotificationDispatcher(
+        publish, queue_size=2, batch_size=1, max_retries=2, retry_base_delay=0
+    )
+    results = [dispatcher.submit(entry(i)) for i in range(6)]
+    # 워커가 하나를 꺼내 발송 중이라도 큐에는 최대 2건만 대기
+    assert results.count(False) == dispatcher.dropped >= 3
+    assert not dispatcher.flush(timeout=0.05)
+
+    release.set()
+    assert dispatcher.close(timeout=5)
+    assert calls == [1] * (3 * results.count(True))
+
+
+def test_close_with_full_queue_returns_and_exit_flush_registers_once(monkeypatch):
+    registered = []
+    monkeypatch.setattr("notification.atexit.register", registered.append)
+    started, release = threading.Event(), threading.Event()
+
+    def publish(batch):
+        started.set()
+        release.wait(5)
+        return []
+
+    dispatcher = NotificationDispatcher(publish, queue_size=1, batch_size=1)
+    dispatcher.submit(entry(0))
+    assert started.wait(5)
+    # 워커가 발송 중인 동안 큐를 가득 채움
+    assert dispatcher.submit(entry(1)) and not dispatcher.submit(entry(2))
+    # flush 시간 초과 후에도 종료 요청 때문에 다시 막히거나 queue.Full을 내지 않음
+    began = time.monotonic()
+    assert not dispatcher.close(timeout=0.1)
+    assert time.monotonic() - began < 1.0
+
+    release.set()
+    worker = dispatcher._worker
+    assert dispatcher.close(timeout=5) and not worker.is_alive()
+    # 닫은 뒤 다시 제출하면 워커는 새로 뜨지만 atexit 등록은 그대로 한 번
+    assert dispatcher.submit(entry(9))
+    assert dispatcher.close(timeout=5)
+    assert registered == [dispatcher.flush]
+
+
+def test_pending_notifications_are_flushed_at_exit(tmp_path):
+    out = tmp_path / "published.txt"
+    script = textwrap.dedent(
+        f"""
+        import time
+        from notification import NotificationDispatcher
+
+        def publish(batch):
+            time.sleep(0.2)
+            with open({str(out)!r}, "a") as f:
+                f.writelines(e["Subject"] + "\\n" for e in batch)
+            return []
+
+        dispatcher = NotificationDispatcher(publish, batch_size=2)
+        for i in range(5):
+            dispatcher.submit({{"Subject": f"s{{i}}", "Message": ""}})
+        """
+    )
+    subprocess.run([sys.executable, "-c", script], check=True, timeout=60)
+    assert out.read_text().split() == [f"s{i}" for i in range(5)]
+
+
+class FakeSns:
+    def __init__(self, response=None, error=None):
+        self.response = response
+        self.error = error
+        self.requests = []
+
+    def publish_batch(self, TopicArn, PublishBatchRequestEntries):
+        self.requests.append(PublishBatchRequestEntries)
+        if self.error:
+            raise self.error
+        return self.response
+
+
+def test_sns_publish_errors_return_retryable_entries(monkeypatch):
+    entries = [entry(i) for i in range(3)]
+    monkeypatch.setattr(notifier, "topic_arn", "arn:aws:sns:test")
+
+    throttled = ClientError({"Error": {"Code": "Throttling"}}, "PublishBatch")
+    monkeypatch.setattr(notifier, "sns_client", FakeSns(error=throttled))
+    assert notifier._publish_batch(entries) == entries
+
+    response = {
+        "Successful": [{"Id": "0", "MessageId": "m-0"}],
+        "Failed": [
+            {"Id": "1", "Code": "InternalError", "SenderFault": False},
+            {"Id": "2", "Code": "InvalidParameter", "SenderFault": True},
+        ],
+    }
+    sns = FakeSns(response=response)
+    monkeypatch.setattr(notifier, "sns_client", sns)
+    # 서버 측 실패만 다시 보내고, 요청 자체가 잘못된 항목은 버림
+    assert notifier._publish_batch(entries) == [entries[1]]
+    assert [e["Id"] for e in sns.requests[0]] == ["0", "1", "2"]
@@ -67,6 +67,10 @@ def test_notifications():
         )
         print("✅ 오류 알림 발송 완료\n")
 
+        # 백그라운드 큐에 쌓인 알림 발송 대기
+        if not notifier.flush(timeout=30):
+            print("⚠️ 일부 알림이 시간 내에 발송되지 않았습니다.")
+
         print("🎉 모든 알림 테스트가 완료되었습니다!")
         print("📧 이메일을 확인하여 알림이 정상적으로 도착했는지 확인하세요.")
 
@@ -0,0 +1,142 @@
+"""주문 분할 실행 테스트"""
+
+import json
+import logging
+
+import pytest
+
+from backtest import BacktestEngine
+from fill_simulator import FillModel
+from order_scheduler import (
+    OrderScheduler,
+    SlicingConfig,
+    new_parent_order,
+    parent_report,
+    reconcile,
+)
+from test_backtest_chunked import make_candles
+
+logging.getLogger("backtest").setLevel(logging.WARNING)
+logging.getLogger("order_scheduler").setLevel(logging.WARNING)
+
+
+class FakeExecutor:
+    """자식 주문마다 가격이 0.1씩 오르는 시장가 실행기"""
+
+    def __init__(self, fail_at=None):
+        self.calls = []
+        self.fail_at = fail_at
+
+    def execute(self, side, amount):
+        if len(self.calls) == self.fail_at:
+            self.fail_at = None
+            raise ConnectionError("network down")
+        self.calls.append(amount)
+        price = 100.0 + 0.1 * len(self.calls)
+        cost = amount * price
+        return {
+            "order_id": str(len(self.calls)),
+            "filled": amount,
+            "amount": amount,
+            "price": price,
+            "gross_cost": cost,
+            "cost": cost * 1.001,
+            "fee": cost * 0.001,
+            "maker_ratio": 0.0,
+        }
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+    def __call__(self):
+        return self.now
+
+
+def make_scheduler(executor, **config):
+    clock = FakeClock()
+    config = SlicingConfig(**{"mode": "twap", "interval_seconds": 60, **config})
+    return OrderScheduler(executor, config, clock=clock, sleep=clock.sleep), clock
+
+
+@pytest.mark.parametrize(
+    "config, expected",
+    [
+        ({"mode": "twap", "slices": 4}, [0.25, 0.25, 0.25, 0.25]),
+        ({"mode": "iceberg", "display_size": 0.3}, [0.3, 0.3, 0.3, 0.1]),
+        ({"mode": "iceberg", "display_size": 2.0}, [1.0]),
+    ],
+)
+def test_child_quantities(config, expected):
+    assert SlicingConfig(**config).child_quantities(1.0) == pytest.approx(expected)
+
+
+def test_twap_runs_children_on_schedule():
+    executor = FakeExecutor()
+    scheduler, clock = make_scheduler(executor, slices=4)
+    parent = new_parent_order("buy", 1.0, scheduler.config, 0.0, now=clock())
+    saved = []
+    scheduler.run(parent, lambda p: saved.append(json.dumps(p)))
+
+    assert parent["status"] == "done"
+    assert executor.calls == pytest.approx([0.25] * 4)
+    assert clock() == 1_000.0 + 3 * 60
+    report = parent_report(parent)
+    assert report["filled"] == pytest.approx(1.0)
+    assert report["price"] == pytest.approx(100.25)
+    assert report["fee_rate"] == pytest.approx(0.001)
+    # 자식 주문마다 체결 전/후 두 번 저장
+    assert len(saved) == 8
+
+
+def test_deadline_leaves_parent_active_then_resumes():
+    executor = FakeExecutor()
+    scheduler, clock = make_scheduler(executor, slices=4)
+    parent = new_parent_order("sell", 1.0, scheduler.config, 1.0, now=clock())
+    scheduler.run(parent, max_seconds=90)
+
+    assert parent["status"] == "active"
+    assert parent["next_child"] == 2
+    assert parent_report(parent)["in_progress"]
+
+    # 상태 저장/복원 후 다음 실행에서 이어서 진행
+    parent = json.loads(json.dumps(parent))
+    scheduler.start(parent).result()
+    assert parent["status"] == "done"
+    assert len(executor.calls) == 4
+
+
+def test_interrupted_child_is_reconciled_from_balance():
+    executor = FakeExecutor(fail_at=1)
+    scheduler, clock = make_scheduler(executor, slices=2)
+    parent = new_parent_order("buy", 1.0, scheduler.config, 0.2, now=clock())
+    with pytest.raises(ConnectionError):
+        scheduler.run(parent)
+    assert parent["in_flight"]
+
+    # 중단된 두 번째 자식 주문은 실제로 체결됐다 (잔고 0.2 -> 1.2)
+    reconcile(parent, 1.2, 101.0)
+    assert not parent["in_flight"]
+    assert parent["status"] == "done"
+    assert parent["filled"] == pytest.approx(1.0)
+    assert parent["children"][-1]["order_id"] is None
+
+
+def test_backtest_slicing_path():
+    engine = BacktestEngine()
+    engine.fill_model = FillModel(
+        spread_bps=2.0, impact_coef=0.1, impact_model="sqrt", trading_fee=0.001
+    )
+    df = make_candles(3000)
+    df["volume"] = 0.5  # 얇은 호가 -> 시장 충격이 큼
+    slicing = SlicingConfig(mode="twap", slices=5, interval_seconds=60)
+    comparison = engine.compare_slicing(df, slicing)
+
+    single, sliced = comparison["single"], comparison["twap"]
+    assert single["trades"] == sliced["trades"] > 0
+    assert sliced["fills"] == 5 * sliced["trades"]
+    assert sliced["slippage_bps"] < single["slippage_bps"]
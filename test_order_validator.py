@@ -0,0 +1,110 @@
+"""주문 사전 검증 테스트"""
+
+import pytest
+
+from order_validator import FilterCache, OrderRejected, OrderValidator, SymbolFilters
+
+# BTC/USDT 바이낸스 필터 (load_markets()의 market['info']['filters'])
+BINANCE_MARKET = {
+    "info": {
+        "filters": [
+            {
+                "filterType": "PRICE_FILTER",
+                "minPrice": "0.01000000",
+                "maxPrice": "1000000.00000000",
+                "tickSize": "0.01000000",
+            },
+            {
+                "filterType": "LOT_SIZE",
+                "minQty": "0.00001000",
+                "maxQty": "9000.00000000",
+                "stepSize": "0.00001000",
+            },
+            {"filterType": "MARKET_LOT_SIZE", "minQty": "0", "maxQty": "100.0"},
+            {
+                "filterType": "NOTIONAL",
+                "minNotional": "5.00000000",
+                "applyMinToMarket": True,
+                "maxNotional": "9000000.00000000",
+            },
+        ]
+    }
+}
+
+FILTERS = SymbolFilters.from_market(BINANCE_MARKET)
+
+
+@pytest.mark.parametrize(
+    "side, amount, price, order_type, balance, expected",
+    [
+        # 수량은 stepSize로 내림
+        ("buy", 0.0016049876, 31000.0, "market", None, (0.00160, 31000.0)),
+        ("sell", 0.123456789, 31000.0, "market", 1.0, (0.12345, 31000.0)),
+        # 부동소수점 오차가 있어도 정확히 step 배수
+        ("buy", 0.00003, 200000.0, "market", None, (0.00003, 200000.0)),
+        # 지정가는 매수 내림, 매도 올림
+        ("buy", 0.001, 31000.019, "limit", None, (0.001, 31000.01)),
+        ("sell", 0.001, 31000.011, "limit", None, (0.001, 31000.02)),
+        # 잔고가 정확히 충분한 경우
+        ("sell", 0.5, 31000.0, "market", 0.5, (0.5, 31000.0)),
+    ],
+)
+def test_valid_orders_are_rounded(side, amount, price, order_type, balance, expected):
+    validator = OrderValidator(FILTERS, fee_rate=0.001)
+    result = validator.validate(side, amount, price, order_type, balance)
+    assert result == pytest.approx(expected)
+
+
+@pytest.mark.parametrize(
+    "side, amount, price, order_type, balance, reason",
+    [
+        ("buy", 0.000009, 31000.0, "market", None, "최소 수량"),
+        ("buy", 0.0001, 31000.0, "market", None, "최소 주문 금액"),
+        ("sell", 0.00016, 31000.0, "limit", None, "최소 주문 금액"),
+        ("buy", 150.0, 31000.0, "market", None, "최대 수량"),
+        ("buy", 0.001, 0.001, "limit", None, "최소 가격"),
+        ("buy", 0.01, 31000.0, "market", 310.0, "잔고 부족"),
+        ("sell", 0.01, 31000.0, "market", 0.00999, "잔고 부족"),
+    ],
+)
+def test_invalid_orders_are_rejected(side, amount, price, order_type, balance, reason):
+    validator = OrderValidator(FILTERS, fee_rate=0.001)
+    with pytest.raises(OrderRejected, match=reason):
+        validator.validate(side, amount, price, order_type, balance)
+
+
+@pytest.mark.parametrize(
+    "quantities, price, expected",
+    [
+        ([0.0002] * 5, 31000.0, [0.0002] * 5),
+        # 최소 금액(5 USDT) 미만 조각은 합쳐서 주문
+        ([0.0001] * 5, 31000.0, [0.0002, 0.0003]),
+        ([0.0003334] * 3, 31000.0, [0.00033, 0.00033, 0.00034]),
+        ([0.00001] * 3, 31000.0, [0.00003]),
+    ],
+)
+def test_normalize_schedule(quantities, price, expected):
+    pieces = OrderValidator(FILTERS).normalize_schedule(quantities, price)
+    assert pieces == pytest.approx(expected)
+    assert sum(pieces) == pytest.approx(sum(quantities), abs=1e-5)
+
+
+def test_rejected_before_network_call_and_filters_cached(tmp_path):
+    class Exchange:
+        precisionMode = 4
+        calls = 0
+
+        def load_markets(self):
+            Exchange.calls += 1
+
+        def market(self, symbol):
+            return BINANCE_MARKET
+
+    cache = FilterCache(str(tmp_path / "filters.json"))
+    validator = OrderValidator(lambda: cache.get(Exchange(), "BTC/USDT"))
+    with pytest.raises(OrderRejected):
+        validator.validate("buy", 0.0001, 31000.0)
+
+    # 두 번째 프로세스는 디스크 캐시에서 필터를 읽는다
+    assert cache.get(Exchange(), "BTC/USDT").to_dict() == FILTERS.to_dict()
+    assert Exchange.calls == 1
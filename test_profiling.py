@@ -0,0 +1,53 @@
+"""실행 프로파일링 테스트"""
+
+import contextlib
+
+import numpy as np
+import pytest
+
+from profiling import Profiler, profile_from_env, profile_run
+
+
+def busy_work():
+    total = 0.0
+    for _ in range(200):
+        total += float(np.sort(np.random.default_rng(0).random(20_000)).sum())
+    return total
+
+
+def allocate_blocks():
+    return [bytearray(64 * 1024) for _ in range(64)]
+
+
+def test_disabled_profiling_is_a_no_op(monkeypatch):
+    monkeypatch.delenv("PROFILE_MODE", raising=False)
+    assert isinstance(profile_run(None), contextlib.nullcontext)
+    assert isinstance(profile_from_env("fargate"), contextlib.nullcontext)
+    with pytest.raises(ValueError):
+        profile_run("io")
+
+
+def test_cpu_profile_writes_hot_functions_and_collapsed_stacks(tmp_path):
+    with profile_run("cpu", str(tmp_path), "unit") as profiler:
+        busy_work()
+
+    assert isinstance(profiler, Profiler)
+    assert {p.rsplit(".", 1)[1] for p in profiler.files} == {"txt", "prof", "collapsed"}
+    assert "busy_work" in profiler.summary and "cumulative" in profiler.summary
+
+    lines = open(profiler.files[2], encoding="utf-8").read().splitlines()
+    assert lines
+    stack, count = lines[0].rsplit(" ", 1)
+    assert stack.startswith("MainThread;") and int(count) > 0
+    assert any("busy_work (test_profiling.py" in line for line in lines)
+
+
+def test_mem_profile_reports_allocation_sites(tmp_path):
+    with profile_run("mem", str(tmp_path), "unit") as profiler:
+        blocks = allocate_blocks()
+
+    assert len(blocks) == 64
+    top_site = profiler.summary.splitlines()[3]
+    assert "test_profiling.py" in top_site and "KiB" in top_site
+    collapsed = open(profiler.files[1], encoding="utf-8").read()
+    assert "test_profiling.py" in collapsed
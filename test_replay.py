@@ -0,0 +1,102 @@
+"""거래소 호출 기록/재생 테스트"""
+
+import ccxt
+import pytest
+
+from metrics_server import InstrumentedExchange
+from replay import RecordingExchange, ReplayExchange, ReplayMismatch, recording_stats
+
+
+class FakeExchange:
+    id = "fake"
+
+    def __init__(self):
+        self.calls = 0
+
+    def fetch_ticker(self, symbol):
+        self.calls += 1
+        return {"symbol": symbol, "last": 100.0 + self.calls}
+
+    def create_market_buy_order(self, symbol, amount):
+        raise ccxt.InsufficientFunds("not enough USDT")
+
+
+@pytest.fixture
+def recording(tmp_path):
+    path = str(tmp_path / "session.jsonl.gz")
+    exchange = RecordingExchange(FakeExchange(), path)
+    assert exchange.fetch_ticker("BTC/USDT")["last"] == 101.0
+    assert exchange.fetch_ticker(symbol="BTC/USDT")["last"] == 102.0
+    with pytest.raises(ccxt.InsufficientFunds):
+        exchange.create_market_buy_order("BTC/USDT", amount=0.001)
+    exchange.close()
+    return path
+
+
+def test_replay_returns_recorded_responses(recording):
+    replay = ReplayExchange(recording)
+
+    assert replay.fetch_ticker("BTC/USDT")["last"] == 101.0
+    assert replay.fetch_ticker(symbol="BTC/USDT")["last"] == 102.0
+    with pytest.raises(ccxt.InsufficientFunds, match="not enough USDT"):
+        replay.create_market_buy_order("BTC/USDT", amount=0.001)
+    assert replay.remaining == 0
+
+
+def test_replay_detects_diverging_calls(recording):
+    replay = ReplayExchange(recording)
+    with pytest.raises(ReplayMismatch):
+        replay.fetch_ticker("ETH/USDT")
+
+    replay = ReplayExchange(recording)
+    with pytest.raises(ReplayMismatch):
+        replay.fetch_balance()
+
+
+def test_recording_stats(recording):
+    stats = recording_stats(recording)
+
+    assert stats["fetch_ticker"]["calls"] == 2
+    assert stats["create_market_buy_order"]["errors"] == 1
+
+
+def test_replay_exposes_recorded_attributes_not_functions(recording):
+    replay = ReplayExchange(recording)
+    assert (replay.id, replay.precisionMode, replay.markets) == ("fake", 4, None)
+    with pytest.raises(AttributeError):
+        replay.rateLimit
+    # 메트릭 프록시가 응답 헤더를 읽어도 함수가 아니라 기록된 값
+    assert InstrumentedExchange(replay).fetch_ticker("BTC/USDT")["last"] == 101.0
+    assert replay.last_response_headers is None
+
+
+def run_bot(monkeypatch, tmp_path, variable, name, cycles=3):
+    """FakeExchange 봇을 기록 또는 재생 모드로 여러 주기 실행"""
+    from trade import TradingBot
+
+    monkeypatch.setenv("EXCHANGE_FAKE", "1")
+    monkeypatch.setenv(variable, str(tmp_path / "session.jsonl.gz"))
+    bot = TradingBot()
+    bot.filter_cache.path = str(tmp_path / f"{name}-filters.json")
+    # 첫 주기에 매수해 clientOrderId가 붙은 주문까지 기록
+    monkeypatch.setattr(bot, "should_buy", lambda df, state: not state["position"])
+
+    state = {"position": None, "total_trades": 0}
+    actions = [bot.execute_strategy(state)["action"] for _ in range(cycles)]
+    return bot, actions, state
+
+
+def test_trading_bot_session_replays_without_mismatch(monkeypatch, tmp_path):
+    bot, recorded, recorded_state = run_bot(
+        monkeypatch, tmp_path, "EXCHANGE_RECORD", "record"
+    )
+    bot.resilient._exchange._exchange.close()
+    monkeypatch.delenv("EXCHANGE_RECORD")
+
+    bot, replayed, replayed_state = run_bot(
+        monkeypatch, tmp_path, "EXCHANGE_REPLAY", "replay"
+    )
+    replay = bot.resilient._exchange._exchange
+    assert isinstance(replay, ReplayExchange) and replay.remaining == 0
+    assert recorded == replayed and recorded[0] == "BUY"
+    assert replayed_state["position"] == recorded_state["position"]
@@ -0,0 +1,181 @@
+"""캔들 리샘플링 테스트 (pandas resample 기준값과 비교)"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from fake_exchange import FakeExchange
+from resample import (
+    IncrementalResampler,
+    align_to_base,
+    alignment_index,
+    resample_ohlcv,
+)
+
+AGG = {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+MONDAY = pd.Timestamp("1970-01-05")
+
+
+def base_candles(start: str, minutes: int, seed: int = 1, skip=()) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 30000 * np.exp(np.cumsum(rng.normal(0, 0.001, minutes)))
+    df = pd.DataFrame(
+        {
+            "open": np.concatenate(([30000.0], close[:-1])),
+            "high": close * 1.001,
+            "low": close * 0.999,
+            "close": close,
+            "volume": rng.uniform(1, 5, minutes),
+        },
+        index=pd.date_range(start, periods=minutes, freq="1min", name="timestamp"),
+    )
+    return df.drop(df.index[list(skip)])
+
+
+def reference(df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    if timeframe.endswith("w"):
+        rule, origin = f"{int(timeframe[:-1]) * 7}D", MONDAY
+    else:
+        rule, origin = timeframe.replace("m", "min"), "epoch"
+    resampled = df.resample(rule, origin=origin)
+    expected = resampled.agg(AGG)
+    expected["candles"] = resampled["close"].count()
+    return expected[expected["candles"] > 0]
+
+
+@pytest.mark.parametrize("timeframe", ["5m", "15m", "1h", "4h", "1d", "1w"])
+def test_matches_pandas_at_bucket_edges(timeframe):
+    # 봉 경계가 아닌 시각에 시작하고, 중간 구간이 빠진 3주 분량 1분봉
+    df = base_candles("2024-01-03 00:07", 3 * 7 * 1440, skip=range(600, 640))
+    resampled = resample_ohlcv(df, timeframe, "1m")
+
+    pd.testing.assert_frame_equal(
+        resampled, reference(df, timeframe), check_freq=False, check_dtype=False
+    )
+
+
+def test_partial_last_bar_is_kept_or_dropped():
+    df = base_candles("2024-01-01 00:00", 37)
+    resampled = resample_ohlcv(df, "15m", "1m")
+    assert list(resampled["candles"]) == [15, 15, 7]
+    assert resampled["close"].iloc[-1] == df["close"].iloc[-1]
+
+    dropped = resample_ohlcv(df, "15m", "1m", drop_partial=True)
+    assert list(dropped["candles"]) == [15, 15]
+    # 마지막 봉이 다 찼으면 그대로 유지
+    full = resample_ohlcv(df.iloc[:30], "15m", "1m", drop_partial=True)
+    assert len(full) == 2
+
+    with pytest.raises(ValueError):
+        resample_ohlcv(df, "7m", "5m")
+
+
+def test_live_higher_timeframe_data_matches_reference(monkeypatch):
+    monkeypatch.setenv("EXCHANGE_FAKE", "1")
+    from trade import TradingBot
+
+    bot = TradingBot()
+    bot.base_timeframe, bot.timeframe = "1m", "15m"
+    # 15분봉 중간(8분 경과) 시점
+    now_ms = int(pd.Timestamp("2024-03-04 12:08:30").value // 1_000_000)
+    bot.exchange = FakeExchange(bot.symbol, "1m", bars=600, seed=3, now_ms=now_ms)
+
+    live = bot.get_ohlcv_data(limit=10)
+
+    candles = bot.exchange.fetch_ohlcv(bot.symbol, "1m")
+    base = bot._to_dataframe(candles)
+    expected = reference(base, "15m").drop(columns="candles").tail(10)
+    pd.testing.assert_frame_equal(live, expected, check_freq=False, check_dtype=False)
+    # 첫 봉은 잘리지 않고, 마지막은 진행 중인 봉(기본 봉 8개)까지 포함
+    assert live.index[0] == pd.Timestamp("2024-03-04 09:45")
+    assert live.index[-1] == pd.Timestamp("2024-03-04 12:00")
+    assert live["close"].iloc[-1] == candles[-1][4]
+
+
+def test_alignment_uses_only_closed_higher_bars():
+    df = base_candles("2024-01-01 00:00", 40)
+    higher = resample_ohlcv(df, "15m", "1m")
+
+    positions = alignment_index(df.index, higher.index, "1m", "15m")
+    # 00:14 기본 봉이 마감되는 00:15에 첫 15분봉도 마감
+    assert list(positions[:16]) == [-1] * 14 + [0, 0]
+    # 진행 중인 00:30 봉은 끝까지 참조하지 않음
+    assert positions[29] == 1 and positions[-1] == 1
+
+    aligned = align_to_base(higher[["close"]], df.index, "1m", "15m")
+    assert aligned["close"].iloc[:14].isna().all()
+    assert aligned["close"].iloc[14] == df["close"].iloc[14]
+    assert aligned["close"].iloc[-1] == df["close"].iloc[29]
+
+
+def test_incremental_resampler_matches_vectorized_across_restarts():
+    df = base_candles("2024-01-01 00:07", 200, skip=range(50, 70))
+    candles = [
+        [int(ts.value // 1_000_000), *row] for ts, row in zip(df.index, df.values)
+    ]
+
+    resampler = IncrementalResampler("15m", "1m")
+    closed = []
+    for i, candle in enumerate(candles):
+        closed.extend(resampler.update(candle))
+        if i % 37 == 0:
+            # 실행마다 상태를 저장하고 다시 읽어도 결과가 같아야 함
+            state = json.loads(json.dumps(resampler.to_state()))
+            resampler = IncrementalResampler.from_state(state, "15m", "1m")
+    bars = closed + [resampler.partial]
+
+    expected = resample_ohlcv(df, "15m", "1m")
+    assert [bar[0] for bar in bars] == list(expected.index.asi8 // 1_000_000)
+    np.testing.assert_allclose([bar[1:] for bar in bars], expected.to_numpy())
+    # 이미 누적한 캔들이 다시 들어와도 무시
+    assert resampler.update(candles[-1]) == []
+    assert IncrementalResampler.from_state(None, "15m", "1m") is None
+    with pytest.raises(ValueError):
+        IncrementalResampler("7m", "5m")
+
+
+def test_live_resampled_window_fetches_only_new_base_candles(monkeypatch):
+    monkeypatch.setenv("EXCHANGE_FAKE", "1")
+    from trade import TradingBot
+
+    bot = TradingBot()
+    bot.base_timeframe, bot.timeframe = "1m", "15m"
+    limit = max(100, bot.strategy.warmup)
+    now_ms = int(pd.Timestamp("2024-03-04 12:08:30").value // 1_000_000)
+    exchange = FakeExchange(
+        bot.symbol, "1m", bars=15 * (limit + 2), seed=3, now_ms=now_ms
+    )
+    bot.exchange = exchange
+
+    requests = []
+    fetch_ohlcv = exchange.fetch_ohlcv
+
+    def recording_fetch(*args, **kwargs):
+        requests.append(kwargs.get("since"))
+        return fetch_ohlcv(*args, **kwargs)
+
+    monkeypatch.setattr(exchange, "fetch_ohlcv", recording_fetch)
+
+    window = None
+    # 같은 상위 봉 안, 봉 경계, 한 봉 이상, 새 캔들 없음
+    for step in (0, 1, 7, 15, 0, 3):
+        exchange.advance(step)
+        requests.clear()
+        previous = window
+        df, window = bot.get_close_data(window)
+        window = json.loads(json.dumps(window))
+
+        if previous is not None:
+            assert requests == [previous["resampler"]["last"] + 60_000]
+        candles = fetch_ohlcv(bot.symbol, "1m")
+        assert window["resampler"]["last"] == candles[-2][0]
+
+        # 이어 붙인 경우는 저장된 warmup 구간 + 새 봉만 반환
+        assert len(df) > bot.strategy.warmup
+        expected = reference(bot._to_dataframe(candles), "15m")["close"]
+        expected = expected.tail(len(df))
+        pd.testing.assert_series_equal(
+            df["close"], expected, check_freq=False, check_names=False
+        )
@@ -0,0 +1,200 @@
+"""거래소 호출 복원력 계층 테스트 (가짜 거래소 장애 주입)"""
+
+import logging
+import random
+import time
+
+import ccxt
+import pytest
+
+from fake_exchange import FakeExchange, Fault
+from resilience import (
+    CircuitOpen,
+    DeadlineExceeded,
+    OrderStateUnknown,
+    ResilientExchange,
+    RetryPolicy,
+)
+
+logging.getLogger("resilience").setLevel(logging.ERROR)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+    def __call__(self):
+        return self.now
+
+
+def make_resilient(exchange, clock, **kwargs):
+    options = {"retry": RetryPolicy(max_attempts=4, rng=random.Random(0))}
+    options.update(kwargs)
+    return ResilientExchange(exchange, clock=clock, sleep=clock.sleep, **options)
+
+
+def test_transient_read_errors_are_retried_with_backoff():
+    clock = FakeClock()
+    fake = FakeExchange()
+    fake.fail("fetch_ticker", ccxt.RequestTimeout("t1"), ccxt.NetworkError("t2"))
+    exchange = make_resilient(fake, clock)
+
+    assert exchange.fetch_ticker("BTC/USDT")["last"] > 0
+    assert fake.calls.count("fetch_ticker") == 3
+    # 지터 백오프: 0 <= 대기 <= base * (1 + 2)
+    assert 0 < clock.now <= 0.5 * 3
+
+
+def test_exchange_errors_are_not_retried():
+    clock = FakeClock()
+    fake = FakeExchange()
+    fake.fail("fetch_balance", ccxt.AuthenticationError("bad key"))
+    with pytest.raises(ccxt.AuthenticationError):
+        make_resilient(fake, clock).fetch_balance()
+    assert fake.calls.count("fetch_balance") == 1
+
+
+def test_order_with_lost_response_is_not_duplicated():
+    clock = FakeClock()
+    fake = FakeExchange()
+    # 주문은 접수됐지만 응답이 유실됨
+    fake.fail("create_order", Fault(ccxt.RequestTimeout("lost"), after_call=True))
+    exchange = make_resilient(fake, clock)
+
+    order = exchange.create_order("BTC/USDT", "market", "buy", 0.001)
+    assert order["status"] == "closed"
+    assert order["clientOrderId"].startswith("bot-")
+    assert len(fake.orders) == 1
+    assert fake.calls.count("create_order") == 1
+
+
+def test_order_rejected_before_acceptance_is_resent_with_same_client_id():
+    clock = FakeClock()
+    fake = FakeExchange()
+    fake.fail("create_order", ccxt.ExchangeNotAvailable("503"))
+    exchange = make_resilient(fake, clock)
+
+    exchange.create_order(
+        "BTC/USDT", "market", "buy", 0.001, params={"clientOrderId": "bot-fixed"}
+    )
+    assert fake.calls.count("create_order") == 2
+    assert [o["clientOrderId"] for o in fake.orders.values()] == ["bot-fixed"]
+
+
+def test_order_with_unknown_state_is_never_resent():
+    clock = FakeClock()
+    fake = FakeExchange()
+    # 체결 후 응답 유실, 조회도 한동안 실패
+    fake.fail("create_order", Fault(ccxt.RequestTimeout("lost"), after_call=True))
+    fake.fail("fetch_order", *[ccxt.NetworkError("down")] * 50)
+    exchange = make_resilient(fake, clock)
+    exchange.start_cycle(10.0)
+
+    with pytest.raises(OrderStateUnknown):
+        exchange.create_order("BTC/USDT", "market", "buy", 0.001)
+    assert fake.calls.count("create_order") == 1 and len(fake.orders) == 1
+    # 조회는 마감 시간까지 계속 재시도
+    assert fake.calls.count("fetch_order") > 4 and clock.now <= 10.0
+
+    # 조회가 결국 성공하면 접수된 주문을 그대로 돌려줌
+    fake.fail("create_order", Fault(ccxt.RequestTimeout("lost"), after_call=True))
+    fake._faults["fetch_order"].clear()
+    fake.fail("fetch_order", *[ccxt.NetworkError("down")] * 2)
+    order = exchange.create_order("BTC/USDT", "market", "sell", 0.001)
+    assert order["side"] == "sell" and len(fake.orders) == 2
+
+
+@pytest.mark.parametrize("accepted", [True, False])
+def test_bot_reconciles_unknown_order_from_balance_next_cycle(
+    monkeypatch, tmp_path, accepted
+):
+    monkeypatch.setenv("EXCHANGE_FAKE", "1")
+    from trade import TradingBot
+
+    bot = TradingBot()
+    bot.filter_cache.path = str(tmp_path / "filters.json")
+    clock = FakeClock()
+    bot.resilient._retry = RetryPolicy(max_attempts=4, rng=random.Random(0))
+    bot.resilient._clock, bot.resilient._sleep = clock, clock.sleep
+    bot.resilient._cycle_seconds = 10.0
+    fake = bot.resilient._exchange._exchange
+    # 접수 여부와 관계없이 응답이 오지 않고 조회도 계속 실패
+    fake.fail("create_order", Fault(ccxt.RequestTimeout("lost"), after_call=accepted))
+    fake.fail("fetch_order", *[ccxt.NetworkError("down")] * 100)
+    monkeypatch.setattr(bot, "should_buy", lambda df, state: not state["position"])
+
+    saved = []
+    state = {"position": None, "total_trades": 0}
+    with pytest.raises(OrderStateUnknown):
+        bot.execute_strategy(state, lambda s: saved.append(s["parent_order"]))
+    assert saved[-1]["in_flight"] and state["parent_order"] is saved[-1]
+    assert fake.calls.count("create_order") == 1
+
+    # 다음 주기: 다시 주문하지 않고 BTC 잔고 변화로 포지션 복원 (없으면 그대로)
+    fake._faults["fetch_order"].clear()
+    result = bot.execute_strategy(state)
+    assert result["action"] == ("BUY" if accepted else "NO_ACTION")
+    assert result["new_state"]["parent_order"] is None
+    position = result["new_state"]["position"]
+    if accepted:
+        assert position["buy_amount"] == pytest.approx(fake.balances["BTC"])
+    else:
+        assert position is None and fake.balances["BTC"] == 0
+    assert fake.calls.count("create_order") == 1
+
+
+def test_circuit_breaker_opens_and_recovers():
+    clock = FakeClock()
+    fake = FakeExchange()
+    fake.fail("fetch_ohlcv", *[ccxt.NetworkError("down")] * 3)
+    exchange = make_resilient(
+        fake,
+        clock,
+        retry=RetryPolicy(max_attempts=2, base_delay=0.0),
+        failure_threshold=3,
+        reset_seconds=30,
+    )
+
+    with pytest.raises(ccxt.NetworkError):
+        exchange.fetch_ohlcv("BTC/USDT", "5m")
+    with pytest.raises(CircuitOpen):
+        exchange.fetch_ohlcv("BTC/USDT", "5m")
+    assert fake.calls.count("fetch_ohlcv") == 3
+    assert exchange.breaker("fetch_ohlcv").state == "open"
+    # 다른 엔드포인트는 영향 없음
+    exchange.fetch_ticker("BTC/USDT")
+
+    clock.now += 30
+    assert exchange.breaker("fetch_ohlcv").state == "half_open"
+    assert exchange.fetch_ohlcv("BTC/USDT", "5m")
+    assert exchange.breaker("fetch_ohlcv").state == "closed"
+
+
+def test_cycle_deadline_bounds_retries():
+    clock = FakeClock()
+    fake = FakeExchange()
+    fake.fail("fetch_ticker", *[ccxt.RequestTimeout("slow")] * 10)
+    exchange = make_resilient(
+        fake, clock, retry=RetryPolicy(max_attempts=10, base_delay=4.0)
+    )
+    exchange.start_cycle(5.0)
+
+    with pytest.raises(DeadlineExceeded):
+        exchange.fetch_ticker("BTC/USDT")
+    assert clock.now <= 5.0
+    # DeadlineExceeded는 기존 네트워크 오류 처리로 잡힌다
+    assert issubclass(DeadlineExceeded, ccxt.NetworkError)
+
+
+def test_hedged_read_uses_faster_response():
+    fake = FakeExchange()
+    fake.fail("fetch_order_book", Fault(latency=1.0))
+    exchange = ResilientExchange(fake, hedge_after=0.05)
+
+    started = time.monotonic()
+    book = exchange.fetch_order_book("BTC/USDT")
+    assert time.monotonic() - started < 0.5
+    assert book["bids"] and fake.calls.count("fetch_order_book") == 2
@@ -0,0 +1,61 @@
+"""백테스트 결과 캐시 테스트"""
+
+import logging
+
+import pytest
+
+from backtest import BacktestEngine
+from result_cache import ResultCache, data_fingerprint
+from test_backtest_chunked import make_candles
+
+logging.getLogger("backtest").setLevel(logging.WARNING)
+
+
+@pytest.fixture
+def engine():
+    return BacktestEngine()
+
+
+def test_cached_run_returns_same_results(engine, tmp_path, monkeypatch):
+    cache = ResultCache(str(tmp_path))
+    df = make_candles(2000)
+    data_fp = data_fingerprint(df)
+
+    results, metrics = engine.run_cached(df, data_fp, cache)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cache miss")
+
+    monkeypatch.setattr(engine, "run_backtest", fail)
+    cached_results, cached_metrics = engine.run_cached(df, data_fp, cache)
+
+    assert cached_metrics == pytest.approx(metrics)
+    assert cached_results["trades"] == results["trades"]
+    assert [h["total_value"] for h in cached_results["balance_history"]] == [
+        h["total_value"] for h in results["balance_history"]
+    ]
+
+
+def test_key_changes_invalidate_cache(engine, tmp_path):
+    cache = ResultCache(str(tmp_path))
+    df = make_candles(500)
+    engine.run_cached(df, data_fingerprint(df), cache)
+    assert len(list(tmp_path.glob("*.json"))) == 1
+
+    # 데이터가 바뀌면 다른 키
+    changed = df.copy()
+    changed.iloc[-1, changed.columns.get_loc("close")] *= 1.01
+    assert data_fingerprint(changed) != data_fingerprint(df)
+
+    # 파라미터가 바뀌어도 다른 키
+    engine.profit_threshold = 0.01
+    engine.run_cached(df, data_fingerprint(df), cache)
+    assert len(list(tmp_path.glob("*.json"))) == 2
+
+
+def test_data_index_roundtrip(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    data_id = ("BTC/USDT", "5m", "5m", "2024-01-01", "2024-01-31")
+    assert cache.lookup_data(data_id) is None
+    cache.remember_data(data_id, "abc")
+    assert ResultCache(str(tmp_path)).lookup_data(data_id) == "abc"
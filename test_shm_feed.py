@@ -0,0 +1,102 @@
+"""공유 메모리 캔들 피드 테스트"""
+
+import numpy as np
+import pytest
+
+from fake_exchange import FakeExchange
+from shm_feed import (
+    BASE_COLUMNS,
+    CandleFeed,
+    CandleRing,
+    SharedIndicators,
+    evaluate_snapshot,
+    run_group,
+)
+from strategy import create_strategy
+
+MINUTE = 60_000
+TRADING = {"symbol": "BTC/USDT", "timeframe": "5m", "sma_short": 7, "sma_long": 25}
+
+
+def rows(timestamps, close):
+    values = np.zeros((len(timestamps), len(BASE_COLUMNS)))
+    values[:, BASE_COLUMNS.index("close")] = close
+    return np.asarray(timestamps, dtype=np.int64), values
+
+
+def test_ring_appends_updates_last_bar_and_wraps():
+    ring = CandleRing.create(4, BASE_COLUMNS, symbol="BTC/USDT")
+    reader = CandleRing.attach(ring.name)
+    try:
+        assert reader.meta["symbol"] == "BTC/USDT" and reader.snapshot().seq == 0
+        assert ring.write(*rows([0, MINUTE, 2 * MINUTE], [1.0, 2.0, 3.0])) == 3
+
+        # 마지막 봉 갱신 + 새 봉, 이전 봉은 무시
+        assert ring.write(*rows([MINUTE, 2 * MINUTE, 3 * MINUTE], [9, 3.5, 4])) == 1
+        assert list(reader.snapshot().close) == [1.0, 2.0, 3.5, 4.0]
+
+        # 용량을 넘으면 오래된 봉부터 덮어씀
+        assert ring.write(*rows([4 * MINUTE, 5 * MINUTE], [5.0, 6.0])) == 2
+        snapshot = reader.snapshot()
+        assert list(snapshot.timestamps // MINUTE) == [2, 3, 4, 5]
+        assert list(reader.snapshot(2).close) == [5.0, 6.0]
+        assert reader.count == 6 and snapshot.seq == 6
+
+        # 쓰는 중(홀수 seq)이면 일관된 복사본을 돌려주지 않음
+        ring._counters[0] += 1
+        with pytest.raises(TimeoutError):
+            reader.snapshot(retries=10)
+        assert not reader.wait(snapshot.seq, timeout=0.01)
+        ring._counters[0] += 1
+        assert reader.wait(snapshot.seq, timeout=0.01)
+    finally:
+        reader.close()
+        ring.close()
+
+
+def test_feed_indicators_match_strategy_evaluation():
+    exchange = FakeExchange("BTC/USDT", "5m", bars=300, seed=3)
+    strategies = [
+        create_strategy(TRADING),
+        create_strategy(TRADING, {"sma_short": 5, "sma_long": 20}),
+        create_strategy({"strategy": "rsi_reversion"}),
+    ]
+    feed = CandleFeed.for_strategies(
+        exchange, "BTC/USDT", "5m", strategies, capacity=512
+    )
+    try:
+        # 첫 조회 후 새 봉을 조금씩 받아도 지표 열은 전체 재계산과 같음
+        assert feed.poll() == 300
+        for _ in range(5):
+            exchange.advance(7)
+            assert feed.poll() == 7
+        snapshot = feed.ring.snapshot()
+        close = np.array([c[4] for c in exchange.fetch_ohlcv("BTC/USDT", "5m")])
+        np.testing.assert_array_equal(snapshot.close, close)
+        for strategy in strategies:
+            shared = SharedIndicators(snapshot)
+            expected = strategy.evaluate(close)
+            actual = strategy.evaluate(snapshot.close, shared)
+            for spec, values in expected[0].items():
+                np.testing.assert_allclose(actual[0][spec], values, equal_nan=True)
+            assert shared.misses == 0
+            assert evaluate_snapshot(strategy, snapshot) == strategy.evaluate_latest(
+                close
+            )
+    finally:
+        feed.close()
+
+
+def test_worker_processes_read_shared_feed():
+    exchange = FakeExchange("BTC/USDT", "5m", bars=200, seed=5)
+    signals = []
+    param_sets = [{"sma_short": 5, "sma_long": 20}, {"sma_short": 7, "sma_long": 25}]
+    run_group(exchange, "BTC/USDT", "5m", TRADING, param_sets, 0.2, signals.append, 4.0)
+
+    last = exchange.fetch_ohlcv("BTC/USDT", "5m")[-1]
+    assert {s["worker"] for s in signals} == {"strategy-0", "strategy-1"}
+    for signal in signals:
+        assert signal["timestamp"] == last[0] and signal["close"] == last[4]
+        strategy = create_strategy(TRADING, signal["params"])
+        close = np.array([c[4] for c in exchange.fetch_ohlcv("BTC/USDT", "5m")])
+        assert (signal["entry"], signal["exit"]) == strategy.evaluate_latest(close)
@@ -0,0 +1,135 @@
+"""DynamoDB 배치 상태 저장/조회 테스트 (가짜 클라이언트 사용, 네트워크 없음)"""
+
+from types import SimpleNamespace
+
+import pytest
+
+import state_store
+from state_store import (
+    DYNAMODB_BATCH_GET_LIMIT,
+    DYNAMODB_BATCH_WRITE_LIMIT,
+    StateLoadError,
+    StateStore,
+    decode_dynamodb_item,
+    encode_dynamodb_item,
+)
+
+
+class FakeDynamoClient:
+    """첫 요청마다 마지막 항목 하나를 미처리로 돌려주는 batch API"""
+
+    def __init__(self, fail_get: bool = False):
+        self.items = {}
+        self.get_requests = []
+        self.write_requests = []
+        self.fail_get = fail_get
+
+    def batch_get_item(self, RequestItems):
+        if self.fail_get:
+            raise RuntimeError("ProvisionedThroughputExceededException")
+        ((table, request),) = RequestItems.items()
+        keys = request["Keys"]
+        self.get_requests.append(len(keys))
+        served, unprocessed = (keys[:-1], keys[-1:]) if len(keys) > 1 else (keys, [])
+        response = {
+            "Responses": {
+                table: [
+                    self.items[key["trading_pair"]["S"]]
+                    for key in served
+                    if key["trading_pair"]["S"] in self.items
+                ]
+            }
+        }
+        if unprocessed:
+            response["UnprocessedKeys"] = {table: {"Keys": unprocessed}}
+        return response
+
+    def batch_write_item(self, RequestItems):
+        ((table, requests),) = RequestItems.items()
+        self.write_requests.append(len(requests))
+        served, unprocessed = (
+            (requests[:-1], requests[-1:]) if len(requests) > 1 else (requests, [])
+        )
+        for request in served:
+            item = request["PutRequest"]["Item"]
+            self.items[item["trading_pair"]["S"]] = item
+        return {"UnprocessedItems": {table: unprocessed} if unprocessed else {}}
+
+
+@pytest.fixture
+def store(monkeypatch):
+    client = FakeDynamoClient()
+    monkeypatch.setenv("DYNAMODB_TABLE", "trading-state")
+    monkeypatch.setattr(
+        state_store.boto3, "resource", lambda *a, **k: SimpleNamespace(Table=str)
+    )
+    monkeypatch.setattr(state_store.boto3, "client", lambda *a, **k: client)
+    monkeypatch.setattr(state_store, "DYNAMODB_RETRY_BASE_DELAY", 0)
+    return StateStore(use_s3=False)
+
+
+def test_item_codec_round_trip():
+    state = {
+        "trading_pair": "BTC/USDT",
+        "position": {"buy_price": 45000.12345678901, "buy_amount": 0.000444},
+        "last_trade": None,
+        "total_trades": 10,
+        "paper": True,
+        "closes": [1.5, 2, 1e-9],
+    }
+    encoded = encode_dynamodb_item(state)
+    assert encoded["position"]["M"]["buy_price"] == {"N": "45000.12345678901"}
+    assert decode_dynamodb_item(encoded) == state
+
+
+def test_batches_are_chunked_and_unprocessed_retried(store):
+    client = store.dynamodb_client
+    pairs = [f"COIN{i}/USDT" for i in range(DYNAMODB_BATCH_GET_LIMIT + 30)]
+    states = {
+        pair: {"position": None, "total_profit": float(i)}
+        for i, pair in enumerate(pairs)
+    }
+
+    store.save_states(states)
+    # 25개씩 나눠 쓰고, 미처리 항목은 따로 다시 보냄
+    chunks = -(-len(pairs) // DYNAMODB_BATCH_WRITE_LIMIT)
+    assert client.write_requests.count(DYNAMODB_BATCH_WRITE_LIMIT) == chunks - 1
+    assert len(client.write_requests) == chunks * 2
+    assert len(client.items) == len(pairs)
+
+    loaded = store.load_states(pairs + ["NEW/USDT"])
+    assert client.get_requests[:2] == [DYNAMODB_BATCH_GET_LIMIT, 1]
+    assert loaded[pairs[42]]["total_profit"] == 42.0
+    assert loaded["NEW/USDT"]["position"] is None
+    assert "created_at" in loaded["NEW/USDT"]
+
+
+def test_batch_load_error_is_not_replaced_by_default_state(store):
+    store.dynamodb_client.fail_get = True
+    with pytest.raises(RuntimeError):
+        store.load_states(["BTC/USDT"])
+
+
+class FailingS3:
+    class exceptions:
+        class NoSuchKey(Exception):
+            pass
+
+    def get_object(self, Bucket, Key):
+        raise TimeoutError("read timeout")
+
+
+def test_failed_load_never_overwrites_saved_state(monkeypatch):
+    import fargate_main
+
+    monkeypatch.setattr(state_store.boto3, "client", lambda *a, **k: FailingS3())
+    store = StateStore(use_s3=True)
+    with pytest.raises(StateLoadError):
+        store.load_state()
+
+    saved = []
+    monkeypatch.setattr(store, "save_state", saved.append)
+    monkeypatch.setattr(fargate_main.notifier, "notify_error", lambda *a, **k: None)
+    # 조회 오류는 실패한 주기로 끝나고 기본 상태를 저장하지 않음
+    assert fargate_main.run_cycle(None, store) == 1
+    assert saved == []
@@ -0,0 +1,77 @@
+"""전략 프레임워크 테스트 (백테스트 벡터화 평가 == 실거래 최근 봉 평가)"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicator_cache import IndicatorCache
+from strategy import STRATEGIES, IndicatorSpec, compute_indicator, create_strategy
+
+
+def make_closes(n: int = 400, seed: int = 7) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return 30000 * np.exp(np.cumsum(rng.normal(0, 0.004, n)))
+
+
+@pytest.mark.parametrize("name", sorted(STRATEGIES))
+def test_latest_bar_matches_vectorized_signals(name):
+    closes = make_closes()
+    strategy = STRATEGIES[name]()
+    _, entry, exit_, _ = strategy.evaluate(closes)
+
+    for end in range(1, len(closes) + 1):
+        assert strategy.evaluate_latest(closes[:end]) == (
+            entry[end - 1],
+            exit_[end - 1],
+        )
+
+
+def test_indicators_match_pandas_reference():
+    closes = make_closes()
+    series = pd.Series(closes)
+
+    np.testing.assert_allclose(
+        compute_indicator(IndicatorSpec("sma", (25,)), closes),
+        series.rolling(25).mean().to_numpy(),
+        rtol=1e-12,
+    )
+    np.testing.assert_allclose(
+        compute_indicator(IndicatorSpec("bb_upper", (20, 2.0)), closes),
+        (series.rolling(20).mean() + 2 * series.rolling(20).std(ddof=0)).to_numpy(),
+        rtol=1e-9,
+    )
+
+
+def test_shared_indicators_are_computed_once():
+    strategy = create_strategy({"sma_short": 7, "sma_long": 7})
+    assert len(strategy.compute_indicators(make_closes(50))) == 1
+
+
+def test_legacy_sma_config_builds_crossover_strategy():
+    strategy = create_strategy({"sma_short": 5, "sma_long": 20})
+    assert strategy.describe() == {
+        "strategy": "sma_crossover",
+        "sma_short": 5,
+        "sma_long": 20,
+    }
+    assert strategy.warmup == 20
+
+    with pytest.raises(ValueError):
+        create_strategy({"strategy": "unknown"})
+
+
+def test_bollinger_bands_share_one_mean_std_computation():
+    closes = make_closes()
+    cache = IndicatorCache()
+    wide = create_strategy({"strategy": "bollinger_reversion"})
+    narrow = create_strategy(
+        {"strategy": "bollinger_reversion", "strategy_params": {"num_std": 1.5}}
+    )
+    upper = wide.compute_indicators(closes, cache)[wide.upper_spec]
+    # 밴드 하나 + 상단/하단, 같은 구간의 다른 배수는 밴드를 재사용
+    assert cache.misses == 3
+    narrow.compute_indicators(closes, cache)
+    assert (cache.misses, cache.hits) == (5, 1)
+    np.testing.assert_array_equal(
+        upper, compute_indicator(wide.upper_spec, closes), strict=True
+    )
@@ -0,0 +1,88 @@
+"""예약 실행 사이 캔들 구간 유지(warm start) 테스트"""
+
+import json
+
+import numpy as np
+import pytest
+
+from fake_exchange import FakeExchange
+from order_scheduler import SlicingConfig, new_parent_order
+from warm_start import WARM_STATE_KEY
+
+
+@pytest.fixture
+def bot(monkeypatch):
+    monkeypatch.setenv("EXCHANGE_FAKE", "1")
+    from trade import TradingBot
+
+    bot = TradingBot()
+    bot.exchange = FakeExchange(bot.symbol, bot.timeframe, bars=300, seed=7)
+    return bot
+
+
+def test_runs_fetch_only_new_candles_and_match_full_fetch(bot):
+    exchange = bot.exchange
+    warmup = bot.strategy.warmup
+    df, window = bot.get_close_data(None)
+    assert len(df) == 100
+    # 상태 저장소를 거친 것처럼 JSON으로 왕복
+    window = json.loads(json.dumps(window))
+    assert len(window["closes"]) == warmup
+
+    for bars in (1, 3, 0, 2):
+        exchange.advance(bars)
+        saved = window
+        df, window = bot.get_close_data(saved)
+        assert (window == saved) == (bars == 0)
+        window = json.loads(json.dumps(window))
+        assert len(df) == warmup + bars + 1
+        full = bot.get_ohlcv_data(100)
+        np.testing.assert_array_equal(df.index[-warmup:], full.index[-warmup:])
+        np.testing.assert_array_equal(
+            df["close"].to_numpy()[-warmup:], full["close"].to_numpy()[-warmup:]
+        )
+        assert bot.strategy.evaluate_latest(df["close"].to_numpy()) == (
+            bot.strategy.evaluate_latest(full["close"].to_numpy())
+        )
+        assert window["last"] == int(full.index[-2].value // 1_000_000)
+
+
+def test_resyncs_on_gap_config_change_or_short_window(bot):
+    _, window = bot.get_close_data(None)
+
+    # 받은 개수가 limit에 닿으면 중간이 빠졌을 수 있으므로 전체를 다시 받음
+    bot.exchange.advance(150)
+    df, latest = bot.get_close_data(window)
+    assert len(df) == 100
+
+    assert len(bot.get_close_data({**window, "config": "other"})[0]) == 100
+    assert len(bot.get_close_data({**window, "closes": window["closes"][:5]})[0]) == 100
+    # 저장된 다음 봉이 아니라 더 뒤부터 오면 누락 구간
+    df, resynced = bot.get_close_data({**window, "last": window["last"] - 10**9})
+    assert len(df) == 100 and resynced == latest
+
+
+def test_window_is_merged_after_resumed_parent_order(monkeypatch, tmp_path):
+    monkeypatch.setenv("EXCHANGE_FAKE", "1")
+    from trade import TradingBot
+
+    bot = TradingBot()
+    bot.filter_cache.path = str(tmp_path / "filters.json")
+    bot.scheduler.config = SlicingConfig("twap", slices=2, interval_seconds=0)
+    fake = bot.resilient._exchange._exchange
+    _, window = bot.get_close_data(None)
+    fake.advance(2)
+
+    parent = new_parent_order("buy", 0.002, bot.scheduler.config, 0.0)
+    state = {"position": None, "parent_order": parent, WARM_STATE_KEY: window}
+    saved = []
+
+    def save_progress(current):
+        # 백그라운드 스레드가 저장하는 동안 주 스레드는 상태를 고치지 않음
+        saved.append(json.loads(json.dumps(current))[WARM_STATE_KEY])
+
+    result = bot.execute_strategy(state, save_progress)
+    assert result["action"] == "BUY" and len(saved) == 4
+    assert all(progress == window for progress in saved)
+    latest = result["new_state"][WARM_STATE_KEY]
+    assert latest != window and latest == bot.get_close_data(None)[1]
@@ -1,13 +1,43 @@
 import logging
 import os
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import ccxt
+import numpy as np
 import pandas as pd
 
-from config_loader import config_loader
+from config_loader import ConfigError, TradingConfig, config_loader
+from execution import ExecutionConfig, OrderExecutor
+from fake_exchange import FakeExchange
+from fill_simulator import FillModel, PaperExchange
+from metrics_server import InstrumentedExchange
 from notification import notifier
+from order_scheduler import (
+    OrderScheduler,
+    SlicingConfig,
+    new_parent_order,
+    parent_report,
+    reconcile,
+)
+from order_validator import FilterCache, OrderRejected, OrderValidator
+from replay import wrap_exchange_from_env
+from resample import (
+    IncrementalResampler,
+    bucket_start,
+    resample_ohlcv,
+    timeframe_to_ms,
+)
+from resilience import OrderStateUnknown, ResilientExchange
+from strategy import create_strategy, net_profit_rate
+from warm_start import (
+    WARM_STATE_KEY,
+    CandleWindow,
+    extend_resampled,
+    live_bars,
+    resample_closed,
+    window_config,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -15,17 +45,10 @@ logger = logging.getLogger(__name__)
 class TradingBot:
     def __init__(self):
         """바이낸스 거래 봇 초기화"""
-        # 설정 파일에서 거래 설정 로드
-        trading_config = config_loader.get_trading_config()
+        # 설정 파일에서 검증된 거래 설정 스냅샷 로드
+        config = config_loader.get_trading_snapshot()
         exchange_config = config_loader.get_exchange_config()
-
-        self.symbol = trading_config.get("symbol", "BTC/USDT")
-        self.timeframe = trading_config.get("timeframe", "5m")
-        self.sma_short = trading_config.get("sma_short", 7)
-        self.sma_long = trading_config.get("sma_long", 25)
-        self.trade_amount = trading_config.get("trade_amount", 90.0)
-        self.profit_threshold = trading_config.get("profit_threshold", 0.003)
-        self.trading_fee = trading_config.get("trading_fee", 0.001)
+        self.symbol = config.symbol
 
         # 바이낸스 거래소 초기화
         self.exchange = ccxt.binance(
@@ -37,28 +60,278 @@ class TradingBot:
             }
         )
 
+        # EXCHANGE_FAKE=<seed>: 네트워크 없이 결정적 가짜 거래소로 실행 (로컬/자원 예산 테스트)
+        fake_seed = os.getenv("EXCHANGE_FAKE")
+        if fake_seed:
+            base, quote = self.symbol.split("/")
+            self.exchange = FakeExchange(
+                self.symbol,
+                config.base_timeframe,
+                seed=int(fake_seed),
+                balances={quote: config.initial_balance, base: 0.0},
+                fee=config.trading_fee,
+            )
+            logger.info(f"가짜 거래소(seed={fake_seed})로 실행합니다")
+
+        # 모의 거래: 시세는 실제 거래소, 체결은 백테스트와 같은 FillModel로 시뮬레이션
+        paper_env = os.getenv("PAPER_TRADING")
+        if (
+            paper_env.lower() == "true"
+            if paper_env is not None
+            else exchange_config.get("paper_trading", False)
+        ):
+            base, quote = self.symbol.split("/")
+            self.exchange = PaperExchange(
+                self.exchange,
+                FillModel.from_config(
+                    config_loader.get_fill_model_config(), config.trading_fee
+                ),
+                initial_balances={quote: config.initial_balance, base: 0.0},
+                state_path=exchange_config.get("paper_state_path"),
+            )
+            logger.info("모의 거래(paper trading) 모드로 실행합니다")
+
+        # EXCHANGE_RECORD/EXCHANGE_REPLAY 설정 시 거래소 호출 기록/재생
+        self.exchange = wrap_exchange_from_env(self.exchange)
+
+        # 거래소 호출 시간/오류/사용 가중치 메트릭 (재시도는 시도마다 기록)
+        self.exchange = InstrumentedExchange(self.exchange)
+
+        # 재시도/멱등 주문/서킷 브레이커/주기 마감 시간 (기록은 실제 시도 단위로 남음)
+        self.resilient = ResilientExchange.from_config(
+            self.exchange, config_loader.get_resilience_config()
+        )
+        self.exchange = self.resilient
+
+        # 주문 사전 검증용 심볼 필터 캐시 (첫 주문 때 로드)
+        self.filter_cache = FilterCache.from_config(exchange_config)
+        self.apply_config(config)
+
+    def apply_config(self, config: TradingConfig) -> None:
+        """거래 설정 스냅샷 적용 (매매 판단 주기 사이에만 호출)
+
+        새 전략/주문 실행 객체를 모두 만든 뒤 한 번에 교체하므로 실패하면 기존 설정이
+        그대로 남는다. 심볼 변경은 잔고/포지션이 달라지므로 재시작이 필요하다.
+        """
+        if config.symbol != self.symbol:
+            raise ConfigError([f"심볼 변경({self.symbol} -> {config.symbol})은 재시작이 필요합니다"])
+
+        strategy = create_strategy(config)
+        # 주문 실행 (market 또는 maker_first)
+        execution_config = ExecutionConfig.from_config(config)
+        # 수익률 판단에 쓰는 예상 수수료 (maker 우선이면 maker 수수료)
+        expected_fee = (
+            execution_config.maker_fee
+            if execution_config.mode == "maker_first"
+            and execution_config.maker_fee is not None
+            else config.trading_fee
+        )
+        filter_cache = self.filter_cache
+        validator = OrderValidator(
+            lambda: filter_cache.get(self.exchange, self.symbol), config.trading_fee
+        )
+        executor = OrderExecutor(
+            self.exchange, self.symbol, execution_config, validator=validator
+        )
+        # 큰 주문 분할 실행 (TWAP/iceberg)
+        slicing = SlicingConfig.from_config(config)
+        scheduler = OrderScheduler(executor, slicing)
+
+        self.config = config
+        self.timeframe = config.timeframe
+        # 기본 캔들 타임프레임 (설정 시 이 캔들 하나로 상위 타임프레임을 만든다)
+        self.base_timeframe = config.base_timeframe
+        self.strategy = strategy
+        self.trade_amount = config.trade_amount
+        self.profit_threshold = config.profit_threshold
+        self.trading_fee = config.trading_fee
+        self.expected_fee = expected_fee
+        self.validator = validator
+        self.executor = executor
+        self.slicing = slicing
+        self.scheduler = scheduler
+
     def get_ohlcv_data(self, limit: int = 100) -> pd.DataFrame:
         """OHLCV 데이터 조회"""
+        if self.base_timeframe != self.timeframe:
+            return self.get_timeframe_data([self.timeframe], limit)[self.timeframe]
+
         try:
             ohlcv = self.exchange.fetch_ohlcv(
                 symbol=self.symbol, timeframe=self.timeframe, limit=limit
             )
+            return self._to_dataframe(ohlcv)
+        except Exception as e:
+            logger.error(f"Failed to fetch OHLCV data: {e}")
+            raise
 
+    def get_close_data(
+        self, saved_window: Optional[Dict[str, Any]]
+    ) -> Tuple[pd.DataFrame, Optional[Dict[str, Any]]]:
+        """최근 종가 조회 (저장된 구간 이후 캔들만 받아 이어 붙임) -> (종가, 새 구간)
+
+        saved_window는 상태의 WARM_STATE_KEY 항목이다. 저장된 구간이 없거나, 설정이
+        바뀌었거나, 누락 구간이 보이면 전체를 다시 받는다. 상태는 바꾸지 않으며 새 구간
+        (없으면 None)을 상태에 반영하는 것은 호출하는 쪽이다.
+        """
+        limit = max(100, self.strategy.warmup)
+        if self.base_timeframe != self.timeframe:
+            return self._get_resampled_close_data(saved_window, limit)
+
+        config = window_config(self.symbol, self.timeframe)
+        window, reason = CandleWindow.from_state(
+            saved_window, config, self.strategy.warmup
+        )
+        series = None
+        if window is not None:
+            ohlcv = self.exchange.fetch_ohlcv(
+                symbol=self.symbol,
+                timeframe=self.timeframe,
+                since=window.last + window.timeframe_ms,
+                limit=limit,
+            )
+            series = window.extend(ohlcv, limit)
+            reason = "누락 구간"
+
+        if series is None:
+            logger.info(f"캔들 구간 전체 재동기화 ({reason})")
+            df = self.get_ohlcv_data(limit)
+            timestamps = df.index.asi8 // 1_000_000
+            closes = df["close"].to_numpy()
+        else:
+            timestamps, closes = series
             df = pd.DataFrame(
-                ohlcv, columns=["timestamp", "open", "high", "low", "close", "volume"]
+                {"close": closes}, index=pd.to_datetime(timestamps, unit="ms")
             )
-            df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
-            df.set_index("timestamp", inplace=True)
+            df.index.name = "timestamp"
+            logger.info(f"저장된 캔들 구간 이후 {len(ohlcv)}개만 조회")
+
+        if series is not None and not ohlcv:
+            # 새 캔들이 없으면 저장된 구간을 그대로 유지
+            return df, saved_window
+        updated = CandleWindow.from_candles(
+            timestamps,
+            closes,
+            timeframe_to_ms(self.timeframe),
+            self.strategy.warmup,
+        )
+        return df, None if updated is None else updated.to_state(config)
+
+    def _get_resampled_close_data(
+        self, saved_window: Optional[Dict[str, Any]], limit: int
+    ) -> Tuple[pd.DataFrame, Optional[Dict[str, Any]]]:
+        """base_timeframe 리샘플링 경로의 get_close_data
+
+        저장된 상위 봉 구간과 리샘플러 상태가 있으면 마지막으로 누적한 기본 캔들 이후만
+        받아 IncrementalResampler에 넣는다. 진행 중인 상위 봉은 마지막 기본 캔들까지
+        반영해 붙이지만 상태에는 마감된 기본 캔들만 누적한다.
+        """
+        config = window_config(self.symbol, self.timeframe, self.base_timeframe)
+        window, reason = CandleWindow.from_state(
+            saved_window, config, self.strategy.warmup
+        )
+        resampler = IncrementalResampler.from_state(
+            (saved_window or {}).get("resampler"), self.timeframe, self.base_timeframe
+        )
+        series = None
+        if window is not None and resampler is None:
+            reason = "리샘플링 상태 없음"
+        elif window is not None:
+            ohlcv = self.exchange.fetch_ohlcv(
+                symbol=self.symbol,
+                timeframe=self.base_timeframe,
+                since=resampler.last_timestamp + timeframe_to_ms(self.base_timeframe),
+                limit=1000,
+            )
+            series = extend_resampled(window, resampler, ohlcv, 1000)
+            reason = "누락 구간"
+
+        if series is None:
+            logger.info(f"캔들 구간 전체 재동기화 ({reason})")
+            ohlcv = self._fetch_base_ohlcv(self.timeframe, limit)
+            timestamps, closes, resampler = resample_closed(
+                ohlcv, self.timeframe, self.base_timeframe
+            )
+        else:
+            timestamps, closes = series
+            logger.info(f"마지막 기본 캔들 이후 {len(ohlcv)}개만 조회")
+
+        live_timestamps, live_closes = (
+            live_bars(resampler, ohlcv[-1], self.timeframe) if ohlcv else ([], [])
+        )
+        df = pd.DataFrame(
+            {"close": np.concatenate([closes, live_closes])},
+            index=pd.to_datetime(
+                np.concatenate([timestamps, live_timestamps]).astype(np.int64),
+                unit="ms",
+            ),
+        ).tail(limit)
+        df.index.name = "timestamp"
+
+        updated = CandleWindow.from_closed(
+            timestamps,
+            closes,
+            timeframe_to_ms(self.timeframe),
+            self.strategy.warmup,
+        )
+        if updated is None or resampler is None:
+            return df, None
+        return df, {**updated.to_state(config), "resampler": resampler.to_state()}
+
+    def _fetch_base_ohlcv(self, longest: str, limit: int) -> List[List[float]]:
+        """가장 긴 타임프레임 limit개를 만들 기본 캔들을 페이지 단위로 조회"""
+        base_ms = timeframe_to_ms(self.base_timeframe)
+
+        # 가장 긴 타임프레임 봉 경계부터 받아야 첫 봉이 잘리지 않음
+        now = self.exchange.milliseconds()
+        first = now - (limit - 1) * timeframe_to_ms(longest)
+        since = int(bucket_start(np.array([first]), longest)[0])
+
+        ohlcv = []
+        while since <= now:
+            batch = self.exchange.fetch_ohlcv(
+                symbol=self.symbol,
+                timeframe=self.base_timeframe,
+                since=since,
+                limit=1000,
+            )
+            if not batch:
+                break
+            ohlcv.extend(batch)
+            since = batch[-1][0] + base_ms
+        return ohlcv
+
+    def get_timeframe_data(
+        self, timeframes: List[str], limit: int = 100
+    ) -> Dict[str, pd.DataFrame]:
+        """기본 캔들을 한 번만 받아 타임프레임별 최근 limit개 캔들 생성"""
+        try:
+            longest = max(timeframes, key=timeframe_to_ms)
+            ohlcv = self._fetch_base_ohlcv(longest, limit)
 
-            return df
+            base_df = self._to_dataframe(ohlcv)
+            base_df = base_df[~base_df.index.duplicated(keep="last")]
+            return {
+                tf: (
+                    base_df.tail(limit)
+                    if tf == self.base_timeframe
+                    else resample_ohlcv(base_df, tf, self.base_timeframe)
+                    .drop(columns="candles")
+                    .tail(limit)
+                )
+                for tf in timeframes
+            }
         except Exception as e:
             logger.error(f"Failed to fetch OHLCV data: {e}")
             raise
 
-    def calculate_sma(self, df: pd.DataFrame) -> pd.DataFrame:
-        """단순 이동평균 계산"""
-        df[f"sma_{self.sma_short}"] = df["close"].rolling(window=self.sma_short).mean()
-        df[f"sma_{self.sma_long}"] = df["close"].rolling(window=self.sma_long).mean()
+    @staticmethod
+    def _to_dataframe(ohlcv: List[List[float]]) -> pd.DataFrame:
+        df = pd.DataFrame(
+            ohlcv, columns=["timestamp", "open", "high", "low", "close", "volume"]
+        )
+        df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
+        df.set_index("timestamp", inplace=True)
         return df
 
     def get_current_balance(self) -> Dict[str, float]:
@@ -87,40 +360,49 @@ class TradingBot:
             notifier.notify_error("잔고 조회 실패", error_msg)
             raise
 
-    def place_buy_order(self, amount_usdt: float) -> Dict[str, Any]:
-        """매수 주문"""
+    def place_buy_order(
+        self,
+        amount_usdt: float,
+        on_progress: Optional[Callable] = None,
+        quote_balance: Optional[float] = None,
+        base_balance: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """매수 주문 (분할 대상 금액이면 부모 주문으로 나눠 실행)"""
         try:
             # 현재 가격 조회
             ticker = self.exchange.fetch_ticker(self.symbol)
             current_price = ticker["last"]
 
-            # BTC 수량 계산 (수수료 고려)
-            btc_amount = (amount_usdt * (1 - self.trading_fee)) / current_price
+            # BTC 수량 계산 (수수료 고려) 후 거래소 필터에 맞춤
+            btc_amount = (amount_usdt * (1 - self.expected_fee)) / current_price
+            btc_amount, _ = self.validator.validate(
+                "buy", btc_amount, current_price, balance=quote_balance
+            )
 
             logger.info(
                 f"매수 주문 시도 - 가격: ${current_price:.2f}, 수량: {btc_amount:.6f} BTC"
             )
 
-            # 시장가 매수 주문
-            order = self.exchange.create_market_buy_order(
-                symbol=self.symbol, amount=btc_amount
+            # 주문 실행 (실제 체결가/수량/수수료 보고서)
+            report = self._execute_order(
+                "buy", btc_amount, current_price, on_progress, base_balance
             )
 
-            logger.info(f"매수 주문 성공: {order['id']}")
+            logger.info(f"매수 주문 성공: {report['order_id']}")
 
-            # 거래 실행 알림
-            notifier.notify_trade_executed(
-                "BUY", current_price, btc_amount, 0
-            )  # 잔고는 나중에 업데이트
+            # 거래 실행 알림 (분할 주문은 끝났을 때)
+            if not report.get("in_progress"):
+                notifier.notify_trade_executed(
+                    "BUY", report["price"], report["amount"], 0
+                )  # 잔고는 나중에 업데이트
 
-            return {
-                "order_id": order["id"],
-                "amount": btc_amount,
-                "price": current_price,
-                "cost": amount_usdt,
-                "timestamp": datetime.now(),
-            }
+            return {**report, "timestamp": datetime.now()}
 
+        except OrderRejected as e:
+            error_msg = f"주문 사전 검증으로 매수 주문 거부: {e}"
+            logger.error(error_msg)
+            notifier.notify_error("주문 검증 실패", error_msg)
+            raise
         except ccxt.InsufficientFunds:
             error_msg = f"잔고 부족으로 매수 주문 실패 - 필요: ${amount_usdt:.2f}"
             logger.error(error_msg)
@@ -142,34 +424,42 @@ class TradingBot:
             notifier.notify_error("매수 주문 실패", error_msg)
             raise
 
-    def place_sell_order(self, btc_amount: float) -> Dict[str, Any]:
-        """매도 주문"""
+    def place_sell_order(
+        self,
+        btc_amount: float,
+        on_progress: Optional[Callable] = None,
+        base_balance: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """매도 주문 (분할 대상 금액이면 부모 주문으로 나눠 실행)"""
         try:
             logger.info(f"매도 주문 시도 - 수량: {btc_amount:.6f} BTC")
 
-            # 시장가 매도 주문
-            order = self.exchange.create_market_sell_order(
-                symbol=self.symbol, amount=btc_amount
+            # 거래소 필터에 맞춰 수량 조정/검증
+            current_price = self.exchange.fetch_ticker(self.symbol)["last"]
+            btc_amount, _ = self.validator.validate(
+                "sell", btc_amount, current_price, balance=base_balance
             )
 
-            sell_price = order["price"] or order["average"]
-            sell_cost = order["cost"]
+            # 주문 실행 (실제 체결가/수량/수수료 보고서)
+            report = self._execute_order(
+                "sell", btc_amount, current_price, on_progress, base_balance
+            )
 
-            logger.info(f"매도 주문 성공: {order['id']} - 가격: ${sell_price:.2f}")
+            logger.info(f"매도 주문 성공: {report['order_id']} - 가격: ${report['price']:.2f}")
 
-            # 거래 실행 알림
-            notifier.notify_trade_executed(
-                "SELL", sell_price, btc_amount, 0
-            )  # 잔고는 나중에 업데이트
+            # 거래 실행 알림 (분할 주문은 끝났을 때)
+            if not report.get("in_progress"):
+                notifier.notify_trade_executed(
+                    "SELL", report["price"], report["filled"], 0
+                )  # 잔고는 나중에 업데이트
 
-            return {
-                "order_id": order["id"],
-                "amount": btc_amount,
-                "price": sell_price,
-                "cost": sell_cost,
-                "timestamp": datetime.now(),
-            }
+            return {**report, "timestamp": datetime.now()}
 
+        except OrderRejected as e:
+            error_msg = f"주문 사전 검증으로 매도 주문 거부: {e}"
+            logger.error(error_msg)
+            notifier.notify_error("주문 검증 실패", error_msg)
+            raise
         except ccxt.InsufficientFunds:
             error_msg = f"보유 BTC 부족으로 매도 주문 실패 - 필요: {btc_amount:.6f} BTC"
             logger.error(error_msg)
@@ -191,17 +481,67 @@ class TradingBot:
             notifier.notify_error("매도 주문 실패", error_msg)
             raise
 
+    def _execute_order(
+        self,
+        side: str,
+        amount: float,
+        price: float,
+        on_progress: Optional[Callable] = None,
+        base_balance: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """단일 주문 또는 부모 주문(TWAP/iceberg) 실행 -> 실행 보고서
+
+        base_balance는 주문 전 기준 통화 잔고 (없으면 조회, 잔고 대사 기준점)
+        """
+        if base_balance is None:
+            base_balance = self.get_current_balance()["BTC"]
+
+        if not self.slicing.applies_to(amount * price):
+            try:
+                return self.executor.execute(side, amount)
+            except OrderStateUnknown:
+                # 접수 여부를 모르는 주문은 자식 주문 하나짜리 부모 주문으로 저장해
+                # 다음 실행에서 잔고 변화로 대사 (다시 보내지 않음)
+                parent = new_parent_order(side, amount, self.slicing, base_balance)
+                parent.update({"schedule": [amount], "in_flight": True})
+                if on_progress:
+                    on_progress(parent)
+                raise
+
+        parent = new_parent_order(side, amount, self.slicing, base_balance)
+        # 자식 주문도 거래소 필터(stepSize, 최소 수량/금액)를 만족하도록 조정
+        parent["schedule"] = self.validator.normalize_schedule(
+            parent["schedule"], price
+        )
+        logger.info(
+            f"{self.slicing.mode.upper()} 부모 주문 {parent['id']} 시작 - "
+            f"{len(parent['schedule'])}개 자식 주문"
+        )
+        self.scheduler.run(parent, on_progress)
+        return {**parent_report(parent), "parent_order": parent}
+
+    def resume_parent_order(
+        self, parent: Dict[str, Any], on_progress: Optional[Callable] = None
+    ):
+        """이전 실행에서 끝나지 않은 부모 주문을 백그라운드에서 이어서 실행 (Future)"""
+        if parent.get("in_flight"):
+            # 자식 주문 도중 중단됨 -> 체결분을 잔고 변화로 대사
+            price = self.exchange.fetch_ticker(self.symbol)["last"]
+            reconcile(parent, self.get_current_balance()["BTC"], price)
+        logger.info(
+            f"부모 주문 {parent['id']} 이어서 실행 - 자식 주문 "
+            f"{parent['next_child']}/{len(parent['schedule'])}"
+        )
+        return self.scheduler.start(parent, on_progress)
+
     def should_buy(self, data: pd.DataFrame, current_state: Dict[str, Any]) -> bool:
         """매수 조건 확인"""
         if current_state.get("position") is not None:
             return False  # 이미 포지션 보유 중
 
-        latest = data.iloc[-1]
-        sma_short = latest[f"sma_{self.sma_short}"]
-        sma_long = latest[f"sma_{self.sma_long}"]
-
-        # SMA(7) > SMA(25) 매수 신호
-        return sma_short > sma_long and not pd.isna(sma_short) and not pd.isna(sma_long)
+        # 전략의 매수 신호 (최근 봉 기준)
+        entry_signal, _ = self.strategy.evaluate_latest(data["close"].to_numpy())
+        return entry_signal
 
     def should_sell(self, data: pd.DataFrame, current_state: Dict[str, Any]) -> bool:
         """매도 조건 확인"""
@@ -209,32 +549,160 @@ class TradingBot:
         if position is None:
             return False  # 보유 포지션 없음
 
-        latest = data.iloc[-1]
-        current_price = latest["close"]
-        buy_price = position["buy_price"]
+        current_price = data["close"].iloc[-1]
+        _, exit_signal = self.strategy.evaluate_latest(data["close"].to_numpy())
 
-        sma_short = latest[f"sma_{self.sma_short}"]
-        sma_long = latest[f"sma_{self.sma_long}"]
-
-        # 수익률 계산 (실제 매도시 받을 금액 기준)
-        gross_profit_rate = (current_price - buy_price) / buy_price
-        # 실제 수익률 = 총 수익률 - 매수/매도 수수료
-        profit_rate = gross_profit_rate - (2 * self.trading_fee)
+        # 실제 수익률 = 총 수익률 - 매수(실제)/매도(예상) 수수료
+        buy_fee_rate = position.get("buy_fee_rate", self.trading_fee)
+        profit_rate = net_profit_rate(
+            position["buy_price"], current_price, (buy_fee_rate + self.expected_fee) / 2
+        )
 
-        # SMA(7) < SMA(25) and 수익률 >= 0.3%
-        sma_condition = (
-            sma_short < sma_long and not pd.isna(sma_short) and not pd.isna(sma_long)
+        # 전략 매도 신호 and 수익률 >= 0.3%
+        return exit_signal and profit_rate >= self.profit_threshold
+
+    @staticmethod
+    def _update_execution_stats(
+        current_state: Dict[str, Any], report: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """누적 체결 통계 (주문 수, 수수료, maker/taker 체결량)"""
+        stats = dict(
+            current_state.get("execution_stats")
+            or {"orders": 0, "fees_paid": 0.0, "maker_volume": 0.0, "taker_volume": 0.0}
+        )
+        maker_volume = report["filled"] * report["maker_ratio"]
+        stats["orders"] += 1
+        stats["fees_paid"] += report["fee"]
+        stats["maker_volume"] += maker_volume
+        stats["taker_volume"] += report["filled"] - maker_volume
+        return stats
+
+    def _apply_buy(
+        self, current_state: Dict[str, Any], order_result: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """매수 체결 보고서를 상태에 반영 -> 결과 갱신 항목"""
+        new_state = current_state.copy()
+        new_state["parent_order"] = None
+        new_state["position"] = {
+            "buy_price": order_result["price"],
+            "buy_amount": order_result["amount"],
+            "buy_time": order_result["timestamp"].isoformat(),
+            "order_id": order_result["order_id"],
+            "buy_cost": order_result["cost"],
+            "buy_fee": order_result["fee"],
+            "buy_fee_rate": order_result["fee_rate"],
+            "maker_ratio": order_result["maker_ratio"],
+        }
+        new_state["execution_stats"] = self._update_execution_stats(
+            current_state, order_result
+        )
+        return {
+            "action": "BUY",
+            "message": f"매수 주문 실행 완료 - 가격: ${order_result['price']:.2f}",
+            "new_state": new_state,
+            "state_changed": True,
+        }
+
+    def _apply_sell(
+        self, current_state: Dict[str, Any], order_result: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """매도 체결 보고서를 상태에 반영 -> 결과 갱신 항목"""
+        position = current_state["position"]
+
+        # 수익 계산 (실제 매수 금액/매도 수령액 기준)
+        buy_cost = position.get("buy_cost", self.trade_amount)
+        profit = order_result["cost"] - buy_cost
+        profit_rate = (order_result["price"] - position["buy_price"]) / position[
+            "buy_price"
+        ]
+
+        new_state = current_state.copy()
+        new_state["parent_order"] = None
+        new_state["position"] = None
+        new_state["last_trade"] = {
+            "buy_price": position["buy_price"],
+            "sell_price": order_result["price"],
+            "profit": profit,
+            "profit_rate": profit_rate,
+            "net_profit_rate": profit / buy_cost,
+            "buy_fee": position.get("buy_fee"),
+            "sell_fee": order_result["fee"],
+            "sell_time": order_result["timestamp"].isoformat(),
+        }
+        new_state["execution_stats"] = self._update_execution_stats(
+            current_state, order_result
         )
-        profit_condition = profit_rate >= self.profit_threshold
 
-        return sma_condition and profit_condition
+        # 수익 실현 알림
+        notifier.notify_profit_achieved(
+            position["buy_price"], order_result["price"], profit, profit_rate
+        )
 
-    def execute_strategy(self, current_state: Dict[str, Any]) -> Dict[str, Any]:
-        """전략 실행"""
+        return {
+            "action": "SELL",
+            "message": f"매도 주문 실행 완료 - 가격: ${order_result['price']:.2f}, 수익: ${profit:.2f} ({profit_rate*100:.2f}%)",
+            "new_state": new_state,
+            "state_changed": True,
+        }
+
+    def _apply_order(
+        self, side: str, current_state: Dict[str, Any], order_result: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """체결 보고서 반영 (분할 주문이 진행 중이면 진행 상황만 저장)"""
+        parent = order_result.get("parent_order")
+        if parent is not None and parent["status"] != "active" and not parent["filled"]:
+            # 대사 결과 체결분이 없으면 포지션은 그대로 두고 부모 주문만 정리
+            new_state = current_state.copy()
+            new_state["parent_order"] = None
+            return {
+                "action": "NO_ACTION",
+                "message": f"{side.upper()} 주문 체결분 없음 ({parent['id']})",
+                "new_state": new_state,
+                "state_changed": True,
+            }
+        if parent is not None and parent["status"] == "active":
+            new_state = current_state.copy()
+            new_state["parent_order"] = parent
+            return {
+                "action": f"{side.upper()}_IN_PROGRESS",
+                "message": f"분할 주문 진행 중 - 체결 {order_result['filled']:.6f}/"
+                f"{order_result['requested']:.6f}",
+                "new_state": new_state,
+                "state_changed": True,
+            }
+        if side == "buy":
+            return self._apply_buy(current_state, order_result)
+        return self._apply_sell(current_state, order_result)
+
+    def execute_strategy(
+        self,
+        current_state: Dict[str, Any],
+        save_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> Dict[str, Any]:
+        """전략 실행
+
+        save_progress를 주면 분할 주문의 자식 주문마다 parent_order를 갱신한
+        current_state를 저장해 중단 후 이어서 실행할 수 있게 한다.
+        """
+
+        def on_progress(parent: Dict[str, Any]) -> None:
+            current_state["parent_order"] = parent
+            if save_progress:
+                save_progress(current_state)
+
+        # 이번 주기의 모든 거래소 호출(재시도 대기 포함)은 마감 시간 안에서만 실행
+        self.resilient.start_cycle()
         try:
-            # OHLCV 데이터 조회 및 SMA 계산
-            df = self.get_ohlcv_data()
-            df = self.calculate_sma(df)
+            # 이전 실행의 분할 주문은 데이터 조회/신호 계산과 병렬로 이어서 실행
+            pending = current_state.get("parent_order")
+            resumed = None
+            if pending and pending.get("status") == "active":
+                resumed = self.resume_parent_order(pending, on_progress)
+
+            # 종가 조회 (지표는 전략이 최근 구간에서 계산, 저장된 구간 이후만 받음)
+            # 새 구간은 분할 주문이 끝난 뒤 반영 (그 전까지 백그라운드 스레드의
+            # on_progress가 current_state를 고치고 저장함)
+            df, window = self.get_close_data(current_state.get(WARM_STATE_KEY))
 
             # 현재 잔고 조회
             balance = self.get_current_balance()
@@ -244,30 +712,48 @@ class TradingBot:
                 "message": "No trading signal",
                 "current_balance": balance,
                 "current_position": current_state.get("position"),
+                "current_price": float(df["close"].iloc[-1]),
                 "state_changed": False,
             }
 
+            # 분할 주문 스레드가 끝난 뒤에만 current_state를 고침
+            parent = resumed.result() if resumed is not None else None
+
+            # 새로 마감된 캔들이 있으면 구간만 바뀐 상태도 저장
+            if window != current_state.get(WARM_STATE_KEY):
+                if window is None:
+                    current_state.pop(WARM_STATE_KEY, None)
+                else:
+                    current_state[WARM_STATE_KEY] = window
+                result["new_state"] = current_state
+                result["state_changed"] = True
+
+            # 분할 주문이 끝나야 포지션이 확정되므로 이번 실행은 그 결과만 반영
+            if parent is not None:
+                order_result = {
+                    **parent_report(parent),
+                    "parent_order": parent,
+                    "timestamp": datetime.now(),
+                }
+                if not order_result["in_progress"] and order_result["filled"]:
+                    notifier.notify_trade_executed(
+                        parent["side"].upper(),
+                        order_result["price"],
+                        order_result["filled"],
+                        0,
+                    )
+                result.update(
+                    self._apply_order(parent["side"], current_state, order_result)
+                )
+                return result
+
             # 매수 조건 확인
             if self.should_buy(df, current_state):
                 if balance["USDT"] >= self.trade_amount:
-                    order_result = self.place_buy_order(self.trade_amount)
-
-                    new_state = current_state.copy()
-                    new_state["position"] = {
-                        "buy_price": order_result["price"],
-                        "buy_amount": order_result["amount"],
-                        "buy_time": order_result["timestamp"].isoformat(),
-                        "order_id": order_result["order_id"],
-                    }
-
-                    result.update(
-                        {
-                            "action": "BUY",
-                            "message": f"매수 주문 실행 완료 - 가격: ${order_result['price']:.2f}",
-                            "new_state": new_state,
-                            "state_changed": True,
-                        }
+                    order_result = self.place_buy_order(
+                        self.trade_amount, on_progress, balance["USDT"], balance["BTC"]
                     )
+                    result.update(self._apply_order("buy", current_state, order_result))
                 else:
                     # 잔고 부족 알림
                     shortage = self.trade_amount - balance["USDT"]
@@ -281,37 +767,10 @@ class TradingBot:
             # 매도 조건 확인
             elif self.should_sell(df, current_state):
                 position = current_state["position"]
-                order_result = self.place_sell_order(position["buy_amount"])
-
-                # 수익 계산
-                profit = order_result["cost"] - self.trade_amount
-                profit_rate = (
-                    order_result["price"] - position["buy_price"]
-                ) / position["buy_price"]
-
-                new_state = current_state.copy()
-                new_state["position"] = None
-                new_state["last_trade"] = {
-                    "buy_price": position["buy_price"],
-                    "sell_price": order_result["price"],
-                    "profit": profit,
-                    "profit_rate": profit_rate,
-                    "sell_time": order_result["timestamp"].isoformat(),
-                }
-
-                # 수익 실현 알림
-                notifier.notify_profit_achieved(
-                    position["buy_price"], order_result["price"], profit, profit_rate
-                )
-
-                result.update(
-                    {
-                        "action": "SELL",
-                        "message": f"매도 주문 실행 완료 - 가격: ${order_result['price']:.2f}, 수익: ${profit:.2f} ({profit_rate*100:.2f}%)",
-                        "new_state": new_state,
-                        "state_changed": True,
-                    }
+                order_result = self.place_sell_order(
+                    position["buy_amount"], on_progress, balance["BTC"]
                 )
+                result.update(self._apply_order("sell", current_state, order_result))
 
             return result
 
@@ -0,0 +1,216 @@
+"""
+예약 실행 사이 캔들 구간 유지 (warm start)
+
+실행마다 최근 100개 캔들을 다시 받는 대신, 마감된 최근 종가 구간을 거래 상태에 작게
+저장해 두고 다음 실행에서는 그 이후 캔들만 받아 이어 붙인다. 지표는 전략이 마지막
+warmup 구간에서 다시 계산한다. 지표가 구간 밖 데이터에 의존하지 않으므로 누적 합을
+따로 저장하지 않아도 캔들을 모두 다시 받은 경우나 백테스트와 같은 값이 나온다.
+
+저장 형식 (상태의 WARM_STATE_KEY 항목)
+- config: 심볼/타임프레임 해시 (바뀌면 전체 재동기화)
+- last: 마지막 마감 캔들 시각(ms), timeframe_ms: 캔들 간격
+- closes: 마감 캔들 종가 (시간순, 빠진 봉 없이 연속)
+
+마지막으로 받은 캔들은 아직 진행 중일 수 있으므로 저장하지 않고 다음 실행에서 다시 받는다.
+
+base_timeframe 리샘플링을 쓰면 closes는 마감된 상위 봉 종가이고, 진행 중인 상위 봉은
+IncrementalResampler 상태(resampler 항목: 마지막 마감 기본 캔들 시각, 누적 중인 봉)로
+저장한다. 다음 실행은 그 이후 기본 캔들만 받아 누적한다.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from resample import (
+    OHLCV_COLUMNS,
+    IncrementalResampler,
+    bucket_start,
+    resample_ohlcv,
+    timeframe_to_ms,
+)
+
+WARM_STATE_KEY = "candle_window"
+
+
+def window_config(
+    symbol: str, timeframe: str, base_timeframe: Optional[str] = None
+) -> str:
+    """저장된 구간이 현재 설정과 맞는지 확인하는 해시"""
+    settings = {"symbol": symbol, "timeframe": timeframe}
+    if base_timeframe and base_timeframe != timeframe:
+        settings["base_timeframe"] = base_timeframe
+    encoded = json.dumps(settings, sort_keys=True)
+    return hashlib.sha1(encoded.encode()).hexdigest()[:12]
+
+
+def _contiguous_tail(timestamps: np.ndarray, timeframe_ms: int) -> int:
+    """마지막 누락 구간 이후 연속 구간의 시작 위치"""
+    breaks = np.flatnonzero(np.diff(timestamps) != timeframe_ms)
+    return int(breaks[-1]) + 1 if len(breaks) else 0
+
+
+class CandleWindow(NamedTuple):
+    """마감된 최근 캔들 종가 구간"""
+
+    last: int
+    timeframe_ms: int
+    closes: np.ndarray
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        offsets = np.arange(len(self.closes), dtype=np.int64)[::-1]
+        return self.last - self.timeframe_ms * offsets
+
+    @classmethod
+    def from_candles(
+        cls, timestamps: np.ndarray, closes: np.ndarray, timeframe_ms: int, size: int
+    ) -> Optional["CandleWindow"]:
+        """받은 캔들에서 마지막(진행 중일 수 있는) 봉을 뺀 연속 구간 최대 size개"""
+        return cls.from_closed(timestamps[:-1], closes[:-1], timeframe_ms, size)
+
+    @classmethod
+    def from_closed(
+        cls, timestamps: np.ndarray, closes: np.ndarray, timeframe_ms: int, size: int
+    ) -> Optional["CandleWindow"]:
+        """마감된 캔들의 마지막 연속 구간 최대 size개"""
+        start = max(_contiguous_tail(timestamps, timeframe_ms), len(closes) - size)
+        if start >= len(closes):
+            return None
+        return cls(
+            int(timestamps[-1]),
+            timeframe_ms,
+            np.asarray(closes[start:], dtype=np.float64),
+        )
+
+    @classmethod
+    def from_state(
+        cls, data: Optional[Dict[str, Any]], config: str, size: int
+    ) -> Tuple[Optional["CandleWindow"], str]:
+        """저장된 구간 복원 -> (구간, 쓸 수 없으면 그 이유)"""
+        if not data:
+            return None, "저장된 구간 없음"
+        if data.get("config") != config:
+            return None, "설정 변경"
+        closes = np.asarray(data.get("closes") or [], dtype=np.float64)
+        if len(closes) < size:
+            return None, f"구간이 짧음 ({len(closes)}/{size})"
+        return cls(int(data["last"]), int(data["timeframe_ms"]), closes[-size:]), ""
+
+    def to_state(self, config: str) -> Dict[str, Any]:
+        return {
+            "config": config,
+            "last": self.last,
+            "timeframe_ms": self.timeframe_ms,
+            "closes": self.closes.tolist(),
+        }
+
+    def extend(
+        self, ohlcv: List[List[float]], limit: int
+    ) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """last 이후 받은 캔들을 이어 붙인 (시각, 종가), 누락 가능성이 있으면 None
+
+        받은 개수가 limit에 닿으면 더 있을 수 있으므로 누락으로 본다.
+        """
+        if len(ohlcv) >= limit:
+            return None
+        candles = np.asarray(ohlcv, dtype=np.float64).reshape(-1, 6)
+        timestamps = candles[:, 0].astype(np.int64)
+        expected = self.last + self.timeframe_ms * np.arange(
+            1, len(timestamps) + 1, dtype=np.int64
+        )
+        if not np.array_equal(timestamps, expected):
+            return None
+        return (
+            np.concatenate([self.timestamps, timestamps]),
+            np.concatenate([self.closes, candles[:, 4]]),
+        )
+
+
+def resample_closed(
+    ohlcv: List[List[float]], timeframe: str, base_timeframe: str
+) -> Tuple[np.ndarray, np.ndarray, Optional[IncrementalResampler]]:
+    """받은 기본 캔들 중 마감된 것(마지막 제외)을 리샘플링 -> (마감 상위 봉 시각, 종가, 리샘플러)
+
+    IncrementalResampler에 하나씩 넣은 것과 같은 결과를 벡터화로 만든다. 아직 마감되지
+    않은 마지막 상위 봉은 리샘플러의 누적 중인 봉이 된다.
+    """
+    candles = np.asarray(ohlcv, dtype=np.float64).reshape(-1, 6)[:-1]
+    if len(candles) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0), None
+    df = pd.DataFrame(
+        candles[:, 1:],
+        columns=OHLCV_COLUMNS,
+        index=pd.to_datetime(candles[:, 0], unit="ms"),
+    )
+    df = df[~df.index.duplicated(keep="last")]
+    bars = resample_ohlcv(df, timeframe, base_timeframe)
+    timestamps = bars.index.asi8 // 1_000_000
+    closes = bars["close"].to_numpy()
+
+    resampler = IncrementalResampler(timeframe, base_timeframe)
+    current = None
+    if bars["candles"].iloc[-1] < resampler.expected_candles:
+        last = bars.iloc[-1]
+        current = [
+            int(timestamps[-1]),
+            *last[OHLCV_COLUMNS].tolist(),
+            int(last["candles"]),
+        ]
+        timestamps, closes = timestamps[:-1], closes[:-1]
+    resampler = IncrementalResampler.from_state(
+        {"last": int(candles[-1, 0]), "current": current}, timeframe, base_timeframe
+    )
+    return timestamps, closes, resampler
+
+
+def extend_resampled(
+    window: CandleWindow,
+    resampler: IncrementalResampler,
+    ohlcv: List[List[float]],
+    limit: int,
+) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """저장된 상위 봉 구간 뒤에 새 기본 캔들로 마감된 상위 봉을 이어 붙인 (시각, 종가)
+
+    ohlcv는 리샘플러의 마지막 기본 캔들 다음부터 받은 것이어야 하고, 마지막(진행 중일 수
+    있는) 캔들을 뺀 나머지를 resampler에 누적한다. 받은 개수가 limit에 닿았거나 기본
+    캔들 또는 상위 봉이 이어지지 않으면 누락 가능성이 있으므로 None.
+    """
+    base_ms = timeframe_to_ms(resampler.base_timeframe)
+    if not ohlcv or len(ohlcv) >= limit:
+        return None
+    if int(ohlcv[0][0]) != resampler.last_timestamp + base_ms:
+        return None
+
+    closed = [bar for candle in ohlcv[:-1] for bar in resampler.update(candle)]
+    timestamps = np.array([bar[0] for bar in closed], dtype=np.int64)
+    expected = window.last + window.timeframe_ms * np.arange(
+        1, len(closed) + 1, dtype=np.int64
+    )
+    if not np.array_equal(timestamps, expected):
+        return None
+    return (
+        np.concatenate([window.timestamps, timestamps]),
+        np.concatenate([window.closes, [bar[4] for bar in closed]]),
+    )
+
+
+def live_bars(
+    resampler: Optional[IncrementalResampler], candle: List[float], timeframe: str
+) -> Tuple[List[int], List[float]]:
+    """진행 중인 상위 봉(들)의 (시각, 종가): 누적 중인 봉에 마지막 기본 캔들을 더한 값
+
+    누적 중인 봉이 마지막 캔들과 다른 상위 봉이면 (중간 기본 캔들 누락) 둘 다 반환한다.
+    """
+    start = int(bucket_start(np.array([int(candle[0])]), timeframe)[0])
+    timestamps, closes = [], []
+    current = resampler.partial if resampler is not None else None
+    if current is not None and current[0] != start:
+        timestamps.append(int(current[0]))
+        closes.append(float(current[4]))
+    timestamps.append(start)
+    closes.append(float(candle[4]))
+    return timestamps, closes